@@ -64,7 +64,7 @@ from ._internal.planning.planner import LargePlanner
 
 # === Runtime Orchestration (Phase 1.10) ===
 # ✅ DONE: Plan execution orchestrator
-from ._internal.runtime.orchestrator import execute_plan
+from ._internal.runtime.orchestrator import execute_plan, execute_plan_stream
 from ._internal.security.secrets_redactor import install_secrets_redactor
 
 # === Configuration (Phase 0.c) ===
@@ -194,6 +194,7 @@ __all__ = [
 
     # Runtime Orchestration (Phase 1.10)
     "execute_plan",
+    "execute_plan_stream",
 ]
 
 # Auto-install secrets redaction on root logger to prevent credential leakage in logs.
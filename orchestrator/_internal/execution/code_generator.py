@@ -13,6 +13,9 @@ Usage:
     catalog = ToolCatalog()
     generator = StubGenerator(catalog, Path("stubs"))
     stubs = generator.generate_all()
+
+    catalog.add_tool(new_tool)
+    generator.sync()  # regenerates only what changed
 """
 
 import logging
@@ -63,6 +66,8 @@ class StubGenerator:
         self.catalog = catalog
         self.output_dir = output_dir
         self.generated_stubs: dict[str, GeneratedStub] = {}
+        # Catalog generation the stubs on disk reflect (None until generate_all)
+        self._generation: int | None = None
 
     def generate_all(self) -> dict[str, str]:
         """
@@ -78,6 +83,7 @@ class StubGenerator:
 
         stubs = {}
 
+        generation = self.catalog.generation
         for server_name, tools in by_server.items():
             server_dir = self.output_dir / "tools" / server_name
             server_dir.mkdir(parents=True, exist_ok=True)
@@ -85,37 +91,99 @@ class StubGenerator:
             logger.info(f"Generating {len(tools)} stubs for server: {server_name}")
 
             for tool in tools:
-                try:
-                    stub_path = server_dir / f"{tool.name}.py"
-                    stub_code = self._generate_stub(tool)
-
-                    # Write to disk
-                    stub_path.write_text(stub_code)
-
-                    stubs[str(stub_path)] = stub_code
-
-                    # Track generated stub
-                    self.generated_stubs[tool.name] = GeneratedStub(
-                        tool_name=tool.name,
-                        file_path=stub_path,
-                        code=stub_code,
-                        imports=self._extract_imports(stub_code),
-                        classes=self._extract_classes(stub_code)
-                    )
-
-                except Exception as e:
-                    logger.error(f"Failed to generate stub for {tool.name}: {e}")
-                    continue
+                stub = self._write_stub(tool, server_dir)
+                if stub is not None:
+                    stubs[str(stub.file_path)] = stub.code
 
             # Generate __init__.py for server
             self._generate_server_init(server_dir, tools)
 
         # Generate top-level __init__.py
         self._generate_top_init()
+        self._generation = generation
 
         logger.info(f"Generated {len(stubs)} stubs")
         return stubs
 
+    def sync(self) -> dict[str, str]:
+        """
+        Bring stubs up to date with the catalog's changes since the last generation.
+
+        Only added/updated tools are regenerated and removed tools' stubs are
+        deleted; server ``__init__.py`` files are rewritten for the affected
+        servers only. Falls back to ``generate_all`` if nothing was generated
+        yet or the catalog's change history no longer reaches back far enough.
+
+        Returns:
+            Dictionary mapping file paths to code for the regenerated stubs
+        """
+        diff = None if self._generation is None else self.catalog.diff_since(self._generation)
+        if diff is None:
+            return self.generate_all()
+        if not diff:
+            return {}
+
+        tools_dir = self.output_dir / "tools"
+        affected: set[str] = set()
+        for name in diff.removed | diff.updated.keys():
+            previous = self.generated_stubs.pop(name, None)
+            if previous is not None:
+                previous.file_path.unlink(missing_ok=True)
+                affected.add(previous.file_path.parent.name)
+
+        stubs = {}
+        for name in {**diff.added, **diff.updated}:
+            tool = self.catalog.get_tool(name)
+            if tool is None:
+                continue
+            server = tool.domain or "general"
+            server_dir = tools_dir / server
+            server_dir.mkdir(parents=True, exist_ok=True)
+            stub = self._write_stub(tool, server_dir)
+            if stub is not None:
+                stubs[str(stub.file_path)] = stub.code
+            affected.add(server)
+
+        by_server = self._group_by_server()
+        for server in affected:
+            server_dir = tools_dir / server
+            if server in by_server:
+                self._generate_server_init(server_dir, by_server[server])
+            elif server_dir.is_dir():
+                (server_dir / "__init__.py").unlink(missing_ok=True)
+                if not any(server_dir.iterdir()):
+                    server_dir.rmdir()
+        self._generate_top_init()
+        self._generation = diff.generation
+
+        logger.info(
+            f"Synced stubs: {len(diff.added)} added, {len(diff.updated)} updated, {len(diff.removed)} removed"
+        )
+        return stubs
+
+    def _write_stub(self, tool: ToolDefinition, server_dir: Path) -> GeneratedStub | None:
+        """Generate and write one tool's stub; returns None if generation failed."""
+        try:
+            stub_path = server_dir / f"{tool.name}.py"
+            stub_code = self._generate_stub(tool)
+
+            # Write to disk
+            stub_path.write_text(stub_code)
+
+            # Track generated stub
+            stub = self.generated_stubs[tool.name] = GeneratedStub(
+                tool_name=tool.name,
+                file_path=stub_path,
+                code=stub_code,
+                imports=self._extract_imports(stub_code),
+                classes=self._extract_classes(stub_code)
+            )
+            return stub
+
+        except Exception as e:
+            logger.error(f"Failed to generate stub for {tool.name}: {e}")
+            return None
+
     def validate_stub(self, code: str) -> bool:
         """Lightweight validation for generated code: AST parse + class/function presence.
 
@@ -31,11 +31,12 @@ try:
         PointStruct,
         VectorParams,
     )
-    from sentence_transformers import SentenceTransformer
     QDRANT_AVAILABLE = True
 except ImportError:
     QDRANT_AVAILABLE = False
 
+from ...shared.quantization import EMBEDDING_DTYPES, qdrant_collection_options, qdrant_search_params
+
 if TYPE_CHECKING:
     pass
 
@@ -312,6 +313,15 @@ def get_skill(name: str) -> Skill | None:
     return None
 
 
+def _skill_vector_dtype() -> str:
+    """Skill vector storage dtype from QDRANT_VECTOR_DTYPE (float32, float16 or int8)."""
+    dtype = os.getenv("QDRANT_VECTOR_DTYPE", "float32")
+    if dtype not in EMBEDDING_DTYPES:
+        logger.warning(f"Invalid QDRANT_VECTOR_DTYPE '{dtype}'; using float32")
+        return "float32"
+    return dtype
+
+
 def _get_qdrant() -> tuple[Any, Any] | None:
     """
     Get Qdrant client and embedding model if QDRANT_URL is set.
@@ -339,18 +349,24 @@ def _get_qdrant() -> tuple[Any, Any] | None:
         # Test connection by listing collections
         _qdrant_client.get_collections()
 
-        # Load embedding model
-        _embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+        # Shared embedding server if running, else an in-process model
+        from ...tools.embedding_server import load_embedding_model
+
+        _embedding_model = load_embedding_model("all-MiniLM-L6-v2")
+        if _embedding_model is None:
+            raise RuntimeError("No embedding model available (sentence-transformers not installed)")
 
         # Ensure collection exists
         collection_name = os.getenv("QDRANT_COLLECTION", "toolweaver_skills")
         try:
             _qdrant_client.get_collection(collection_name)
         except Exception:
-            # Create collection if missing
+            # Create collection if missing (optionally float16/int8 vectors)
+            vector_options, collection_options = qdrant_collection_options(_skill_vector_dtype())
             _qdrant_client.create_collection(
                 collection_name=collection_name,
-                vectors_config=VectorParams(size=384, distance=Distance.COSINE)
+                vectors_config=VectorParams(size=384, distance=Distance.COSINE, **vector_options),
+                **collection_options,
             )
             logger.info(f"Created Qdrant collection: {collection_name}")
 
@@ -512,11 +528,13 @@ def search_skills(query: str, top_k: int = 5) -> list[tuple[Skill, float]]:
                 warnings.simplefilter("ignore")
                 query_embedding = model.encode(query, show_progress_bar=False).tolist()
 
-            # Search Qdrant
+            # Search Qdrant (int8 collections rescore candidates with the originals)
+            search_params = qdrant_search_params(_skill_vector_dtype(), rescore=True)
             search_results = client.search(
                 collection_name=collection_name,
                 query_vector=query_embedding,
-                limit=top_k
+                limit=top_k,
+                **({"search_params": search_params} if search_params is not None else {}),
             )
 
             # Convert to skills
@@ -4,7 +4,8 @@ from collections import OrderedDict
 from collections.abc import AsyncGenerator, Awaitable, Callable
 from typing import Any
 
-from orchestrator.plugins.registry import get_registry
+from orchestrator.plugins.registry import PluginNotFoundError, get_registry
+from orchestrator.shared.change_feed import CatalogChange
 
 from ..dispatch.workers import (
     apply_changes_worker,
@@ -35,6 +36,13 @@ _idempotency_store: "OrderedDict[str, tuple[float, dict[str, Any]]]" = OrderedDi
 _IDEMPOTENCY_TTL_S = 600
 _IDEMPOTENCY_MAX = 256
 
+def _make_plugin_handler(plugin_instance: Any, tool_name: str) -> ToolHandler:
+    async def _handler(payload: dict[str, Any]) -> dict[str, Any]:
+        result = await plugin_instance.execute(tool_name, payload)
+        return result  # type: ignore[no-any-return]
+    return _handler
+
+
 class MCPClientShim:
     def __init__(
         self,
@@ -48,7 +56,9 @@ class MCPClientShim:
         # Start with built-in tool map
         self.tool_map = dict(_tool_map)
 
-        # Merge in tools registered via @mcp_tool/@tool decorators (plugin registry)
+        # Merge in tools registered via @mcp_tool/@tool decorators (plugin registry),
+        # then follow the registry's change feed instead of rescanning plugins
+        self._plugin_tools: set[str] = set()
         registry = get_registry()
         for plugin_name in registry.list():
             plugin = registry.get(plugin_name)
@@ -67,14 +77,9 @@ class MCPClientShim:
                 if not name or name in self.tool_map:
                     continue
 
-                # Capture plugin and name in closure with proper types
-                def make_handler(plugin_instance: Any, tool_name: str) -> Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]:
-                    async def _handler(payload: dict[str, Any]) -> dict[str, Any]:
-                        result = await plugin_instance.execute(tool_name, payload)
-                        return result  # type: ignore[no-any-return]
-                    return _handler
-
-                self.tool_map[name] = make_handler(plugin, name)
+                self.tool_map[name] = _make_plugin_handler(plugin, name)
+                self._plugin_tools.add(name)
+        registry.subscribe(self._on_registry_change, weak=True)
         self._max_retries = max_retries
         self._retry_backoff_s = retry_backoff_s
         self._circuit_breaker_threshold = circuit_breaker_threshold
@@ -83,6 +88,23 @@ class MCPClientShim:
         self._circuit_open_until: float | None = None
         self._observer = observer
 
+    def _on_registry_change(self, change: CatalogChange) -> None:
+        """Apply one plugin registry change to ``tool_map`` (built-in tools take precedence)."""
+        name = change.name
+        if change.kind == "remove":
+            if name in self._plugin_tools:
+                self._plugin_tools.discard(name)
+                self.tool_map.pop(name, None)
+            return
+        if name in self.tool_map and name not in self._plugin_tools:
+            return
+        try:
+            plugin = get_registry().get(change.source or "")
+        except PluginNotFoundError:
+            return
+        self.tool_map[name] = _make_plugin_handler(plugin, name)
+        self._plugin_tools.add(name)
+
     async def call_tool(self, tool_name: str, payload: dict[str, Any], idempotency_key: str | None = None, timeout: int = 30) -> dict[str, Any]:
         if idempotency_key:
             cached = self._get_cached(idempotency_key)
@@ -34,6 +34,8 @@ except ImportError:
     REDIS_AVAILABLE = False
     redis = None
 
+from ...shared.quantization import pack_embedding, unpack_embedding, validate_dtype
+
 logger = logging.getLogger(__name__)
 
 
@@ -397,10 +399,15 @@ class ToolCache:
     2. Search Results (1h TTL) - Query results
     3. Embeddings (7d TTL) - Text embeddings
     4. Tool Metadata (24h TTL) - Individual tools
+
+    Embeddings can be stored as float16 or int8 (per-vector scale) to cut
+    cache memory and transfer size 2-4x; ``get_embedding`` always returns
+    float32 vectors.
     """
 
-    def __init__(self, redis_cache: RedisCache):
+    def __init__(self, redis_cache: RedisCache, embedding_dtype: str = "float32"):
         self.cache = redis_cache
+        self.embedding_dtype = validate_dtype(embedding_dtype)
 
         # TTL values (seconds)
         self.CATALOG_TTL = 24 * 3600  # 24 hours
@@ -429,13 +436,15 @@ class ToolCache:
         return self.cache.set(key, results, ttl=self.SEARCH_TTL)
 
     def get_embedding(self, text_hash: str, model_name: str) -> Any:
-        """Get cached embedding"""
+        """Get cached embedding (quantized entries are dequantized)"""
         key = f"embedding:{text_hash}:{model_name}"
-        return self.cache.get(key)
+        return unpack_embedding(self.cache.get(key))
 
     def set_embedding(self, text_hash: str, model_name: str, embedding: Any) -> bool:
-        """Cache embedding"""
+        """Cache embedding (quantized to ``embedding_dtype`` unless float32)"""
         key = f"embedding:{text_hash}:{model_name}"
+        if self.embedding_dtype != "float32":
+            embedding = pack_embedding(embedding, self.embedding_dtype)
         return self.cache.set(key, embedding, ttl=self.EMBEDDING_TTL)
 
     def get_tool(self, tool_name: str, version: str) -> dict[str, Any] | None:
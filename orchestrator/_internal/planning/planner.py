@@ -42,6 +42,37 @@ except ImportError:
     genai = None  # type: ignore[assignment]
 
 
+def _prompt_tool_entry(tool: ToolDefinition) -> str:
+    """Indented JSON for one tool in the system prompt's tool listing."""
+    entry = {
+        "description": tool.description,
+        "parameters": {p.name: p.type for p in tool.parameters},
+        "required": [p.name for p in tool.parameters if p.required],
+        "metadata": tool.metadata,
+    }
+    return json.dumps(entry, indent=2).replace("\n", "\n    ")
+
+
+def _format_tool_listing(tools_by_type: dict[str, list[ToolDefinition]]) -> str:
+    """
+    Render ``{"<type>_tools": {name: entry}}`` exactly as ``json.dumps(..., indent=2)``.
+
+    Each tool's entry is serialized once and cached on the tool, so building
+    the prompt for N tools is a string join rather than N re-serializations.
+    """
+    groups = []
+    for tool_type, tools in tools_by_type.items():
+        if tools:
+            entries = ",\n".join(
+                f"    {json.dumps(tool.name)}: {tool.cached_serialization('planner_prompt', _prompt_tool_entry)}"
+                for tool in tools
+            )
+            groups.append(f'  "{tool_type}_tools": {{\n{entries}\n  }}')
+    if not groups:
+        return "{}"
+    return "{\n" + ",\n".join(groups) + "\n}"
+
+
 class LargePlanner:
     """
     Uses a large language model (GPT-4o, Claude 3.5) to generate execution plans
@@ -385,19 +416,8 @@ class LargePlanner:
             "code_exec": tool_catalog.get_by_type("code_exec")
         }
 
-        # Build tool descriptions
-        tool_descriptions = {}
-        for tool_type, tools in tools_by_type.items():
-            if tools:
-                tool_descriptions[f"{tool_type}_tools"] = {
-                    tool.name: {
-                        "description": tool.description,
-                        "parameters": {p.name: p.type for p in tool.parameters},
-                        "required": [p.name for p in tool.parameters if p.required],
-                        "metadata": tool.metadata
-                    }
-                    for tool in tools
-                }
+        # Build tool descriptions from memoized per-tool fragments
+        tool_listing = _format_tool_listing(tools_by_type)
 
         # Build programmatic calling section if enabled
         ptc_section = ""
@@ -457,7 +477,7 @@ DON'T use programmatic calling when:
         return f"""You are an execution planner for a hybrid orchestration system. Your job is to convert natural language requests into structured JSON execution plans.
 
 Available Tools:
-{json.dumps(tool_descriptions, indent=2)}
+{tool_listing}
 
 Plan Structure:
 {{
@@ -538,8 +558,8 @@ Respond with only the JSON execution plan."""
                     self.search_engine = ToolSearchEngine()
                     logger.info("Initialized semantic search engine")
 
-                # Search for relevant tools
-                search_results = self.search_engine.search(
+                # Search for relevant tools (model inference runs off the event loop)
+                search_results = await self.search_engine.search_async(
                     query=user_request,
                     catalog=catalog,
                     top_k=10,  # Get top 10 most relevant tools
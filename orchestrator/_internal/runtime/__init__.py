@@ -1,3 +1,19 @@
-from .orchestrator import execute_plan, final_synthesis, get_monitor, retry
+from .execution_scheduler import (
+    ConcurrencyLimits,
+    ExecutionScheduler,
+    SlotRequest,
+    get_execution_scheduler,
+)
+from .orchestrator import execute_plan, execute_plan_stream, final_synthesis, get_monitor, retry
 
-__all__ = ["execute_plan", "final_synthesis", "get_monitor", "retry"]
+__all__ = [
+    "ConcurrencyLimits",
+    "ExecutionScheduler",
+    "SlotRequest",
+    "execute_plan",
+    "execute_plan_stream",
+    "final_synthesis",
+    "get_execution_scheduler",
+    "get_monitor",
+    "retry",
+]
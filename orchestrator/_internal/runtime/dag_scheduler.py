@@ -0,0 +1,344 @@
+"""
+DAG Scheduler for ToolWeaver
+
+Event-driven execution of plan steps. Instead of running "waves" of ready
+steps (where one slow step holds back everything scheduled after its wave),
+each step starts the moment its last dependency completes, so a plan's
+makespan approaches its critical path.
+
+Readiness is tracked with per-step in-degree counters: a completion only
+decrements the counters of the finished step's dependents, so no pending
+step is ever rescanned.
+
+With an ``admit`` hook (e.g. the execution scheduler's bulkheads) a ready
+step first waits for admission. Steps that become ready together request
+admission in descending ``priorities`` order (e.g. ``PlanGraph.critical_path``
+ranks), and a finished step's admission is released only after its
+dependents have requested theirs, so a freed slot can go to the next step
+on the critical path rather than to whichever step queued first.
+
+``stream()`` yields a ``StepEvent`` as each step finishes, so callers can
+act on partial results; ``run()`` consumes the stream and returns all
+outputs.
+
+When a step fails (past its retry policy) the failure mode decides what
+happens to the rest of the plan:
+
+    wait       no new steps start; steps in flight finish (default)
+    fail_fast  steps in flight are cancelled immediately
+    continue   only the failed step's descendants are skipped; independent
+               branches keep running to completion
+
+Usage:
+    graph = PlanGraph.from_steps(plan["steps"])
+    scheduler = DagScheduler(graph, run=lambda step_id: run_step(steps[step_id], outputs, ...))
+    outputs = await scheduler.run()
+
+    async for step_id, status, result, timing in scheduler.stream():
+        ...
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Literal, NamedTuple, Protocol
+
+logger = logging.getLogger(__name__)
+
+StepStatus = Literal["completed", "failed", "cancelled", "skipped"]
+FailureMode = Literal["wait", "fail_fast", "continue"]
+FAILURE_MODES: tuple[str, ...] = ("wait", "fail_fast", "continue")
+
+
+@dataclass(frozen=True)
+class StepTiming:
+    """When a step ran, in seconds since the plan started."""
+    started_s: float
+    finished_s: float
+
+    @property
+    def duration_s(self) -> float:
+        return self.finished_s - self.started_s
+
+
+class StepEvent(NamedTuple):
+    """
+    A finished step; ``result`` is the output, or the exception for failures.
+
+    Cancelled steps (fail_fast) and skipped descendants of a failed step
+    (continue) get an event with ``result=None``.
+    """
+    step_id: str
+    status: StepStatus
+    result: Any
+    timing: StepTiming
+
+
+class Admission(Protocol):
+    """Permission for a step to run (e.g. ``execution_scheduler.SlotRequest``)."""
+
+    async def wait(self) -> None: ...
+
+    def release(self) -> None: ...
+
+
+class StepFailedError(RuntimeError):
+    """
+    A plan step failed after exhausting its retry policy.
+
+    ``step_id``/``error`` describe the first failure; ``failures`` holds every
+    failed step and ``outputs`` the steps that did complete (all independent
+    branches in "continue" mode).
+    """
+
+    def __init__(self, step_id: str, error: BaseException):
+        super().__init__(f"Step {step_id} failed: {error}")
+        self.step_id = step_id
+        self.error = error
+        self.failures: dict[str, BaseException] = {step_id: error}
+        self.outputs: dict[str, Any] = {}
+
+
+class PlanGraph:
+    """
+    Dependency graph of a plan's steps.
+
+    Raises:
+        RuntimeError: If a step depends on an unknown step or the plan is cyclic
+    """
+
+    def __init__(self, dependencies: dict[str, Iterable[str]]):
+        self.dependencies: dict[str, tuple[str, ...]] = {
+            step_id: tuple(dict.fromkeys(deps)) for step_id, deps in dependencies.items()
+        }
+        self.dependents: dict[str, list[str]] = {step_id: [] for step_id in self.dependencies}
+        for step_id, deps in self.dependencies.items():
+            for dep in deps:
+                if dep not in self.dependents:
+                    raise RuntimeError(f"Step {step_id} depends on unknown step {dep}")
+                self.dependents[dep].append(step_id)
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_steps(cls, steps: Iterable[dict[str, Any]]) -> "PlanGraph":
+        """Build from plan step dicts (``id`` and optional ``depends_on``)."""
+        return cls({step["id"]: step.get("depends_on") or [] for step in steps})
+
+    def in_degrees(self) -> dict[str, int]:
+        """Number of unfinished dependencies per step, before anything has run."""
+        return {step_id: len(deps) for step_id, deps in self.dependencies.items()}
+
+    def roots(self) -> list[str]:
+        """Steps without dependencies."""
+        return [step_id for step_id, deps in self.dependencies.items() if not deps]
+
+    def critical_path(self, weights: dict[str, float] | None = None) -> dict[str, float]:
+        """
+        Longest remaining path from each step to the end of the plan.
+
+        Args:
+            weights: Estimated duration per step (missing steps weigh 1, so
+                without weights this is the number of steps on the path)
+
+        Returns:
+            Step id -> the step's weight plus the heaviest chain of dependents
+        """
+        weights = weights or {}
+        ranks: dict[str, float] = {}
+        for step_id in reversed(self.order):
+            downstream = max((ranks[dependent] for dependent in self.dependents[step_id]), default=0.0)
+            ranks[step_id] = weights.get(step_id, 1.0) + downstream
+        return ranks
+
+    def _topological_order(self) -> list[str]:
+        remaining = self.in_degrees()
+        order = self.roots()
+        for step_id in order:  # grows while iterating (Kahn's algorithm)
+            for dependent in self.dependents[step_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    order.append(dependent)
+        if len(order) != len(self.dependencies):
+            stuck = sorted(set(self.dependencies) - set(order))
+            raise RuntimeError(f"Cyclic plan; steps in or behind a cycle: {stuck}")
+        return order
+
+    def __len__(self) -> int:
+        return len(self.dependencies)
+
+
+class DagScheduler:
+    """
+    Runs a ``PlanGraph``, starting each step as soon as its dependencies are done.
+
+    On a step failure, ``failure_mode`` decides whether steps in flight are
+    awaited ("wait"), cancelled ("fail_fast"), or whether independent
+    branches carry on ("continue"); ``StepFailedError`` is raised for the
+    first failure once the plan has wound down.
+    """
+
+    def __init__(
+        self,
+        graph: PlanGraph,
+        run: Callable[[str], Awaitable[Any]],
+        outputs: dict[str, Any] | None = None,
+        failure_mode: FailureMode = "wait",
+        priorities: dict[str, float] | None = None,
+        admit: Callable[[str], Admission] | None = None,
+    ):
+        """
+        Args:
+            graph: Plan dependency graph
+            run: Executes one step by id and returns its output
+            outputs: Dict to collect step outputs in (shared with ``run`` so
+                steps can read their dependencies' outputs)
+            failure_mode: "wait", "fail_fast" or "continue"
+            priorities: Higher starts first among steps that become ready
+                together (default: plan order)
+            admit: Requests admission for a ready step; the step runs once
+                the admission's ``wait()`` returns, and the admission is
+                released after the step's dependents have been started
+
+        Raises:
+            ValueError: If failure_mode is unknown
+        """
+        if failure_mode not in FAILURE_MODES:
+            raise ValueError(f"failure_mode must be one of {FAILURE_MODES}, got {failure_mode!r}")
+        self.graph = graph
+        self._run = run
+        self.outputs: dict[str, Any] = {} if outputs is None else outputs
+        self.failure_mode = failure_mode
+        self.priorities = priorities or {}
+        self._admit = admit
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Execute every step.
+
+        Returns:
+            Step id -> output
+
+        Raises:
+            StepFailedError: If a step fails
+        """
+        async for _ in self.stream():
+            pass
+        return self.outputs
+
+    async def stream(self) -> AsyncIterator[StepEvent]:
+        """
+        Execute every step, yielding an event as each one finishes.
+
+        Outputs are recorded (and dependents started) before the event is
+        yielded. Closing the iterator early cancels the steps in flight.
+
+        Raises:
+            StepFailedError: After the last event, if a step failed
+        """
+        remaining = self.graph.in_degrees()
+        running: dict[asyncio.Task[Any], str] = {}
+        started: dict[str, float] = {}
+        skipped: set[str] = set()
+        admissions: dict[str, Admission] = {}
+        failure: StepFailedError | None = None
+        origin = time.perf_counter()
+
+        async def run_admitted(step_id: str, admission: Admission) -> Any:
+            await admission.wait()
+            return await self._run(step_id)
+
+        def start(step_ids: list[str]) -> None:
+            for step_id in sorted(step_ids, key=lambda s: -self.priorities.get(s, 0.0)):
+                started[step_id] = time.perf_counter() - origin
+                if self._admit is None:
+                    task = asyncio.ensure_future(self._run(step_id))
+                else:
+                    admissions[step_id] = self._admit(step_id)
+                    task = asyncio.ensure_future(run_admitted(step_id, admissions[step_id]))
+                running[task] = step_id
+
+        def release(step_ids: Iterable[str]) -> None:
+            for step_id in list(step_ids):
+                admission = admissions.pop(step_id, None)
+                if admission is not None:
+                    admission.release()
+
+        def skip_descendants(step_id: str, now: float) -> list[StepEvent]:
+            events = []
+            frontier = list(self.graph.dependents[step_id])
+            while frontier:
+                dependent = frontier.pop()
+                if dependent not in skipped:
+                    skipped.add(dependent)
+                    events.append(StepEvent(dependent, "skipped", None, StepTiming(now, now)))
+                    frontier.extend(self.graph.dependents[dependent])
+            if events:
+                logger.info(f"Skipping descendants of failed step {step_id}: {sorted(e.step_id for e in events)}")
+            return events
+
+        start(self.graph.roots())
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                finished_s = time.perf_counter() - origin
+                # Record every completion of this batch before handing control to the caller
+                events = []
+                ready = []
+                finished = []
+                for task in sorted(done, key=running.__getitem__):
+                    step_id = running.pop(task)
+                    finished.append(step_id)
+                    timing = StepTiming(started[step_id], finished_s)
+                    error = task.exception()
+                    if error is not None:
+                        logger.error(f"Step {step_id} failed: {error}")
+                        if failure is None:
+                            failure = StepFailedError(step_id, error)
+                        failure.failures[step_id] = error
+                        events.append(StepEvent(step_id, "failed", error, timing))
+                        if self.failure_mode == "continue":
+                            events.extend(skip_descendants(step_id, finished_s))
+                        continue
+
+                    logger.info(f"Step {step_id} completed successfully")
+                    self.outputs[step_id] = task.result()
+                    events.append(StepEvent(step_id, "completed", self.outputs[step_id], timing))
+                    if failure is not None and self.failure_mode != "continue":
+                        continue
+                    for dependent in self.graph.dependents[step_id]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            ready.append(dependent)
+
+                if failure is None or self.failure_mode == "continue":
+                    start(ready)
+                release(finished)
+                if failure is not None and self.failure_mode == "fail_fast" and running:
+                    cancelled_s = time.perf_counter() - origin
+                    events.extend(
+                        StepEvent(step_id, "cancelled", None, StepTiming(started[step_id], cancelled_s))
+                        for step_id in sorted(running.values())
+                    )
+                    await self._cancel(running)
+                    release(admissions)
+                for event in events:
+                    yield event
+        finally:
+            await self._cancel(running)
+            release(admissions)
+
+        if failure is not None:
+            failure.outputs = dict(self.outputs)
+            raise failure
+
+    @staticmethod
+    async def _cancel(running: dict[asyncio.Task[Any], str]) -> None:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+            logger.info(f"Cancelled {len(running)} in-flight steps: {sorted(running.values())}")
+        running.clear()
@@ -0,0 +1,389 @@
+"""
+Execution Scheduler for ToolWeaver
+
+Runtime-wide admission control for plan steps. Without it every ready step
+starts at once and concurrent plans are not coordinated, so one hot tool
+(say ``receipt_ocr``) can fill the process with calls, overload its backend
+and starve every other plan.
+
+Before it runs, a step takes one slot in each bulkhead it belongs to:
+
+    global       every step, across all plans in the process
+    tool:<name>  steps calling one tool
+    agent:<id>   steps delegating to one agent (instead of tool:<name>)
+    type:<type>  steps of one tool type (mcp, function, code_exec, agent)
+
+Slots are granted all-or-nothing, and a waiting step only holds up steps
+that need the same saturated bulkhead: steps queued behind a full
+``tool:receipt_ocr`` never block a step for another tool.
+
+Under contention the waiter with the highest priority goes first (ties in
+arrival order). ``execute_plan`` uses each step's critical-path rank - the
+estimated time from the step's start to the end of its plan - so steps that
+gate long downstream chains are admitted before short side branches. The
+DAG scheduler queues a step (``request``) as soon as it is ready and only
+releases a finished step's slots after queueing its dependents, so a freed
+slot can pass straight to the next step on the critical path. Every
+admission of a queued step is logged with its priority and wait time.
+
+Limits come from ``ConcurrencyLimits`` (read from the environment by
+default) and from ``ToolDefinition.metadata["max_concurrency"]`` of
+registered tools; explicit limits win over tool metadata. A bulkhead
+without a limit is unbounded, so by default nothing is capped.
+
+Environment Variables:
+    TOOLWEAVER_MAX_CONCURRENT_STEPS - Global cap on running steps (default: unbounded)
+    TOOLWEAVER_DEFAULT_TOOL_CONCURRENCY - Cap for tools/agents without their own limit
+    TOOLWEAVER_TOOL_CONCURRENCY - Per-tool caps, e.g. "receipt_ocr=4,github_create_pr=2"
+    TOOLWEAVER_AGENT_CONCURRENCY - Per-agent caps, e.g. "researcher=2"
+    TOOLWEAVER_TOOL_TYPE_CONCURRENCY - Per-tool-type caps, e.g. "agent=4,code_exec=2"
+
+Usage:
+    scheduler = get_execution_scheduler()
+    scheduler.register_tools(catalog.tools.values())
+
+    async with scheduler.slot(step, priority=critical_path_s):
+        result = await run_step(step, ...)
+"""
+
+import asyncio
+import bisect
+import itertools
+import logging
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from ...shared.models import ToolDefinition
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_BULKHEAD = "global"
+METADATA_LIMIT_KEY = "max_concurrency"
+
+ToolLookup = Callable[[str], ToolDefinition | None]
+
+
+def _parse_limit(value: Any, name: str) -> int | None:
+    """Positive int limit, or None (unbounded) if unset or invalid."""
+    if value is None or value == "":
+        return None
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid {name} limit {value!r}; ignoring")
+        return None
+
+
+def _parse_limits(value: str | None, name: str) -> dict[str, int]:
+    """Parse "key=limit,key=limit"; invalid entries are logged and skipped."""
+    limits: dict[str, int] = {}
+    for entry in filter(None, (e.strip() for e in (value or "").split(","))):
+        key, _, limit = entry.partition("=")
+        parsed = _parse_limit(limit.strip(), f"{name} {key.strip()}")
+        if parsed is not None:
+            limits[key.strip()] = parsed
+    return limits
+
+
+@dataclass
+class ConcurrencyLimits:
+    """
+    Bulkhead limits; None (or a missing key) means unbounded.
+
+    Attributes:
+        max_concurrent: Cap on steps running at once, across all plans
+        default_per_tool: Cap for each tool/agent without a limit of its own
+        per_tool: Tool name -> cap (overrides tool metadata)
+        per_agent: Agent id -> cap
+        per_type: Tool type -> cap
+    """
+    max_concurrent: int | None = None
+    default_per_tool: int | None = None
+    per_tool: dict[str, int] = field(default_factory=dict)
+    per_agent: dict[str, int] = field(default_factory=dict)
+    per_type: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "ConcurrencyLimits":
+        """Load limits from the TOOLWEAVER_*_CONCURRENCY environment variables."""
+        return cls(
+            max_concurrent=_parse_limit(os.getenv("TOOLWEAVER_MAX_CONCURRENT_STEPS"), "TOOLWEAVER_MAX_CONCURRENT_STEPS"),
+            default_per_tool=_parse_limit(
+                os.getenv("TOOLWEAVER_DEFAULT_TOOL_CONCURRENCY"), "TOOLWEAVER_DEFAULT_TOOL_CONCURRENCY"
+            ),
+            per_tool=_parse_limits(os.getenv("TOOLWEAVER_TOOL_CONCURRENCY"), "TOOLWEAVER_TOOL_CONCURRENCY"),
+            per_agent=_parse_limits(os.getenv("TOOLWEAVER_AGENT_CONCURRENCY"), "TOOLWEAVER_AGENT_CONCURRENCY"),
+            per_type=_parse_limits(os.getenv("TOOLWEAVER_TOOL_TYPE_CONCURRENCY"), "TOOLWEAVER_TOOL_TYPE_CONCURRENCY"),
+        )
+
+
+@dataclass(eq=False)
+class SlotRequest:
+    """
+    A step's claim on its bulkhead slots, queued until they are granted.
+
+    ``release()`` gives the slots back, or leaves the queue if they were not
+    granted yet; releasing twice is harmless.
+    """
+    scheduler: "ExecutionScheduler"
+    step_id: str
+    bulkheads: dict[str, int | None]
+    priority: float
+    loop: asyncio.AbstractEventLoop
+    future: "asyncio.Future[None]"
+    seq: int
+    queued_at: float
+    granted: bool = False
+    queued: bool = False  # had to wait for a slot
+    released: bool = False
+
+    def order(self) -> tuple[float, int]:
+        return (-self.priority, self.seq)
+
+    async def wait(self) -> None:
+        """Wait until the slots are granted (cancelling the wait releases the request)."""
+        if self.granted:
+            return
+        try:
+            await self.future
+        except asyncio.CancelledError:
+            self.release()
+            raise
+
+    def release(self) -> None:
+        """Give the slots back (or leave the queue) and admit whichever waiters now fit."""
+        self.scheduler._settle(self)
+
+
+class ExecutionScheduler:
+    """
+    Process-wide bulkheads for plan steps.
+
+    Thread-safe: plans running on different event loops share the same
+    slots, and a freed slot wakes the next waiter on its own loop.
+    """
+
+    def __init__(self, limits: ConcurrencyLimits | None = None, tool_lookup: ToolLookup | None = None):
+        """
+        Args:
+            limits: Explicit limits (default: unbounded)
+            tool_lookup: Resolves tool names not registered with
+                ``register_tools`` (e.g. from the plugin registry), for
+                their type and metadata limit; results are cached per tool
+                name until the next ``register_tools`` call
+        """
+        self.limits = limits or ConcurrencyLimits()
+        self._tool_lookup = tool_lookup
+        self._tools: dict[str, ToolDefinition] = {}
+        # Tool name -> (type, metadata limit), or None if unknown; cached so
+        # steps do not repeat the registry lookup
+        self._tool_info_cache: dict[str, tuple[str, int | None] | None] = {}
+        self._active: dict[str, int] = {}
+        self._waiters: list[SlotRequest] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def register_tools(self, tools: Iterable[ToolDefinition]) -> None:
+        """Use these definitions' type and ``metadata["max_concurrency"]`` for their steps."""
+        with self._lock:
+            for tool in tools:
+                self._tools[tool.name] = tool
+            self._tool_info_cache.clear()
+
+    def _tool(self, name: str) -> ToolDefinition | None:
+        tool = self._tools.get(name)
+        if tool is None and self._tool_lookup is not None:
+            try:
+                tool = self._tool_lookup(name)
+            except Exception as e:
+                logger.debug(f"Tool lookup failed for '{name}': {e}")
+        return tool if isinstance(tool, ToolDefinition) else None
+
+    @staticmethod
+    def _metadata_limit(tool: ToolDefinition | None) -> int | None:
+        if tool is None:
+            return None
+        return _parse_limit(tool.metadata.get(METADATA_LIMIT_KEY), f"{tool.name} metadata {METADATA_LIMIT_KEY}")
+
+    def _tool_info(self, name: str) -> tuple[str, int | None] | None:
+        """A tool's type and metadata limit (None if unknown), looked up once per name."""
+        try:
+            return self._tool_info_cache[name]
+        except KeyError:
+            pass
+        tool = self._tool(name)
+        info = (tool.type, self._metadata_limit(tool)) if tool is not None else None
+        self._tool_info_cache[name] = info
+        return info
+
+    def bulkheads(self, step: dict[str, Any]) -> dict[str, int | None]:
+        """
+        Bulkheads a step occupies while it runs, with their current limits.
+
+        Args:
+            step: Plan step dict
+
+        Returns:
+            Bulkhead key (e.g. "tool:receipt_ocr") -> limit (None = unbounded);
+            only the global bulkhead when nothing else can be limited
+        """
+        limits = self.limits
+        tool_name = step.get("tool") or "unknown"
+        agent_id = step.get("agent_id") if step.get("type") == "agent" else None
+        if agent_id is None and tool_name.startswith("agent_"):
+            agent_id = tool_name[len("agent_"):]
+
+        info = self._tool_info(f"agent_{agent_id}" if agent_id is not None else tool_name)
+        metadata_limit = info[1] if info is not None else None
+        if (
+            metadata_limit is None
+            and limits.default_per_tool is None
+            and not (limits.per_tool or limits.per_agent or limits.per_type)
+        ):
+            return {GLOBAL_BULKHEAD: limits.max_concurrent}
+
+        if agent_id is not None:
+            tool_type = info[0] if info is not None else "agent"
+            own_key = f"agent:{agent_id}"
+            own_limit = limits.per_agent.get(agent_id) or metadata_limit
+        else:
+            if info is not None:
+                tool_type = info[0]
+            elif tool_name in ("code_exec", "function_call"):
+                tool_type = "code_exec" if tool_name == "code_exec" else "function"
+            else:
+                tool_type = "mcp"
+            own_key = f"tool:{tool_name}"
+            own_limit = limits.per_tool.get(tool_name) or metadata_limit
+
+        return {
+            GLOBAL_BULKHEAD: limits.max_concurrent,
+            f"type:{tool_type}": limits.per_type.get(tool_type),
+            own_key: own_limit or limits.default_per_tool,
+        }
+
+    def request(self, step: dict[str, Any], priority: float = 0.0) -> SlotRequest:
+        """
+        Queue a step for its bulkhead slots without waiting.
+
+        The request is granted at once if the slots are free; otherwise
+        ``await request.wait()`` returns when they are.
+
+        Args:
+            step: Plan step dict
+            priority: Higher goes first when steps compete for a slot
+                (e.g. the step's critical-path estimate in seconds)
+
+        Returns:
+            The request, to ``wait()`` on and ``release()`` when the step is done
+        """
+        loop = asyncio.get_running_loop()
+        request = SlotRequest(
+            scheduler=self,
+            step_id=step.get("id", "unknown"),
+            bulkheads=self.bulkheads(step),
+            priority=priority,
+            loop=loop,
+            future=loop.create_future(),
+            seq=next(self._seq),
+            queued_at=time.perf_counter(),
+        )
+        with self._lock:
+            bisect.insort(self._waiters, request, key=SlotRequest.order)
+            self._grant()
+            request.queued = not request.granted
+            if request.queued:
+                saturated = [
+                    key for key, limit in request.bulkheads.items()
+                    if limit is not None and self._active.get(key, 0) >= limit
+                ]
+                logger.debug(f"Step {request.step_id} (priority {priority:.3f}) queued for bulkheads {saturated}")
+        return request
+
+    async def acquire(self, step: dict[str, Any], priority: float = 0.0) -> SlotRequest:
+        """Wait for the step's bulkhead slots (see ``request``); release the result when done."""
+        request = self.request(step, priority)
+        await request.wait()
+        return request
+
+    @asynccontextmanager
+    async def slot(self, step: dict[str, Any], priority: float = 0.0) -> AsyncIterator[None]:
+        """Hold the step's bulkhead slots for the duration of the block (see ``request``)."""
+        request = await self.acquire(step, priority)
+        try:
+            yield
+        finally:
+            request.release()
+
+    def stats(self) -> dict[str, Any]:
+        """Running steps per bulkhead and the number of queued steps."""
+        with self._lock:
+            return {"active": dict(self._active), "waiting": len(self._waiters)}
+
+    def _fits(self, bulkheads: dict[str, int | None]) -> bool:
+        return all(limit is None or self._active.get(key, 0) < limit for key, limit in bulkheads.items())
+
+    def _settle(self, request: SlotRequest) -> None:
+        with self._lock:
+            if request.released:
+                return
+            request.released = True
+            if not request.granted:
+                self._waiters.remove(request)
+                return
+            for key in request.bulkheads:
+                self._active[key] -= 1
+                if not self._active[key]:
+                    del self._active[key]
+            self._grant()
+
+    def _grant(self) -> None:
+        # Called with the lock held; scans in priority order so a waiter is
+        # only passed over while one of its own bulkheads is full
+        for request in list(self._waiters):
+            if not self._fits(request.bulkheads):
+                continue
+            self._waiters.remove(request)
+            try:
+                request.loop.call_soon_threadsafe(_wake, request.future)
+            except RuntimeError:
+                request.released = True  # event loop closed; nobody is waiting any more
+                continue
+            request.granted = True
+            for key in request.bulkheads:
+                self._active[key] = self._active.get(key, 0) + 1
+            if request.queued:
+                logger.info(
+                    f"Admitted step {request.step_id} (priority {request.priority:.3f}) after waiting "
+                    f"{time.perf_counter() - request.queued_at:.3f}s; {len(self._waiters)} still queued"
+                )
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_default_scheduler: ExecutionScheduler | None = None
+_default_lock = threading.Lock()
+
+
+def _lookup_registry_tool(name: str) -> ToolDefinition | None:
+    from ...tools.discovery_api import get_tool_info
+
+    tool = get_tool_info(name)
+    return tool if isinstance(tool, ToolDefinition) else None
+
+
+def get_execution_scheduler() -> ExecutionScheduler:
+    """Return the process-wide execution scheduler (limits from the environment, tools from the plugin registry)."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = ExecutionScheduler(ConcurrencyLimits.from_env(), tool_lookup=_lookup_registry_tool)
+        return _default_scheduler
@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import os
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import datetime
 from functools import partial
 from typing import TYPE_CHECKING, Any
@@ -12,6 +12,8 @@ from ..dispatch.hybrid_dispatcher import dispatch_step
 from ..infra.a2a_client import A2AClient, AgentDelegationRequest
 from ..infra.mcp_client import MCPClientShim
 from ..observability.monitoring import ToolUsageMonitor
+from .dag_scheduler import DagScheduler, FailureMode, PlanGraph, StepEvent
+from .execution_scheduler import ExecutionScheduler, SlotRequest, get_execution_scheduler
 
 if TYPE_CHECKING:
     pass
@@ -197,10 +199,80 @@ async def run_step(step: dict[str, Any], step_outputs: dict[str, Any], mcp_clien
             monitor.log_tool_call(tool_name, success=False, latency=latency, error=str(e), execution_id=step_id)
         raise
 
-async def execute_plan(plan: dict[str, Any], *, a2a_client: A2AClient | None = None) -> dict[str, Any]:
+def _monitored_tool_name(step: dict[str, Any]) -> str:
+    """Name ``run_step`` records a step's calls under in the monitor."""
+    if step.get("type") == "agent":
+        return f"agent_{step.get('agent_id', 'unknown')}"
+    return str(step.get("tool", "unknown"))
+
+
+def _recorded_tool_latencies(
+    steps: dict[str, dict[str, Any]],
+    monitor: ToolUsageMonitor | None,
+    percentile: str,
+) -> dict[str, float | None]:
+    """Recorded latency percentile per monitored tool (None if the tool has no recorded calls)."""
+    per_tool: dict[str, float | None] = {}
+    for step in steps.values():
+        name = _monitored_tool_name(step)
+        if name in per_tool:
+            continue
+        metrics = monitor.get_tool_metrics(name) if monitor else {}
+        latency = metrics.get("latency", {}).get(percentile) if isinstance(metrics, dict) else None
+        per_tool[name] = float(latency) if isinstance(latency, (int, float)) else None
+    return per_tool
+
+
+def _latency_estimates(steps: dict[str, dict[str, Any]], per_tool: dict[str, float | None]) -> dict[str, float]:
+    known = sorted(latency for latency in per_tool.values() if latency is not None)
+    fallback = known[len(known) // 2] if known else 1.0
+    estimates = {}
+    for step_id, step in steps.items():
+        latency = per_tool[_monitored_tool_name(step)]
+        estimates[step_id] = fallback if latency is None else latency
+    return estimates
+
+
+def estimate_step_latencies(
+    steps: dict[str, dict[str, Any]],
+    monitor: ToolUsageMonitor | None,
+    percentile: str = "p50",
+) -> dict[str, float]:
+    """
+    Estimate each step's duration from its tool's recorded latencies.
+
+    Steps whose tool has no recorded calls get the median of the known
+    estimates (1s if nothing is known, which ranks paths by step count).
+
+    Args:
+        steps: Step id -> step definition
+        monitor: Monitor with per-tool latency percentiles (``get_tool_metrics``)
+        percentile: "p50" for typical latency, "p95" to weight slow tails
+
+    Returns:
+        Step id -> estimated seconds
+    """
+    return _latency_estimates(steps, _recorded_tool_latencies(steps, monitor, percentile))
+
+
+async def execute_plan(
+    plan: dict[str, Any],
+    *,
+    a2a_client: A2AClient | None = None,
+    failure_mode: FailureMode = "wait",
+    execution_scheduler: ExecutionScheduler | None = None,
+) -> dict[str, Any]:
     """
     Execute a multi-step execution plan with dependency resolution.
 
+    Steps are scheduled event-driven: each one starts as soon as all of its
+    dependencies have completed and the runtime-wide execution scheduler
+    has a slot for it (global, per-tool, per-agent and per-tool-type
+    concurrency limits shared by all running plans). When slots are
+    contended, the step with the longest estimated remaining path to the
+    end of the plan (weighted by per-tool p50 latencies from the monitor)
+    is admitted first.
+
     This orchestrator supports hybrid tool types:
     - MCP workers (deterministic tools)
     - Function calls (structured APIs)
@@ -209,55 +281,114 @@ async def execute_plan(plan: dict[str, Any], *, a2a_client: A2AClient | None = N
     Args:
         plan: Plan dictionary with steps and final_synthesis config
         a2a_client: Optional A2A client for agent delegation
+        failure_mode: What happens when a step fails past its retries:
+            "wait" lets steps in flight finish, "fail_fast" cancels them,
+            "continue" skips only the failed step's descendants and runs
+            the independent branches to completion
+        execution_scheduler: Bulkheads to run steps under (default: the
+            process-wide scheduler from ``get_execution_scheduler()``)
 
     Returns:
         Context dictionary with all step outputs
 
     Raises:
         RuntimeError: If plan is invalid, cyclic, or step execution fails
+            (StepFailedError carries the partial outputs)
     """
-    PlanModel(**plan)  # validate
-    steps = {s['id']: s for s in plan['steps']}
-    pending = set(steps.keys())
     completed: dict[str, Any] = {}
-    mcp_client = MCPClientShim()
-    a2a_client = a2a_client or None
-    monitor = get_monitor()
+    stream = execute_plan_stream(
+        plan,
+        a2a_client=a2a_client,
+        outputs=completed,
+        failure_mode=failure_mode,
+        execution_scheduler=execution_scheduler,
+    )
+    async for _ in stream:
+        pass
 
-    def ready_steps() -> list[str]:
-        """Find steps whose dependencies are all completed."""
-        return [sid for sid in pending if all(dep in completed for dep in steps[sid].get('depends_on', []))]
+    context = { 'steps': completed }
+    logger.info("Plan execution completed successfully")
+    return context
 
-    # Log plan start
-    plan.get('request_id', 'unknown')
-    logger.info(f"Starting plan execution with {len(steps)} steps")
+async def execute_plan_stream(
+    plan: dict[str, Any],
+    *,
+    a2a_client: A2AClient | None = None,
+    outputs: dict[str, Any] | None = None,
+    failure_mode: FailureMode = "wait",
+    execution_scheduler: ExecutionScheduler | None = None,
+) -> AsyncIterator[StepEvent]:
+    """
+    Execute a plan like ``execute_plan``, yielding each step's result as it completes.
 
-    while pending:
-        ready = ready_steps()
-        if not ready:
-            raise RuntimeError(f"Stuck or cyclic plan; pending={pending}, completed={list(completed.keys())}")
+    Events are ``(step_id, status, result, timing)`` tuples (``StepEvent``):
+    status is "completed", "failed", "cancelled" (fail_fast) or "skipped"
+    (continue), result is the step output (the exception for failures,
+    None for cancelled/skipped steps) and timing holds start/finish offsets
+    in seconds since the plan started (a step's duration includes any time
+    it queued for an execution scheduler slot). Dependents of a step are
+    already running when its event is yielded. Breaking out of the loop
+    cancels the steps still in flight.
 
-        logger.info(f"Executing {len(ready)} ready steps: {ready}")
-        coros = [run_step(steps[sid], completed, mcp_client, monitor, a2a_client) for sid in ready]
-        results = await asyncio.gather(*coros, return_exceptions=True)
+    Args:
+        plan: Plan dictionary with steps and final_synthesis config
+        a2a_client: Optional A2A client for agent delegation
+        outputs: Optional dict that collects step outputs as they complete
+        failure_mode: "wait", "fail_fast" or "continue" (see ``execute_plan``)
+        execution_scheduler: Bulkheads to run steps under (see ``execute_plan``)
 
-        for sid, res in zip(ready, results, strict=False):
-            if isinstance(res, Exception):
-                logger.exception("Step failed %s", sid)
-                raise RuntimeError(f"Step {sid} failed: {res}")
-            else:
-                logger.info(f"Step {sid} completed successfully")
-                completed[sid] = res
-                pending.remove(sid)
+    Yields:
+        StepEvent for every finished step, in completion order
 
-    context = { 'steps': completed }
-    logger.info("Plan execution completed successfully")
+    Raises:
+        RuntimeError: If plan is invalid or cyclic; StepFailedError (after
+            the last event) if step execution fails
+
+    Example:
+        async for step_id, status, result, timing in execute_plan_stream(plan):
+            await sse.send(step_id, status, result, timing.duration_s)
+    """
+    PlanModel(**plan)  # validate
+    steps = {s['id']: s for s in plan['steps']}
+    graph = PlanGraph.from_steps(plan['steps'])
+    completed: dict[str, Any] = {} if outputs is None else outputs
+    mcp_client = MCPClientShim()
+    monitor = get_monitor()
+    limiter = execution_scheduler or get_execution_scheduler()
 
-    # Flush monitoring logs to backends
-    if monitor:
-        monitor.flush()
+    # When slots are contended, steps gating the longest remaining chain go first
+    per_tool = _recorded_tool_latencies(steps, monitor, "p50")
+    ranks = graph.critical_path(_latency_estimates(steps, per_tool))
 
-    return context
+    async def run(step_id: str) -> Any:
+        return await run_step(steps[step_id], completed, mcp_client, monitor, a2a_client)
+
+    def admit(step_id: str) -> SlotRequest:
+        return limiter.request(steps[step_id], priority=ranks[step_id])
+
+    logger.info(f"Starting plan execution with {len(steps)} steps")
+    ordered = sorted(ranks.items(), key=lambda r: -r[1])
+    unknown = [step_id for step_id, step in steps.items() if per_tool[_monitored_tool_name(step)] is None]
+    if len(unknown) == len(steps):
+        # Every step weighs 1, so ranks count the steps left on the path
+        schedule = ", ".join(f"{step_id}={rank:g}" for step_id, rank in ordered)
+        logger.info(f"Plan {plan.get('request_id')} critical-path priorities (no latency data, in steps): {schedule}")
+    else:
+        schedule = ", ".join(f"{step_id}={rank:.3f}s" for step_id, rank in ordered)
+        assumed = f" (median latency assumed for {sorted(unknown)})" if unknown else ""
+        logger.info(f"Plan {plan.get('request_id')} critical-path priorities: {schedule}{assumed}")
+
+    # Each step starts as soon as its last dependency completes
+    try:
+        scheduler = DagScheduler(
+            graph, run, outputs=completed, failure_mode=failure_mode, priorities=ranks, admit=admit,
+        )
+        async for event in scheduler.stream():
+            yield event
+    finally:
+        # Flush monitoring logs to backends
+        if monitor:
+            monitor.flush()
 
 async def final_synthesis(plan: dict[str, Any], context: dict[str, Any]) -> dict[str, str]:
     """
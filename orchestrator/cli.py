@@ -176,6 +176,27 @@ def info_cmd(args) -> int:
     return 0
 
 
+def serve_embeddings_cmd(args: argparse.Namespace) -> int:
+    """Run the shared embedding server in the foreground."""
+    import logging
+
+    from orchestrator.tools.embedding_server import EmbeddingServerError, run_embedding_server
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        run_embedding_server(
+            socket_path=args.socket,
+            models=args.model or ["all-MiniLM-L6-v2"],
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms,
+            device=args.device,
+        )
+    except EmbeddingServerError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     """Main entry point for CLI."""
     parser = argparse.ArgumentParser(
@@ -221,6 +242,16 @@ def main(argv: list[str] | None = None) -> int:
                              help="Detail level: name (minimal), summary (moderate), full (complete schema)")
     info_parser.set_defaults(func=info_cmd)
 
+    # Embedding server command
+    serve_parser = subparsers.add_parser("serve-embeddings",
+                                         help="Run a shared embedding server for all local ToolWeaver processes")
+    serve_parser.add_argument("--socket", help="Unix socket path (default: $TOOLWEAVER_EMBEDDING_SOCKET or ~/.toolweaver/embedding.sock)")
+    serve_parser.add_argument("--model", action="append", help="Model to serve (repeatable, default: all-MiniLM-L6-v2)")
+    serve_parser.add_argument("--max-batch-size", type=int, default=256, help="Max texts per encode call (default: 256)")
+    serve_parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Batching window in ms (default: 2)")
+    serve_parser.add_argument("--device", help="Model device, e.g. cpu or cuda (default: auto)")
+    serve_parser.set_defaults(func=serve_embeddings_cmd)
+
     args = parser.parse_args(argv)
 
     if not args.command:
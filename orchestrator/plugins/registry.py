@@ -8,6 +8,8 @@ Features:
 - Discovery: Auto-discover plugins via entry points
 - Validation: Ensure plugins implement required interface
 - Thread-safe: Use locks for concurrent access
+- Change feed: generation counter plus add/remove/update tool events
+  (plugins exposing a ``changes`` ChangeFeed have their own events relayed)
 
 Entry Point Pattern (pyproject.toml):
     [project.entry-points."toolweaver.plugins"]
@@ -28,11 +30,13 @@ Plugin Interface:
 from __future__ import annotations
 
 import builtins
+from collections.abc import Callable
 from threading import Lock
 from typing import Any, Protocol, runtime_checkable
 
 from orchestrator._internal.errors import ToolWeaverError
 from orchestrator._internal.logger import get_logger
+from orchestrator.shared.change_feed import CatalogChange, CatalogDiff, ChangeCallback, ChangeFeed
 from orchestrator.shared.models import ToolDefinition
 
 logger = get_logger(__name__)
@@ -83,17 +87,28 @@ class PluginRegistry:
 
     Plugins can be registered at runtime or discovered via entry points.
 
+    Registering, replacing and unregistering plugins publishes per-tool
+    add/remove/update events (``source`` is the plugin name). Tools that a
+    plugin adds later are only seen if the plugin exposes a ``changes``
+    ChangeFeed, as the decorator, template, YAML and MCP adapter plugins do.
+
     Example:
         >>> registry = PluginRegistry()
         >>> registry.register("jira", JiraPlugin())
         >>> plugin = registry.get("jira")
         >>> tools = plugin.get_tools()
+        >>> registry.diff_since(0).added.keys()
+        dict_keys(['create_issue', ...])
     """
 
     def __init__(self) -> None:
         """Initialize empty registry."""
         self._plugins: dict[str, PluginProtocol] = {}
         self._lock = Lock()
+        self._changes = ChangeFeed()
+        # Tool names per plugin as last published, and unsubscribers for relayed plugin feeds
+        self._tool_names: dict[str, set[str]] = {}
+        self._relays: dict[str, Callable[[], None]] = {}
         logger.debug("Initialized PluginRegistry")
 
     def register(
@@ -139,14 +154,50 @@ class PluginRegistry:
                 )
 
         # Validate tool definitions for uniqueness and shape
-        self._validate_plugin_tools(name=name, plugin=plugin)
+        tools = self._validate_plugin_tools(name=name, plugin=plugin)
 
         with self._lock:
             self._plugins[name] = plugin
+            old_names = self._tool_names.get(name, set())
+            self._tool_names[name] = set(tools)
+            self._detach(name)
+            feed = getattr(plugin, "changes", None)
+            if isinstance(feed, ChangeFeed):
+                self._relays[name] = feed.subscribe(self._make_relay(name, plugin))
             logger.info(f"Registered plugin: {name}")
 
-    def _validate_plugin_tools(self, name: str, plugin: PluginProtocol) -> None:
-        """Validate that a plugin's tools are well-formed and deduplicated across registry."""
+        for tool_name in old_names - tools.keys():
+            self._changes.record("remove", tool_name, None, name)
+        for tool_name, tool in tools.items():
+            self._changes.record("update" if tool_name in old_names else "add", tool_name, tool, name)
+
+    def _make_relay(self, name: str, plugin: PluginProtocol) -> ChangeCallback:
+        def relay(change: CatalogChange) -> None:
+            with self._lock:
+                if self._plugins.get(name) is not plugin:
+                    return
+                names = self._tool_names.setdefault(name, set())
+                if change.kind == "remove":
+                    names.discard(change.name)
+                else:
+                    names.add(change.name)
+            self._changes.record(change.kind, change.name, change.tool, name)
+
+        return relay
+
+    def _detach(self, name: str) -> None:
+        """Stop relaying a plugin's own change feed (caller holds the lock)."""
+        unsubscribe = self._relays.pop(name, None)
+        if unsubscribe is not None:
+            unsubscribe()
+
+    def _validate_plugin_tools(self, name: str, plugin: PluginProtocol) -> dict[str, Any]:
+        """
+        Validate that a plugin's tools are well-formed and deduplicated across registry.
+
+        Returns:
+            The plugin's tools keyed by name
+        """
         try:
             tools = plugin.get_tools()
         except Exception as exc:  # noqa: BLE001
@@ -155,7 +206,7 @@ class PluginRegistry:
         if not isinstance(tools, list):
             raise InvalidPluginError(f"Plugin '{name}' get_tools() must return a list, got {type(tools).__name__}")
 
-        seen_local: set[str] = set()
+        seen_local: dict[str, Any] = {}
         for tool in tools:
             tool_name: str | None = None
             if isinstance(tool, dict):
@@ -173,12 +224,14 @@ class PluginRegistry:
                 raise DuplicateToolNameError(
                     f"Plugin '{name}' defines duplicate tool name '{tool_name}'"
                 )
-            seen_local.add(tool_name)
+            seen_local[tool_name] = tool
 
-        # Cross-plugin duplicate detection
+        # Cross-plugin duplicate detection (a plugin being replaced does not collide with itself)
         with self._lock:
             existing_names = set()
-            for p in self._plugins.values():
+            for plugin_name, p in self._plugins.items():
+                if plugin_name == name:
+                    continue
                 for t in (p.get_tools() or []):
                     if isinstance(t, dict):
                         name_val = t.get("name")
@@ -188,11 +241,12 @@ class PluginRegistry:
                         continue
                     if name_val:
                         existing_names.add(name_val)
-        dup = seen_local.intersection(existing_names)
+        dup = seen_local.keys() & existing_names
         if dup:
             raise DuplicateToolNameError(
                 f"Plugin '{name}' tool names collide with existing registry: {', '.join(sorted(dup))}"
             )
+        return seen_local
 
     def unregister(self, name: str) -> None:
         """
@@ -212,8 +266,13 @@ class PluginRegistry:
                 raise PluginNotFoundError(f"Plugin '{name}' not found")
 
             del self._plugins[name]
+            self._detach(name)
+            removed = self._tool_names.pop(name, set())
             logger.info(f"Unregistered plugin: {name}")
 
+        for tool_name in removed:
+            self._changes.record("remove", tool_name, None, name)
+
     def get(self, name: str) -> PluginProtocol:
         """
         Get a plugin by name.
@@ -281,8 +340,49 @@ class PluginRegistry:
         """
         with self._lock:
             self._plugins.clear()
+            for name in builtins.list(self._relays):
+                self._detach(name)
+            removed = self._tool_names
+            self._tool_names = {}
             logger.debug("Cleared all plugins")
 
+        for name, tool_names in removed.items():
+            for tool_name in tool_names:
+                self._changes.record("remove", tool_name, None, name)
+
+    @property
+    def generation(self) -> int:
+        """
+        Generation of the latest tool change across all plugins.
+
+        Example:
+            >>> seen = registry.generation
+            >>> register_plugin("jira", JiraPlugin())
+            >>> registry.diff_since(seen).added
+        """
+        return self._changes.generation
+
+    def subscribe(self, callback: ChangeCallback, weak: bool = False) -> Callable[[], None]:
+        """
+        Call ``callback(change)`` for every tool added, removed or updated.
+
+        Args:
+            callback: Receives a ``CatalogChange`` whose ``source`` is the plugin name
+            weak: Hold a bound-method callback weakly
+
+        Returns:
+            Function that cancels the subscription
+        """
+        return self._changes.subscribe(callback, weak=weak)
+
+    def changes_since(self, generation: int) -> builtins.list[CatalogChange] | None:
+        """Tool changes after ``generation`` (None if no longer in the bounded history)."""
+        return self._changes.changes_since(generation)
+
+    def diff_since(self, generation: int) -> CatalogDiff | None:
+        """Net added/updated/removed tools after ``generation`` (None if history is gone)."""
+        return self._changes.diff_since(generation)
+
     def get_all_tools(self) -> dict[str, builtins.list[Any]]:
         """
         Get all tools from all plugins.
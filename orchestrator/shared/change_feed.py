@@ -0,0 +1,217 @@
+"""
+Catalog Change Feed for ToolWeaver
+
+Generation-numbered log of tool add/remove/update events, shared by the
+catalogs and registries that hold tool definitions (``ToolCatalog``,
+``PluginRegistry``, the decorator/template/YAML plugins, ``ShardedCatalog``).
+
+Every change bumps a monotonically increasing generation. Consumers either
+subscribe to events as they happen, or remember the generation they last
+saw and ask for what changed since then (``changes_since`` / ``diff_since``)
+to update derived state incrementally instead of rescanning. A bounded
+history is kept; if a consumer falls further behind than that, both calls
+return None and the consumer should rebuild from scratch.
+
+Usage:
+    feed = ChangeFeed()
+    unsubscribe = feed.subscribe(lambda change: print(change.kind, change.name))
+    feed.record("add", "github_create_pr", tool)
+
+    diff = feed.diff_since(last_generation)
+    if diff is None:
+        rebuild()
+    else:
+        apply(diff.added, diff.updated, diff.removed)
+        last_generation = diff.generation
+"""
+
+import logging
+import threading
+import weakref
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+ChangeKind = Literal["add", "remove", "update"]
+ChangeCallback = Callable[["CatalogChange"], None]
+
+DEFAULT_HISTORY = 4096
+
+
+@dataclass(frozen=True)
+class CatalogChange:
+    """One tool change; ``tool`` is the new definition (None for removals)."""
+    generation: int
+    kind: ChangeKind
+    name: str
+    tool: Any = None
+    source: str | None = None  # e.g. plugin name or shard domain
+
+
+@dataclass
+class CatalogDiff:
+    """Net effect of the changes between two generations, keyed by tool name."""
+    since: int
+    generation: int
+    added: dict[str, Any] = field(default_factory=dict)
+    updated: dict[str, Any] = field(default_factory=dict)
+    removed: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+class ChangeFeed:
+    """
+    Thread-safe generation counter, bounded change history and subscriber list.
+
+    Subscribers are called synchronously, in generation order, by the thread
+    that records the change; callback errors are logged and do not stop
+    delivery. The history is state about a catalog rather than part of its
+    value, so feeds compare equal to each other and copy as empty feeds.
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
+        self._generation = 0
+        self._history: deque[CatalogChange] = deque(maxlen=history)
+        self._subscribers: list[Callable[[], ChangeCallback | None]] = []
+        self._lock = threading.RLock()
+
+    @property
+    def generation(self) -> int:
+        """Generation of the latest change (0 if nothing changed yet)."""
+        return self._generation
+
+    def record(self, kind: ChangeKind, name: str, tool: Any = None, source: str | None = None) -> CatalogChange:
+        """
+        Record a change and notify subscribers.
+
+        Args:
+            kind: "add", "remove" or "update"
+            name: Tool name
+            tool: New tool definition (None for removals)
+            source: Where the tool lives (plugin name, shard domain, ...)
+
+        Returns:
+            The recorded change
+        """
+        with self._lock:
+            self._generation += 1
+            change = CatalogChange(self._generation, kind, name, tool, source)
+            self._history.append(change)
+            for callback in self._live_subscribers():
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.warning(f"Change subscriber failed on {kind} '{name}': {e}")
+            return change
+
+    def subscribe(self, callback: ChangeCallback, weak: bool = False) -> Callable[[], None]:
+        """
+        Call ``callback(change)`` for every future change.
+
+        Args:
+            callback: Receives each ``CatalogChange``
+            weak: Hold a bound-method callback weakly, so subscribing does not
+                keep its object alive (the subscription ends with the object)
+
+        Returns:
+            Function that cancels the subscription
+        """
+        ref: Callable[[], ChangeCallback | None]
+        if weak:
+            ref = weakref.WeakMethod(callback)
+        else:
+            def ref() -> ChangeCallback:
+                return callback
+
+        with self._lock:
+            self._subscribers.append(ref)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if ref in self._subscribers:
+                    self._subscribers.remove(ref)
+
+        return unsubscribe
+
+    def changes_since(self, generation: int) -> list[CatalogChange] | None:
+        """
+        Changes after ``generation``, oldest first.
+
+        Returns:
+            The changes, or None if some of them are no longer in the history
+        """
+        with self._lock:
+            if generation >= self._generation:
+                return []
+            oldest = self._history[0].generation if self._history else self._generation + 1
+            if generation + 1 < oldest:
+                return None
+            return [c for c in self._history if c.generation > generation]
+
+    def diff_since(self, generation: int) -> CatalogDiff | None:
+        """
+        Net added/updated/removed tools after ``generation``.
+
+        A tool added and then removed again does not appear; a tool removed
+        and then re-added counts as updated.
+
+        Returns:
+            The diff, or None if the history no longer reaches back that far
+        """
+        with self._lock:
+            changes = self.changes_since(generation)
+            current = self._generation
+        if changes is None:
+            return None
+
+        existed: dict[str, bool] = {}
+        latest: dict[str, CatalogChange] = {}
+        for change in changes:
+            existed.setdefault(change.name, change.kind != "add")
+            latest[change.name] = change
+
+        diff = CatalogDiff(since=generation, generation=current)
+        for name, change in latest.items():
+            present = change.kind != "remove"
+            if present and existed[name]:
+                diff.updated[name] = change.tool
+            elif present:
+                diff.added[name] = change.tool
+            elif existed[name]:
+                diff.removed.add(name)
+        return diff
+
+    def _live_subscribers(self) -> list[ChangeCallback]:
+        callbacks = []
+        for ref in list(self._subscribers):
+            callback = ref()
+            if callback is None:
+                self._subscribers.remove(ref)
+            else:
+                callbacks.append(callback)
+        return callbacks
+
+    def __len__(self) -> int:
+        return len(self._history)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ChangeFeed)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __copy__(self) -> "ChangeFeed":
+        return ChangeFeed(history=self._history.maxlen or DEFAULT_HISTORY)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "ChangeFeed":
+        return self.__copy__()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (ChangeFeed, (self._history.maxlen or DEFAULT_HISTORY,))
+
+    def __repr__(self) -> str:
+        return f"ChangeFeed(generation={self._generation}, history={len(self._history)})"
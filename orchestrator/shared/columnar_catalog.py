@@ -0,0 +1,510 @@
+"""
+Columnar Tool Catalog for ToolWeaver
+
+``ToolCatalog`` keeps one fully validated ``ToolDefinition`` (with nested
+parameter and example models) per tool. At 100k tools that is gigabytes of
+Python objects and a long validation pass on every start.
+
+``ColumnarToolCatalog`` stores the catalog as a few compact columns instead:
+- one contiguous buffer of compact JSON tool records (plus row offsets)
+- one contiguous UTF-8 buffer of descriptions (plus row offsets)
+- small integer arrays for type, domain and ``defer_loading``
+- a name -> row dict
+
+Filtering by type/domain, iterating names and reading descriptions work on
+the columns directly. A full ``ToolDefinition`` is validated only when a tool
+is actually accessed, and a bounded LRU keeps recently materialized tools.
+
+It is API-compatible with the read side of ``ToolCatalog`` (``tools``,
+``get_tool``, ``get_by_type``, ``to_llm_format``, ``add_tool``).
+
+Usage:
+    catalog = ColumnarToolCatalog.from_records(json.load(f)["tools"].values())
+    catalog.get_tool("github_create_pr")          # validated on first access
+    catalog.get_by_type("mcp")
+    catalog.to_llm_format(defer_loading=True)
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any, get_args, overload
+
+import numpy as np
+from pydantic_core import to_json
+
+from .models import ToolCatalog, ToolDefinition
+
+# Type code N in the type column is TOOL_TYPES[N]
+TOOL_TYPES: tuple[str, ...] = get_args(ToolDefinition.model_fields["type"].annotation)
+_TYPE_CODES = {tool_type: code for code, tool_type in enumerate(TOOL_TYPES)}
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class _Column:
+    """
+    Append-only fixed-width column backed by a numpy buffer.
+
+    Appends grow the buffer geometrically (amortized O(1)); ``view()`` returns
+    a read-only view of the filled rows without copying. External buffers
+    (e.g. read-only mmap views) are used as-is until the first write.
+    """
+
+    def __init__(self, dtype: Any, values: Any = None):
+        self._data = np.zeros(0, dtype=dtype) if values is None else np.asarray(values, dtype=dtype)
+        self._size = len(self._data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row: int) -> int:
+        return int(self._data[row])
+
+    def __setitem__(self, row: int, value: int) -> None:
+        if not self._data.flags.writeable:
+            self._data = self._data.copy()
+        self._data[row] = value
+
+    def append(self, value: int) -> None:
+        if self._size == len(self._data) or not self._data.flags.writeable:
+            grown = np.zeros(max(16, 2 * self._size), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size] = value
+        self._size += 1
+
+    def view(self) -> np.ndarray:
+        # Size first: a concurrent append grows the buffer before bumping it
+        size = self._size
+        view = self._data[:size]
+        view.flags.writeable = False
+        return view
+
+
+class _ToolView(Mapping[str, ToolDefinition]):
+    """Read-only ``name -> ToolDefinition`` mapping that materializes on access."""
+
+    def __init__(self, catalog: "ColumnarToolCatalog"):
+        self._catalog = catalog
+
+    def __getitem__(self, name: str) -> ToolDefinition:
+        tool = self._catalog.get_tool(name)
+        if tool is None:
+            raise KeyError(name)
+        return tool
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._catalog.names())
+
+    def __len__(self) -> int:
+        return len(self._catalog)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._catalog
+
+
+class _LazyTools(Sequence[ToolDefinition]):
+    """Live tools in ``names()`` order; each one is validated when indexed."""
+
+    def __init__(self, catalog: "ColumnarToolCatalog", rows: np.ndarray):
+        self._catalog = catalog
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> ToolDefinition: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ToolDefinition]: ...
+
+    def __getitem__(self, index: int | slice) -> ToolDefinition | list[ToolDefinition]:
+        if isinstance(index, slice):
+            return [self._catalog._materialize(int(row)) for row in self._rows[index]]
+        return self._catalog._materialize(int(self._rows[index]))
+
+
+class ColumnarToolCatalog:
+    """
+    Memory-compact, lazily-materialized tool catalog.
+
+    Re-adding a tool under an existing name supersedes the old row; the old
+    record stays in the buffers until the catalog is rebuilt (``compact``).
+    """
+
+    def __init__(
+        self,
+        source: str = "unknown",
+        version: str = "1.0",
+        metadata: dict[str, Any] | None = None,
+        discovered_at: datetime | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        """
+        Create an empty catalog.
+
+        Args:
+            source: Where the tools were discovered from
+            version: Catalog version
+            metadata: Catalog-level metadata
+            discovered_at: Discovery timestamp (defaults to now)
+            cache_size: Number of materialized ToolDefinitions kept in the LRU
+        """
+        self.source = source
+        self.version = version
+        self.metadata: dict[str, Any] = metadata or {}
+        self.discovered_at = discovered_at or datetime.now(timezone.utc)
+        self.cache_size = cache_size
+
+        self._records = bytearray()
+        self._record_offsets = _Column(np.uint64, [0])
+        self._descriptions = bytearray()
+        self._description_offsets = _Column(np.uint64, [0])
+        self._type_codes = _Column(np.uint8)
+        self._domain_codes = _Column(np.uint32)
+        self._deferred = _Column(np.uint8)
+        self._live = _Column(np.uint8)
+        self._names: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._domains: list[str] = []
+        self._domain_ids: dict[str, int] = {}
+        self._generation = 0
+
+        self._cache: OrderedDict[int, ToolDefinition] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]], **kwargs: Any) -> "ColumnarToolCatalog":
+        """
+        Build a catalog from serialized tool dicts (e.g. ``model_dump(mode="json")``).
+
+        Only the hot fields are checked here; full validation is deferred
+        until a tool is accessed.
+        """
+        catalog = cls(**kwargs)
+        for record in records:
+            catalog.add_record(record)
+        return catalog
+
+    @classmethod
+    def from_tools(cls, tools: Iterable[ToolDefinition], **kwargs: Any) -> "ColumnarToolCatalog":
+        """Build a catalog from validated ToolDefinitions."""
+        catalog = cls(**kwargs)
+        for tool in tools:
+            catalog.add_tool(tool)
+        return catalog
+
+    @classmethod
+    def from_catalog(cls, catalog: ToolCatalog, **kwargs: Any) -> "ColumnarToolCatalog":
+        """Convert a ``ToolCatalog``, keeping its catalog-level fields."""
+        kwargs.setdefault("source", catalog.source)
+        kwargs.setdefault("version", catalog.version)
+        kwargs.setdefault("metadata", dict(catalog.metadata))
+        kwargs.setdefault("discovered_at", catalog.discovered_at)
+        return cls.from_tools(catalog.tools.values(), **kwargs)
+
+    @classmethod
+    def from_columns(
+        cls,
+        names: list[str],
+        records: Any,
+        record_offsets: Any,
+        descriptions: Any,
+        description_offsets: Any,
+        type_codes: Any,
+        domain_codes: Any,
+        deferred: Any,
+        domains: list[str],
+        **kwargs: Any,
+    ) -> "ColumnarToolCatalog":
+        """
+        Wrap prebuilt columns, e.g. read-only views into a memory-mapped snapshot.
+
+        Buffers are used as-is (no copy); they are copied into growable
+        buffers only if the catalog is modified afterwards.
+        """
+        catalog = cls(**kwargs)
+        catalog._records = records
+        catalog._record_offsets = _Column(np.uint64, record_offsets)
+        catalog._descriptions = descriptions
+        catalog._description_offsets = _Column(np.uint64, description_offsets)
+        catalog._type_codes = _Column(np.uint8, type_codes)
+        catalog._domain_codes = _Column(np.uint32, domain_codes)
+        catalog._deferred = _Column(np.uint8, deferred)
+        catalog._live = _Column(np.uint8, np.ones(len(names), dtype=np.uint8))
+        catalog._names = list(names)
+        catalog._rows = {name: row for row, name in enumerate(names)}
+        catalog._domains = list(domains)
+        catalog._domain_ids = {domain: code for code, domain in enumerate(domains)}
+        if len(catalog._rows) != len(names):
+            raise ValueError("Duplicate tool names in catalog columns")
+        return catalog
+
+    def export_columns(self) -> dict[str, Any]:
+        """Compact the catalog and return its columns (inverse of ``from_columns``)."""
+        self.compact()
+        with self._lock:
+            return {
+                "names": list(self._names),
+                "records": bytes(self._records),
+                "record_offsets": self._record_offsets.view().copy(),
+                "descriptions": bytes(self._descriptions),
+                "description_offsets": self._description_offsets.view().copy(),
+                "type_codes": self._type_codes.view().copy(),
+                "domain_codes": self._domain_codes.view().copy(),
+                "deferred": self._deferred.view().copy(),
+                "domains": list(self._domains),
+            }
+
+    def to_catalog(self) -> ToolCatalog:
+        """Materialize every tool into a regular ``ToolCatalog``."""
+        return ToolCatalog(
+            tools={name: self._materialize(row) for name, row in self._rows.items()},
+            discovered_at=self.discovered_at,
+            source=self.source,
+            version=self.version,
+            metadata=dict(self.metadata),
+        )
+
+    def add_tool(self, tool: ToolDefinition) -> None:
+        """Register a validated tool (replaces any tool with the same name)."""
+        record = tool.model_dump_json(exclude_defaults=True).encode("utf-8")
+        row = self._append(tool.name, tool.type, tool.domain, tool.description, tool.defer_loading, record)
+        with self._lock:
+            self._remember(row, tool)
+
+    def add_record(self, record: dict[str, Any]) -> None:
+        """
+        Register a serialized tool dict without validating it.
+
+        Raises:
+            ValueError: If name, type or description are missing or invalid
+        """
+        name = record.get("name")
+        description = record.get("description")
+        tool_type = record.get("type")
+        if not isinstance(name, str) or not isinstance(description, str):
+            raise ValueError(f"Tool record needs string 'name' and 'description': {name!r}")
+        if tool_type not in _TYPE_CODES:
+            raise ValueError(f"Tool '{name}' has unknown type {tool_type!r}")
+        encoded = to_json(record, serialize_unknown=True)
+        self._append(
+            name,
+            tool_type,
+            record.get("domain") or "general",
+            description,
+            bool(record.get("defer_loading", False)),
+            encoded,
+        )
+
+    def _append(
+        self, name: str, tool_type: str, domain: str, description: str, deferred: bool, record: bytes
+    ) -> int:
+        if not isinstance(self._records, bytearray):
+            self._make_writable()
+        domain_id = self._domain_ids.get(domain)
+        if domain_id is None:
+            domain_id = self._domain_ids[domain] = len(self._domains)
+            self._domains.append(domain)
+
+        with self._lock:
+            row = len(self._names)
+            self._records += record
+            self._record_offsets.append(len(self._records))
+            self._descriptions += description.encode("utf-8")
+            self._description_offsets.append(len(self._descriptions))
+            self._type_codes.append(_TYPE_CODES[tool_type])
+            self._domain_codes.append(domain_id)
+            self._deferred.append(1 if deferred else 0)
+            self._live.append(1)
+            self._names.append(name)
+
+            previous = self._rows.get(name)
+            if previous is not None:
+                self._live[previous] = 0
+                self._cache.pop(previous, None)
+            self._rows[name] = row
+            self._generation += 1
+        return row
+
+    def _make_writable(self) -> None:
+        """Copy externally provided (read-only) byte buffers into growable ones."""
+        with self._lock:
+            self._records = bytearray(self._records)
+            self._descriptions = bytearray(self._descriptions)
+
+    def compact(self) -> None:
+        """Drop superseded rows, rewriting the buffers."""
+        if len(self._rows) == len(self._names):
+            return
+        fresh = ColumnarToolCatalog(self.source, self.version, self.metadata, self.discovered_at, self.cache_size)
+        with self._lock:
+            for row in sorted(self._rows.values()):
+                fresh_row = fresh._append(
+                    self._names[row],
+                    TOOL_TYPES[self._type_codes[row]],
+                    self._domains[self._domain_codes[row]],
+                    self.get_description(self._names[row]) or "",
+                    bool(self._deferred[row]),
+                    self._record_bytes(row),
+                )
+                cached = self._cache.get(row)
+                if cached is not None:
+                    fresh._remember(fresh_row, cached)
+            lock, generation = self._lock, self._generation
+            self.__dict__.update(fresh.__dict__)
+            # Rows were renumbered, so views over the old rows are stale
+            self._lock, self._generation = lock, generation + 1
+
+    # ------------------------------------------------------------------
+    # Columnar reads (no materialization)
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def names(self) -> list[str]:
+        """Live tool names in insertion order."""
+        return [self._names[row] for row in self._live_rows()]
+
+    def domains(self) -> list[str]:
+        """Domains that have at least one live tool."""
+        live = self._live_rows()
+        used = np.unique(self._domain_codes.view()[live])
+        return [self._domains[code] for code in used]
+
+    def tool_domains(self) -> list[str]:
+        """Domain of each live tool, aligned with ``names()``."""
+        return [self._domains[code] for code in self._domain_codes.view()[self._live_rows()]]
+
+    def tool_types(self) -> list[str]:
+        """Type of each live tool, aligned with ``names()``."""
+        return [TOOL_TYPES[code] for code in self._type_codes.view()[self._live_rows()]]
+
+    def lazy_tools(self) -> Sequence[ToolDefinition]:
+        """Live tools aligned with ``names()``, validated only when indexed."""
+        return _LazyTools(self, self._live_rows())
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every add (like ``ToolCatalog.generation``)."""
+        return self._generation
+
+    def get_description(self, name: str) -> str | None:
+        """Return a tool's description without materializing the tool."""
+        row = self._rows.get(name)
+        if row is None:
+            return None
+        start, end = self._description_offsets[row], self._description_offsets[row + 1]
+        return str(self._descriptions[start:end], "utf-8")
+
+    def get_record(self, name: str) -> dict[str, Any] | None:
+        """Return a tool's raw serialized dict without validating it."""
+        row = self._rows.get(name)
+        if row is None:
+            return None
+        record: dict[str, Any] = json.loads(self._record_bytes(row))
+        return record
+
+    @property
+    def tools(self) -> Mapping[str, ToolDefinition]:
+        """Lazy ``name -> ToolDefinition`` mapping (same shape as ``ToolCatalog.tools``)."""
+        return _ToolView(self)
+
+    # ------------------------------------------------------------------
+    # ToolCatalog-compatible API
+    # ------------------------------------------------------------------
+
+    def get_tool(self, name: str) -> ToolDefinition | None:
+        """Retrieve tool by name."""
+        row = self._rows.get(name)
+        if row is None:
+            return None
+        return self._materialize(row)
+
+    def get_by_type(self, tool_type: str) -> list[ToolDefinition]:
+        """Get all tools of specific type (mcp, function, code_exec)."""
+        code = _TYPE_CODES.get(tool_type)
+        if code is None:
+            return []
+        return self._materialize_rows(self._type_codes.view() == code)
+
+    def get_by_domain(self, domain: str) -> list[ToolDefinition]:
+        """Get all tools of a domain."""
+        code = self._domain_ids.get(domain)
+        if code is None:
+            return []
+        return self._materialize_rows(self._domain_codes.view() == code)
+
+    def to_llm_format(self, defer_loading: bool = False, include_examples: bool = True) -> list[dict[str, Any]]:
+        """
+        Convert all tools to LLM function calling format.
+
+        Args:
+            defer_loading: If True, only include tools with defer_loading=False
+            include_examples: If True, include usage examples in descriptions
+        """
+        mask = None
+        if defer_loading:
+            mask = self._deferred.view() == 0
+        return [
+            tool.to_llm_format(include_examples=include_examples)
+            for tool in self._materialize_rows(mask)
+        ]
+
+    def to_llm_json(self, defer_loading: bool = False, include_examples: bool = True) -> str:
+        """JSON array of ``to_llm_format``, joined from the tools' memoized fragments."""
+        mask = None
+        if defer_loading:
+            mask = self._deferred.view() == 0
+        fragments = [tool.to_llm_json(include_examples=include_examples) for tool in self._materialize_rows(mask)]
+        return f"[{', '.join(fragments)}]"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _live_rows(self, mask: np.ndarray | None = None) -> np.ndarray:
+        live = self._live.view().astype(bool)
+        if mask is not None:
+            live &= mask
+        rows: np.ndarray = np.flatnonzero(live)
+        return rows
+
+    def _materialize_rows(self, mask: np.ndarray | None) -> list[ToolDefinition]:
+        return [self._materialize(int(row)) for row in self._live_rows(mask)]
+
+    def _record_bytes(self, row: int) -> bytes:
+        return bytes(self._records[self._record_offsets[row]:self._record_offsets[row + 1]])
+
+    def _remember(self, row: int, tool: ToolDefinition) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[row] = tool
+        self._cache.move_to_end(row)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _materialize(self, row: int) -> ToolDefinition:
+        with self._lock:
+            tool = self._cache.get(row)
+            if tool is not None:
+                self._cache.move_to_end(row)
+                return tool
+            record = self._record_bytes(row)
+        tool = ToolDefinition.model_validate_json(record)
+        with self._lock:
+            if self._live[row]:
+                self._remember(row, tool)
+        return tool
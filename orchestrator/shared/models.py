@@ -1,7 +1,24 @@
+import json
+from collections.abc import Callable, Mapping
 from datetime import datetime, timezone
-from typing import Any, Literal
+from typing import Any, Literal, TypeVar
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .change_feed import CatalogChange, CatalogDiff, ChangeCallback, ChangeFeed, ChangeKind
+
+_T = TypeVar("_T")
+_ToolT = TypeVar("_ToolT", bound="ToolDefinition")
+
+
+class _SerializationCache(dict[str, Any]):
+    """Memoized serializations of a model; never affects model equality."""
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _SerializationCache)
+
+    __hash__ = None
 
-from pydantic import BaseModel, Field
 
 # --- Tool Definition Models (Phase 1: Foundation) ---
 
@@ -62,6 +79,36 @@ class ToolDefinition(BaseModel):
     examples: list[ToolExample] = Field(default_factory=list)  # Phase 5: Usage examples
     domain: str = "general"  # Phase 7: Tool domain for sharding (github, slack, aws, etc.)
 
+    # Memoized serializations (LLM format, JSON fragments); dropped when a field is reassigned
+    _serialized: _SerializationCache = PrivateAttr(default_factory=_SerializationCache)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self.invalidate_serialization_cache()
+
+    def model_copy(self: _ToolT, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> _ToolT:
+        copied = super().model_copy(update=update, deep=deep)
+        copied.invalidate_serialization_cache()
+        return copied
+
+    def invalidate_serialization_cache(self) -> None:
+        """Drop memoized serializations (needed only after editing nested fields in place)."""
+        self._serialized = _SerializationCache()
+
+    def cached_serialization(self, key: str, build: Callable[["ToolDefinition"], _T]) -> _T:
+        """
+        Return ``build(self)``, memoized under ``key`` until the tool changes.
+
+        Used for serialized forms that are rebuilt on every planner call
+        (LLM format, pre-encoded prompt fragments).
+        """
+        try:
+            return self._serialized[key]  # type: ignore[no-any-return]
+        except KeyError:
+            value = self._serialized[key] = build(self)
+            return value
+
     def to_llm_format(self, include_examples: bool = True) -> dict[str, Any]:
         """
         Convert to OpenAI/Anthropic function calling format.
@@ -72,9 +119,34 @@ class ToolDefinition(BaseModel):
         - Anthropic tool use
         - Google Gemini function calling
 
+        The result is memoized; callers get fresh containers each time.
+
         Args:
             include_examples: If True, appends examples to description (Phase 5)
         """
+        cached = self.cached_serialization(
+            "llm_examples" if include_examples else "llm",
+            lambda tool: tool._build_llm_format(include_examples),
+        )
+        parameters = cached["parameters"]
+        return {
+            "name": cached["name"],
+            "description": cached["description"],
+            "parameters": {
+                "type": "object",
+                "properties": {name: dict(spec) for name, spec in parameters["properties"].items()},
+                "required": list(parameters["required"]),
+            },
+        }
+
+    def to_llm_json(self, include_examples: bool = True) -> str:
+        """Pre-encoded JSON of ``to_llm_format`` (memoized), for assembling tool lists."""
+        return self.cached_serialization(
+            "llm_json_examples" if include_examples else "llm_json",
+            lambda tool: json.dumps(tool.to_llm_format(include_examples=include_examples)),
+        )
+
+    def _build_llm_format(self, include_examples: bool) -> dict[str, Any]:
         description = self.description
 
         # Append examples to description for better LLM understanding
@@ -114,6 +186,7 @@ class ToolCatalog(BaseModel):
     - Discovery timestamp tracking
     - Filtering by type
     - Conversion to LLM formats
+    - Change tracking (generation counter, add/remove/update events)
     """
     tools: dict[str, ToolDefinition] = Field(default_factory=dict)
     discovered_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -121,9 +194,39 @@ class ToolCatalog(BaseModel):
     version: str = "1.0"
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    # Changes made through add_tool/remove_tool (direct edits of `tools` are not tracked)
+    _changes: ChangeFeed = PrivateAttr(default_factory=ChangeFeed)
+
     def add_tool(self, tool: ToolDefinition) -> None:
-        """Register a new tool in the catalog."""
+        """Register a new tool in the catalog (re-registering drops its memoized serializations)."""
+        tool.invalidate_serialization_cache()
+        kind: ChangeKind = "update" if tool.name in self.tools else "add"
         self.tools[tool.name] = tool
+        self._changes.record(kind, tool.name, tool, self.source)
+
+    def remove_tool(self, name: str) -> ToolDefinition | None:
+        """Remove a tool by name; returns it, or None if it was not registered."""
+        tool = self.tools.pop(name, None)
+        if tool is not None:
+            self._changes.record("remove", name, None, self.source)
+        return tool
+
+    @property
+    def generation(self) -> int:
+        """Number of tracked changes so far; compare with a remembered value to detect changes."""
+        return self._changes.generation
+
+    def subscribe(self, callback: ChangeCallback, weak: bool = False) -> Callable[[], None]:
+        """Call ``callback(change)`` on every add/remove/update; returns an unsubscribe function."""
+        return self._changes.subscribe(callback, weak=weak)
+
+    def changes_since(self, generation: int) -> list[CatalogChange] | None:
+        """Changes after ``generation`` (None if the bounded history no longer covers them)."""
+        return self._changes.changes_since(generation)
+
+    def diff_since(self, generation: int) -> CatalogDiff | None:
+        """Net added/updated/removed tools after ``generation`` (None if history is gone)."""
+        return self._changes.diff_since(generation)
 
     def get_tool(self, name: str) -> ToolDefinition | None:
         """Retrieve tool by name."""
@@ -147,6 +250,21 @@ class ToolCatalog(BaseModel):
             if not defer_loading or not t.defer_loading
         ]
 
+    def to_llm_json(self, defer_loading: bool = False, include_examples: bool = True) -> str:
+        """
+        JSON array of ``to_llm_format``, joined from memoized per-tool fragments.
+
+        Args:
+            defer_loading: If True, only include tools with defer_loading=False
+            include_examples: If True, include usage examples in descriptions
+        """
+        fragments = [
+            t.to_llm_json(include_examples=include_examples)
+            for t in self.tools.values()
+            if not defer_loading or not t.defer_loading
+        ]
+        return f"[{', '.join(fragments)}]"
+
 # --- Plan schema models ---
 class RetryPolicy(BaseModel):
     retries: int = 1
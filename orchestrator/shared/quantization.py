@@ -0,0 +1,194 @@
+"""
+Embedding Quantization for ToolWeaver
+
+Compact storage for L2-normalized embedding vectors:
+- ``float32``: full precision (no quantization)
+- ``float16``: half precision, 2x smaller
+- ``int8``: symmetric scalar quantization with one float32 scale per
+  vector (``vector ~= codes * scale``), ~4x smaller
+
+Scores are computed directly from the codes: cosine similarity against a
+normalized query is ``(codes @ query) * scale``, evaluated in bounded
+chunks so no full float32 copy of the matrix is ever materialized.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+# Rows upcast to float32 at once while scoring a quantized matrix
+SCORE_CHUNK_ROWS = 16384
+
+
+def validate_dtype(dtype: str) -> str:
+    """Return ``dtype`` if it is a supported embedding dtype, else raise ValueError."""
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype '{dtype}' (expected one of {EMBEDDING_DTYPES})")
+    return dtype
+
+
+@dataclass
+class QuantizedVectors:
+    """
+    Quantized vectors plus per-vector scales.
+
+    ``codes`` has the storage dtype and the vectors' shape; ``scales`` is
+    None unless the dtype is int8.
+    """
+
+    codes: np.ndarray
+    scales: np.ndarray | None = None
+
+    @property
+    def dtype(self) -> str:
+        return str(self.codes.dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+
+    def dequantize(self) -> np.ndarray:
+        """Reconstruct float32 vectors."""
+        vectors = self.codes.astype(np.float32)
+        if self.scales is not None:
+            vectors *= np.asarray(self.scales, dtype=np.float32)[..., None]
+        return vectors
+
+
+def quantize(vectors: Any, dtype: str) -> QuantizedVectors:
+    """
+    Quantize a vector or a (rows, dim) matrix.
+
+    Args:
+        vectors: Array-like of shape (dim,) or (rows, dim)
+        dtype: One of EMBEDDING_DTYPES
+
+    Returns:
+        QuantizedVectors with the same shape as ``vectors``
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if validate_dtype(dtype) == "float32":
+        return QuantizedVectors(vectors)
+    if dtype == "float16":
+        return QuantizedVectors(vectors.astype(np.float16))
+
+    max_abs = np.max(np.abs(vectors), axis=-1) if vectors.size else np.zeros(vectors.shape[:-1])
+    scales = (max_abs / 127.0).astype(np.float32)
+    safe = np.where(scales > 0, scales, 1.0)[..., None]
+    codes = np.clip(np.rint(vectors / safe), -127, 127).astype(np.int8)
+    return QuantizedVectors(codes, scales)
+
+
+def quantized_scores(codes: np.ndarray, scales: np.ndarray | None, query: np.ndarray) -> np.ndarray:
+    """
+    Dot products of quantized rows against a float32 query.
+
+    Args:
+        codes: (rows, dim) matrix in any EMBEDDING_DTYPES dtype
+        scales: Per-row scales for int8 codes (None otherwise)
+        query: Float32 query vector
+
+    Returns:
+        Float32 scores, one per row
+    """
+    query = np.asarray(query, dtype=np.float32)
+    if codes.dtype == np.float32:
+        exact: np.ndarray = codes @ query
+        return exact
+
+    scores = np.empty(len(codes), dtype=np.float32)
+    for start in range(0, len(codes), SCORE_CHUNK_ROWS):
+        block = codes[start : start + SCORE_CHUNK_ROWS]
+        scores[start : start + len(block)] = block.astype(np.float32) @ query
+    if scales is not None:
+        scores *= scales
+    return scores
+
+
+def pack_embedding(vector: Any, dtype: str) -> dict[str, Any]:
+    """
+    Serialize one embedding into a compact, pickle-friendly payload.
+
+    Args:
+        vector: Embedding vector
+        dtype: Storage dtype (one of EMBEDDING_DTYPES)
+
+    Returns:
+        Dict with dtype, shape, raw code bytes and (int8 only) scale
+    """
+    quantized = quantize(np.asarray(vector, dtype=np.float32).reshape(-1), dtype)
+    return {
+        "dtype": dtype,
+        "dim": int(quantized.codes.shape[0]),
+        "codes": quantized.codes.tobytes(),
+        "scale": float(quantized.scales) if quantized.scales is not None else None,
+    }
+
+
+def unpack_embedding(payload: Any) -> Any:
+    """
+    Reverse ``pack_embedding``.
+
+    Values that are not packed payloads (e.g. vectors cached before
+    quantization was enabled) are returned unchanged.
+    """
+    if not (isinstance(payload, dict) and "codes" in payload and payload.get("dtype") in EMBEDDING_DTYPES):
+        return payload
+    codes = np.frombuffer(payload["codes"], dtype=np.dtype(payload["dtype"]), count=payload["dim"])
+    vector = codes.astype(np.float32)
+    if payload.get("scale") is not None:
+        vector *= np.float32(payload["scale"])
+    return vector
+
+
+def qdrant_collection_options(dtype: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Qdrant options that store vectors at the given precision.
+
+    Args:
+        dtype: One of EMBEDDING_DTYPES
+
+    Returns:
+        (extra VectorParams kwargs, extra create_collection kwargs)
+    """
+    if validate_dtype(dtype) == "float32":
+        return {}, {}
+
+    from qdrant_client import models
+
+    if dtype == "float16":
+        return {"datatype": models.Datatype.FLOAT16}, {}
+    return {}, {
+        "quantization_config": models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        )
+    }
+
+
+def qdrant_search_params(dtype: str, rescore: bool, oversampling: float = 2.0) -> Any | None:
+    """
+    Qdrant SearchParams for an int8-quantized collection.
+
+    Args:
+        dtype: Collection embedding dtype
+        rescore: Rerank oversampled candidates with the original vectors
+        oversampling: Candidate multiplier for the rescoring pass
+
+    Returns:
+        SearchParams, or None when the collection is not int8-quantized
+    """
+    if dtype != "int8":
+        return None
+
+    from qdrant_client import models
+
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(
+            rescore=rescore, oversampling=oversampling if rescore else None
+        )
+    )
@@ -0,0 +1,386 @@
+"""
+Incremental BM25 Index for ToolWeaver
+
+Long-lived inverted index used by ToolSearchEngine for keyword scoring:
+- Postings (term -> document -> term frequency)
+- Document lengths and average length
+- Lazily computed IDF for query terms only
+
+Scores match rank_bm25.BM25Okapi (k1=1.5, b=0.75, epsilon=0.25) but the
+index is built once per catalog and updated one tool at a time, so a
+query only touches the postings of its own terms.
+"""
+
+import logging
+import math
+from typing import Any
+
+import numpy as np
+
+from ..shared.models import ToolDefinition
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> list[str]:
+    """Tokenize text for BM25 (lowercase + whitespace split)."""
+    return text.lower().split()
+
+
+def tool_bm25_text(tool: ToolDefinition) -> str:
+    """Build the BM25 document text for a tool (name, description, parameter descriptions)."""
+    param_text = " ".join(p.description for p in tool.parameters)
+    return f"{tool.name} {tool.description} {param_text}"
+
+
+class BM25Index:
+    """
+    Incrementally maintained BM25 (Okapi) inverted index keyed by tool name.
+
+    Documents occupy integer slots; removed slots are reused so memory stays
+    proportional to the live catalog. Per-term posting arrays are cached as
+    NumPy arrays and rebuilt only when that term's postings change.
+
+    Usage:
+        index = BM25Index()
+        index.sync(catalog.tools.values())
+        scores = index.get_scores("create github issue", ["tool_a", "tool_b"])
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation parameter
+            b: Document length normalization parameter
+            epsilon: Floor factor for negative IDF (as in BM25Okapi)
+        """
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self._reset()
+
+    def _reset(self) -> None:
+        # term -> {slot: term frequency}
+        self._postings: dict[str, dict[int, int]] = {}
+        # term -> (slots, term frequencies) as arrays, rebuilt on change
+        self._posting_arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+        self._slots: dict[str, int] = {}  # tool name -> slot
+        self._names: list[str | None] = []  # slot -> tool name
+        # slot -> term frequencies (None: derive from the loaded state, see load_state)
+        self._terms: list[dict[str, int] | None] = []
+        self._loaded: tuple[list[str], np.ndarray, np.ndarray] | None = None
+        self._tools: dict[str, ToolDefinition] = {}  # tool name -> indexed object
+        self._free_slots: list[int] = []
+        self._doc_len = np.zeros(0, dtype=np.float64)
+        self._total_len = 0
+
+        self._average_idf: float | None = None
+        # Bumped on every mutation so callers can detect stale slot arrays
+        self.version = getattr(self, "version", 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._slots
+
+    @property
+    def avgdl(self) -> float:
+        """Average document length of the live corpus."""
+        return self._total_len / len(self._slots) if self._slots else 0.0
+
+    def add(self, tool: ToolDefinition) -> None:
+        """
+        Add or replace a tool in the index.
+
+        Args:
+            tool: Tool definition to index (keyed by ``tool.name``)
+        """
+        if tool.name in self._slots:
+            self.remove(tool.name)
+
+        tokens = tokenize(tool_bm25_text(tool))
+        frequencies: dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._names[slot] = tool.name
+            self._terms[slot] = frequencies
+        else:
+            slot = len(self._names)
+            self._names.append(tool.name)
+            self._terms.append(frequencies)
+            if slot >= len(self._doc_len):
+                grown = np.zeros(max(16, 2 * len(self._doc_len)), dtype=np.float64)
+                grown[: len(self._doc_len)] = self._doc_len
+                self._doc_len = grown
+
+        self._slots[tool.name] = slot
+        self._tools[tool.name] = tool
+        self._doc_len[slot] = len(tokens)
+        self._total_len += len(tokens)
+
+        for term, tf in frequencies.items():
+            self._postings.setdefault(term, {})[slot] = tf
+            self._posting_arrays.pop(term, None)
+        self._average_idf = None
+        self.version += 1
+
+    def remove(self, name: str) -> bool:
+        """
+        Remove a tool from the index.
+
+        Args:
+            name: Tool name to remove
+
+        Returns:
+            True if the tool was indexed and has been removed
+        """
+        slot = self._slots.pop(name, None)
+        if slot is None:
+            return False
+
+        for term in self._slot_terms(slot):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+            self._posting_arrays.pop(term, None)
+
+        self._total_len -= int(self._doc_len[slot])
+        self._doc_len[slot] = 0
+        self._names[slot] = None
+        self._terms[slot] = {}
+        self._tools.pop(name, None)
+        self._free_slots.append(slot)
+        self._average_idf = None
+        self.version += 1
+        return True
+
+    def ensure(self, tools: Any) -> int:
+        """
+        Index any tools that are missing or whose definition object changed.
+
+        Args:
+            tools: Iterable of ToolDefinition objects
+
+        Returns:
+            Number of tools (re)indexed
+        """
+        updated = 0
+        for tool in tools:
+            if self._tools.get(tool.name) is not tool:
+                self.add(tool)
+                updated += 1
+        return updated
+
+    def sync(self, tools: Any) -> int:
+        """
+        Make the index mirror ``tools`` exactly (add, update and remove).
+
+        Tools are compared by object identity, so re-registering a tool
+        (``catalog.add_tool``) re-indexes it while unchanged tools are skipped.
+
+        Args:
+            tools: Iterable of ToolDefinition objects
+
+        Returns:
+            Number of tools added, updated or removed
+        """
+        tools = list(tools)
+        changed = self.ensure(tools)
+        if len(self._slots) != len(tools):
+            live = {tool.name for tool in tools}
+            for name in [n for n in self._slots if n not in live]:
+                self.remove(name)
+                changed += 1
+        if changed:
+            logger.debug(f"BM25 index synced ({changed} changes, {len(self._slots)} docs)")
+        return changed
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._reset()
+
+    def export_state(self, names: list[str]) -> dict[str, Any]:
+        """
+        Export postings for ``names`` as flat arrays, for persisting with a catalog.
+
+        Document ``i`` in the exported state is ``names[i]``; postings are
+        stored CSR-style (``postings_ptr`` delimits each term's entries).
+
+        Args:
+            names: Indexed tool names, in the order they will be restored
+
+        Returns:
+            Dict of parameters, terms and NumPy arrays (see ``load_state``)
+        """
+        positions = {self._slots[name]: i for i, name in enumerate(names)}
+        terms: list[str] = []
+        pointers = [0]
+        docs: list[int] = []
+        frequencies: list[int] = []
+        for term in sorted(self._postings):
+            entries = [(positions[s], tf) for s, tf in self._postings[term].items() if s in positions]
+            if not entries:
+                continue
+            terms.append(term)
+            docs.extend(doc for doc, _ in entries)
+            frequencies.extend(tf for _, tf in entries)
+            pointers.append(len(docs))
+
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "epsilon": self.epsilon,
+            "terms": terms,
+            "postings_ptr": np.array(pointers, dtype=np.uint64),
+            "postings_docs": np.array(docs, dtype=np.uint32),
+            "postings_tfs": np.array(frequencies, dtype=np.uint32),
+            "doc_len": self._doc_len[[self._slots[name] for name in names]].astype(np.float64),
+        }
+
+    def load_state(
+        self, names: list[str], state: dict[str, Any], tools: list[ToolDefinition] | None = None
+    ) -> None:
+        """
+        Replace the index contents with an exported state, without re-tokenizing.
+
+        Args:
+            names: Tool names, as passed to ``export_state``
+            state: Output of ``export_state`` (arrays may be read-only views)
+            tools: Tool objects aligned with ``names``; without them a later
+                ``ensure``/``sync`` re-indexes every tool it is given
+
+        Raises:
+            ValueError: If the state was built with different BM25 parameters
+                or for a different number of documents
+        """
+        if (state["k1"], state["b"], state["epsilon"]) != (self.k1, self.b, self.epsilon):
+            raise ValueError("BM25 state was built with different parameters")
+        doc_len = np.array(state["doc_len"], dtype=np.float64)
+        if len(doc_len) != len(names):
+            raise ValueError(f"BM25 state has {len(doc_len)} documents, expected {len(names)}")
+
+        self._reset()
+        self._names = list(names)
+        self._slots = {name: slot for slot, name in enumerate(names)}
+        self._tools = {tool.name: tool for tool in tools or []}
+        self._terms = [None] * len(names)
+        self._doc_len = doc_len
+        self._total_len = int(doc_len.sum())
+
+        terms = list(state["terms"])
+        pointers = np.array(state["postings_ptr"], dtype=np.intp)
+        docs = np.array(state["postings_docs"], dtype=np.intp)
+        doc_list = docs.tolist()
+        frequency_list = np.asarray(state["postings_tfs"]).tolist()
+        bounds = pointers.tolist()
+        for i, term in enumerate(terms):
+            start, end = bounds[i], bounds[i + 1]
+            self._postings[term] = dict(zip(doc_list[start:end], frequency_list[start:end], strict=True))
+        # Per-slot term dicts are only needed by remove(); derive them on demand
+        self._loaded = (terms, pointers, docs)
+        self.version += 1
+        logger.debug(f"BM25 index loaded ({len(self._slots)} docs, {len(self._postings)} terms)")
+
+    def _slot_terms(self, slot: int) -> dict[str, int]:
+        terms = self._terms[slot]
+        if terms is None and self._loaded is not None:
+            loaded_terms, pointers, docs = self._loaded
+            entries = np.flatnonzero(docs == slot)
+            term_ids = np.searchsorted(pointers, entries, side="right") - 1
+            terms = {loaded_terms[i]: self._postings[loaded_terms[i]][slot] for i in term_ids.tolist()}
+            self._terms[slot] = terms
+        return terms or {}
+
+    def _raw_idf(self, doc_freq: int) -> float:
+        n_docs = len(self._slots)
+        return math.log(n_docs - doc_freq + 0.5) - math.log(doc_freq + 0.5)
+
+    def _get_average_idf(self) -> float:
+        # Only needed for the negative-IDF floor; recomputed once per mutation batch
+        if self._average_idf is None:
+            if self._postings:
+                doc_freqs = np.fromiter(map(len, self._postings.values()), dtype=np.float64, count=len(self._postings))
+                n_docs = len(self._slots)
+                raw_idf = np.log(n_docs - doc_freqs + 0.5) - np.log(doc_freqs + 0.5)
+                self._average_idf = float(raw_idf.mean())
+            else:
+                self._average_idf = 0.0
+        return self._average_idf
+
+    def idf(self, term: str) -> float:
+        """IDF for a term (negative values floored to epsilon * average IDF)."""
+        postings = self._postings.get(term)
+        if not postings:
+            return 0.0
+        value = self._raw_idf(len(postings))
+        if value < 0:
+            value = self.epsilon * self._get_average_idf()
+        return value
+
+    def _get_posting_arrays(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        arrays = self._posting_arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            arrays = (
+                np.fromiter(postings.keys(), dtype=np.intp, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+            self._posting_arrays[term] = arrays
+        return arrays
+
+    def score_slots(self, query: str) -> np.ndarray:
+        """
+        Score every slot for a query.
+
+        Args:
+            query: Raw query text
+
+        Returns:
+            Array of BM25 scores indexed by slot (free slots score 0)
+        """
+        scores = np.zeros(len(self._names), dtype=np.float64)
+        if not self._slots:
+            return scores
+
+        avgdl = self.avgdl or 1.0
+        for term in tokenize(query):
+            if term not in self._postings:
+                continue
+            slots, tfs = self._get_posting_arrays(term)
+            norm = self.k1 * (1 - self.b + self.b * self._doc_len[slots] / avgdl)
+            scores[slots] += self.idf(term) * (tfs * (self.k1 + 1) / (tfs + norm))
+        return scores
+
+    def slot_of(self, name: str) -> int:
+        """Return the slot for an indexed tool name (KeyError if missing)."""
+        return self._slots[name]
+
+    def get_slots(self, names: list[str]) -> np.ndarray:
+        """Return slots for indexed tool names (KeyError if any is missing)."""
+        return np.fromiter((self._slots[n] for n in names), dtype=np.intp, count=len(names))
+
+    def get_scores(self, query: str, names: list[str]) -> np.ndarray:
+        """
+        Score the given tools for a query.
+
+        Args:
+            query: Raw query text
+            names: Tool names to score (must be indexed)
+
+        Returns:
+            Array of raw BM25 scores aligned with ``names``
+        """
+        slot_scores = self.score_slots(query)
+        if not names:
+            return np.zeros(0, dtype=np.float64)
+        scores: np.ndarray = slot_scores[self.get_slots(names)]
+        return scores
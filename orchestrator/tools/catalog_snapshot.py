@@ -0,0 +1,338 @@
+"""
+Binary Catalog Snapshots for ToolWeaver
+
+Versioned single-file snapshot of a tool catalog plus its precomputed
+search artifacts, designed to be memory-mapped and read lazily:
+
+    [prefix]   magic, format version, header offset, header length
+    [sections] 8-byte aligned binary sections
+    [header]   UTF-8 JSON: catalog fields, domain table, section table
+
+Catalog sections hold the ``ColumnarToolCatalog`` columns: compact JSON
+tool records with an offset index, NUL-separated tool names (the name
+index), descriptions, and type/domain/defer_loading codes. Optional search
+sections hold BM25 postings (CSR arrays), per-tool content fingerprints and
+embedding rows with their text hashes (see
+``ToolSearchEngine.export_search_state``).
+
+Opening a snapshot maps the file and parses only the JSON header. Record
+boundaries live in the offset section rather than inline length prefixes,
+so the mapped records section is used directly as the catalog's record
+column; a tool is validated only when it is read.
+
+Usage:
+    write_snapshot(path, catalog, search_state=engine.export_search_state(catalog))
+
+    with CatalogSnapshot.open(path) as snapshot:
+        catalog = snapshot.lazy_catalog()
+        tool = catalog.get_tool("github_create_pr")       # validated on first access
+        engine.restore_search_state(catalog, snapshot.search_state())
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..shared.columnar_catalog import ColumnarToolCatalog
+from ..shared.models import ToolCatalog, ToolDefinition
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"TWSNAP\r\n"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# magic, format version, reserved flags, header offset, header length
+_PREFIX = struct.Struct("<8sIIQQ")
+_ALIGNMENT = 8
+_HASH_BYTES = 32  # hex MD5 digests
+
+
+def _encode_strings(values: list[str], what: str) -> bytes:
+    for value in values:
+        if "\x00" in value:
+            raise ValueError(f"{what} may not contain NUL characters: {value!r}")
+    return "\x00".join(values).encode("utf-8")
+
+
+def _decode_strings(data: Any, count: int) -> list[str]:
+    if count == 0:
+        return []
+    return str(data, "utf-8").split("\x00")
+
+
+def _encode_hashes(values: list[str]) -> bytes:
+    encoded = "".join(values).encode("ascii")
+    if len(encoded) != _HASH_BYTES * len(values):
+        raise ValueError("Expected 32-character hex digests")
+    return encoded
+
+
+def _decode_hashes(data: Any, count: int) -> list[str]:
+    text = str(data, "ascii")
+    return [text[i * _HASH_BYTES:(i + 1) * _HASH_BYTES] for i in range(count)]
+
+
+def write_snapshot(
+    path: Path,
+    catalog: ToolCatalog | ColumnarToolCatalog,
+    search_state: dict[str, Any] | None = None,
+) -> Path:
+    """
+    Write a catalog (and optionally its search artifacts) as a snapshot.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    that still map the previous snapshot keep a consistent view.
+
+    Args:
+        path: Destination file
+        catalog: Catalog to store
+        search_state: Output of ``ToolSearchEngine.export_search_state`` for this catalog
+
+    Returns:
+        The snapshot path
+
+    Raises:
+        ValueError: If the search state does not match the catalog's tools
+    """
+    path = Path(path)
+    if isinstance(catalog, ColumnarToolCatalog):
+        columnar = catalog
+    else:
+        columnar = ColumnarToolCatalog.from_catalog(catalog, cache_size=0)
+    columns = columnar.export_columns()
+    names = columns["names"]
+
+    sections: dict[str, tuple[bytes | np.ndarray, str]] = {
+        "names": (_encode_strings(names, "Tool names"), "bytes"),
+        "records": (columns["records"], "bytes"),
+        "record_offsets": (columns["record_offsets"], "<u8"),
+        "descriptions": (columns["descriptions"], "bytes"),
+        "description_offsets": (columns["description_offsets"], "<u8"),
+        "type_codes": (columns["type_codes"], "u1"),
+        "domain_codes": (columns["domain_codes"], "<u4"),
+        "deferred": (columns["deferred"], "u1"),
+    }
+
+    search_header: dict[str, Any] | None = None
+    if search_state is not None:
+        if list(search_state["names"]) != names:
+            raise ValueError("Search state does not match the catalog's tools")
+        bm25 = search_state["bm25"]
+        search_header = {
+            "bm25": {"k1": bm25["k1"], "b": bm25["b"], "epsilon": bm25["epsilon"], "terms": len(bm25["terms"])},
+        }
+        sections.update({
+            "fingerprints": (_encode_hashes(search_state["fingerprints"]), "bytes"),
+            "bm25_terms": (_encode_strings(bm25["terms"], "BM25 terms"), "bytes"),
+            "bm25_ptr": (np.asarray(bm25["postings_ptr"], dtype="<u8"), "<u8"),
+            "bm25_docs": (np.asarray(bm25["postings_docs"], dtype="<u4"), "<u4"),
+            "bm25_tfs": (np.asarray(bm25["postings_tfs"], dtype="<u4"), "<u4"),
+            "bm25_doc_len": (np.asarray(bm25["doc_len"], dtype="<f8"), "<f8"),
+        })
+        if "embeddings" in search_state:
+            embeddings = np.ascontiguousarray(search_state["embeddings"], dtype="<f4")
+            search_header["embedding_model"] = search_state["embedding_model"]
+            search_header["embedding_dim"] = int(embeddings.shape[1])
+            sections.update({
+                "embedding_hashes": (_encode_hashes(search_state["embedding_hashes"]), "bytes"),
+                "embeddings": (embeddings, "<f4"),
+            })
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    table: dict[str, list[Any]] = {}
+    with open(tmp_path, "wb") as f:
+        f.write(b"\x00" * _PREFIX.size)
+        for name, (data, dtype) in sections.items():
+            f.write(b"\x00" * (-f.tell() % _ALIGNMENT))
+            blob = data if isinstance(data, bytes) else data.tobytes()
+            table[name] = [f.tell(), len(blob), dtype]
+            f.write(blob)
+
+        header = {
+            "catalog": {
+                "discovered_at": columnar.discovered_at.isoformat(),
+                "source": columnar.source,
+                "version": columnar.version,
+                "metadata": columnar.metadata,
+            },
+            "count": len(names),
+            "domains": columns["domains"],
+            "sections": table,
+            "search": search_header,
+        }
+        header_bytes = json.dumps(header, default=str).encode("utf-8")
+        header_offset = f.tell()
+        f.write(header_bytes)
+        f.seek(0)
+        f.write(_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, 0, header_offset, len(header_bytes)))
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote catalog snapshot ({len(names)} tools, search={search_header is not None}) to {path}")
+    return path
+
+
+class CatalogSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Usage:
+        with CatalogSnapshot.open(path) as snapshot:
+            catalog = snapshot.lazy_catalog()
+    """
+
+    def __init__(self, path: Path):
+        """
+        Map a snapshot file and parse its header.
+
+        Raises:
+            ValueError: If the file is not a snapshot or has an unsupported version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _PREFIX.size:
+            self.close()
+            raise ValueError(f"Not a catalog snapshot: {self.path}")
+        magic, version, _flags, header_offset, header_len = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"Not a catalog snapshot: {self.path}")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported catalog snapshot version {version} at {self.path}")
+
+        self._view = memoryview(self._mmap)
+        self.header: dict[str, Any] = json.loads(bytes(self._view[header_offset:header_offset + header_len]))
+        self._names: list[str] | None = None
+        self._lazy_catalog: ColumnarToolCatalog | None = None
+
+    @classmethod
+    def open(cls, path: Path) -> "CatalogSnapshot":
+        return cls(path)
+
+    def __enter__(self) -> "CatalogSnapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self.header["count"])
+
+    def close(self) -> None:
+        """Release the mapping (deferred while lazily-read catalogs still reference it)."""
+        self._lazy_catalog = None
+        view = getattr(self, "_view", None)
+        if view is not None:
+            try:
+                view.release()
+            except BufferError:
+                return
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # unmapped once the last NumPy view is garbage collected
+
+    @property
+    def discovered_at(self) -> datetime:
+        return datetime.fromisoformat(self.header["catalog"]["discovered_at"])
+
+    @property
+    def names(self) -> list[str]:
+        """Tool names in catalog order."""
+        if self._names is None:
+            self._names = _decode_strings(self._section("names"), len(self))
+        return self._names
+
+    def _section(self, name: str) -> Any:
+        offset, length, dtype = self.header["sections"][name]
+        if dtype == "bytes":
+            return self._view[offset:offset + length]
+        return np.frombuffer(self._mmap, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset)
+
+    def _catalog_fields(self) -> dict[str, Any]:
+        fields = self.header["catalog"]
+        return {
+            "discovered_at": self.discovered_at,
+            "source": fields["source"],
+            "version": fields["version"],
+            "metadata": dict(fields["metadata"]),
+        }
+
+    def lazy_catalog(self, cache_size: int | None = None) -> ColumnarToolCatalog:
+        """
+        Catalog backed directly by the mapped sections; tools are validated on access.
+
+        Args:
+            cache_size: Materialized-tool LRU size (ColumnarToolCatalog default if None)
+        """
+        if self._lazy_catalog is None or cache_size is not None:
+            kwargs = self._catalog_fields()
+            if cache_size is not None:
+                kwargs["cache_size"] = cache_size
+            self._lazy_catalog = ColumnarToolCatalog.from_columns(
+                names=self.names,
+                records=self._section("records"),
+                record_offsets=self._section("record_offsets"),
+                descriptions=self._section("descriptions"),
+                description_offsets=self._section("description_offsets"),
+                type_codes=self._section("type_codes"),
+                domain_codes=self._section("domain_codes"),
+                deferred=self._section("deferred"),
+                domains=self.header["domains"],
+                **kwargs,
+            )
+        return self._lazy_catalog
+
+    def get_tool(self, name: str) -> ToolDefinition | None:
+        """Read a single tool through the name index."""
+        return self.lazy_catalog().get_tool(name)
+
+    def to_catalog(self) -> ToolCatalog:
+        """Validate every record into a regular ``ToolCatalog`` (no intermediate dicts)."""
+        records = self._section("records")
+        offsets = self._section("record_offsets").tolist()
+        tools = {
+            name: ToolDefinition.model_validate_json(bytes(records[offsets[i]:offsets[i + 1]]))
+            for i, name in enumerate(self.names)
+        }
+        return ToolCatalog(tools=tools, **self._catalog_fields())
+
+    def search_state(self) -> dict[str, Any] | None:
+        """
+        Search artifacts in ``ToolSearchEngine.restore_search_state`` format.
+
+        Arrays are read-only views into the mapping; None if the snapshot
+        was written without search artifacts.
+        """
+        search = self.header.get("search")
+        if search is None:
+            return None
+        count = len(self)
+        state: dict[str, Any] = {
+            "names": self.names,
+            "fingerprints": _decode_hashes(self._section("fingerprints"), count),
+            "bm25": {
+                "k1": search["bm25"]["k1"],
+                "b": search["bm25"]["b"],
+                "epsilon": search["bm25"]["epsilon"],
+                "terms": _decode_strings(self._section("bm25_terms"), search["bm25"]["terms"]),
+                "postings_ptr": self._section("bm25_ptr"),
+                "postings_docs": self._section("bm25_docs"),
+                "postings_tfs": self._section("bm25_tfs"),
+                "doc_len": self._section("bm25_doc_len"),
+            },
+        }
+        if "embedding_model" in search:
+            state["embedding_model"] = search["embedding_model"]
+            state["embedding_hashes"] = _decode_hashes(self._section("embedding_hashes"), count)
+            state["embeddings"] = self._section("embeddings").reshape(count, search["embedding_dim"])
+        return state
@@ -6,6 +6,7 @@ from collections.abc import Callable
 from typing import Any, Literal, get_args, get_origin
 
 from ..plugins.registry import get_registry, register_plugin
+from ..shared.change_feed import ChangeFeed
 from ..shared.models import ToolDefinition, ToolParameter
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,8 @@ class _FunctionDecoratorPlugin:
     def __init__(self) -> None:
         self._functions: dict[str, Callable[[dict[str, Any]], Any]] = {}
         self._defs: dict[str, ToolDefinition] = {}
+        # Add/remove/update events, relayed by the PluginRegistry
+        self.changes = ChangeFeed()
 
     def get_tools(self) -> list[dict[str, Any]]:
         # Return ToolDefinitions as plain dicts for registry consumers
@@ -33,10 +36,20 @@ class _FunctionDecoratorPlugin:
         return result
 
     def add(self, name: str, fn: Callable[[dict[str, Any]], Any], td: ToolDefinition) -> None:
-        if name in self._functions:
+        replaced = name in self._functions
+        if replaced:
             logger.warning("Duplicate tool registration detected for '%s'; replacing previous entry", name)
         self._functions[name] = fn
         self._defs[name] = td
+        self.changes.record("update" if replaced else "add", name, td)
+
+    def remove(self, name: str) -> bool:
+        if name not in self._functions:
+            return False
+        del self._functions[name]
+        del self._defs[name]
+        self.changes.record("remove", name)
+        return True
 
 
 _DEF_PLUGIN_NAME = "decorators"
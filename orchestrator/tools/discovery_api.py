@@ -1,36 +1,148 @@
 from __future__ import annotations
 
 import logging
+import threading
 from collections.abc import Sequence
 from typing import Any
 
-from ..plugins.registry import get_registry
+from ..plugins.registry import PluginRegistry, get_registry
 from ..shared.models import ToolCatalog, ToolDefinition
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_tool(tool: Any) -> ToolDefinition | None:
+    """Validate a plugin's tool entry (dict or ToolDefinition); None if it is invalid."""
+    if isinstance(tool, ToolDefinition):
+        return tool
+    try:
+        return ToolDefinition.model_validate(tool)
+    except Exception:
+        # Skip invalid entries rather than failing discovery
+        return None
+
+
+class _ToolIndex:
+    """Name-, domain- and type-indexed view of the plugin registry's tools.
+
+    Built from one scan of the registry, then kept current from the registry's
+    change feed: a lookup first compares generations (no work if nothing
+    changed) and otherwise validates only the tools that were added or updated.
+    Tools a third-party plugin adds after registration are picked up only if
+    the plugin exposes a ``changes`` feed or is re-registered.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._registry: PluginRegistry | None = None
+        self._generation = -1
+        self._by_plugin: dict[str, dict[str, ToolDefinition]] = {}
+        self._by_name: dict[str, ToolDefinition] = {}
+        self._by_domain: dict[str, dict[str, ToolDefinition]] = {}
+        self._by_type: dict[str, dict[str, ToolDefinition]] = {}
+
+    def get(self, name: str) -> ToolDefinition | None:
+        self._sync()
+        return self._by_name.get(name)
+
+    def all(self) -> list[ToolDefinition]:
+        """All tools, in plugin registration order."""
+        self._sync()
+        with self._lock:
+            return [td for tools in self._by_plugin.values() for td in tools.values()]
+
+    def by_plugin(self, plugin: str) -> list[ToolDefinition]:
+        self._sync()
+        with self._lock:
+            return list(self._by_plugin.get(plugin, {}).values())
+
+    def by_domain(self, domain: str) -> list[ToolDefinition]:
+        self._sync()
+        with self._lock:
+            return list(self._by_domain.get(domain, {}).values())
+
+    def by_type(self, tool_type: str) -> list[ToolDefinition]:
+        self._sync()
+        with self._lock:
+            return list(self._by_type.get(tool_type, {}).values())
+
+    def filtered(self, *, domain: str | None = None, type_filter: str | None = None) -> list[ToolDefinition]:
+        """Tools matching both filters, served from the smaller index."""
+        if domain and type_filter:
+            return [td for td in self.by_domain(domain) if td.type == type_filter]
+        if domain:
+            return self.by_domain(domain)
+        if type_filter:
+            return self.by_type(type_filter)
+        return self.all()
+
+    def invalidate(self) -> None:
+        """Force a full rescan on the next lookup."""
+        with self._lock:
+            self._registry = None
+
+    def _sync(self) -> None:
+        registry = get_registry()
+        if registry is self._registry and registry.generation == self._generation:
+            return
+        with self._lock:
+            changes = registry.changes_since(self._generation) if registry is self._registry else None
+            if changes is None:
+                self._rebuild(registry)
+                return
+            for change in changes:
+                self._discard(change.source or "", change.name)
+                if change.kind != "remove":
+                    td = _normalize_tool(change.tool)
+                    if td is not None:
+                        self._insert(change.source or "", td)
+                self._generation = change.generation
+
+    def _rebuild(self, registry: PluginRegistry) -> None:
+        # Read the generation first: changes made during the scan are replayed on the next sync
+        generation = registry.generation
+        self._by_plugin, self._by_name, self._by_domain, self._by_type = {}, {}, {}, {}
+        for plugin, tools in registry.get_all_tools().items():
+            self._by_plugin[plugin] = {}
+            for tool in tools:
+                td = _normalize_tool(tool)
+                if td is not None:
+                    self._insert(plugin, td)
+        self._registry = registry
+        self._generation = generation
+        logger.debug(f"Indexed {len(self._by_name)} tools from {len(self._by_plugin)} plugins")
+
+    def _insert(self, plugin: str, td: ToolDefinition) -> None:
+        self._by_plugin.setdefault(plugin, {})[td.name] = td
+        self._by_name[td.name] = td
+        self._by_domain.setdefault(td.domain, {})[td.name] = td
+        self._by_type.setdefault(td.type, {})[td.name] = td
+
+    def _discard(self, plugin: str, name: str) -> None:
+        td = self._by_name.pop(name, None)
+        if td is None:
+            return
+        plugin_tools = self._by_plugin.get(plugin, {})
+        plugin_tools.pop(name, None)
+        if not plugin_tools:
+            self._by_plugin.pop(plugin, None)
+        self._by_domain.get(td.domain, {}).pop(name, None)
+        self._by_type.get(td.type, {}).pop(name, None)
+
+
+_tool_index = _ToolIndex()
+
+
 def _collect_all_tool_defs(catalog: ToolCatalog | None = None) -> list[ToolDefinition]:
     """Collect all tool definitions from all plugins, normalized to ToolDefinition.
 
-    Plugins return lists of dicts or ToolDefinitions; we validate to ToolDefinition for consistent access.
+    Plugins return lists of dicts or ToolDefinitions; registry tools come from
+    the shared index, so they are validated once rather than on every call.
     """
     if catalog is not None:
         tools_list: list[Any] = list(catalog.tools.values())
         return [ToolDefinition.model_validate(t) if not isinstance(t, ToolDefinition) else t for t in tools_list]
-
-    registry = get_registry()
-    all_tools: list[ToolDefinition] = []
-    plugin_tools_dict: dict[str, list[Any]] = registry.get_all_tools()
-    for _, tools in plugin_tools_dict.items():
-        for t in tools:
-            try:
-                td = ToolDefinition.model_validate(t) if not isinstance(t, ToolDefinition) else t
-                all_tools.append(td)
-            except Exception:
-                # Skip invalid entries rather than failing discovery
-                continue
-    return all_tools
+    return _tool_index.all()
 
 
 DETAIL_LEVELS = {"name", "summary", "full"}
@@ -83,24 +195,14 @@ def get_available_tools(
     domain: str | None = None,
 ) -> list[ToolDefinition]:
     """List available tools across all plugins with optional filters."""
-    registry = get_registry()
-    tool_dict: dict[str, list[Any]] = (
-        {plugin: registry.get(plugin).get_tools()} if plugin else registry.get_all_tools()
-    )
+    if not plugin:
+        return _tool_index.filtered(domain=domain, type_filter=type_filter)
 
-    out: list[ToolDefinition] = []
-    for _, tools in tool_dict.items():
-        for t in tools:
-            try:
-                td = ToolDefinition.model_validate(t)
-            except Exception:
-                continue
-            if type_filter and td.type != type_filter:
-                continue
-            if domain and td.domain != domain:
-                continue
-            out.append(td)
-    return out
+    get_registry().get(plugin)  # raises PluginNotFoundError for unknown plugins
+    return [
+        td for td in _tool_index.by_plugin(plugin)
+        if (not type_filter or td.type == type_filter) and (not domain or td.domain == domain)
+    ]
 
 
 def browse_tools(
@@ -180,7 +282,11 @@ def search_tools(
 
     if not semantic_attempted or not results:
         query_norm = (query or "").strip().lower()
-        for td in _collect_all_tool_defs(catalog):
+        candidates = (
+            _collect_all_tool_defs(catalog) if catalog is not None
+            else _tool_index.filtered(domain=domain, type_filter=type_filter)
+        )
+        for td in candidates:
             if type_filter and td.type != type_filter:
                 continue
             if domain and td.domain != domain:
@@ -222,13 +328,15 @@ def get_tool_info(
     catalog: ToolCatalog | None = None,
 ) -> ToolDefinition | dict[str, Any] | None:
     """Get tool definition by name with optional projection."""
-    for td in _collect_all_tool_defs(catalog):
-        if td.name == name:
-            return _format_tool_view(td, detail_level=detail_level, include_examples=include_examples)
-    return None
+    td = catalog.get_tool(name) if catalog is not None else _tool_index.get(name)
+    if td is None:
+        return None
+    return _format_tool_view(td, detail_level=detail_level, include_examples=include_examples)
 
 
 def list_tools_by_domain(domain: str, *, catalog: ToolCatalog | None = None) -> list[ToolDefinition]:
+    if catalog is None:
+        return _tool_index.by_domain(domain)
     return [td for td in _collect_all_tool_defs(catalog) if td.domain == domain]
 
 
@@ -274,9 +382,7 @@ def semantic_search_tools(
         return []
 
     # Build catalog from all tools
-    all_tools = _collect_all_tool_defs()
-    if domain:
-        all_tools = [t for t in all_tools if t.domain == domain]
+    all_tools = _tool_index.filtered(domain=domain)
 
     catalog = ToolCatalog(tools={t.name: t for t in all_tools})
 
@@ -285,9 +391,10 @@ def semantic_search_tools(
         fallback_to_memory=True
     )
 
-    # Index catalog (lazy, cached in Qdrant)
+    # Index catalog (incremental, cached in Qdrant); a domain-filtered
+    # catalog must not delete the other domains' tools
     try:
-        search_engine.index_catalog(catalog, batch_size=32)
+        search_engine.index_catalog(catalog, batch_size=32, delete_missing=domain is None)
     except Exception as e:
         logger.warning(f"Failed to index catalog: {e}")
         if fallback_to_substring:
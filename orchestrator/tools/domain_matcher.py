@@ -0,0 +1,253 @@
+"""
+Domain Keyword Matching for ToolWeaver
+
+Domain detection checks a query (or tool name) against every keyword of
+every registered domain. Instead of one substring test per keyword, all
+keywords are compiled into a single Aho–Corasick automaton, so one pass over
+the text finds every keyword it contains (including overlapping ones):
+classification costs O(len(text) + matches) regardless of keyword count.
+
+Domains and keywords can be registered at runtime; the automaton is rebuilt
+lazily on the next match after a change.
+
+Usage:
+    registry = DomainRegistry({"github": {"keywords": ["repo", "pull request"], "tools": []}})
+    registry.register("jira", keywords=["ticket", "sprint"])
+    registry.scores("open a jira ticket for the repo")  # {"github": 1, "jira": 1}
+"""
+
+import logging
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Catch-all domain: never matched by keywords
+GENERAL_DOMAIN = "general"
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over a fixed set of keywords.
+
+    Usage:
+        matcher = KeywordMatcher(["pr", "pull request", "issue"])
+        matcher.find("open a pull request")  # {0, 1}
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile keywords into an automaton.
+
+        Args:
+            keywords: Keywords to match (index in this sequence is the match ID)
+        """
+        self.keywords = list(keywords)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+
+        outputs: list[list[int]] = [[]]
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(index)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self._fail[child]])
+        self._out: list[tuple[int, ...]] = [tuple(dict.fromkeys(ids)) for ids in outputs]
+
+    def find(self, text: str) -> set[int]:
+        """
+        Indices of all keywords occurring in ``text`` (case-sensitive).
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of keyword indices
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+@dataclass
+class _Compiled:
+    matcher: KeywordMatcher
+    # Per keyword: (domain order, domain) pairs it belongs to
+    keyword_domains: list[list[tuple[int, str]]]
+    # Per known tool name pattern: (domain order, domain) pairs
+    tool_domains: list[list[tuple[int, str]]]
+    domain_order: dict[str, int]
+
+
+class DomainRegistry:
+    """
+    Runtime-extensible domain -> keywords/tool-name registry with a
+    compiled single-pass matcher.
+
+    Domains keep their registration order, which breaks ties exactly like
+    the original ordered keyword scan.
+    """
+
+    def __init__(self, domains: Mapping[str, Mapping[str, Any]] | None = None):
+        """
+        Initialize registry.
+
+        Args:
+            domains: Initial domains, ``{domain: {"keywords": [...], "tools": [...]}}``
+        """
+        self._keywords: dict[str, list[str]] = {}
+        self._tools: dict[str, list[str]] = {}
+        self._compiled: _Compiled | None = None
+        self._lock = threading.Lock()
+        for domain, config in (domains or {}).items():
+            self.register(domain, config.get("keywords", ()), config.get("tools", ()))
+        if GENERAL_DOMAIN not in self._keywords:
+            self.register(GENERAL_DOMAIN)
+
+    def register(self, domain: str, keywords: Iterable[str] = (), tools: Iterable[str] = ()) -> None:
+        """
+        Add a domain, or extend an existing one with more keywords/tool names.
+
+        Args:
+            domain: Domain name
+            keywords: Keywords that indicate the domain in queries and tool names
+            tools: Known tool names (substring of a tool name) for the domain
+        """
+        with self._lock:
+            domain_keywords = self._keywords.setdefault(domain, [])
+            domain_tools = self._tools.setdefault(domain, [])
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if keyword and keyword not in domain_keywords:
+                    domain_keywords.append(keyword)
+            for tool_name in tools:
+                tool_name = tool_name.strip().lower()
+                if tool_name and tool_name not in domain_tools:
+                    domain_tools.append(tool_name)
+            self._compiled = None
+        logger.debug(f"Registered domain '{domain}' ({len(self._keywords[domain])} keywords)")
+
+    def unregister(self, domain: str) -> bool:
+        """Remove a domain (the general domain cannot be removed)."""
+        if domain == GENERAL_DOMAIN:
+            return False
+        with self._lock:
+            removed = self._keywords.pop(domain, None) is not None
+            self._tools.pop(domain, None)
+            self._compiled = None
+        return removed
+
+    def __contains__(self, domain: object) -> bool:
+        return domain in self._keywords
+
+    def domains(self) -> list[str]:
+        """Registered domain names in registration order."""
+        return list(self._keywords)
+
+    def keywords(self, domain: str) -> list[str]:
+        """Keywords registered for a domain."""
+        return list(self._keywords.get(domain, ()))
+
+    def tools(self, domain: str) -> list[str]:
+        """Known tool names registered for a domain."""
+        return list(self._tools.get(domain, ()))
+
+    def _compile(self) -> _Compiled:
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+
+            patterns: dict[str, int] = {}
+            keyword_domains: list[list[tuple[int, str]]] = []
+            tool_domains: list[list[tuple[int, str]]] = []
+            domain_order = {domain: order for order, domain in enumerate(self._keywords)}
+
+            def pattern_id(text: str) -> int:
+                if text not in patterns:
+                    patterns[text] = len(patterns)
+                    keyword_domains.append([])
+                    tool_domains.append([])
+                return patterns[text]
+
+            for domain, order in domain_order.items():
+                if domain == GENERAL_DOMAIN:
+                    continue
+                for keyword in self._keywords[domain]:
+                    keyword_domains[pattern_id(keyword)].append((order, domain))
+                for tool_name in self._tools[domain]:
+                    tool_domains[pattern_id(tool_name)].append((order, domain))
+
+            self._compiled = _Compiled(
+                matcher=KeywordMatcher(patterns),
+                keyword_domains=keyword_domains,
+                tool_domains=tool_domains,
+                domain_order=domain_order,
+            )
+            logger.debug(f"Compiled domain matcher: {len(domain_order)} domains, {len(patterns)} patterns")
+            return self._compiled
+
+    def scores(self, text: str) -> dict[str, int]:
+        """
+        Number of distinct keywords of each domain found in ``text``.
+
+        Args:
+            text: Query or description (matched case-insensitively)
+
+        Returns:
+            Domain -> keyword match count for every non-general domain
+        """
+        compiled = self._compile()
+        scores = {domain: 0 for domain in compiled.domain_order if domain != GENERAL_DOMAIN}
+        for pattern in compiled.matcher.find(text.lower()):
+            for _, domain in compiled.keyword_domains[pattern]:
+                scores[domain] += 1
+        return scores
+
+    def classify_name(self, name: str) -> str | None:
+        """
+        Domain for a tool name: a known tool name match wins, then a keyword
+        match; ties go to the earliest registered domain.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Domain name, or None if nothing matches
+        """
+        compiled = self._compile()
+        found = compiled.matcher.find(name.lower())
+        for table in (compiled.tool_domains, compiled.keyword_domains):
+            candidates = [entry for pattern in found for entry in table[pattern]]
+            if candidates:
+                return min(candidates)[1]
+        return None
@@ -0,0 +1,494 @@
+"""
+Shared Embedding Inference Server for ToolWeaver
+
+One process per host loads each SentenceTransformer model once and serves
+``encode`` requests from every ToolWeaver process (uvicorn workers, CLIs,
+search engines, the skill library) over a Unix domain socket. Requests that
+arrive within a short window are merged into one ``encode`` call, so many
+small query encodes share a single forward pass.
+
+Clients use ``load_embedding_model()``: it returns a remote model when the
+server socket accepts connections and falls back to loading the model in
+process otherwise (or when the server goes away later).
+
+Wire format (both directions): 4-byte big-endian header length, JSON
+header, then for responses ``nbytes`` of raw float32 row-major data.
+
+Start the server:
+    toolweaver serve-embeddings --model all-MiniLM-L6-v2
+
+Environment Variables:
+    TOOLWEAVER_EMBEDDING_SOCKET - Socket path (default: ~/.toolweaver/embedding.sock)
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Imported lazily: clients served by the embedding server never load torch
+SENTENCE_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+UNIX_SOCKETS_AVAILABLE = hasattr(socket, "AF_UNIX")
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+MAX_HEADER_BYTES = 64 * 1024 * 1024
+
+
+class EmbeddingServerError(RuntimeError):
+    """The embedding server rejected a request or could not be reached."""
+
+
+def get_socket_path() -> Path:
+    """Socket path from TOOLWEAVER_EMBEDDING_SOCKET (default: ~/.toolweaver/embedding.sock)."""
+    configured = os.getenv("TOOLWEAVER_EMBEDDING_SOCKET")
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".toolweaver" / "embedding.sock"
+
+
+def _load_sentence_transformer(model_name: str, device: str | None = None) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    if device is not None:
+        return SentenceTransformer(model_name, device=device)
+    return SentenceTransformer(model_name)
+
+
+def _encode_frame(header: dict[str, Any], payload: bytes = b"") -> bytes:
+    data = json.dumps(header).encode()
+    return _HEADER.pack(len(data)) + data + payload
+
+
+@dataclass
+class _PendingRequest:
+    texts: list[str]
+    normalize: bool
+    future: asyncio.Future[np.ndarray] = field(repr=False)
+
+
+class EmbeddingServer:
+    """
+    Unix-socket embedding server with cross-client micro-batching.
+
+    Each model has a queue drained by one batching task: it takes the first
+    waiting request, keeps collecting requests for up to ``max_wait_ms`` (or
+    until ``max_batch_size`` texts), runs one ``encode`` on the inference
+    thread and hands every client its slice of the result.
+
+    Usage:
+        server = EmbeddingServer(models=["all-MiniLM-L6-v2"])
+        await server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        socket_path: str | Path | None = None,
+        models: Sequence[str] = ("all-MiniLM-L6-v2",),
+        max_batch_size: int = 256,
+        max_wait_ms: float = 2.0,
+        device: str | None = None,
+        model_loader: Callable[[str], Any] | None = None,
+    ):
+        """
+        Initialize server (models load lazily on first request).
+
+        Args:
+            socket_path: Unix socket path (defaults to get_socket_path())
+            models: Model names clients may request
+            max_batch_size: Max texts merged into one encode call
+            max_wait_ms: How long a batch waits for more requests
+            device: Device passed to SentenceTransformer (e.g. "cuda")
+            model_loader: Callable returning a model for a name (default: SentenceTransformer)
+        """
+        self.socket_path = Path(socket_path) if socket_path is not None else get_socket_path()
+        self.models = list(models)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000
+        self.device = device
+        self.model_loader = model_loader or self._load_model
+
+        self._loaded: dict[str, Any] = {}
+        self._queues: dict[str, asyncio.Queue[_PendingRequest]] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+        self._server: asyncio.AbstractServer | None = None
+        # One inference thread: encode calls never overlap on the model
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="toolweaver-embed")
+        self.stats = {"requests": 0, "batches": 0, "texts": 0}
+
+    def _load_model(self, model_name: str) -> Any:
+        if not SENTENCE_AVAILABLE:
+            raise EmbeddingServerError("sentence-transformers is not installed on the server")
+        return _load_sentence_transformer(model_name, self.device)
+
+    async def start(self) -> None:
+        """Bind the socket and start the per-model batching tasks."""
+        if not UNIX_SOCKETS_AVAILABLE:
+            raise EmbeddingServerError("Unix domain sockets are not supported on this platform")
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if _socket_accepts(self.socket_path):
+                raise EmbeddingServerError(f"An embedding server is already listening on {self.socket_path}")
+            self.socket_path.unlink()  # stale socket from a crashed server
+
+        for model_name in self.models:
+            self._queues[model_name] = asyncio.Queue()
+            self._tasks.append(asyncio.create_task(self._batch_loop(model_name)))
+
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)  # same-user clients only
+        logger.info(f"Embedding server listening on {self.socket_path} (models: {', '.join(self.models)})")
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop serving, fail queued requests and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for queue in self._queues.values():
+            while not queue.empty():
+                pending = queue.get_nowait()
+                if not pending.future.done():
+                    pending.future.set_exception(EmbeddingServerError("Embedding server shutting down"))
+        self._executor.shutdown(wait=False)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        logger.info("Embedding server stopped")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                except asyncio.IncompleteReadError:
+                    break  # client closed the connection
+                if length > MAX_HEADER_BYTES:
+                    writer.write(_encode_frame({"error": "Request too large"}))
+                    break
+                request = json.loads(await reader.readexactly(length))
+                writer.write(await self._respond(request))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            logger.warning(f"Embedding server connection error: {e}")
+        finally:
+            writer.close()
+
+    async def _respond(self, request: dict[str, Any]) -> bytes:
+        model_name = request.get("model")
+        texts = request.get("texts")
+        if model_name not in self._queues:
+            return _encode_frame({"error": f"Model '{model_name}' is not served"})
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            return _encode_frame({"error": "texts must be a list of strings"})
+
+        future: asyncio.Future[np.ndarray] = asyncio.get_running_loop().create_future()
+        await self._queues[model_name].put(_PendingRequest(texts, bool(request.get("normalize")), future))
+        try:
+            vectors = await future
+        except Exception as e:
+            return _encode_frame({"error": str(e)})
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        return _encode_frame({"shape": list(vectors.shape), "nbytes": vectors.nbytes}, vectors.tobytes())
+
+    async def _batch_loop(self, model_name: str) -> None:
+        queue = self._queues[model_name]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            size = len(batch[0].texts)
+            deadline = loop.time() + self.max_wait_s
+            while size < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and queue.empty():
+                    break
+                try:
+                    pending = queue.get_nowait() if remaining <= 0 else await asyncio.wait_for(queue.get(), remaining)
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                batch.append(pending)
+                size += len(pending.texts)
+
+            texts = [text for pending in batch for text in pending.texts]
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode, model_name, texts)
+            except Exception as e:
+                logger.error(f"Embedding batch failed ({model_name}, {len(texts)} texts): {e}")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["texts"] += len(texts)
+            logger.debug(f"Encoded {len(texts)} texts from {len(batch)} requests ({model_name})")
+
+            start = 0
+            for pending in batch:
+                rows = vectors[start : start + len(pending.texts)]
+                start += len(pending.texts)
+                if pending.normalize:
+                    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+                    rows = np.divide(rows, norms, out=np.zeros_like(rows), where=norms > 0)
+                if not pending.future.done():
+                    pending.future.set_result(rows)
+
+    def _encode(self, model_name: str, texts: list[str]) -> np.ndarray:
+        model = self._loaded.get(model_name)
+        if model is None:
+            logger.info(f"Embedding server loading model: {model_name}")
+            model = self._loaded[model_name] = self.model_loader(model_name)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        vectors = model.encode(texts, batch_size=self.max_batch_size, show_progress_bar=False, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+
+def _socket_accepts(socket_path: Path, timeout: float = 0.5) -> bool:
+    """True if something is accepting connections on the Unix socket."""
+    if not UNIX_SOCKETS_AVAILABLE or not socket_path.exists():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def embedding_server_running(socket_path: str | Path | None = None) -> bool:
+    """True if an embedding server accepts connections (default socket path)."""
+    return _socket_accepts(Path(socket_path) if socket_path is not None else get_socket_path())
+
+
+class RemoteEmbeddingModel:
+    """
+    Client for the embedding server with SentenceTransformer-style ``encode``.
+
+    A connection is kept per client and reused under a lock. If the server
+    becomes unreachable, calls fall back to an in-process SentenceTransformer
+    (loaded on first fallback) when ``fallback`` is enabled.
+
+    Usage:
+        model = RemoteEmbeddingModel("all-MiniLM-L6-v2")
+        vectors = model.encode(["create github issue"], normalize_embeddings=True)
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        socket_path: str | Path | None = None,
+        timeout: float = 30.0,
+        fallback: bool = True,
+    ):
+        """
+        Initialize client (connects lazily).
+
+        Args:
+            model_name: Model to request from the server
+            socket_path: Unix socket path (defaults to get_socket_path())
+            timeout: Socket timeout in seconds per request
+            fallback: Encode in process if the server is unreachable
+        """
+        self.model_name = model_name
+        self.socket_path = Path(socket_path) if socket_path is not None else get_socket_path()
+        self.timeout = timeout
+        self.fallback = fallback
+        self._sock: socket.socket | None = None
+        self._lock = threading.Lock()
+        self._local_model: Any | None = None
+        self._dimension: int | None = None
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(str(self.socket_path))
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        return self._sock
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _recv_exactly(self, sock: socket.socket, size: int) -> bytes:
+        chunks = bytearray()
+        while len(chunks) < size:
+            chunk = sock.recv(min(size - len(chunks), 1 << 20))
+            if not chunk:
+                raise ConnectionError("Embedding server closed the connection")
+            chunks.extend(chunk)
+        return bytes(chunks)
+
+    def _request(self, texts: list[str], normalize: bool) -> np.ndarray:
+        frame = _encode_frame({"model": self.model_name, "texts": texts, "normalize": normalize})
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    sock = self._connect()
+                    sock.sendall(frame)
+                    (length,) = _HEADER.unpack(self._recv_exactly(sock, _HEADER.size))
+                    header: dict[str, Any] = json.loads(self._recv_exactly(sock, length))
+                    if "error" in header:
+                        raise EmbeddingServerError(header["error"])
+                    payload = self._recv_exactly(sock, int(header["nbytes"]))
+                    vectors: np.ndarray = np.frombuffer(payload, dtype=np.float32).reshape(header["shape"]).copy()
+                    return vectors
+                except (ConnectionError, BrokenPipeError) as e:
+                    # A reused connection may have been closed by a server restart
+                    self._disconnect()
+                    if attempt == 1:
+                        raise EmbeddingServerError(str(e)) from e
+                except OSError as e:
+                    self._disconnect()
+                    raise EmbeddingServerError(str(e)) from e
+        raise EmbeddingServerError("unreachable")  # pragma: no cover
+
+    def _get_local_model(self) -> Any:
+        if self._local_model is None:
+            if not SENTENCE_AVAILABLE:
+                raise EmbeddingServerError(
+                    "Embedding server unavailable and sentence-transformers is not installed"
+                )
+            logger.warning(f"Embedding server unavailable; loading {self.model_name} in process")
+            self._local_model = _load_sentence_transformer(self.model_name)
+        return self._local_model
+
+    def encode(
+        self,
+        sentences: str | list[str],
+        batch_size: int = 32,
+        show_progress_bar: bool | None = None,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """
+        Encode text(s) on the server (same return shapes as SentenceTransformer).
+
+        Args:
+            sentences: A text or list of texts
+            batch_size: Used only by the in-process fallback
+            show_progress_bar: Used only by the in-process fallback
+            convert_to_numpy: Accepted for compatibility (always NumPy)
+            normalize_embeddings: L2-normalize the vectors
+            **kwargs: Ignored (e.g. ``device``; the server owns placement)
+
+        Returns:
+            (dim,) array for a single text, else (len(sentences), dim)
+        """
+        single = isinstance(sentences, str)
+        texts: list[str] = [sentences] if isinstance(sentences, str) else list(sentences)
+
+        if self._local_model is None:
+            try:
+                vectors = self._request(texts, normalize_embeddings)
+                if vectors.size:
+                    self._dimension = int(vectors.shape[1])
+                return vectors[0] if single else vectors
+            except EmbeddingServerError as e:
+                if not self.fallback:
+                    raise
+                logger.warning(f"Embedding server request failed: {e}")
+
+        embeddings: np.ndarray = self._get_local_model().encode(
+            sentences,
+            batch_size=batch_size,
+            show_progress_bar=show_progress_bar,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize_embeddings,
+        )
+        return embeddings
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding dimension (probes the server once if unknown)."""
+        if self._dimension is None:
+            self._dimension = int(np.asarray(self.encode(["dimension probe"])).shape[-1])
+        return self._dimension
+
+    def close(self) -> None:
+        """Close the server connection."""
+        with self._lock:
+            self._disconnect()
+
+
+def load_embedding_model(model_name: str, device: str | None = None) -> Any | None:
+    """
+    Return an embedding model, preferring the shared embedding server.
+
+    Args:
+        model_name: SentenceTransformer model name
+        device: Device for an in-process model (ignored for the server)
+
+    Returns:
+        RemoteEmbeddingModel if the server is running, an in-process
+        SentenceTransformer otherwise, or None if neither is available
+    """
+    socket_path = get_socket_path()
+    if embedding_server_running(socket_path):
+        logger.info(f"Using embedding server at {socket_path} for {model_name}")
+        return RemoteEmbeddingModel(model_name, socket_path=socket_path)
+
+    if not SENTENCE_AVAILABLE:
+        return None
+    logger.info(f"Loading embedding model in process: {model_name}")
+    return _load_sentence_transformer(model_name, device)
+
+
+def run_embedding_server(
+    socket_path: str | Path | None = None,
+    models: Sequence[str] = ("all-MiniLM-L6-v2",),
+    max_batch_size: int = 256,
+    max_wait_ms: float = 2.0,
+    device: str | None = None,
+) -> None:
+    """Run an EmbeddingServer in the foreground until interrupted."""
+    server = EmbeddingServer(
+        socket_path=socket_path,
+        models=models,
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms,
+        device=device,
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
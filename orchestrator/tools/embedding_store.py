@@ -0,0 +1,252 @@
+"""
+Memory-Mapped Embedding Store for ToolWeaver
+
+Consolidated, append-only float32 matrix of tool embeddings persisted under
+a cache directory:
+- ``<name>.f32``: raw row-major float32 vectors (L2-normalized on append)
+- ``<name>.keys``: one key (text hash) per line, line N describes row N
+- ``<name>.json``: format version and embedding dimension
+
+The matrix is opened with ``np.memmap`` in read-only mode, so several worker
+processes on one host share the same pages from the OS page cache instead of
+each loading its own copy. Appends are serialized across processes with an
+advisory file lock where the platform supports it.
+"""
+
+import json
+import logging
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+
+
+class EmbeddingStore:
+    """
+    Append-only, memory-mapped embedding matrix with a key -> row index.
+
+    Usage:
+        store = EmbeddingStore(cache_dir, name="embeddings")
+        rows = store.append_many(["hash_a", "hash_b"], vectors)
+        scores = store.scores(query_vector, rows)
+    """
+
+    def __init__(self, directory: Path, name: str = "embeddings"):
+        """
+        Initialize store (no file IO until first use).
+
+        Args:
+            directory: Directory holding the store files
+            name: Base file name for this store (one store per embedding model)
+        """
+        self.directory = Path(directory)
+        self.name = name
+        self._thread_lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self.dim: int | None = None
+        self._rows: dict[str, int] = {}
+        self._keys_offset = 0  # bytes of the keys file already read
+        self._matrix: np.ndarray | None = None
+
+    @property
+    def data_path(self) -> Path:
+        return self.directory / f"{self.name}.f32"
+
+    @property
+    def keys_path(self) -> Path:
+        return self.directory / f"{self.name}.keys"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.directory / f"{self.name}.json"
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._rows)
+
+    def __contains__(self, key: object) -> bool:
+        self.refresh()
+        return key in self._rows
+
+    def get_row(self, key: str) -> int | None:
+        """Return the row for a key, or None if not stored."""
+        row = self._rows.get(key)
+        if row is None:
+            self.refresh()
+            row = self._rows.get(key)
+        return row
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Read-only (rows, dim) view of all stored vectors."""
+        self.refresh()
+        if self._matrix is None:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._matrix
+
+    def _read_meta(self) -> None:
+        if self.dim is not None or not self.meta_path.exists():
+            return
+        meta = json.loads(self.meta_path.read_text())
+        if meta.get("version") != STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported embedding store version {meta.get('version')} at {self.meta_path}"
+            )
+        self.dim = int(meta["dim"])
+
+    def refresh(self) -> None:
+        """Pick up rows appended by this or other processes and remap the matrix."""
+        self._read_meta()
+        if self.dim is None or not self.keys_path.exists():
+            return
+
+        if self.keys_path.stat().st_size == self._keys_offset and self._matrix is not None:
+            return
+
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            tail = f.read()
+        # Ignore a partially written last line
+        complete = tail[: tail.rfind(b"\n") + 1]
+        row_bytes = self.dim * 4
+        data_rows = self.data_path.stat().st_size // row_bytes if self.data_path.exists() else 0
+
+        for line in complete.decode().splitlines():
+            if len(self._rows) >= data_rows:
+                break
+            self._rows.setdefault(line, len(self._rows))
+            self._keys_offset += len(line) + 1
+
+        if self._rows:
+            self._matrix = np.memmap(
+                self.data_path, dtype=np.float32, mode="r", shape=(len(self._rows), self.dim)
+            )
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialize appends across threads and (where supported) processes."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._thread_lock, open(self.directory / f"{self.name}.lock", "a+b") as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def append_many(self, keys: Sequence[str], vectors: Any) -> list[int]:
+        """
+        Append vectors for keys not yet stored.
+
+        Args:
+            keys: Keys (e.g. text hashes), one per vector
+            vectors: Array-like of shape (len(keys), dim)
+
+        Returns:
+            Row index for every key (existing rows are reused)
+        """
+        if not keys:
+            return []
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+
+        with self._locked():
+            self.refresh()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self.meta_path.write_text(
+                    json.dumps({"version": STORE_FORMAT_VERSION, "dim": self.dim})
+                )
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} != store dimension {self.dim}")
+
+            new_keys: list[str] = []
+            new_vectors: list[np.ndarray] = []
+            pending: set[str] = set()
+            for key, vector in zip(keys, vectors, strict=True):
+                if key not in self._rows and key not in pending:
+                    pending.add(key)
+                    new_keys.append(key)
+                    new_vectors.append(vector)
+
+            if new_keys:
+                block = np.vstack(new_vectors)
+                norms = np.linalg.norm(block, axis=1, keepdims=True)
+                block = np.divide(block, norms, out=np.zeros_like(block), where=norms > 0)
+
+                # Write at the row boundary implied by the key file so a torn
+                # write from a crashed process is overwritten, never misaligned
+                self.data_path.touch(exist_ok=True)
+                with open(self.data_path, "r+b") as f:
+                    f.seek(len(self._rows) * self.dim * 4)
+                    f.write(block.tobytes())
+                    f.truncate()
+                with open(self.keys_path, "ab") as f:
+                    f.write("".join(f"{k}\n" for k in new_keys).encode())
+                self.refresh()
+                logger.debug(f"Embedding store appended {len(new_keys)} rows ({len(self._rows)} total)")
+
+        return [self._rows[key] for key in keys]
+
+    def append(self, key: str, vector: Any) -> int:
+        """Append a single vector (no-op if key is stored) and return its row."""
+        return self.append_many([key], [vector])[0]
+
+    def scores(self, query: Any, rows: Sequence[int] | np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of a query vector against the given rows.
+
+        Args:
+            query: Query vector (normalized here)
+            rows: Row indices to score
+
+        Returns:
+            Similarities aligned with ``rows``
+        """
+        scores: np.ndarray = self.scores_many(np.asarray(query).reshape(1, -1), rows)[0]
+        return scores
+
+    def scores_many(self, queries: Any, rows: Sequence[int] | np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of several query vectors against the given rows.
+
+        Args:
+            queries: Query vectors, shape (num_queries, dim) (normalized here)
+            rows: Row indices to score
+
+        Returns:
+            Similarities, shape (num_queries, len(rows))
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        matrix = self.matrix
+        if len(rows) == 0 or len(matrix) == 0:
+            return np.zeros((len(queries), len(rows)), dtype=np.float32)
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = np.divide(queries, norms, out=np.zeros_like(queries), where=norms > 0)
+        # One matmul over the mapped rows; gather only when scoring a small subset
+        if 2 * len(rows) >= len(matrix):
+            return np.asarray(queries @ matrix.T)[:, rows]
+        return np.asarray(queries @ matrix[rows].T)
+
+    def close(self) -> None:
+        """Drop the memory mapping and in-memory index (files are kept)."""
+        with self._thread_lock:
+            self._reset_state()
@@ -0,0 +1,101 @@
+"""
+Inference Executor for ToolWeaver search engines
+
+Model loading and ``encode`` calls are CPU/GPU bound and block the event
+loop. Async search entry points hand that work to a dedicated thread pool
+whose size bounds how many encodes run at once, process-wide.
+
+Environment Variables:
+    TOOLWEAVER_INFERENCE_CONCURRENCY - Max concurrent inference calls (default: 1)
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_INFERENCE_CONCURRENCY = 1
+
+
+class InferenceExecutor:
+    """
+    Dedicated thread pool for blocking model inference.
+
+    The pool size is the concurrency limit: at most ``max_concurrency``
+    encodes run at once, across every event loop that shares the executor,
+    and extra calls queue without blocking their loops. Search engines only
+    hand model loading and ``encode`` to the pool; their caches and indexes
+    are updated on the calling thread.
+
+    Usage:
+        executor = InferenceExecutor(max_concurrency=2)
+        embeddings = await executor.run(model.encode, ["query"])
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_INFERENCE_CONCURRENCY):
+        """
+        Initialize executor (threads start lazily on first use).
+
+        Args:
+            max_concurrency: Max number of inference calls running at once
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="toolweaver-inference",
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the inference pool and await its result.
+
+        Args:
+            func: Blocking callable (e.g. a synchronous search or encode)
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads (a later run() starts a new pool)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_default_executor: InferenceExecutor | None = None
+_default_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Return the process-wide inference executor shared by all search engines."""
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            try:
+                concurrency = int(os.getenv("TOOLWEAVER_INFERENCE_CONCURRENCY", DEFAULT_INFERENCE_CONCURRENCY))
+            except ValueError:
+                logger.warning("Invalid TOOLWEAVER_INFERENCE_CONCURRENCY; using default")
+                concurrency = DEFAULT_INFERENCE_CONCURRENCY
+            _default_executor = InferenceExecutor(max_concurrency=concurrency)
+        return _default_executor
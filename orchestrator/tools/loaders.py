@@ -35,6 +35,7 @@ import yaml
 from pydantic import ValidationError
 
 from ..plugins.registry import get_registry, register_plugin
+from ..shared.change_feed import ChangeFeed, ChangeKind
 from ..shared.models import ToolDefinition, ToolParameter
 
 logger = logging.getLogger(__name__)
@@ -61,6 +62,8 @@ class _YAMLToolPlugin:
     def __init__(self) -> None:
         self._tools: dict[str, ToolDefinition] = {}
         self._workers: dict[str, Callable[..., Any]] = {}
+        # Add/remove/update events, relayed by the PluginRegistry
+        self.changes = ChangeFeed()
 
     def get_tools(self) -> list[dict[str, Any]]:
         """Return all loaded tools as dicts."""
@@ -84,10 +87,21 @@ class _YAMLToolPlugin:
 
     def add(self, tool_def: ToolDefinition, worker: Callable[..., Any]) -> None:
         """Add a tool and its worker function."""
+        kind: ChangeKind = "update" if tool_def.name in self._tools else "add"
         self._tools[tool_def.name] = tool_def
         self._workers[tool_def.name] = worker
+        self.changes.record(kind, tool_def.name, tool_def)
         logger.info(f"Registered YAML tool: {tool_def.name}")
 
+    def remove(self, name: str) -> bool:
+        """Remove a YAML-loaded tool; returns False if it was not loaded."""
+        if name not in self._tools:
+            return False
+        del self._tools[name]
+        del self._workers[name]
+        self.changes.record("remove", name)
+        return True
+
 
 _YAML_PLUGIN_NAME = "yaml_tools"
 
@@ -7,9 +7,25 @@ import aiohttp
 from aiohttp import TCPConnector
 
 from ..plugins.registry import register_plugin
+from ..shared.change_feed import ChangeFeed
 from ..shared.models import ToolDefinition
 
 
+def _publish_defs(
+    defs: dict[str, ToolDefinition], changes: ChangeFeed, discovered: dict[str, ToolDefinition]
+) -> None:
+    """Replace an adapter's tool definitions, recording what changed for the PluginRegistry."""
+    for name in [name for name in defs if name not in discovered]:
+        del defs[name]
+        changes.record("remove", name)
+    for name, td in discovered.items():
+        previous = defs.get(name)
+        if previous == td:
+            continue
+        defs[name] = td
+        changes.record("add" if previous is None else "update", name, td)
+
+
 class MCPHttpAdapterPlugin:
     """Plugin that discovers tools from a remote MCP-like HTTP server and executes them.
 
@@ -28,6 +44,8 @@ class MCPHttpAdapterPlugin:
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self._defs: dict[str, ToolDefinition] = {}
+        # Tools found by discover(), relayed by the PluginRegistry
+        self.changes = ChangeFeed()
         self.headers: dict[str, str] = headers or {}
         self.timeout_s = timeout_s
         self.verify_ssl = verify_ssl
@@ -57,14 +75,15 @@ class MCPHttpAdapterPlugin:
             async with session.get(f"{self.base_url}/tools", headers=self.headers) as resp:
                 resp.raise_for_status()
                 tools = await resp.json()
-                self._defs.clear()
+                discovered: dict[str, ToolDefinition] = {}
                 for t in tools:
                     try:
                         td = ToolDefinition.model_validate(t)
-                        self._defs[td.name] = td
+                        discovered[td.name] = td
                     except Exception:
                         # Skip invalid entries
                         continue
+                _publish_defs(self._defs, self.changes, discovered)
         return dict(self._defs)
 
     async def execute_stream(
@@ -180,6 +199,8 @@ class MCPWebSocketAdapterPlugin:
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self._defs: dict[str, ToolDefinition] = {}
+        # Tools found by discover(), relayed by the PluginRegistry
+        self.changes = ChangeFeed()
         self.headers: dict[str, str] = headers or {}
         self.timeout_s = timeout_s
         self.verify_ssl = verify_ssl
@@ -202,13 +223,14 @@ class MCPWebSocketAdapterPlugin:
                             break
                         if isinstance(payload, dict) and payload.get("result") is not None:
                             tools = payload["result"]
-                            self._defs.clear()
+                            discovered: dict[str, ToolDefinition] = {}
                             for t in tools or []:
                                 try:
                                     td = ToolDefinition.model_validate(t)
-                                    self._defs[td.name] = td
+                                    discovered[td.name] = td
                                 except Exception:
                                     continue
+                            _publish_defs(self._defs, self.changes, discovered)
                             break
                     elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
                         break
@@ -272,6 +294,8 @@ class MCPJsonRpcHttpAdapterPlugin:
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self._defs: dict[str, ToolDefinition] = {}
+        # Tools found by discover(), relayed by the PluginRegistry
+        self.changes = ChangeFeed()
         self.headers: dict[str, str] = {
             "Content-Type": "application/json",
             "Accept": "application/json, text/event-stream",
@@ -317,7 +341,7 @@ class MCPJsonRpcHttpAdapterPlugin:
                 result = data["result"]
                 tools_list = result.get("tools", [])
 
-                self._defs.clear()
+                discovered: dict[str, ToolDefinition] = {}
                 for tool_data in tools_list:
                     try:
                         # Convert MCP format to ToolDefinition
@@ -327,9 +351,10 @@ class MCPJsonRpcHttpAdapterPlugin:
                             description=tool_data.get("description", ""),
                             input_schema=tool_data.get("inputSchema", {"type": "object", "properties": {}}),
                         )
-                        self._defs[td.name] = td
+                        discovered[td.name] = td
                     except Exception:
                         continue
+                _publish_defs(self._defs, self.changes, discovered)
 
         return dict(self._defs)
 
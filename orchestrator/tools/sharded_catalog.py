@@ -6,14 +6,31 @@ search space by ~10x. Provides automatic domain detection and fallback to
 global search when domain-specific search yields insufficient results.
 """
 
+import asyncio
+import heapq
 import logging
-from typing import TypedDict
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypedDict
 
+import numpy as np
+
+from orchestrator.shared.change_feed import CatalogChange, CatalogDiff, ChangeCallback, ChangeFeed
 from orchestrator.shared.models import ToolCatalog, ToolDefinition
 
+from .domain_matcher import GENERAL_DOMAIN, DomainRegistry
+
+if TYPE_CHECKING:
+    from .tool_search import ToolSearchEngine
+
 logger = logging.getLogger(__name__)
 
-# Domain keywords for automatic detection
+# Default domain keywords for automatic detection (extend at runtime with
+# ShardedCatalog.register_domain / load_domains)
 class DomainConfig(TypedDict):
     keywords: list[str]
     tools: list[str]
@@ -47,6 +64,54 @@ DOMAIN_KEYWORDS: dict[str, DomainConfig] = {
 }
 
 
+class _MemoizedEncoder:
+    """
+    Embedding model shared by all shard engines, with a small query LRU.
+
+    A fan-out query is encoded once up front (``encode_query``); every shard
+    engine that then encodes the same query text gets the cached vector.
+    Other encodes (tool texts while a shard is indexed) pass through
+    uncached, so indexing a cold shard does not evict memoized queries.
+    """
+
+    def __init__(self, model: Any, max_entries: int = 256):
+        self.model = model
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode_query(self, query: str) -> Any:
+        """Encode a query and memoize its vector."""
+        with self._lock:
+            vector = self._cache.get(query)
+            if vector is not None:
+                self._cache.move_to_end(query)
+                return vector
+        vector = np.asarray(self.model.encode([query], convert_to_numpy=True, show_progress_bar=False))[0]
+        with self._lock:
+            self._cache[query] = vector
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return vector
+
+    def encode(self, sentences: Any, **kwargs: Any) -> Any:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        with self._lock:
+            cached = {t: self._cache[t] for t in texts if t in self._cache}
+            for text in cached:
+                self._cache.move_to_end(text)
+        misses = list(dict.fromkeys(t for t in texts if t not in cached))
+        if misses:
+            vectors = np.asarray(self.model.encode(misses, **kwargs))
+            cached.update(zip(misses, vectors, strict=True))
+        result = np.stack([cached[t] for t in texts]) if texts else np.zeros((0, 0), dtype=np.float32)
+        return result[0] if single else result
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.model.get_sentence_embedding_dimension())
+
+
 class ShardedCatalog:
     """
     Tool catalog organized by domain for optimized search.
@@ -56,6 +121,10 @@ class ShardedCatalog:
     - Automatic domain detection from query
     - Fallback to global search
     - Maintains global catalog for comprehensive search
+    - Per-shard BM25 + embedding indexes, built on a shard's first query
+    - Concurrent fan-out over candidate shards for ambiguous queries
+    - Runtime-registrable domains, matched in one pass over the query
+    - Change feed (generation counter, add/remove/update events by domain)
 
     Usage:
         catalog = ShardedCatalog()
@@ -69,21 +138,66 @@ class ShardedCatalog:
 
         # Global search (fallback, ~1000 tools)
         results = catalog.search_global("general task")
+
+        # Ranked search on per-shard indexes (fans out when ambiguous)
+        results = catalog.search("post the github release notes to slack", top_k=5)
     """
 
-    def __init__(self):
-        """Initialize empty sharded catalog"""
+    def __init__(
+        self,
+        domains: dict[str, DomainConfig] | None = None,
+        auto_register_domains: bool = False,
+        embedding_model: str = "all-MiniLM-L6-v2",
+        cache_dir: Path | None = None,
+        max_fanout: int = 3,
+        max_loaded_shards: int | None = None,
+        search_engine_factory: Callable[[str], "ToolSearchEngine"] | None = None,
+    ):
+        """
+        Initialize empty sharded catalog (no search index is built until queried).
+
+        Args:
+            domains: Domain keyword/tool-name config (default: DOMAIN_KEYWORDS)
+            auto_register_domains: Create a shard for unknown ``tool.domain``
+                values instead of filing those tools under general
+            embedding_model: Embedding model shared by all shard indexes
+            cache_dir: Cache directory for shard search engines
+            max_fanout: Max shards searched concurrently for an ambiguous query
+            max_loaded_shards: Keep at most this many shard indexes in memory
+                (least recently queried are dropped); None keeps all
+            search_engine_factory: Builds the search engine for a domain
+                (default: a ToolSearchEngine sharing one embedding model)
+        """
+        self.domains = DomainRegistry(DOMAIN_KEYWORDS if domains is None else domains)
+        self.auto_register_domains = auto_register_domains
         self.shards: dict[str, ToolCatalog] = {
-            domain: ToolCatalog() for domain in DOMAIN_KEYWORDS.keys()
+            domain: ToolCatalog() for domain in self.domains.domains()
         }
         self.global_catalog: ToolCatalog = ToolCatalog()
-        self._tool_count_by_domain: dict[str, int] = dict.fromkeys(DOMAIN_KEYWORDS.keys(), 0)
+        self._tool_count_by_domain: dict[str, int] = dict.fromkeys(self.domains.domains(), 0)
+        self._tool_domains: dict[str, str] = {}
+        self._changes = ChangeFeed()
+
+        self.embedding_model = embedding_model
+        self.cache_dir = cache_dir
+        self.max_fanout = max(1, max_fanout)
+        self.max_loaded_shards = max_loaded_shards
+        self.search_engine_factory = search_engine_factory or self._create_search_engine
+        # Lazily built per-shard search engines, most recently used last
+        self._shard_engines: OrderedDict[str, ToolSearchEngine] = OrderedDict()
+        self._engines_lock = threading.Lock()
+        self._encoder: _MemoizedEncoder | None = None
+        self._encoder_loaded = False
+        self._executor: ThreadPoolExecutor | None = None
         logger.info(f"Initialized ShardedCatalog with {len(self.shards)} domain shards")
 
     def add_tool(self, tool: ToolDefinition) -> str:
         """
         Add tool to appropriate domain shard and global catalog.
 
+        Re-adding a tool name replaces the previous definition, moving it to
+        another shard if its domain changed.
+
         Args:
             tool: Tool definition with optional domain field
 
@@ -99,18 +213,120 @@ class ShardedCatalog:
 
         # Add to domain shard
         if domain not in self.shards:
-            logger.warning(f"Unknown domain '{domain}', adding to 'general'")
-            domain = "general"
-
+            if self.auto_register_domains:
+                self.register_domain(domain)
+            else:
+                logger.warning(f"Unknown domain '{domain}', adding to 'general'")
+                domain = GENERAL_DOMAIN
+
+        previous = self._tool_domains.get(tool.name)
+        if previous is not None and previous != domain:
+            self.shards[previous].remove_tool(tool.name)
+            self._tool_count_by_domain[previous] -= 1
+        if previous != domain:
+            self._tool_count_by_domain[domain] += 1
         self.shards[domain].add_tool(tool)
-        self._tool_count_by_domain[domain] += 1
+        self._tool_domains[tool.name] = domain
 
         # Add to global catalog
         self.global_catalog.add_tool(tool)
+        self._changes.record("add" if previous is None else "update", tool.name, tool, domain)
 
         logger.debug(f"Added tool '{tool.name}' to domain '{domain}'")
         return domain
 
+    def remove_tool(self, name: str) -> str | None:
+        """
+        Remove a tool from its shard and the global catalog.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Domain the tool was in, or None if it was not in the catalog
+        """
+        domain = self._tool_domains.pop(name, None)
+        if domain is None:
+            return None
+        self.shards[domain].remove_tool(name)
+        self._tool_count_by_domain[domain] -= 1
+        self.global_catalog.remove_tool(name)
+        self._changes.record("remove", name, None, domain)
+        logger.debug(f"Removed tool '{name}' from domain '{domain}'")
+        return domain
+
+    @property
+    def generation(self) -> int:
+        """Generation of the latest add/remove/update across all shards."""
+        return self._changes.generation
+
+    def subscribe(self, callback: ChangeCallback, weak: bool = False) -> Callable[[], None]:
+        """
+        Call ``callback(change)`` on every tool change; ``change.source`` is the shard domain.
+
+        Returns:
+            Function that cancels the subscription
+        """
+        return self._changes.subscribe(callback, weak=weak)
+
+    def changes_since(self, generation: int) -> list[CatalogChange] | None:
+        """Tool changes after ``generation`` (None if no longer in the bounded history)."""
+        return self._changes.changes_since(generation)
+
+    def diff_since(self, generation: int) -> CatalogDiff | None:
+        """Net added/updated/removed tools after ``generation`` (None if history is gone)."""
+        return self._changes.diff_since(generation)
+
+    def register_domain(
+        self,
+        domain: str,
+        keywords: list[str] | None = None,
+        tools: list[str] | None = None,
+    ) -> None:
+        """
+        Add a domain (with its own shard) or extend an existing domain's keywords.
+
+        Args:
+            domain: Domain name
+            keywords: Query keywords for the domain (a new domain without
+                keywords is matched by its own name)
+            tools: Known tool names (substrings of tool names) for the domain
+        """
+        if keywords is None and domain not in self.domains:
+            keywords = [domain.replace("_", " ")]
+        self.domains.register(domain, keywords or [], tools or [])
+        if domain not in self.shards:
+            self.shards[domain] = ToolCatalog()
+            self._tool_count_by_domain[domain] = 0
+            logger.info(f"Registered domain '{domain}'")
+
+    def load_domains(self, path: str | Path) -> int:
+        """
+        Register domains from a YAML or JSON file.
+
+        The file maps domain names to ``{"keywords": [...], "tools": [...]}``.
+
+        Args:
+            path: Config file path
+
+        Returns:
+            Number of domains registered or extended
+        """
+        import json
+
+        import yaml
+
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Domain config must be a mapping of domain -> keywords/tools: {path}")
+        for domain, config in data.items():
+            config = config or {}
+            self.register_domain(str(domain), config.get("keywords"), config.get("tools"))
+        logger.info(f"Loaded {len(data)} domains from {path}")
+        return len(data)
+
     def get_shard(self, domain: str) -> ToolCatalog | None:
         """Get catalog for specific domain"""
         return self.shards.get(domain)
@@ -126,6 +342,18 @@ class ShardedCatalog:
             "total": len(self.global_catalog.tools)
         }
 
+    def domain_scores(self, query: str) -> dict[str, int]:
+        """
+        Keyword match counts per domain for a query (general excluded).
+
+        Args:
+            query: Search query text
+
+        Returns:
+            Domain -> number of its keywords found in the query
+        """
+        return self.domains.scores(query)
+
     def detect_domain(self, query: str) -> str | None:
         """
         Detect most likely domain from query using keyword matching.
@@ -136,17 +364,9 @@ class ShardedCatalog:
         Returns:
             Domain name or None if no clear match
         """
-        query_lower = query.lower()
-        domain_scores: dict[str, int] = dict.fromkeys(DOMAIN_KEYWORDS.keys(), 0)
-
-        # Score each domain based on keyword matches
-        for domain, config in DOMAIN_KEYWORDS.items():
-            if domain == "general":
-                continue  # Skip general (catch-all)
-
-            for keyword in config["keywords"]:
-                if keyword in query_lower:
-                    domain_scores[domain] += 1
+        domain_scores = self.domain_scores(query)
+        if not domain_scores:
+            return None
 
         # Get domain with highest score
         max_score = max(domain_scores.values())
@@ -169,23 +389,10 @@ class ShardedCatalog:
         Returns:
             Detected domain name (defaults to 'general')
         """
-        tool_name_lower = tool.name.lower()
-
-        # Check tool name against known tool patterns first
-        for domain, config in DOMAIN_KEYWORDS.items():
-            if domain == "general":
-                continue
-            for known_tool in config["tools"]:
-                if known_tool.lower() in tool_name_lower:
-                    return domain
-
-        # Check tool name for domain keywords
-        for domain, config in DOMAIN_KEYWORDS.items():
-            if domain == "general":
-                continue
-            for keyword in config["keywords"]:
-                if keyword in tool_name_lower:
-                    return domain
+        # Known tool name patterns first, then domain keywords in the name
+        detected = self.domains.classify_name(tool.name)
+        if detected:
+            return detected
 
         # Check description for domain keywords
         if tool.description:
@@ -260,6 +467,221 @@ class ShardedCatalog:
         logger.info("No domain detected, using global search")
         return (self.global_catalog, "global")
 
+    def candidate_shards(self, query: str) -> list[str]:
+        """
+        Shards to search for a query, best match first.
+
+        One matching domain is searched alone; several matching domains
+        (an ambiguous query) give the top ``max_fanout`` by keyword score;
+        no match gives every non-empty shard (global search).
+
+        Args:
+            query: Search query text
+
+        Returns:
+            Domain names of non-empty shards
+        """
+        scores = self.domain_scores(query)
+        matched = sorted(
+            (d for d, score in scores.items() if score > 0 and self.shards[d].tools),
+            key=lambda d: -scores[d],
+        )
+        if matched:
+            return matched[: self.max_fanout]
+        return [domain for domain, shard in self.shards.items() if shard.tools]
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        min_score: float = 0.3,
+        min_results: int = 1,
+    ) -> list[tuple[ToolDefinition, float]]:
+        """
+        Ranked search over the candidate shards' own indexes.
+
+        Candidate shards are searched concurrently and their results merged
+        with a heap. Every shard normalizes BM25 by the best raw BM25 score
+        across the searched shards, so hybrid scores from different shards
+        are on one scale. If the candidates yield fewer than
+        ``min_results`` tools, all shards are searched.
+
+        Args:
+            query: Search query
+            top_k: Number of results
+            min_score: Minimum relevance score (0-1)
+            min_results: Minimum results before widening to all shards
+
+        Returns:
+            List of (ToolDefinition, score) tuples, sorted by relevance
+        """
+        candidates = self.candidate_shards(query)
+        if not candidates:
+            return []
+        self._prepare_query(query)
+
+        results = self._merge(self._fan_out(query, candidates, top_k, min_score), top_k)
+        if len(results) < min_results:
+            remaining = [d for d, shard in self.shards.items() if shard.tools and d not in candidates]
+            if remaining:
+                logger.info(f"Only {len(results)} results from {candidates}; searching {len(remaining)} more shards")
+                # Re-search the candidates too: the wider set may raise the BM25 normalizer
+                results = self._merge(self._fan_out(query, candidates + remaining, top_k, min_score), top_k)
+        return results
+
+    async def search_async(
+        self,
+        query: str,
+        top_k: int = 5,
+        min_score: float = 0.3,
+        min_results: int = 1,
+    ) -> list[tuple[ToolDefinition, float]]:
+        """
+        Non-blocking ``search``: candidate shards run as concurrent
+        ``search_async`` calls on the engines' inference executor.
+
+        Creating cold shard engines (which may load the embedding model),
+        encoding the query and the shared BM25 pass (which indexes cold
+        shards) run on the fan-out executor, off the event loop.
+        """
+        candidates = self.candidate_shards(query)
+        if not candidates:
+            return []
+        loop = asyncio.get_running_loop()
+
+        def prepare(domains: list[str]) -> tuple[list["ToolSearchEngine"], float | None]:
+            engines = [self.get_shard_engine(d) for d in domains]
+            self._prepare_query(query)
+            return engines, self._bm25_max(query, domains)
+
+        async def search_shards(domains: list[str]) -> list[list[tuple[ToolDefinition, float]]]:
+            engines, bm25_max = await loop.run_in_executor(self._get_executor(), prepare, domains)
+            return list(await asyncio.gather(*(
+                engine.search_async(query, self.shards[d], top_k, min_score, bm25_max=bm25_max)
+                for engine, d in zip(engines, domains, strict=True)
+            )))
+
+        results = self._merge(await search_shards(candidates), top_k)
+        if len(results) < min_results:
+            remaining = [d for d, shard in self.shards.items() if shard.tools and d not in candidates]
+            if remaining:
+                results = self._merge(await search_shards(candidates + remaining), top_k)
+        return results
+
+    def _fan_out(
+        self, query: str, domains: list[str], top_k: int, min_score: float
+    ) -> list[list[tuple[ToolDefinition, float]]]:
+        if len(domains) == 1:
+            return [self.get_shard_engine(domains[0]).search(query, self.shards[domains[0]], top_k, min_score)]
+
+        def shard_bm25_max(domain: str) -> float:
+            return self.get_shard_engine(domain).bm25_max(query, self.shards[domain])
+
+        logger.info(f"Fan-out search over {len(domains)} shards: {domains}")
+        bm25_max = max(self._get_executor().map(shard_bm25_max, domains))
+
+        def search_shard(domain: str) -> list[tuple[ToolDefinition, float]]:
+            return self.get_shard_engine(domain).search(
+                query, self.shards[domain], top_k, min_score, bm25_max=bm25_max
+            )
+
+        return list(self._get_executor().map(search_shard, domains))
+
+    def _bm25_max(self, query: str, domains: list[str]) -> float | None:
+        """Shared BM25 normalizer for a multi-shard search (None for a single shard)."""
+        if len(domains) == 1:
+            return None
+        return max(self.get_shard_engine(d).bm25_max(query, self.shards[d]) for d in domains)
+
+    @staticmethod
+    def _merge(
+        shard_results: list[list[tuple[ToolDefinition, float]]], top_k: int
+    ) -> list[tuple[ToolDefinition, float]]:
+        """Top ``top_k`` across shards (one entry per tool name; scores share one BM25 scale)."""
+        best: dict[str, tuple[ToolDefinition, float]] = {}
+        for tool, score in chain.from_iterable(shard_results):
+            if tool.name not in best or score > best[tool.name][1]:
+                best[tool.name] = (tool, score)
+        return heapq.nlargest(top_k, best.values(), key=lambda item: item[1])
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._engines_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_fanout, thread_name_prefix="toolweaver-shard"
+                )
+            return self._executor
+
+    def _prepare_query(self, query: str) -> None:
+        """Encode the query once so every shard engine reuses the vector."""
+        encoder = self._get_encoder()
+        if encoder is not None:
+            try:
+                encoder.encode_query(query)
+            except Exception as e:
+                logger.debug(f"Query pre-encoding failed: {e}")
+
+    def _get_encoder(self) -> _MemoizedEncoder | None:
+        with self._engines_lock:
+            if not self._encoder_loaded:
+                from .embedding_server import load_embedding_model
+
+                model = load_embedding_model(self.embedding_model)
+                self._encoder = _MemoizedEncoder(model) if model is not None else None
+                self._encoder_loaded = True
+            return self._encoder
+
+    def _create_search_engine(self, domain: str) -> "ToolSearchEngine":
+        from .tool_search import ToolSearchEngine
+
+        engine = ToolSearchEngine(
+            embedding_model=self.embedding_model,
+            cache_dir=self.cache_dir,
+            disk_cache=False,
+            small_catalog_threshold=0,  # always score: unscored 1.0 results would outrank every other shard
+        )
+        encoder = self._get_encoder()
+        if encoder is not None:
+            engine.embedding_model = encoder
+        return engine
+
+    def get_shard_engine(self, domain: str) -> "ToolSearchEngine":
+        """
+        Search engine (BM25 + embedding index) for a shard, created on first use.
+
+        Args:
+            domain: Shard domain
+
+        Returns:
+            The shard's search engine
+        """
+        with self._engines_lock:
+            engine = self._shard_engines.get(domain)
+            if engine is not None:
+                self._shard_engines.move_to_end(domain)
+                return engine
+
+        engine = self.search_engine_factory(domain)
+        with self._engines_lock:
+            engine = self._shard_engines.setdefault(domain, engine)
+            self._shard_engines.move_to_end(domain)
+            if self.max_loaded_shards is not None:
+                while len(self._shard_engines) > self.max_loaded_shards:
+                    evicted, _ = self._shard_engines.popitem(last=False)
+                    logger.info(f"Unloaded search index for shard '{evicted}'")
+        logger.info(f"Loaded search index for shard '{domain}' ({len(self.shards[domain].tools)} tools)")
+        return engine
+
+    def loaded_shards(self) -> list[str]:
+        """Domains whose search index is currently in memory."""
+        with self._engines_lock:
+            return list(self._shard_engines)
+
+    def unload_shard(self, domain: str) -> bool:
+        """Drop a shard's search index (rebuilt on its next query)."""
+        with self._engines_lock:
+            return self._shard_engines.pop(domain, None) is not None
+
     def __repr__(self) -> str:
         stats = self.get_stats()
         return f"ShardedCatalog(domains={len(self.shards)}, tools={stats})"
@@ -5,6 +5,7 @@ from collections.abc import Callable
 from typing import Any, Literal
 
 from ..plugins.registry import get_registry, register_plugin
+from ..shared.change_feed import ChangeFeed, ChangeKind
 from ..shared.models import ToolDefinition, ToolParameter
 
 logger = logging.getLogger(__name__)
@@ -188,6 +189,8 @@ class _TemplatePlugin:
     def __init__(self) -> None:
         self._templates: dict[str, BaseTemplate] = {}
         self._defs: dict[str, ToolDefinition] = {}
+        # Add/remove/update events, relayed by the PluginRegistry
+        self.changes = ChangeFeed()
 
     def get_tools(self) -> list[dict[str, Any]]:
         # Serialize ToolDefinition to dict, including nested models
@@ -201,8 +204,18 @@ class _TemplatePlugin:
 
     def add(self, tmpl: BaseTemplate) -> None:
         td = tmpl.build_definition()
+        kind: ChangeKind = "update" if tmpl.name in self._templates else "add"
         self._templates[tmpl.name] = tmpl
         self._defs[tmpl.name] = td
+        self.changes.record(kind, tmpl.name, td)
+
+    def remove(self, name: str) -> bool:
+        if name not in self._templates:
+            return False
+        del self._templates[name]
+        del self._defs[name]
+        self.changes.record("remove", name)
+        return True
 
 
 _TPL_PLUGIN_NAME = "templates"
@@ -21,7 +21,9 @@ from typing import Any
 import aiohttp
 from pydantic import BaseModel
 
+from ..shared.columnar_catalog import ColumnarToolCatalog
 from ..shared.models import ToolCatalog, ToolDefinition, ToolParameter
+from .catalog_snapshot import CatalogSnapshot, write_snapshot
 
 
 class DiscoveryMetrics(BaseModel):
@@ -366,23 +368,42 @@ class ToolDiscoveryOrchestrator:
     This is the main entry point for tool discovery in the system.
     """
 
-    def __init__(self, cache_dir: Path | None = None, cache_ttl_hours: int = 24):
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        cache_ttl_hours: int = 24,
+        search_engine: Any | None = None,
+        cache_search_state: bool = False,
+    ):
         """
         Args:
             cache_dir: Directory to cache discovered tools.
                       Defaults to ~/.toolweaver/
+            cache_ttl_hours: Cache time-to-live in hours
+            search_engine: Optional ToolSearchEngine that search artifacts
+                      (BM25 postings, embedding rows) found in the cache
+                      snapshot are restored into
+            cache_search_state: Also store search_engine's artifacts when
+                      saving the cache. This warms the engine, encoding every
+                      tool during discovery, so it is off by default
         """
         self.discoverers: list[ToolDiscoveryService] = []
         self.cache_dir = cache_dir or Path.home() / ".toolweaver"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_file = self.cache_dir / "discovered_tools.json"
+        # Binary snapshot (see catalog_snapshot); the JSON file is read only as a fallback
+        self.cache_file = self.cache_dir / "discovered_tools.snapshot"
+        self.legacy_cache_file = self.cache_dir / "discovered_tools.json"
         self.cache_ttl_hours = cache_ttl_hours
+        self.search_engine = search_engine
+        self.cache_search_state = cache_search_state
 
     def register_discoverer(self, discoverer: ToolDiscoveryService) -> None:
         """Register a discovery service"""
         self.discoverers.append(discoverer)
 
-    async def discover_all(self, use_cache: bool = True, cache_ttl_hours: int | None = None) -> ToolCatalog:
+    async def discover_all(
+        self, use_cache: bool = True, cache_ttl_hours: int | None = None
+    ) -> ToolCatalog | ColumnarToolCatalog:
         """
         Run all registered discoverers and build a unified ToolCatalog.
 
@@ -391,11 +412,12 @@ class ToolDiscoveryOrchestrator:
             cache_ttl_hours: Cache time-to-live in hours
 
         Returns:
-            ToolCatalog with all discovered tools
+            ToolCatalog with all discovered tools; a cache hit returns a
+            ColumnarToolCatalog over the snapshot that validates tools on access
         """
         # Try to load from cache
         ttl = cache_ttl_hours if cache_ttl_hours is not None else self.cache_ttl_hours
-        if use_cache and self.cache_file.exists():
+        if use_cache and (self.cache_file.exists() or self.legacy_cache_file.exists()):
             cached_catalog = self._load_cache()
             if cached_catalog and self._is_cache_valid(cached_catalog, ttl):
                 print(f"Using cached tools: {len(cached_catalog.tools)} tools from cache")
@@ -458,10 +480,27 @@ class ToolDiscoveryOrchestrator:
 
         return catalog
 
-    def _load_cache(self) -> ToolCatalog | None:
-        """Load cached tool catalog"""
+    def _load_cache(self) -> ToolCatalog | ColumnarToolCatalog | None:
+        """Load cached tool catalog (and search artifacts, if a search engine is set)"""
+        if not self.cache_file.exists():
+            return self._load_legacy_cache()
+        try:
+            # Left open: the lazy catalog reads from the mapping, which is
+            # released once the catalog is garbage collected
+            snapshot = CatalogSnapshot.open(self.cache_file)
+            catalog = snapshot.lazy_catalog()
+            search_state = snapshot.search_state()
+            if self.search_engine is not None and search_state is not None:
+                self.search_engine.restore_search_state(catalog, search_state)
+            return catalog
+        except Exception as e:
+            print(f"Failed to load cache: {e}")
+            return None
+
+    def _load_legacy_cache(self) -> ToolCatalog | None:
+        """Load a JSON cache written by older versions"""
         try:
-            with open(self.cache_file) as f:
+            with open(self.legacy_cache_file) as f:
                 data = json.load(f)
             return ToolCatalog(**data)
         except Exception as e:
@@ -469,25 +508,27 @@ class ToolDiscoveryOrchestrator:
             return None
 
     def _save_cache(self, catalog: ToolCatalog) -> None:
-        """Save tool catalog to cache"""
+        """Save tool catalog (and search artifacts, if cache_search_state is set) to cache"""
         try:
-            with open(self.cache_file, 'w') as f:
-                # Use model_dump() to convert to dict
-                json.dump(catalog.model_dump(), f, indent=2, default=str)
+            search_state = None
+            if self.search_engine is not None and self.cache_search_state:
+                search_state = self.search_engine.export_search_state(catalog)
+            write_snapshot(self.cache_file, catalog, search_state=search_state)
             print(f"Cached {len(catalog.tools)} tools to {self.cache_file}")
         except Exception as e:
             print(f"Failed to save cache: {e}")
 
-    def _is_cache_valid(self, catalog: ToolCatalog, ttl_hours: int) -> bool:
+    def _is_cache_valid(self, catalog: ToolCatalog | ColumnarToolCatalog, ttl_hours: int) -> bool:
         """Check if cached catalog is still valid"""
         age = datetime.now(timezone.utc) - catalog.discovered_at
         return age.total_seconds() < (ttl_hours * 3600)
 
     def invalidate_cache(self):
-        """Delete the cache file to force re-discovery"""
-        if self.cache_file.exists():
-            self.cache_file.unlink()
-            print(f"Cache invalidated: {self.cache_file}")
+        """Delete the cache files to force re-discovery"""
+        for cache_file in (self.cache_file, self.legacy_cache_file):
+            if cache_file.exists():
+                cache_file.unlink()
+                print(f"Cache invalidated: {cache_file}")
 
 
 # Convenience function for quick discovery
@@ -498,7 +539,7 @@ async def discover_tools(
     use_cache: bool = True,
     a2a_client: Any = None,
     registry_url: str | None = None,
-) -> ToolCatalog:
+) -> ToolCatalog | ColumnarToolCatalog:
     """
     Convenience function to discover tools from common sources.
 
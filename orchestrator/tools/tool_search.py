@@ -10,37 +10,109 @@ Phase 3 Implementation
 """
 
 import hashlib
+import json
 import logging
 import pickle
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Sequence
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, cast
-
-if TYPE_CHECKING:
-    from sentence_transformers import SentenceTransformer
-else:
-    SentenceTransformer = None
+from typing import Any, NamedTuple, cast
 
 import numpy as np
 
-try:
-    from sentence_transformers import SentenceTransformer  # noqa: F811
-    SENTENCE_AVAILABLE = True
-except Exception:  # ImportError or runtime env issues
-    SentenceTransformer = None  # type: ignore[assignment,misc]
-    SENTENCE_AVAILABLE = False
-
-try:
-    from rank_bm25 import BM25Okapi
-    BM25_AVAILABLE = True
-except Exception:
-    BM25_AVAILABLE = False
-
+from ..shared.columnar_catalog import ColumnarToolCatalog
 from ..shared.models import ToolCatalog, ToolDefinition
+from .bm25_index import BM25Index
+from .embedding_server import load_embedding_model
+from .embedding_store import EmbeddingStore
+from .inference import InferenceExecutor, get_inference_executor
 
 logger = logging.getLogger(__name__)
 
 
+class _CatalogView:
+    """
+    Search-ready snapshot of one catalog state.
+
+    Built once per catalog state and reused across queries: tool order,
+    content fingerprint, the catalog's own BM25 index and slots, embedding
+    store rows and per-domain /
+    per-type position arrays, so filtered searches index straight into the
+    matching rows without iterating the catalog.
+
+    A view is valid while its catalog's ``generation`` is unchanged. Views
+    of a ``ColumnarToolCatalog`` take tool domains/types from its columns;
+    their tools are validated only when a search touches them.
+    """
+
+    def __init__(
+        self,
+        catalog: ToolCatalog | ColumnarToolCatalog,
+        generation: int,
+        tools: Sequence[ToolDefinition],
+        fingerprint: str,
+        tool_domains: list[str] | None = None,
+        tool_types: list[str] | None = None,
+        bm25_index: BM25Index | None = None,
+    ):
+        # Holding the catalog keeps its id (the view cache key) stable
+        self.catalog = catalog
+        self.tools = tools
+        self.fingerprint = fingerprint
+        self.generation = generation
+        self.bm25_index = bm25_index or BM25Index()
+        self.bm25_slots: np.ndarray[Any, np.dtype[np.intp]] | None = None
+        self.bm25_version = -1
+        self.embedding_rows: np.ndarray[Any, np.dtype[np.intp]] | None = None
+
+        if tool_domains is None or tool_types is None:
+            tool_domains = [tool.domain for tool in tools]
+            tool_types = [tool.type for tool in tools]
+        domains: dict[str, list[int]] = {}
+        types: dict[str, list[int]] = {}
+        for i, (domain, tool_type) in enumerate(zip(tool_domains, tool_types, strict=True)):
+            domains.setdefault(domain, []).append(i)
+            types.setdefault(tool_type, []).append(i)
+        self.all_positions = np.arange(len(tools), dtype=np.intp)
+        self.domain_positions = {k: np.array(v, dtype=np.intp) for k, v in domains.items()}
+        self.type_positions = {k: np.array(v, dtype=np.intp) for k, v in types.items()}
+        self._filtered: dict[tuple[str | None, str | None], np.ndarray[Any, np.dtype[np.intp]]] = {}
+
+    def positions(
+        self,
+        domain: str | None = None,
+        type_filter: str | None = None,
+    ) -> np.ndarray[Any, np.dtype[np.intp]]:
+        """Sorted positions (into ``tools``) matching the domain/type filters."""
+        key = (domain, type_filter)
+        cached = self._filtered.get(key)
+        if cached is not None:
+            return cached
+
+        empty = np.zeros(0, dtype=np.intp)
+        result = self.all_positions
+        if domain is not None:
+            result = self.domain_positions.get(domain, empty)
+        if type_filter is not None:
+            type_positions = self.type_positions.get(type_filter, empty)
+            result = type_positions if domain is None else np.intersect1d(
+                result, type_positions, assume_unique=True
+            )
+        self._filtered[key] = result
+        return result
+
+
+class _PreparedSearch(NamedTuple):
+    """A filtered, cache-missed search waiting to be scored."""
+    view: _CatalogView
+    positions: np.ndarray[Any, np.dtype[np.intp]]
+    mode: str
+    cache_key: str
+    bm25_max: float | None
+
+
 class ToolSearchEngine:
     """
     Hybrid search engine for tool discovery.
@@ -51,9 +123,11 @@ class ToolSearchEngine:
 
     Features:
     - Smart routing: Skip search for small catalogs (<20 tools)
-    - Embedding caching: Avoid recomputation
-    - Query caching: Fast repeated searches
+    - Incremental BM25 index: Built once, updated per added/removed tool
+    - Embedding caching: One memory-mapped matrix shared across processes
+    - Query caching: In-memory LRU keyed on catalog content, optional disk layer
     - Configurable weights for hybrid scoring
+    - Two-stage mode: BM25 candidates, hybrid rerank (see recall_report)
     """
 
     def __init__(
@@ -61,7 +135,15 @@ class ToolSearchEngine:
         embedding_model: str = "all-MiniLM-L6-v2",  # Fast, 384-dim, 80MB
         bm25_weight: float = 0.3,
         embedding_weight: float = 0.7,
-        cache_dir: Path | None = None
+        cache_dir: Path | None = None,
+        encode_batch_size: int = 64,
+        query_cache_size: int = 1024,
+        query_cache_ttl_s: float = 3600,
+        disk_cache: bool = True,
+        search_mode: str = "exhaustive",
+        candidate_k: int = 200,
+        inference_executor: InferenceExecutor | None = None,
+        small_catalog_threshold: int = 20,
     ):
         """
         Initialize search engine.
@@ -71,16 +153,50 @@ class ToolSearchEngine:
             bm25_weight: Weight for BM25 keyword scores (0-1)
             embedding_weight: Weight for embedding scores (0-1)
             cache_dir: Directory for caching embeddings and results
+            encode_batch_size: Number of uncached tool texts encoded per model call
+            query_cache_size: Max entries in the in-memory query result LRU
+            query_cache_ttl_s: Time-to-live for cached query results (seconds)
+            disk_cache: Also persist query results under cache_dir (second layer)
+            search_mode: Default mode, "exhaustive" or "two_stage" (retrieve then rerank)
+            candidate_k: Candidate set size for two-stage search
+            inference_executor: Executor for search_async (defaults to the shared one)
+            small_catalog_threshold: Return filtered tools unscored (score 1.0) when at
+                most this many remain; 0 always scores
         """
         self.embedding_model_name = embedding_model
         self.embedding_model: Any | None = None  # Lazy load
+        self._model_lock = threading.Lock()
         self.bm25_weight = bm25_weight
         self.embedding_weight = embedding_weight
+        self.encode_batch_size = max(1, encode_batch_size)
+        self.search_mode = search_mode
+        self.candidate_k = max(1, candidate_k)
+        self.inference_executor = inference_executor or get_inference_executor()
+        self.small_catalog_threshold = small_catalog_threshold
+
+        # Keyword index of the most recently searched catalog (each view owns one)
+        self._bm25_index = BM25Index()
 
         # Set up cache directory
         self.cache_dir = cache_dir or Path.home() / ".toolweaver" / "search_cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Consolidated embedding matrix (one store per model) + per-tool row lookup
+        self.embedding_store = EmbeddingStore(
+            self.cache_dir, name=f"embeddings_{embedding_model.replace('/', '_')}"
+        )
+        self._tool_rows: dict[str, tuple[ToolDefinition, int]] = {}
+
+        # Query result cache keyed by query + catalog content fingerprint
+        self.query_cache_size = query_cache_size
+        self.query_cache_ttl_s = query_cache_ttl_s
+        self.disk_cache = disk_cache
+        self._query_cache: OrderedDict[str, tuple[float, list[tuple[ToolDefinition, float]]]] = OrderedDict()
+        self._tool_fingerprints: dict[str, tuple[ToolDefinition, str]] = {}
+
+        # Per-catalog search views (fingerprint, index rows, filter positions)
+        self._catalog_views: dict[int, _CatalogView] = {}
+
         logger.info(
             f"ToolSearchEngine initialized (BM25: {bm25_weight:.1f}, "
             f"Embedding: {embedding_weight:.1f})"
@@ -88,25 +204,31 @@ class ToolSearchEngine:
 
     def _init_embedding_model(self) -> None:
         """Lazy initialization of embedding model if available."""
-        if self.embedding_model is None:
-            if not SENTENCE_AVAILABLE:
-                logger.warning("SentenceTransformer not installed; embedding search disabled.")
-                return
-            logger.info(f"Loading embedding model: {self.embedding_model_name}")
-            self.embedding_model = SentenceTransformer(self.embedding_model_name)
-            logger.info(
-                f"Embedding model loaded (dim={self.embedding_model.get_sentence_embedding_dimension()})"
-            )
+        if self.embedding_model is not None:
+            return
+        # search_async may load from several inference threads at once
+        with self._model_lock:
+            if self.embedding_model is None:
+                # Shared embedding server if running, else an in-process model
+                self.embedding_model = load_embedding_model(self.embedding_model_name)
+                if self.embedding_model is None:
+                    logger.warning("SentenceTransformer not installed; embedding search disabled.")
+                    return
+                logger.info(
+                    f"Embedding model loaded (dim={self.embedding_model.get_sentence_embedding_dimension()})"
+                )
 
     def search(
         self,
         query: str,
-        catalog: ToolCatalog,
+        catalog: ToolCatalog | ColumnarToolCatalog,
         top_k: int = 5,
         min_score: float = 0.3,
         *,
         domain: str | None = None,
         type_filter: str | None = None,
+        mode: str | None = None,
+        bm25_max: float | None = None,
     ) -> list[tuple[ToolDefinition, float]]:
         """
         Search for relevant tools using hybrid approach.
@@ -116,6 +238,13 @@ class ToolSearchEngine:
             catalog: Tool catalog to search
             top_k: Number of tools to return
             min_score: Minimum relevance score (0-1)
+            domain: Optional domain filter
+            type_filter: Optional tool type filter
+            mode: "exhaustive" (score every tool) or "two_stage" (BM25
+                candidates, then hybrid rerank); defaults to ``search_mode``
+            bm25_max: Normalize BM25 by this raw score instead of the best
+                match in ``catalog`` (see ``bm25_max()``; for merging the
+                results of several engines)
 
         Returns:
             List of (ToolDefinition, score) tuples, sorted by relevance
@@ -129,190 +258,792 @@ class ToolSearchEngine:
             for tool, score in results:
                 print(f"{tool.name}: {score:.2f}")
         """
-        tools = [
-            t for t in catalog.tools.values()
-            if (domain is None or t.domain == domain)
-            and (type_filter is None or t.type == type_filter)
-        ]
+        prepared = self._prepare_search(query, catalog, top_k, min_score, domain, type_filter, mode, bm25_max)
+        if not isinstance(prepared, _PreparedSearch):
+            return prepared
+        return self._run_search(query, prepared, top_k, min_score)
 
-        if len(tools) == 0:
+    async def search_async(
+        self,
+        query: str,
+        catalog: ToolCatalog | ColumnarToolCatalog,
+        top_k: int = 5,
+        min_score: float = 0.3,
+        *,
+        domain: str | None = None,
+        type_filter: str | None = None,
+        mode: str | None = None,
+        bm25_max: float | None = None,
+    ) -> list[tuple[ToolDefinition, float]]:
+        """
+        Non-blocking search for use from async code.
+
+        Only model loading and ``encode`` run on the inference executor;
+        filtering, the query cache, BM25 and scoring stay on the calling
+        thread. Cache hits never wait behind other queries' encodes, and
+        engine state is never touched from the executor's threads.
+
+        Example:
+            results = await search_engine.search_async("Send a Slack message", catalog)
+        """
+        prepared = self._prepare_search(query, catalog, top_k, min_score, domain, type_filter, mode, bm25_max)
+        if not isinstance(prepared, _PreparedSearch):
+            return prepared
+        query_embeddings = await self._encode_off_loop(prepared.view, [query])
+        return self._run_search(query, prepared, top_k, min_score, query_embeddings)
+
+    def _prepare_search(
+        self,
+        query: str,
+        catalog: ToolCatalog | ColumnarToolCatalog,
+        top_k: int,
+        min_score: float,
+        domain: str | None,
+        type_filter: str | None,
+        mode: str | None,
+        bm25_max: float | None = None,
+    ) -> list[tuple[ToolDefinition, float]] | _PreparedSearch:
+        """Filter the catalog and check the query cache; returns results if no scoring is needed."""
+        view = self._get_catalog_view(catalog)
+        positions = view.positions(domain, type_filter)
+
+        if len(positions) == 0:
             logger.warning("No tools available after filtering")
             return []
 
         # Smart routing: Skip search if tool count is small
-        if len(tools) <= 20:
-            logger.info(f"Tool count ({len(tools)}) ≤ 20, returning filtered tools")
-            return [(tool, 1.0) for tool in tools[:top_k]]
+        if len(positions) <= self.small_catalog_threshold:
+            logger.info(f"Tool count ({len(positions)}) ≤ {self.small_catalog_threshold}, returning filtered tools")
+            return [(view.tools[i], 1.0) for i in positions[:top_k]]
+
+        mode = mode or self.search_mode
+        if mode not in ("exhaustive", "two_stage"):
+            raise ValueError(f"Unknown search mode: {mode!r}")
 
         # Check cache for this query + tool catalog hash
-        cache_key = self._get_cache_key(query, catalog, domain=domain, type_filter=type_filter)
+        cache_key = self._get_cache_key(
+            query, catalog, domain=domain, type_filter=type_filter, top_k=top_k, min_score=min_score,
+            catalog_hash=view.fingerprint,
+            mode=mode if mode == "exhaustive" else f"{mode}:{self.candidate_k}",
+            bm25_max=bm25_max,
+        )
         cached_results = self._load_from_cache(cache_key)
-        if cached_results:
-            logger.info(f"Cache hit for query: '{query[:50]}...'")
-            return cached_results[:top_k]
-
-        # Perform hybrid search
-        start_time = time.time()
+        if cached_results is not None:
+            logger.debug(f"Cache hit for query: '{query[:50]}...'")
+            return list(cached_results)
 
-        bm25_scores = self._bm25_search(query, tools)
-        embedding_scores = self._embedding_search(query, tools)
+        return _PreparedSearch(view, positions, mode, cache_key, bm25_max)
 
-        # Combine scores with weighted average
-        combined_scores = []
-        for i, tool in enumerate(tools):
-            combined_score = (
-                self.bm25_weight * bm25_scores[i] +
-                self.embedding_weight * embedding_scores[i]
-            )
-            if combined_score >= min_score:
-                combined_scores.append((tool, combined_score))
+    def _run_search(
+        self,
+        query: str,
+        prepared: _PreparedSearch,
+        top_k: int,
+        min_score: float,
+        query_embeddings: np.ndarray[Any, np.dtype[np.floating[Any]]] | None = None,
+    ) -> list[tuple[ToolDefinition, float]]:
+        """Score a prepared search, then cache and log its results."""
+        start_time = time.time()
 
-        # Sort by score descending
-        combined_scores.sort(key=lambda x: x[1], reverse=True)
-        results = combined_scores[:top_k]
+        results = self._score_and_select(
+            query, prepared.view, prepared.positions, top_k, min_score, prepared.mode, query_embeddings,
+            prepared.bm25_max,
+        )
 
         search_duration_ms = (time.time() - start_time) * 1000
 
         # Cache results
-        self._save_to_cache(cache_key, results)
+        self._save_to_cache(prepared.cache_key, results)
 
         logger.info(
-            f"Search '{query[:40]}...' found {len(results)}/{len(tools)} tools "
+            f"Search '{query[:40]}...' found {len(results)}/{len(prepared.positions)} tools "
             f"in {search_duration_ms:.0f}ms (top scores: {[f'{s:.2f}' for _, s in results[:3]]})"
         )
 
         return results
 
-    def _bm25_search(self, query: str, tools: list[ToolDefinition]) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+    async def _encode_off_loop(
+        self, view: _CatalogView, queries: list[str]
+    ) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
         """
-        BM25 keyword-based search (good for exact matches).
+        Encode queries (and, on a cold view, uncached tool texts) on the inference executor.
 
-        Tokenizes tool descriptions and uses TF-IDF-like scoring
-        to find tools matching query keywords.
+        The embedding store and per-tool rows are updated on the calling
+        thread once the encodes return.
         """
-        # Build corpus from tool descriptions
-        corpus = []
-        for tool in tools:
-            # Combine name, description, and parameter descriptions
-            param_text = " ".join(p.description for p in tool.parameters)
-            tool_text = f"{tool.name} {tool.description} {param_text}"
-            corpus.append(tool_text)
+        query_embeddings = await self.inference_executor.run(self._query_embeddings, queries)
+        if query_embeddings.shape[1] and view.embedding_rows is None:
+            rows, misses = self._lookup_embedding_rows(view.tools)
+            if misses:
+                texts = [text for text, _ in misses.values()]
+                embeddings = await self.inference_executor.run(self._encode_texts, texts)
+                self._store_embeddings(view.tools, rows, misses, embeddings)
+            view.embedding_rows = rows
+        return query_embeddings
+
+    def _score_and_select(
+        self,
+        query: str,
+        view: _CatalogView,
+        positions: np.ndarray[Any, np.dtype[np.intp]],
+        top_k: int,
+        min_score: float,
+        mode: str,
+        query_embeddings: np.ndarray[Any, np.dtype[np.floating[Any]]] | None = None,
+        bm25_max: float | None = None,
+    ) -> list[tuple[ToolDefinition, float]]:
+        """Score one query in the given mode and pick its top_k tools."""
+        if mode == "two_stage":
+            staged = self._two_stage_scores(
+                query, view, positions, self.candidate_k, top_k, query_embeddings, bm25_max
+            )
+            if staged is not None:
+                candidates, scores = staged
+                return self._select_top_k(view.tools, candidates, scores, top_k, min_score)
+            logger.debug(f"Too few BM25 candidates for '{query[:40]}', using exhaustive scoring")
 
-        # Tokenize corpus (simple whitespace split + lowercase)
-        tokenized_corpus = [doc.lower().split() for doc in corpus]
+        scores = self._view_scores([query], view, positions, query_embeddings, bm25_max)[0]
+        return self._select_top_k(view.tools, positions, scores, top_k, min_score)
 
-        # Build BM25 index (fallback to zeros if unavailable)
-        if not BM25_AVAILABLE:
-            return np.zeros(len(tokenized_corpus), dtype=float)
-        bm25 = BM25Okapi(tokenized_corpus)
+    def recall_report(
+        self,
+        queries: list[str],
+        catalog: ToolCatalog | ColumnarToolCatalog,
+        top_k: int = 5,
+        *,
+        candidate_k: int | None = None,
+        domain: str | None = None,
+        type_filter: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Compare two-stage results against exhaustive scoring (recall@k).
 
-        # Search
-        tokenized_query = query.lower().split()
-        scores = bm25.get_scores(tokenized_query)
+        Bypasses the query cache. Use it to tune ``candidate_k``.
 
-        # Normalize to 0-1 range
-        max_score = max(scores) if max(scores) > 0 else 1.0
-        normalized_scores = scores / max_score
+        Args:
+            queries: Representative queries
+            catalog: Tool catalog to search
+            top_k: k for recall@k
+            candidate_k: Candidate set size to evaluate (defaults to engine's)
+            domain: Optional domain filter
+            type_filter: Optional tool type filter
 
-        return normalized_scores  # type: ignore[no-any-return]
+        Returns:
+            Dict with mean recall@k, latency per mode and per-query details
 
-    def _embedding_search(self, query: str, tools: list[ToolDefinition]) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        Example:
+            report = engine.recall_report(sample_queries, catalog, top_k=5, candidate_k=100)
+            print(f"recall@5={report['recall_at_k']:.3f}")
+        """
+        view = self._get_catalog_view(catalog)
+        positions = view.positions(domain, type_filter)
+        original_candidate_k = self.candidate_k
+        if candidate_k is not None:
+            self.candidate_k = candidate_k
+
+        per_query: list[dict[str, Any]] = []
+        exhaustive_s = 0.0
+        two_stage_s = 0.0
+        try:
+            for query in queries:
+                start = time.perf_counter()
+                exhaustive = self._score_and_select(query, view, positions, top_k, -np.inf, "exhaustive")
+                exhaustive_s += time.perf_counter() - start
+
+                start = time.perf_counter()
+                two_stage = self._score_and_select(query, view, positions, top_k, -np.inf, "two_stage")
+                two_stage_s += time.perf_counter() - start
+
+                expected = {tool.name for tool, _ in exhaustive}
+                found = {tool.name for tool, _ in two_stage}
+                recall = len(expected & found) / len(expected) if expected else 1.0
+                per_query.append({
+                    "query": query,
+                    "recall": recall,
+                    "missed": sorted(expected - found),
+                })
+        finally:
+            self.candidate_k = original_candidate_k
+
+        count = max(len(queries), 1)
+        return {
+            "top_k": top_k,
+            "candidate_k": candidate_k if candidate_k is not None else original_candidate_k,
+            "num_tools": int(len(positions)),
+            "recall_at_k": sum(q["recall"] for q in per_query) / count,
+            "exhaustive_ms": exhaustive_s * 1000 / count,
+            "two_stage_ms": two_stage_s * 1000 / count,
+            "queries": per_query,
+        }
+
+    def search_many(
+        self,
+        queries: list[str],
+        catalog: ToolCatalog | ColumnarToolCatalog,
+        top_k: int = 5,
+        min_score: float = 0.3,
+        *,
+        domain: str | None = None,
+        type_filter: str | None = None,
+    ) -> list[list[tuple[ToolDefinition, float]]]:
         """
-        Embedding-based semantic search (good for conceptual matches).
+        Search for many queries at once (offline planners, evaluators).
 
-        Uses SentenceTransformer to encode query and tools into dense
-        vectors, then computes cosine similarity.
+        Always scores exhaustively (the batch is one matrix product).
+        Filtering, catalog hashing and tool row lookup happen once; all
+        uncached queries are encoded in one model call and scored against
+        the tool matrix with one matrix product, and top-k selection uses
+        ``argpartition`` per row.
+
+        Args:
+            queries: Natural language requests
+            catalog: Tool catalog to search
+            top_k: Number of tools to return per query
+            min_score: Minimum relevance score (0-1)
+            domain: Optional domain filter
+            type_filter: Optional tool type filter
+
+        Returns:
+            One list of (ToolDefinition, score) tuples per query, in query order
+
+        Example:
+            batches = search_engine.search_many(["send slack", "read file"], catalog)
+            for query_results in batches:
+                print([tool.name for tool, _ in query_results])
+        """
+        view = self._get_catalog_view(catalog)
+        positions = view.positions(domain, type_filter)
+
+        if len(positions) == 0:
+            logger.warning("No tools available after filtering")
+            return [[] for _ in queries]
+
+        if len(positions) <= self.small_catalog_threshold:
+            return [[(view.tools[i], 1.0) for i in positions[:top_k]] for _ in queries]
+
+        results: list[list[tuple[ToolDefinition, float]]] = [[] for _ in queries]
+        pending: dict[str, list[int]] = {}  # uncached query -> positions
+        cache_keys: dict[str, str] = {}
+
+        for i, query in enumerate(queries):
+            if query in pending:
+                pending[query].append(i)
+                continue
+            cache_key = self._get_cache_key(
+                query, catalog, domain=domain, type_filter=type_filter,
+                top_k=top_k, min_score=min_score, catalog_hash=view.fingerprint,
+            )
+            cached_results = self._load_from_cache(cache_key)
+            if cached_results is not None:
+                results[i] = list(cached_results)
+                continue
+            pending[query] = [i]
+            cache_keys[query] = cache_key
+
+        if pending:
+            start_time = time.time()
+
+            pending_queries = list(pending)
+            scores = self._view_scores(pending_queries, view, positions)
+            for query, row in zip(pending_queries, scores, strict=True):
+                query_results = self._select_top_k(view.tools, positions, row, top_k, min_score)
+                self._save_to_cache(cache_keys[query], query_results)
+                for i in pending[query]:
+                    results[i] = list(query_results)
+
+            logger.info(
+                f"Batch search scored {len(pending_queries)}/{len(queries)} queries "
+                f"against {len(positions)} tools in {(time.time() - start_time) * 1000:.0f}ms"
+            )
+
+        return results
+
+    def bm25_max(self, query: str, catalog: ToolCatalog | ColumnarToolCatalog) -> float:
+        """
+        Highest raw BM25 score of any catalog tool for a query.
+
+        Callers merging results from several engines pass the largest value
+        to each engine's ``search(bm25_max=...)`` so BM25 scores share one
+        scale instead of each engine's best match scoring 1.0.
+        """
+        view = self._get_catalog_view(catalog)
+        slots = self._ensure_bm25_slots(view)
+        if len(slots) == 0:
+            return 0.0
+        return float(view.bm25_index.score_slots(query)[slots].max())
+
+    @property
+    def bm25_index(self) -> BM25Index:
+        """BM25 index of the most recently searched catalog."""
+        return self._bm25_index
+
+    def _get_catalog_view(
+        self, catalog: ToolCatalog | ColumnarToolCatalog, fingerprint: str | None = None
+    ) -> _CatalogView:
+        """
+        Return the search view for a catalog, rebuilding it only when the
+        catalog's ``generation`` moved or its tool count changed. A rebuilt
+        view keeps the catalog's BM25 index, so only changed tools are
+        re-tokenized; switching between catalogs re-indexes nothing.
+
+        Tools must be changed through ``add_tool``/``remove_tool``: replacing
+        an entry of ``catalog.tools`` directly is not seen by the view. A
+        ``fingerprint`` (from restored search state) forces a rebuild with that
+        fingerprint; without one, a ``ColumnarToolCatalog`` validates every
+        tool once to fingerprint it.
         """
+        view = self._catalog_views.get(id(catalog))
+        if (
+            view is not None
+            and fingerprint is None
+            and view.catalog is catalog
+            and view.generation == catalog.generation
+            and len(view.tools) == len(catalog.tools)
+        ):
+            self._bm25_index = view.bm25_index
+            return view
+
+        bm25_index = view.bm25_index if view is not None and view.catalog is catalog else None
+        # Read before the tools, so a concurrent change bumps past this view
+        generation = catalog.generation
+        if isinstance(catalog, ColumnarToolCatalog):
+            tools: Sequence[ToolDefinition] = catalog.lazy_tools()
+            view = _CatalogView(
+                catalog,
+                generation,
+                tools,
+                fingerprint or self._fingerprint_tools(tools),
+                tool_domains=catalog.tool_domains(),
+                tool_types=catalog.tool_types(),
+                bm25_index=bm25_index,
+            )
+        else:
+            tools = list(catalog.tools.values())
+            view = _CatalogView(
+                catalog, generation, tools, fingerprint or self._fingerprint_tools(tools), bm25_index=bm25_index
+            )
+        # Evicting a view drops its BM25 index with it
+        if id(catalog) not in self._catalog_views and len(self._catalog_views) >= 16:
+            self._catalog_views.clear()
+        self._catalog_views[id(catalog)] = view
+        self._bm25_index = view.bm25_index
+        return view
+
+    def _ensure_bm25_slots(self, view: _CatalogView) -> np.ndarray[Any, np.dtype[np.intp]]:
+        """BM25 slots for the view's tools, syncing the view's index if it changed."""
+        index = view.bm25_index
+        if view.bm25_version != index.version or view.bm25_slots is None:
+            # Only tools that were added, re-registered or removed are (re)indexed
+            index.sync(view.tools)
+            view.bm25_slots = index.get_slots([tool.name for tool in view.tools])
+            view.bm25_version = index.version
+        return view.bm25_slots
+
+    def _view_embedding_scores(
+        self,
+        queries: list[str],
+        view: _CatalogView,
+        positions: np.ndarray[Any, np.dtype[np.intp]],
+        query_embeddings: np.ndarray[Any, np.dtype[np.floating[Any]]] | None = None,
+    ) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        """Embedding scores (0-1) for the view rows at ``positions``; queries are encoded unless given."""
+        if query_embeddings is None:
+            query_embeddings = self._query_embeddings(queries)
+        if query_embeddings.shape[1] == 0:
+            return np.zeros((len(queries), len(positions)), dtype=float)
+
+        if view.embedding_rows is None:
+            view.embedding_rows = self._get_embedding_rows(view.tools)
+        similarities = self.embedding_store.scores_many(
+            query_embeddings, view.embedding_rows[positions]
+        )
+        return (similarities + 1) / 2
+
+    def _view_scores(
+        self,
+        queries: list[str],
+        view: _CatalogView,
+        positions: np.ndarray[Any, np.dtype[np.intp]],
+        query_embeddings: np.ndarray[Any, np.dtype[np.floating[Any]]] | None = None,
+        bm25_max: float | None = None,
+    ) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        """Weighted hybrid scores for the view rows at ``positions``, shape (len(queries), len(positions))."""
+        slots = self._ensure_bm25_slots(view)
+        bm25_scores = self._bm25_scores_slots(view.bm25_index, queries, slots[positions], bm25_max)
+        embedding_scores = self._view_embedding_scores(queries, view, positions, query_embeddings)
+        return self.bm25_weight * bm25_scores + self.embedding_weight * embedding_scores
+
+    def _two_stage_scores(
+        self,
+        query: str,
+        view: _CatalogView,
+        positions: np.ndarray[Any, np.dtype[np.intp]],
+        candidate_k: int,
+        top_k: int,
+        query_embeddings: np.ndarray[Any, np.dtype[np.floating[Any]]] | None = None,
+        bm25_max: float | None = None,
+    ) -> tuple[np.ndarray[Any, np.dtype[np.intp]], np.ndarray[Any, np.dtype[np.floating[Any]]]] | None:
+        """
+        Retrieve BM25 candidates from the postings, then rerank them with the
+        full hybrid weighting.
+
+        Returns:
+            (candidate positions, hybrid scores), or None when the postings
+            yield fewer than ``top_k`` candidates (caller falls back to
+            exhaustive scoring)
+        """
+        slots = self._ensure_bm25_slots(view)
+        raw = view.bm25_index.score_slots(query)[slots[positions]]
+        matched = np.flatnonzero(raw > 0)
+        if len(matched) < min(top_k, len(positions)):
+            return None
+
+        candidate_k = max(candidate_k, top_k)
+        if len(matched) > candidate_k:
+            matched = matched[np.argpartition(-raw[matched], candidate_k - 1)[:candidate_k]]
+            matched.sort()
+
+        # The best BM25 document is always a candidate, so this normalization
+        # equals the exhaustive one and candidate scores are unchanged
+        bm25_scores = raw[matched] / (bm25_max or raw[matched].max())
+        candidates = positions[matched]
+        embedding_scores = self._view_embedding_scores([query], view, candidates, query_embeddings)[0]
+        return candidates, self.bm25_weight * bm25_scores + self.embedding_weight * embedding_scores
+
+    @staticmethod
+    def _select_top_k(
+        tools: Sequence[ToolDefinition],
+        positions: np.ndarray[Any, np.dtype[np.intp]],
+        scores: np.ndarray[Any, np.dtype[np.floating[Any]]],
+        top_k: int,
+        min_score: float,
+    ) -> list[tuple[ToolDefinition, float]]:
+        """Pick the top_k tools scoring at least min_score, best first."""
+        k = min(top_k, len(positions))
+        if k <= 0:
+            return []
+        if k < len(positions):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(positions))
+        # Sort by score descending, ties broken by catalog order
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(tools[positions[i]], float(scores[i])) for i in order if scores[i] >= min_score]
+
+    def _bm25_scores_slots(
+        self,
+        index: BM25Index,
+        queries: list[str],
+        slots: np.ndarray[Any, np.dtype[np.intp]],
+        bm25_max: float | None = None,
+    ) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        """BM25 scores for index slots, normalized to 0-1 per query (or by ``bm25_max``)."""
+        scores = np.zeros((len(queries), len(slots)), dtype=float)
+        if len(slots) == 0:
+            return scores
+
+        for i, query in enumerate(queries):
+            row = index.score_slots(query)[slots]
+
+            # Normalize to 0-1 range
+            max_score = bm25_max or row.max()
+            scores[i] = row / max_score if max_score > 0 else row
+
+        return scores
+
+    def _query_embeddings(self, queries: list[str]) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        """Query vectors, loading the model if needed (zero-width when no model is available)."""
         self._init_embedding_model()
         if self.embedding_model is None:
-            return np.zeros(len(tools), dtype=float)
+            return np.zeros((len(queries), 0), dtype=np.float32)
+        return self._encode_queries(queries)
+
+    def _encode_queries(self, queries: list[str]) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        """Encode all queries in one model call."""
+        return self.embedding_model.encode(  # type: ignore[union-attr,no-any-return]
+            queries,
+            batch_size=self.encode_batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
 
-        # Get query embedding
-        query_embedding = self.embedding_model.encode(query, convert_to_tensor=False)
+    @staticmethod
+    def _get_embedding_text(tool: ToolDefinition) -> str:
+        """Text used for a tool's embedding (name + description)."""
+        return f"{tool.name}: {tool.description}"
 
-        # Get tool embeddings (with caching)
-        tool_embeddings_list = []
-        for tool in tools:
-            # Use name + description for embedding
-            tool_text = f"{tool.name}: {tool.description}"
-            embedding = self._get_or_compute_embedding(tool_text)
-            tool_embeddings_list.append(embedding)
+    def _get_embedding_rows(self, tools: Sequence[ToolDefinition]) -> np.ndarray[Any, np.dtype[np.intp]]:
+        """
+        Resolve embedding store rows for tools, computing missing embeddings.
 
-        tool_embeddings: Any = np.array(tool_embeddings_list)
+        Rows are memoized per tool object, so unchanged tools cost a dict
+        lookup; re-registered tools are re-hashed. All cache misses are
+        encoded together in batches of ``encode_batch_size``.
+        """
+        rows, misses = self._lookup_embedding_rows(tools)
+        if misses:
+            embeddings = self._encode_texts([text for text, _ in misses.values()])
+            self._store_embeddings(tools, rows, misses, embeddings)
+        return rows
+
+    def _lookup_embedding_rows(
+        self, tools: Sequence[ToolDefinition]
+    ) -> tuple[np.ndarray[Any, np.dtype[np.intp]], dict[str, tuple[str, list[int]]]]:
+        """Store rows for already-embedded tools, plus the misses (text hash -> (text, positions))."""
+        rows = np.empty(len(tools), dtype=np.intp)
+        misses: dict[str, tuple[str, list[int]]] = {}
 
-        # Compute cosine similarity
-        query_norm = query_embedding / np.linalg.norm(query_embedding)
-        tool_norms = tool_embeddings / np.linalg.norm(tool_embeddings, axis=1, keepdims=True)
-        similarities = np.dot(tool_norms, query_norm)
+        for i, tool in enumerate(tools):
+            cached = self._tool_rows.get(tool.name)
+            if cached is not None and cached[0] is tool:
+                rows[i] = cached[1]
+                continue
+            text = self._get_embedding_text(tool)
+            text_hash = hashlib.md5(text.encode()).hexdigest()
+            row = self.embedding_store.get_row(text_hash)
+            if row is None:
+                misses.setdefault(text_hash, (text, []))[1].append(i)
+                continue
+            self._tool_rows[tool.name] = (tool, row)
+            rows[i] = row
+
+        return rows, misses
+
+    def _store_embeddings(
+        self,
+        tools: Sequence[ToolDefinition],
+        rows: np.ndarray[Any, np.dtype[np.intp]],
+        misses: dict[str, tuple[str, list[int]]],
+        embeddings: np.ndarray[Any, np.dtype[np.floating[Any]]],
+    ) -> None:
+        """Append encoded misses to the embedding store and fill in their rows."""
+        hashes = list(misses)
+        new_rows = self.embedding_store.append_many(hashes, embeddings)
+        for text_hash, row in zip(hashes, new_rows, strict=True):
+            for i in misses[text_hash][1]:
+                self._tool_rows[tools[i].name] = (tools[i], row)
+                rows[i] = row
+
+    def _encode_texts(self, texts: list[str]) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        """Encode tool texts in batches of ``encode_batch_size`` (no engine state is touched)."""
+        start_time = time.time()
+        batches = []
+        for start in range(0, len(texts), self.encode_batch_size):
+            batch = texts[start:start + self.encode_batch_size]
+            batches.append(self.embedding_model.encode(  # type: ignore[union-attr]
+                batch,
+                batch_size=self.encode_batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ))
 
-        # Convert from [-1, 1] to [0, 1] range
-        normalized_similarities = (similarities + 1) / 2
+        logger.info(
+            f"Encoded {len(texts)} tool embeddings in {(time.time() - start_time) * 1000:.0f}ms "
+            f"(batch_size={self.encode_batch_size})"
+        )
+        embeddings: np.ndarray[Any, np.dtype[np.floating[Any]]] = np.vstack(batches)
+        return embeddings
 
-        return normalized_similarities  # type: ignore[no-any-return]
+    def warm(self, catalog: ToolCatalog | ColumnarToolCatalog) -> int:
+        """
+        Prebuild search artifacts for a catalog before traffic arrives.
 
-    def _get_or_compute_embedding(self, text: str) -> np.ndarray[Any, np.dtype[np.floating[Any]]]:
+        Loads the embedding model, encodes every uncached tool embedding in
+        batches, syncs the BM25 index and builds the filter positions, so the first query after a deploy
+        or catalog change does not pay the cold-start cost.
+
+        Args:
+            catalog: Tool catalog to warm
+
+        Returns:
+            Number of tools warmed
         """
-        Get cached embedding or compute and cache it.
+        view = self._get_catalog_view(catalog)
+        tools = view.tools
+        self._ensure_bm25_slots(view)
 
-        Uses MD5 hash of text as cache key to avoid recomputing
-        embeddings for the same tool descriptions.
+        self._init_embedding_model()
+        if self.embedding_model is not None and tools:
+            view.embedding_rows = self._get_embedding_rows(tools)
+
+        logger.info(f"Search engine warmed for {len(tools)} tools")
+        return len(tools)
+
+    def export_search_state(self, catalog: ToolCatalog | ColumnarToolCatalog) -> dict[str, Any]:
         """
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        cache_file = self.cache_dir / f"emb_{text_hash}.npy"
+        Export the warmed search artifacts for a catalog, in catalog order.
 
-        if cache_file.exists():
-            return np.load(cache_file)  # type: ignore[no-any-return]
+        Includes BM25 postings, per-tool content fingerprints and (when the
+        embedding model is available) the embedding rows with their text
+        hashes. ``restore_search_state`` loads it back in another process
+        without tokenizing, hashing or encoding the catalog again.
 
-        # Compute embedding
-        if self.embedding_model is None:
-            # Should not happen due to guards; return zeros for safety
-            return np.zeros(0, dtype=float)
-        embedding = self.embedding_model.encode(text, convert_to_tensor=False)
+        Args:
+            catalog: Tool catalog to export artifacts for (warmed first)
 
-        # Save to cache
-        np.save(cache_file, embedding)
+        Returns:
+            Dict of names, fingerprints, BM25 state and optional embeddings
+        """
+        self.warm(catalog)
+        view = self._get_catalog_view(catalog)
+        names = [tool.name for tool in view.tools]
+        state: dict[str, Any] = {
+            "names": names,
+            "fingerprints": [self._tool_fingerprints[name][1] for name in names],
+            "bm25": view.bm25_index.export_state(names),
+        }
+        if view.embedding_rows is not None and len(names):
+            state["embedding_model"] = self.embedding_model_name
+            state["embedding_hashes"] = [
+                hashlib.md5(self._get_embedding_text(tool).encode()).hexdigest() for tool in view.tools
+            ]
+            state["embeddings"] = np.array(self.embedding_store.matrix[view.embedding_rows])
+        return state
+
+    def restore_search_state(self, catalog: ToolCatalog | ColumnarToolCatalog, state: dict[str, Any]) -> bool:
+        """
+        Load artifacts from ``export_search_state`` for the same catalog.
+
+        Embedding rows missing from the local store are appended, so a fresh
+        host needs no encoding; the embedding model itself is still loaded
+        lazily on the first query. A ``ColumnarToolCatalog`` (e.g. a snapshot's
+        ``lazy_catalog()``) is restored from its columns alone: tools are
+        validated only when a search returns them.
+
+        Args:
+            catalog: Catalog holding the same tools, in the same order, as when exported
+            state: Exported search state
 
-        return embedding  # type: ignore[no-any-return]
+        Returns:
+            True if restored, False if the state does not match the catalog
+        """
+        tools: list[ToolDefinition] = []
+        if isinstance(catalog, ColumnarToolCatalog):
+            names = catalog.names()
+        else:
+            tools = list(catalog.tools.values())
+            names = [tool.name for tool in tools]
+        if names != list(state["names"]):
+            logger.warning("Search state does not match catalog; it will be rebuilt on first search")
+            return False
+
+        if isinstance(catalog, ColumnarToolCatalog):
+            fingerprint = hashlib.md5("".join(sorted(state["fingerprints"])).encode()).hexdigest()
+            view = self._get_catalog_view(catalog, fingerprint)
+            view.bm25_index.load_state(names, state["bm25"])
+        else:
+            for tool, digest in zip(tools, state["fingerprints"], strict=True):
+                self._tool_fingerprints[tool.name] = (tool, digest)
+            view = self._get_catalog_view(catalog)
+            view.bm25_index.load_state(names, state["bm25"], tools)
+        view.bm25_slots = view.bm25_index.get_slots(names)
+        view.bm25_version = view.bm25_index.version
+
+        if state.get("embedding_model") == self.embedding_model_name and "embeddings" in state:
+            rows = self.embedding_store.append_many(list(state["embedding_hashes"]), state["embeddings"])
+            if tools:
+                for tool, row in zip(tools, rows, strict=True):
+                    self._tool_rows[tool.name] = (tool, row)
+            view.embedding_rows = np.array(rows, dtype=np.intp)
+
+        logger.info(f"Search state restored for {len(names)} tools")
+        return True
 
     def _get_cache_key(
         self,
         query: str,
-        catalog: ToolCatalog,
+        catalog: ToolCatalog | ColumnarToolCatalog,
         *,
         domain: str | None = None,
         type_filter: str | None = None,
+        top_k: int | None = None,
+        min_score: float | None = None,
+        catalog_hash: str | None = None,
+        mode: str = "exhaustive",
+        bm25_max: float | None = None,
     ) -> str:
-        """Generate cache key from query, catalog, and filters"""
-        # Hash catalog based on tool names (stable across runs)
-        catalog_hash = hashlib.md5(
-            str(sorted(catalog.tools.keys())).encode()
-        ).hexdigest()
+        """Generate cache key from query, catalog content, filters, limits, mode and BM25 normalizer"""
+        if catalog_hash is None:
+            catalog_hash = self._get_catalog_hash(catalog)
 
         # Hash query + filters
-        filter_blob = f"{query}|{domain or ''}|{type_filter or ''}"
+        filter_blob = f"{query}|{domain or ''}|{type_filter or ''}|{top_k}|{min_score}|{mode}"
+        if bm25_max is not None:
+            filter_blob += f"|{bm25_max!r}"
         query_hash = hashlib.md5(filter_blob.encode()).hexdigest()
 
         return f"{query_hash}_{catalog_hash}"
 
+    def _get_catalog_hash(self, catalog: ToolCatalog | ColumnarToolCatalog) -> str:
+        """Fingerprint of catalog content (see _fingerprint_tools)."""
+        return self._get_catalog_view(catalog).fingerprint
+
+    def _fingerprint_tools(self, tools: Sequence[ToolDefinition]) -> str:
+        """
+        Fingerprint tool content (names, types, domains, descriptions, parameters).
+
+        Per-tool digests are memoized by tool object, so rebuilding after a
+        single re-registration only re-hashes that tool.
+        """
+        digests = []
+        for tool in tools:
+            entry = self._tool_fingerprints.get(tool.name)
+            if entry is None or entry[0] is not tool:
+                params = json.dumps(
+                    [p.model_dump() for p in tool.parameters], sort_keys=True, default=str
+                )
+                blob = f"{tool.name}\x1f{tool.type}\x1f{tool.domain}\x1f{tool.description}\x1f{params}"
+                entry = (tool, hashlib.md5(blob.encode()).hexdigest())
+                self._tool_fingerprints[tool.name] = entry
+            digests.append(entry[1])
+
+        return hashlib.md5("".join(sorted(digests)).encode()).hexdigest()
+
     def _load_from_cache(self, cache_key: str) -> list[tuple[ToolDefinition, float]] | None:
-        """Load cached search results if fresh (<1 hour)"""
-        cache_file = self.cache_dir / f"search_{cache_key}.pkl"
+        """Load cached search results (in-memory LRU first, then optional disk layer)"""
+        entry = self._query_cache.get(cache_key)
+        if entry is not None:
+            ts, results = entry
+            if (time.time() - ts) <= self.query_cache_ttl_s:
+                # Move to end (recently used)
+                self._query_cache.move_to_end(cache_key)
+                return results
+            # Expired; remove
+            self._query_cache.pop(cache_key, None)
+
+        if not self.disk_cache:
+            return None
 
-        if cache_file.exists():
-            # Check if cache is fresh (< 1 hour old)
-            age_seconds = time.time() - cache_file.stat().st_mtime
-            if age_seconds < 3600:  # 1 hour TTL
-                try:
-                    with open(cache_file, "rb") as f:
-                            loaded = pickle.load(f)
-                            return cast(list[tuple[ToolDefinition, float]], loaded)
-                except Exception as e:
-                    logger.warning(f"Failed to load cache {cache_key}: {e}")
+        cache_file = self.cache_dir / f"search_{cache_key}.pkl"
+        try:
+            mtime = cache_file.stat().st_mtime
+        except OSError:
+            return None
+
+        if time.time() - mtime < self.query_cache_ttl_s:
+            try:
+                with open(cache_file, "rb") as f:
+                    loaded = cast(list[tuple[ToolDefinition, float]], pickle.load(f))
+                self._remember(cache_key, loaded, mtime)
+                return loaded
+            except Exception as e:
+                logger.warning(f"Failed to load cache {cache_key}: {e}")
 
         return None
 
+    def _remember(self, cache_key: str, results: list[tuple[ToolDefinition, float]], ts: float) -> None:
+        """Insert into the in-memory LRU, evicting the least recently used entry."""
+        self._query_cache[cache_key] = (ts, results)
+        self._query_cache.move_to_end(cache_key)
+        if len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+
     def _save_to_cache(self, cache_key: str, results: list[tuple[ToolDefinition, float]]) -> None:
-        """Save search results to cache"""
+        """Save search results to the in-memory LRU (and disk layer if enabled)"""
+        self._remember(cache_key, list(results), time.time())
+        if not self.disk_cache:
+            return
+
         cache_file = self.cache_dir / f"search_{cache_key}.pkl"
 
         try:
@@ -353,6 +1084,12 @@ class ToolSearchEngine:
 
     def clear_cache(self) -> None:
         """Clear all cached embeddings and search results"""
+        self._bm25_index = BM25Index()
+        self.embedding_store.close()
+        self._tool_rows.clear()
+        self._query_cache.clear()
+        self._tool_fingerprints.clear()
+        self._catalog_views.clear()
         if self.cache_dir.exists():
             import shutil
             shutil.rmtree(self.cache_dir)
@@ -4,7 +4,15 @@ Vector Database Search Engine for ToolWeaver (Phase 7)
 Qdrant-based tool search for scaling to 1000+ tools with sub-100ms latency.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -55,10 +63,592 @@ except Exception:
     TORCH_AVAILABLE = False
 
 from ..shared.models import ToolCatalog, ToolDefinition
+from ..shared.quantization import (
+    QuantizedVectors,
+    qdrant_collection_options,
+    qdrant_search_params,
+    quantize,
+    quantized_scores,
+    validate_dtype,
+)
+from .embedding_server import RemoteEmbeddingModel, embedding_server_running
+from .embedding_store import EmbeddingStore
+from .inference import InferenceExecutor, get_inference_executor
 
 logger = logging.getLogger(__name__)
 
 
+class InMemoryVectorIndex:
+    """
+    Contiguous in-memory vector index used when Qdrant is unavailable.
+
+    Embeddings live in one L2-normalized matrix with a parallel name array
+    and a per-domain row index, so a search is a single dot product plus
+    ``argpartition``. Deleted rows are masked out and reused.
+
+    The matrix can be stored as float16 or int8 (per-row scale) to cut
+    resident memory 2-4x; scores are then computed from the codes directly.
+    With an ``exact_store`` the original float32 vectors are also appended
+    to a memory-mapped EmbeddingStore and the top ``top_k * rerank_factor``
+    quantized candidates are rescored exactly.
+
+    Usage:
+        index = InMemoryVectorIndex(dim=384)
+        index.upsert_many(["tool_a"], ["github"], vectors)
+        hits = index.search(query_vector, top_k=5, domain="github")
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        dtype: str = "float32",
+        exact_store: EmbeddingStore | None = None,
+        rerank_factor: int = 4,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Embedding dimension
+            dtype: Matrix storage dtype ("float32", "float16" or "int8")
+            exact_store: Optional store of float32 originals for exact reranking
+            rerank_factor: Candidates rescored exactly, as a multiple of top_k
+        """
+        self.dim = dim
+        self.dtype = validate_dtype(dtype)
+        self.exact_store = exact_store
+        self.rerank_factor = rerank_factor
+        self._reset()
+
+    def _reset(self) -> None:
+        self.matrix = np.zeros((0, self.dim), dtype=np.dtype(self.dtype))
+        self.scales = np.zeros(0, dtype=np.float32)  # int8 only
+        self.exact_rows = np.full(0, -1, dtype=np.intp)  # row -> exact_store row
+        self.names: list[str | None] = []
+        self.domains: list[str | None] = []
+        self.live = np.zeros(0, dtype=bool)
+        self._rows: dict[str, int] = {}
+        self._free_rows: list[int] = []
+        self._domain_rows: dict[str, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __iter__(self) -> Any:
+        return iter(self._rows)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        vector: np.ndarray = self.vectors(np.array([self._rows[name]]))[0]
+        return vector
+
+    @property
+    def nbytes(self) -> int:
+        """Resident bytes of the vector storage."""
+        return int(self.matrix.nbytes + (self.scales.nbytes if self.dtype == "int8" else 0))
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Dequantized float32 vectors for the given rows."""
+        scales = self.scales[rows] if self.dtype == "int8" else None
+        return QuantizedVectors(self.matrix[rows], scales).dequantize()
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.matrix)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, 2 * capacity, 64)
+        matrix = np.zeros((new_capacity, self.dim), dtype=self.matrix.dtype)
+        matrix[:capacity] = self.matrix
+        scales = np.zeros(new_capacity, dtype=np.float32)
+        scales[:capacity] = self.scales
+        exact_rows = np.full(new_capacity, -1, dtype=np.intp)
+        exact_rows[:capacity] = self.exact_rows
+        live = np.zeros(new_capacity, dtype=bool)
+        live[:capacity] = self.live
+        self.matrix, self.scales, self.exact_rows, self.live = matrix, scales, exact_rows, live
+
+    def upsert_many(self, names: list[str], domains: list[str], vectors: Any) -> None:
+        """
+        Insert or replace vectors.
+
+        Args:
+            names: Tool names (row keys)
+            domains: Tool domains, aligned with names
+            vectors: Array-like of shape (len(names), dim)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(names), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        quantized = quantize(vectors, self.dtype)
+
+        store_rows = None
+        if self.exact_store is not None and self.dtype != "float32":
+            keys = [hashlib.sha1(vector.tobytes()).hexdigest() for vector in vectors]
+            store_rows = self.exact_store.append_many(keys, vectors)
+
+        for i, (name, domain) in enumerate(zip(names, domains, strict=True)):
+            row = self._rows.get(name)
+            if row is None:
+                if self._free_rows:
+                    row = self._free_rows.pop()
+                else:
+                    row = len(self.names)
+                    self._grow(row + 1)
+                    self.names.append(None)
+                    self.domains.append(None)
+                self._rows[name] = row
+            self.matrix[row] = quantized.codes[i]
+            if quantized.scales is not None:
+                self.scales[row] = quantized.scales[i]
+            self.exact_rows[row] = store_rows[i] if store_rows is not None else -1
+            self.names[row] = name
+            self.domains[row] = domain
+            self.live[row] = True
+        self._domain_rows = None
+
+    def remove(self, name: str) -> bool:
+        """Remove a vector; returns True if it was present."""
+        row = self._rows.pop(name, None)
+        if row is None:
+            return False
+        self.live[row] = False
+        self.matrix[row] = 0
+        self.scales[row] = 0.0
+        self.exact_rows[row] = -1
+        self.names[row] = None
+        self.domains[row] = None
+        self._free_rows.append(row)
+        self._domain_rows = None
+        return True
+
+    def clear(self) -> None:
+        """Remove all vectors."""
+        self._reset()
+
+    def rows_for_domain(self, domain: str | None) -> np.ndarray:
+        """Live row indices, optionally restricted to one domain."""
+        if domain is None:
+            return np.flatnonzero(self.live[: len(self.names)])
+        if self._domain_rows is None:
+            grouped: dict[str, list[int]] = {}
+            for row, row_domain in enumerate(self.domains):
+                if row_domain is not None:
+                    grouped.setdefault(row_domain, []).append(row)
+            self._domain_rows = {k: np.array(v, dtype=np.intp) for k, v in grouped.items()}
+        return self._domain_rows.get(domain, np.zeros(0, dtype=np.intp))
+
+    def search(
+        self,
+        query: Any,
+        top_k: int,
+        min_score: float = -1.0,
+        domain: str | None = None,
+        allowed: Any = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Cosine similarity search.
+
+        Args:
+            query: Query vector (normalized here)
+            top_k: Number of results
+            min_score: Minimum similarity
+            domain: Optional domain filter
+            allowed: Optional container of names that may be returned
+
+        Returns:
+            (name, score) tuples, best first
+        """
+        return self._search_rows(
+            self._normalize_query(query), self.rows_for_domain(domain), top_k, min_score, allowed
+        )
+
+    @staticmethod
+    def _normalize_query(query: Any) -> np.ndarray:
+        vector: np.ndarray = np.asarray(query, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _score_rows(self, query: np.ndarray, rows: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Score rows from the (possibly quantized) matrix, then rerank the best exactly."""
+        scales = self.scales[rows] if self.dtype == "int8" else None
+        scores = quantized_scores(self.matrix[rows], scales, query)
+        if self.exact_store is None or self.dtype == "float32" or self.rerank_factor <= 0:
+            return rows, scores
+
+        n = min(len(rows), max(top_k, 1) * self.rerank_factor)
+        if n < len(rows):
+            top = np.argpartition(-scores, n - 1)[:n]
+            rows, scores = rows[top], scores[top]
+        exact_rows = self.exact_rows[rows]
+        has_exact = exact_rows >= 0
+        if has_exact.any():
+            scores = scores.copy()
+            scores[has_exact] = self.exact_store.scores(query, exact_rows[has_exact])
+        return rows, scores
+
+    def _search_rows(
+        self,
+        query: np.ndarray,
+        rows: np.ndarray,
+        top_k: int,
+        min_score: float,
+        allowed: Any,
+    ) -> list[tuple[str, float]]:
+        """Rank a subset of rows against a normalized query."""
+        if len(rows) == 0 or top_k <= 0:
+            return []
+
+        rows, scores = self._score_rows(query, rows, top_k)
+        keep = np.flatnonzero(scores >= min_score)
+        if len(keep) == 0:
+            return []
+
+        k = min(top_k, len(keep))
+        if k < len(keep):
+            candidates = keep[np.argpartition(-scores[keep], k - 1)[:k]]
+        else:
+            candidates = keep
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results = []
+        for i in order:
+            name = self.names[rows[i]]
+            if allowed is None or name in allowed:
+                results.append((name, float(scores[i])))
+        if len(results) < k and len(keep) > k:
+            # Some top hits were filtered out by ``allowed``; rank the rest
+            order = keep[np.argsort(-scores[keep], kind="stable")]
+            results = []
+            for i in order:
+                name = self.names[rows[i]]
+                if allowed is None or name in allowed:
+                    results.append((name, float(scores[i])))
+                    if len(results) == top_k:
+                        break
+        return results
+
+
+class IVFVectorIndex(InMemoryVectorIndex):
+    """
+    Inverted-file (IVF) approximate nearest neighbour index.
+
+    Rows are clustered around spherical k-means centroids ("lists"); a query
+    scores the centroids first and then only the rows of the ``n_probe``
+    closest lists, so search cost grows with ``n / n_lists * n_probe``
+    instead of ``n``. Inserts are assigned to their nearest centroid and
+    deletes drop the row from its list, so ``index_catalog`` and
+    ``delete_tool`` keep the index current without a rebuild. Centroids are
+    retrained once the index has grown ``retrain_growth`` times since the
+    last training. Below ``min_train_size`` rows the index is exhaustive.
+
+    Usage:
+        index = IVFVectorIndex(dim=384, n_probe=8)
+        index.upsert_many(names, domains, vectors)
+        hits = index.search(query_vector, top_k=5)
+        index.save("tool_index.npz")
+        index = IVFVectorIndex.load("tool_index.npz")
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(
+        self,
+        dim: int,
+        n_lists: int | None = None,
+        n_probe: int = 8,
+        min_train_size: int = 1024,
+        retrain_growth: float = 4.0,
+        train_iterations: int = 10,
+        seed: int = 0,
+        dtype: str = "float32",
+        exact_store: EmbeddingStore | None = None,
+        rerank_factor: int = 4,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Embedding dimension
+            n_lists: Number of clusters (default: sqrt of the row count at training)
+            n_probe: Number of closest lists scanned per query
+            min_train_size: Row count at which clustering starts
+            retrain_growth: Retrain when the index grows by this factor
+            train_iterations: k-means iterations per training
+            seed: Random seed for reproducible clustering
+            dtype: Matrix storage dtype ("float32", "float16" or "int8")
+            exact_store: Optional store of float32 originals for exact reranking
+            rerank_factor: Candidates rescored exactly, as a multiple of top_k
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.train_iterations = train_iterations
+        self.seed = seed
+        super().__init__(dim, dtype=dtype, exact_store=exact_store, rerank_factor=rerank_factor)
+
+    def _reset(self) -> None:
+        super()._reset()
+        self.centroids: np.ndarray | None = None
+        self.assignments = np.full(0, -1, dtype=np.intp)
+        self._lists: list[set[int]] = []
+        self._list_arrays: dict[int, np.ndarray] = {}
+        self._trained_size = 0
+        self.metadata: dict[str, Any] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.matrix)
+        super()._grow(needed)
+        if len(self.matrix) > capacity:
+            assignments = np.full(len(self.matrix), -1, dtype=np.intp)
+            assignments[: len(self.assignments)] = self.assignments
+            self.assignments = assignments
+
+    def _unassign(self, row: int) -> None:
+        label = int(self.assignments[row])
+        if label >= 0:
+            self._lists[label].discard(row)
+            self._list_arrays.pop(label, None)
+            self.assignments[row] = -1
+
+    def _assign(self, rows: np.ndarray, chunk_size: int = 8192) -> None:
+        """Assign rows to their nearest centroid (chunked to bound memory)."""
+        assert self.centroids is not None
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            labels = np.argmax(self.vectors(chunk) @ self.centroids.T, axis=1)
+            for row, label in zip(chunk.tolist(), labels.tolist(), strict=True):
+                self._unassign(row)
+                self._lists[label].add(row)
+                self._list_arrays.pop(label, None)
+                self.assignments[row] = label
+
+    def train(self) -> None:
+        """Cluster the live rows and rebuild every inverted list."""
+        rows = np.flatnonzero(self.live[: len(self.names)])
+        if len(rows) == 0:
+            self._reset_lists()
+            return
+
+        n_lists = self.n_lists or max(1, int(round(np.sqrt(len(rows)))))
+        n_lists = min(n_lists, len(rows))
+        rng = np.random.default_rng(self.seed)
+
+        # k-means on a bounded sample; the full set is assigned afterwards
+        sample_size = min(len(rows), 256 * n_lists)
+        sample = self.vectors(np.sort(rng.choice(rows, sample_size, replace=False)))
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(self.train_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = np.zeros_like(centroids)
+            sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+            empty = np.setdiff1d(np.arange(n_lists), present)
+            if len(empty):
+                # Re-seed empty clusters from random sample points
+                sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0)
+
+        self.centroids = centroids.astype(np.float32)
+        self._lists = [set() for _ in range(n_lists)]
+        self._list_arrays = {}
+        self.assignments[:] = -1
+        self._assign(rows)
+        self._trained_size = len(rows)
+        logger.info(f"IVF index trained: {len(rows)} vectors in {n_lists} lists")
+
+    def _reset_lists(self) -> None:
+        self.centroids = None
+        self.assignments[:] = -1
+        self._lists = []
+        self._list_arrays = {}
+        self._trained_size = 0
+
+    def _maybe_train(self) -> None:
+        if not self.is_trained:
+            if len(self) >= self.min_train_size:
+                self.train()
+        elif len(self) >= self.retrain_growth * self._trained_size:
+            self.train()
+
+    def upsert_many(self, names: list[str], domains: list[str], vectors: Any) -> None:
+        """
+        Insert or replace vectors and assign them to their nearest list.
+
+        Args:
+            names: Tool names (row keys)
+            domains: Tool domains, aligned with names
+            vectors: Array-like of shape (len(names), dim)
+        """
+        super().upsert_many(names, domains, vectors)
+        if self.is_trained:
+            self._assign(np.fromiter((self._rows[n] for n in names), dtype=np.intp, count=len(names)))
+        self._maybe_train()
+
+    def remove(self, name: str) -> bool:
+        """Remove a vector and drop it from its list; returns True if it was present."""
+        row = self._rows.get(name)
+        if row is None:
+            return False
+        self._unassign(row)
+        return super().remove(name)
+
+    def _list_rows(self, label: int) -> np.ndarray:
+        rows = self._list_arrays.get(label)
+        if rows is None:
+            rows = np.fromiter(self._lists[label], dtype=np.intp, count=len(self._lists[label]))
+            self._list_arrays[label] = rows
+        return rows
+
+    def search(
+        self,
+        query: Any,
+        top_k: int,
+        min_score: float = -1.0,
+        domain: str | None = None,
+        allowed: Any = None,
+        n_probe: int | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Approximate cosine similarity search over the closest lists.
+
+        Args:
+            query: Query vector (normalized here)
+            top_k: Number of results
+            min_score: Minimum similarity
+            domain: Optional domain filter
+            allowed: Optional container of names that may be returned
+            n_probe: Lists to scan (defaults to ``self.n_probe``)
+
+        Returns:
+            (name, score) tuples, best first
+        """
+        if not self.is_trained:
+            return super().search(query, top_k, min_score=min_score, domain=domain, allowed=allowed)
+
+        assert self.centroids is not None
+        query = self._normalize_query(query)
+        n_probe = max(1, min(n_probe or self.n_probe, len(self.centroids)))
+        expected_rows = len(self) * n_probe / len(self.centroids)
+
+        if domain is not None:
+            domain_rows = self.rows_for_domain(domain)
+            if len(domain_rows) <= expected_rows:
+                # A small domain is cheaper (and exact) to scan directly
+                return self._search_rows(query, domain_rows, top_k, min_score, allowed)
+
+        probed = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        rows = np.concatenate([self._list_rows(int(label)) for label in probed])
+        if domain is not None:
+            rows = rows[np.isin(rows, domain_rows, assume_unique=True)]
+        return self._search_rows(query, rows, top_k, min_score, allowed)
+
+    def save(self, path: str | Path, metadata: dict[str, Any] | None = None) -> None:
+        """
+        Persist the live vectors, their metadata and the centroids.
+
+        The file is written to a temporary path and renamed into place, so a
+        concurrent reader never sees a partial index.
+
+        Args:
+            path: Destination ``.npz`` file
+            metadata: Extra JSON-serializable data, restored as ``index.metadata``
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows = np.flatnonzero(self.live[: len(self.names)])
+        meta = {
+            "version": self.FORMAT_VERSION,
+            "dim": self.dim,
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "min_train_size": self.min_train_size,
+            "retrain_growth": self.retrain_growth,
+            "train_iterations": self.train_iterations,
+            "seed": self.seed,
+            "dtype": self.dtype,
+            "rerank_factor": self.rerank_factor,
+            "trained_size": self._trained_size,
+            "names": [self.names[row] for row in rows],
+            "domains": [self.domains[row] for row in rows],
+            "metadata": metadata if metadata is not None else self.metadata,
+        }
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps(meta)),
+                vectors=self.matrix[rows],
+                scales=self.scales[rows],
+                exact_rows=self.exact_rows[rows],
+                assignments=self.assignments[rows],
+                centroids=self.centroids if self.centroids is not None else np.zeros((0, self.dim), np.float32),
+            )
+        os.replace(tmp_path, path)
+        logger.info(f"Saved IVF index ({len(rows)} vectors) to {path}")
+
+    @classmethod
+    def load(cls, path: str | Path, exact_store: EmbeddingStore | None = None) -> "IVFVectorIndex":
+        """
+        Load an index written by ``save`` (lists are restored, not retrained).
+
+        Args:
+            path: Source ``.npz`` file
+            exact_store: Store the index was saved with, to keep exact reranking
+
+        Returns:
+            Loaded index
+        """
+        with np.load(Path(path), allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != cls.FORMAT_VERSION:
+                raise ValueError(f"Unsupported IVF index version {meta.get('version')} at {path}")
+            index = cls(
+                dim=meta["dim"],
+                n_lists=meta["n_lists"],
+                n_probe=meta["n_probe"],
+                min_train_size=meta["min_train_size"],
+                retrain_growth=meta["retrain_growth"],
+                train_iterations=meta["train_iterations"],
+                seed=meta["seed"],
+                dtype=meta["dtype"],
+                exact_store=exact_store,
+                rerank_factor=meta["rerank_factor"],
+            )
+            count = len(meta["names"])
+            index._grow(count)
+            index.matrix[:count] = data["vectors"]
+            index.scales[:count] = data["scales"]
+            if exact_store is not None:
+                index.exact_rows[:count] = data["exact_rows"]
+            index.live[:count] = True
+            index.names = list(meta["names"])
+            index.domains = list(meta["domains"])
+            index._rows = {name: row for row, name in enumerate(index.names) if name is not None}
+            index.metadata = meta.get("metadata") or {}
+
+            centroids = data["centroids"]
+            if len(centroids):
+                index.centroids = centroids.astype(np.float32)
+                index._lists = [set() for _ in range(len(centroids))]
+                index.assignments[:count] = data["assignments"]
+                for row, label in enumerate(data["assignments"].tolist()):
+                    index._lists[label].add(row)
+                index._trained_size = meta["trained_size"]
+
+        logger.info(f"Loaded IVF index ({count} vectors) from {path}")
+        return index
+
+
 class VectorToolSearchEngine:
     """
     Vector database search engine using Qdrant.
@@ -67,6 +657,7 @@ class VectorToolSearchEngine:
     - Sub-10ms similarity search at 1000+ tools
     - Domain-based filtering for focused search
     - Automatic fallback to in-memory if Qdrant unavailable
+    - Optional persisted IVF (approximate) index for large in-memory catalogs
     - Batch indexing for fast catalog loading
     - Connection pooling and retry logic
 
@@ -82,6 +673,9 @@ class VectorToolSearchEngine:
 
         # Search
         results = search_engine.search("create github PR", catalog, top_k=5)
+
+        # From async code (does not block the event loop)
+        results = await search_engine.search_async("create github PR", catalog)
     """
 
     def __init__(
@@ -92,7 +686,16 @@ class VectorToolSearchEngine:
         embedding_dim: int = 384,
         fallback_to_memory: bool = True,
         use_gpu: bool = True,
-        precompute_embeddings: bool = True
+        precompute_embeddings: bool = True,
+        inference_executor: InferenceExecutor | None = None,
+        ann_index: bool = False,
+        ann_index_path: str | Path | None = None,
+        ann_n_probe: int = 8,
+        embedding_dtype: str = "float32",
+        exact_rerank: bool = False,
+        cache_dir: str | Path | None = None,
+        upsert_batch_size: int = 256,
+        upsert_concurrency: int = 4,
     ):
         """
         Initialize vector search engine.
@@ -105,6 +708,16 @@ class VectorToolSearchEngine:
             fallback_to_memory: Use in-memory search if Qdrant unavailable
             use_gpu: Use GPU for embedding generation if available
             precompute_embeddings: Pre-compute embeddings at startup
+            inference_executor: Executor for search_async (defaults to the shared one)
+            ann_index: Use an IVF approximate index for the in-memory fallback
+            ann_index_path: Persist the IVF index here (loaded at startup if present)
+            ann_n_probe: Lists scanned per query by the IVF index
+            embedding_dtype: Storage for cached/in-memory/Qdrant vectors
+                ("float32", "float16" or "int8")
+            exact_rerank: Rescore quantized top candidates with float32 originals
+            cache_dir: Directory for the float32 originals used by exact_rerank
+            upsert_batch_size: Points per Qdrant upsert request
+            upsert_concurrency: Qdrant upsert requests in flight at once
         """
         self.qdrant_url = qdrant_url
         self.collection_name = collection_name
@@ -113,6 +726,15 @@ class VectorToolSearchEngine:
         self.fallback_to_memory = fallback_to_memory
         self.use_gpu = use_gpu
         self.precompute_embeddings = precompute_embeddings
+        self.inference_executor = inference_executor or get_inference_executor()
+        self.ann_index = ann_index or ann_index_path is not None
+        self.ann_index_path = Path(ann_index_path) if ann_index_path is not None else None
+        self.ann_n_probe = ann_n_probe
+        self.embedding_dtype = validate_dtype(embedding_dtype)
+        self.exact_rerank = exact_rerank
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else Path.home() / ".toolweaver" / "search_cache"
+        self.upsert_batch_size = max(1, upsert_batch_size)
+        self.upsert_concurrency = upsert_concurrency
 
         # Detect GPU availability
         self.device = self._detect_device()
@@ -121,16 +743,71 @@ class VectorToolSearchEngine:
         self.client: Any | None = None
         self.embedding_model: Any | None = None
         self.qdrant_available = False
+        # search_async loads the model and cold-indexes from inference threads
+        self._model_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+
+        # Content hashes of indexed tools, for incremental re-indexing
+        self._qdrant_hashes: dict[str, str] | None = None  # read from Qdrant on first index
+        self._qdrant_legacy_ids: list[Any] = []  # pre-hashing points, deleted on the next full index
+        self._memory_hashes: dict[str, str] = {}
 
         # Fallback in-memory search (if Qdrant unavailable)
-        self.memory_embeddings: dict[str, np.ndarray] = {}
+        self.memory_embeddings = self._create_memory_index()
         self.memory_tools: dict[str, ToolDefinition] = {}
 
-        # Pre-computed embeddings cache
-        self.embedding_cache: dict[str, np.ndarray] = {}
+        # Pre-computed embeddings cache (QuantizedVectors unless float32)
+        self.embedding_cache: dict[str, Any] = {}
 
         logger.info(f"VectorToolSearchEngine initialized (Qdrant: {qdrant_url}, Device: {self.device})")
 
+    def _create_memory_index(self) -> InMemoryVectorIndex:
+        """Create the fallback index (exhaustive, or IVF restored from disk if configured)."""
+        exact_store = None
+        if self.exact_rerank and self.embedding_dtype != "float32":
+            exact_store = EmbeddingStore(
+                self.cache_dir, name=f"vectors_{self.embedding_model_name.replace('/', '_')}"
+            )
+
+        if not self.ann_index:
+            return InMemoryVectorIndex(self.embedding_dim, dtype=self.embedding_dtype, exact_store=exact_store)
+
+        if self.ann_index_path is not None and self.ann_index_path.exists():
+            try:
+                index = IVFVectorIndex.load(self.ann_index_path, exact_store=exact_store)
+                if index.dim == self.embedding_dim and index.dtype == self.embedding_dtype:
+                    index.n_probe = self.ann_n_probe
+                    self._memory_hashes = dict(index.metadata.get("content_hashes", {}))
+                    return index
+                logger.warning(
+                    f"Ignoring IVF index at {self.ann_index_path}: "
+                    f"dim/dtype {index.dim}/{index.dtype} != {self.embedding_dim}/{self.embedding_dtype}"
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load IVF index from {self.ann_index_path}: {e}")
+
+        return IVFVectorIndex(
+            self.embedding_dim, n_probe=self.ann_n_probe, dtype=self.embedding_dtype, exact_store=exact_store
+        )
+
+    def save_memory_index(self) -> bool:
+        """
+        Persist the in-memory IVF index to ``ann_index_path``.
+
+        Returns:
+            True if the index was written
+        """
+        if self.ann_index_path is None or not isinstance(self.memory_embeddings, IVFVectorIndex):
+            return False
+        try:
+            self.memory_embeddings.save(
+                self.ann_index_path, metadata={"content_hashes": self._memory_hashes}
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save IVF index to {self.ann_index_path}: {e}")
+            return False
+
     def _detect_device(self) -> str:
         """
         Detect best available device for embedding generation.
@@ -184,23 +861,35 @@ class VectorToolSearchEngine:
 
     def _init_embedding_model(self) -> None:
         """Lazy initialization of embedding model with GPU support"""
-        if self.embedding_model is None:
-            if not SENTENCE_AVAILABLE:
-                logger.warning("SentenceTransformer not installed; embeddings disabled.")
-                return
-            logger.info(f"Loading embedding model: {self.embedding_model_name}")
-            self.embedding_model = SentenceTransformer(self.embedding_model_name)
-
-            # Move model to GPU if available
-            if self.device in ["cuda", "mps"] and self.embedding_model is not None:
-                try:
-                    self.embedding_model.to(self.device)
-                    logger.info(f"Embedding model moved to {self.device.upper()}")
-                except Exception as e:
-                    logger.warning(f"Failed to move model to {self.device}: {e}")
-                    self.device = "cpu"
+        if self.embedding_model is not None:
+            return
+        with self._model_lock:
+            if self.embedding_model is None:
+                self.embedding_model = self._load_embedding_model()
+
+    def _load_embedding_model(self) -> Any | None:
+        """Embedding server client or in-process model (None if unavailable)."""
+        # Shared embedding server if running (it owns device placement)
+        if embedding_server_running():
+            logger.info(f"Using embedding server for {self.embedding_model_name}")
+            return RemoteEmbeddingModel(self.embedding_model_name)
+        if not SENTENCE_AVAILABLE:
+            logger.warning("SentenceTransformer not installed; embeddings disabled.")
+            return None
+        logger.info(f"Loading embedding model: {self.embedding_model_name}")
+        model = SentenceTransformer(self.embedding_model_name)
+
+        # Move model to GPU if available
+        if self.device in ["cuda", "mps"]:
+            try:
+                model.to(self.device)
+                logger.info(f"Embedding model moved to {self.device.upper()}")
+            except Exception as e:
+                logger.warning(f"Failed to move model to {self.device}: {e}")
+                self.device = "cpu"
 
-            logger.info(f"Embedding model loaded (dim={self.embedding_dim}, device={self.device})")
+        logger.info(f"Embedding model loaded (dim={self.embedding_dim}, device={self.device})")
+        return model
 
     def _ensure_collection_exists(self) -> None:
         """Create collection if it doesn't exist"""
@@ -213,89 +902,247 @@ class VectorToolSearchEngine:
 
             if self.collection_name not in collection_names:
                 logger.info(f"Creating collection: {self.collection_name}")
+                vector_options, collection_options = qdrant_collection_options(self.embedding_dtype)
                 self.client.create_collection(  # type: ignore[union-attr]
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
                         size=self.embedding_dim,
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        **vector_options
+                    ),
+                    **collection_options
                 )
                 logger.info(f"Collection '{self.collection_name}' created")
         except Exception as e:
             logger.error(f"Failed to create collection: {e}")
             self.qdrant_available = False
 
-    def index_catalog(self, catalog: ToolCatalog, batch_size: int = 32) -> bool:
+    def index_catalog(self, catalog: ToolCatalog, batch_size: int = 32, delete_missing: bool = True) -> bool:
         """
-        Index entire tool catalog in Qdrant.
+        Index a tool catalog in Qdrant (or the in-memory fallback).
+
+        Indexing is incremental: each tool's content hash (searchable text
+        plus payload) is compared with what is already indexed, so only
+        added or changed tools are encoded and upserted, and tools no
+        longer in the catalog are deleted. Re-indexing an unchanged catalog
+        does not load or run the embedding model.
 
         Args:
             catalog: Tool catalog to index
             batch_size: Batch size for embedding generation
+            delete_missing: Delete indexed tools that are not in ``catalog``,
+                and legacy points (disable when indexing a partial catalog)
 
         Returns:
             True if indexing succeeded, False otherwise
         """
+        with self._index_lock:
+            return self._index_catalog(catalog, batch_size, delete_missing)
+
+    def _index_catalog(self, catalog: ToolCatalog, batch_size: int, delete_missing: bool) -> bool:
         self._init_qdrant_client()
-        self._init_embedding_model()
 
         tools = list(catalog.tools.values())
         if len(tools) == 0:
             logger.warning("Empty catalog - nothing to index")
             return False
 
-        logger.info(f"Indexing {len(tools)} tools (batch_size={batch_size}, device={self.device})...")
-
-        # Generate embeddings in batches with GPU acceleration
-        descriptions = [self._get_searchable_text(tool) for tool in tools]
-        embeddings = self._generate_embeddings_batch(
-            descriptions,
-            batch_size=batch_size,
-            show_progress=True
-        )
+        hashes = {tool.name: self._get_content_hash(tool) for tool in tools}
 
         if self.qdrant_available:
             try:
                 self._ensure_collection_exists()
-
-                # Create points for Qdrant
-                points = []
-                for i, tool in enumerate(tools):
-                    points.append(
-                        PointStruct(
-                            id=i,
-                            vector=embeddings[i].tolist(),
-                            payload={
-                                "tool_name": tool.name,
-                                "tool_type": tool.type,
-                                "domain": getattr(tool, "domain", "general"),
-                                "description": tool.description,
-                                "version": getattr(tool, "version", "1.0.0")
-                            }
-                        )
-                    )
-
-                # Batch upsert to Qdrant
-                self.client.upsert(  # type: ignore[union-attr]
-                    collection_name=self.collection_name,
-                    points=points
-                )
-                logger.info(f"Successfully indexed {len(tools)} tools in Qdrant")
-                return True
+                if self.qdrant_available:
+                    self._index_qdrant(tools, hashes, batch_size, delete_missing)
+                    return True
             except Exception as e:
                 logger.error(f"Failed to index in Qdrant: {e}")
                 self.qdrant_available = False
 
         # Fallback: Store in memory
         if self.fallback_to_memory:
-            logger.info("Storing embeddings in memory (fallback mode)")
-            for i, tool in enumerate(tools):
-                self.memory_embeddings[tool.name] = embeddings[i]
-                self.memory_tools[tool.name] = tool
+            changed, removed = self._memory_changes(tools, hashes, delete_missing)
+            embeddings = self._encode_tools(changed, batch_size) if changed else None
+            self._apply_memory_changes(tools, hashes, changed, removed, embeddings)
             return True
 
         return False
 
+    def _memory_changes(
+        self, tools: list[ToolDefinition], hashes: dict[str, str], delete_missing: bool
+    ) -> tuple[list[ToolDefinition], list[str]]:
+        """Tools to (re)encode and names to drop for the in-memory index."""
+        indexed = self._memory_hashes
+        changed = [tool for tool in tools if indexed.get(tool.name) != hashes[tool.name]]
+        removed = [name for name in indexed if name not in hashes] if delete_missing else []
+        return changed, removed
+
+    def _apply_memory_changes(
+        self,
+        tools: list[ToolDefinition],
+        hashes: dict[str, str],
+        changed: list[ToolDefinition],
+        removed: list[str],
+        embeddings: np.ndarray | None,
+    ) -> None:
+        """Upsert encoded tools into the in-memory index, drop removed ones and persist it."""
+        indexed = self._memory_hashes
+        if changed and embeddings is not None:
+            self.memory_embeddings.upsert_many(
+                [tool.name for tool in changed],
+                [getattr(tool, "domain", "general") for tool in changed],
+                embeddings,
+            )
+        for name in removed:
+            self.memory_embeddings.remove(name)
+            self.memory_tools.pop(name, None)
+            indexed.pop(name, None)
+        for tool in tools:
+            self.memory_tools[tool.name] = tool
+            indexed[tool.name] = hashes[tool.name]
+
+        logger.info(
+            f"In-memory index updated: {len(changed)} changed, {len(removed)} removed, "
+            f"{len(tools) - len(changed)} unchanged"
+        )
+        if changed or removed:
+            self.save_memory_index()
+
+    def _index_qdrant(
+        self,
+        tools: list[ToolDefinition],
+        hashes: dict[str, str],
+        batch_size: int,
+        delete_missing: bool,
+    ) -> None:
+        """Upsert changed tools and delete removed ones in Qdrant."""
+        indexed = self._get_qdrant_hashes()
+        if delete_missing and self._qdrant_legacy_ids:
+            # Only a full re-index rewrites every tool, so only it drops legacy points
+            logger.info(f"Removing {len(self._qdrant_legacy_ids)} legacy points from {self.collection_name}")
+            self.client.delete(  # type: ignore[union-attr]
+                collection_name=self.collection_name,
+                points_selector=self._qdrant_legacy_ids,
+            )
+            self._qdrant_legacy_ids = []
+        changed = [tool for tool in tools if indexed.get(tool.name) != hashes[tool.name]]
+        removed = [name for name in indexed if name not in hashes] if delete_missing else []
+
+        if changed:
+            embeddings = self._encode_tools(changed, batch_size)
+            points = [
+                PointStruct(
+                    id=self._get_point_id(tool.name),
+                    vector=embeddings[i].tolist(),
+                    payload={**self._get_point_payload(tool), "content_hash": hashes[tool.name]},
+                )
+                for i, tool in enumerate(changed)
+            ]
+            self._upsert_points(points)
+        if removed:
+            self.client.delete(  # type: ignore[union-attr]
+                collection_name=self.collection_name,
+                points_selector=[self._get_point_id(name) for name in removed],
+            )
+
+        for name in removed:
+            indexed.pop(name, None)
+        for tool in changed:
+            indexed[tool.name] = hashes[tool.name]
+        logger.info(
+            f"Qdrant index updated: {len(changed)} changed, {len(removed)} removed, "
+            f"{len(tools) - len(changed)} unchanged"
+        )
+
+    def _upsert_points(self, points: list[Any]) -> None:
+        """Upsert points in batches, several batches in flight at once."""
+        batches = [
+            points[i : i + self.upsert_batch_size] for i in range(0, len(points), self.upsert_batch_size)
+        ]
+
+        def upsert(batch: list[Any]) -> None:
+            self.client.upsert(  # type: ignore[union-attr]
+                collection_name=self.collection_name,
+                points=batch,
+            )
+
+        if len(batches) == 1 or self.upsert_concurrency <= 1:
+            for batch in batches:
+                upsert(batch)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.upsert_concurrency, len(batches))) as pool:
+            # list() re-raises the first failed batch
+            list(pool.map(upsert, batches))
+
+    def _get_qdrant_hashes(self) -> dict[str, str]:
+        """
+        Content hashes of the tools already in the Qdrant collection.
+
+        Read once per engine by scrolling payloads (no vectors). Points
+        written before content hashing (sequential IDs, no hash) are recorded
+        for deletion by the next full re-index, which writes their tools under
+        stable IDs.
+        """
+        if self._qdrant_hashes is not None:
+            return self._qdrant_hashes
+
+        hashes: dict[str, str] = {}
+        legacy_ids: list[Any] = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(  # type: ignore[union-attr]
+                collection_name=self.collection_name,
+                limit=1024,
+                offset=offset,
+                with_payload=["tool_name", "content_hash"],
+                with_vectors=False,
+            )
+            for point in points:
+                payload = point.payload or {}
+                name = payload.get("tool_name")
+                if name is None or str(point.id) != self._get_point_id(name) or "content_hash" not in payload:
+                    legacy_ids.append(point.id)
+                else:
+                    hashes[name] = payload["content_hash"]
+            if offset is None:
+                break
+
+        self._qdrant_legacy_ids = legacy_ids
+        self._qdrant_hashes = hashes
+        return hashes
+
+    def _encode_tools(self, tools: list[ToolDefinition], batch_size: int) -> np.ndarray:
+        """Encode the searchable text of tools (loads the model on first use)."""
+        self._init_embedding_model()
+        logger.info(f"Encoding {len(tools)} tools (batch_size={batch_size}, device={self.device})...")
+        return self._generate_embeddings_batch(
+            [self._get_searchable_text(tool) for tool in tools],
+            batch_size=batch_size,
+            show_progress=len(tools) > batch_size,
+        )
+
+    @staticmethod
+    def _get_point_id(tool_name: str) -> str:
+        """Stable Qdrant point ID for a tool name."""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"toolweaver:tool:{tool_name}"))
+
+    @staticmethod
+    def _get_point_payload(tool: ToolDefinition) -> dict[str, Any]:
+        return {
+            "tool_name": tool.name,
+            "tool_type": tool.type,
+            "domain": getattr(tool, "domain", "general"),
+            "description": tool.description,
+            "version": getattr(tool, "version", "1.0.0")
+        }
+
+    def _get_content_hash(self, tool: ToolDefinition) -> str:
+        """Hash of everything indexed for a tool (embedded text + payload)."""
+        content = json.dumps(
+            [self._get_searchable_text(tool), self._get_point_payload(tool)], sort_keys=True, default=str
+        )
+        return hashlib.sha256(content.encode()).hexdigest()[:32]
+
     def search(
         self,
         query: str,
@@ -355,6 +1202,65 @@ class VectorToolSearchEngine:
         logger.error("Vector search unavailable and fallback disabled")
         return []
 
+    async def search_async(
+        self,
+        query: str,
+        catalog: ToolCatalog,
+        top_k: int = 5,
+        domain: str | None = None,
+        min_score: float = 0.3
+    ) -> list[tuple[ToolDefinition, float]]:
+        """
+        Non-blocking variant of ``search`` for use from async code.
+
+        Only model loading and encoding run on the inference executor: the
+        query (if uncached) and, for a cold in-memory fallback, the catalog's
+        tools. The Qdrant round trip runs on a worker thread without holding
+        an inference slot; the in-memory fallback is updated and scored on
+        the calling thread.
+        """
+        cache_key = self._get_cache_key(query)
+        if cache_key in self.embedding_cache:
+            query_embedding = self._get_cached_embedding(cache_key)
+        else:
+            query_embedding = await self.inference_executor.run(self._encode_query, query)
+            self._cache_embedding(cache_key, query_embedding)
+
+        if self.client is None:
+            await asyncio.to_thread(self._init_qdrant_client)
+
+        if self.qdrant_available:
+            try:
+                return await asyncio.to_thread(
+                    self._qdrant_search, query_embedding, catalog, top_k, domain, min_score
+                )
+            except Exception as e:
+                logger.warning(f"Qdrant search failed: {e}, falling back to memory")
+                self.qdrant_available = False
+
+        if self.fallback_to_memory:
+            if not self.memory_embeddings and catalog.tools:
+                # Cold fallback index: only the encode runs on the executor,
+                # the index itself is updated on this thread
+                tools = list(catalog.tools.values())
+                hashes = {tool.name: self._get_content_hash(tool) for tool in tools}
+                changed, removed = self._memory_changes(tools, hashes, delete_missing=True)
+                embeddings = None
+                if changed:
+                    embeddings = await self.inference_executor.run(self._encode_tools, changed, 32)
+                with self._index_lock:
+                    self._apply_memory_changes(tools, hashes, changed, removed, embeddings)
+            return self._memory_search(query_embedding, catalog, top_k, min_score, domain)
+
+        logger.error("Vector search unavailable and fallback disabled")
+        return []
+
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Load the model if needed and encode one query (touches no engine state)."""
+        self._init_embedding_model()
+        embedding: np.ndarray = self._encode_texts([query], batch_size=1, show_progress=False)[0]
+        return embedding
+
     def _qdrant_search(
         self,
         query_embedding: np.ndarray,
@@ -376,13 +1282,15 @@ class VectorToolSearchEngine:
                 ]
             )
 
-        # Search in Qdrant
+        # Search in Qdrant (int8 collections can rescore with the original vectors)
+        search_params = qdrant_search_params(self.embedding_dtype, rescore=self.exact_rerank)
         search_results = self.client.search(  # type: ignore[union-attr]
             collection_name=self.collection_name,
             query_vector=query_embedding.tolist(),
             query_filter=search_filter,
             limit=top_k,
-            score_threshold=min_score
+            score_threshold=min_score,
+            **({"search_params": search_params} if search_params is not None else {})
         )
 
         # Convert results to (ToolDefinition, score) tuples
@@ -410,23 +1318,15 @@ class VectorToolSearchEngine:
             logger.warning("No embeddings in memory, indexing catalog...")
             self.index_catalog(catalog)
 
-        # Compute cosine similarity for all tools
-        scores = []
-        for tool_name, embedding in self.memory_embeddings.items():
-            if tool_name in catalog.tools:
-                tool = catalog.tools[tool_name]
-
-                # Apply domain filter if specified
-                if domain and tool.domain != domain:
-                    continue
-
-                similarity = np.dot(query_embedding, embedding)
-                if similarity >= min_score:
-                    scores.append((tool, float(similarity)))
-
-        # Sort by score descending
-        scores.sort(key=lambda x: x[1], reverse=True)
-        results = scores[:top_k]
+        # One dot product over the (domain-restricted) matrix + argpartition
+        hits = self.memory_embeddings.search(
+            query_embedding,
+            top_k,
+            min_score=min_score,
+            domain=domain,
+            allowed=catalog.tools,
+        )
+        results = [(catalog.tools[name], score) for name, score in hits]
 
         logger.info(f"In-memory search returned {len(results)} results")
         return results
@@ -456,7 +1356,7 @@ class VectorToolSearchEngine:
         for i, text in enumerate(texts):
             cache_key = self._get_cache_key(text)
             if cache_key in self.embedding_cache:
-                cached_embeddings.append((i, self.embedding_cache[cache_key]))
+                cached_embeddings.append((i, self._get_cached_embedding(cache_key)))
             else:
                 texts_to_encode.append(text)
                 text_indices.append(i)
@@ -476,24 +1376,11 @@ class VectorToolSearchEngine:
             batch_size = min(batch_size * 4, 128)  # 4x larger batches on GPU
             logger.debug(f"Using GPU batch size: {batch_size}")
 
-        # Generate embeddings
-        if self.embedding_model is None:
-            # Embeddings unavailable; return zeros
-            new_embeddings = np.zeros((len(texts_to_encode), self.embedding_dim))
-        else:
-            new_embeddings = self.embedding_model.encode(
-                texts_to_encode,
-                batch_size=batch_size,
-                show_progress_bar=show_progress,
-                convert_to_numpy=True,
-                normalize_embeddings=True,
-                device=self.device
-            )
+        new_embeddings = self._encode_texts(texts_to_encode, batch_size, show_progress)
 
         # Cache new embeddings
         for i, text in enumerate(texts_to_encode):
-            cache_key = self._get_cache_key(text)
-            self.embedding_cache[cache_key] = new_embeddings[i]
+            self._cache_embedding(self._get_cache_key(text), new_embeddings[i])
 
         # Combine cached and new embeddings
         result = np.zeros((len(texts), self.embedding_dim))
@@ -504,6 +1391,32 @@ class VectorToolSearchEngine:
 
         return result
 
+    def _encode_texts(self, texts: list[str], batch_size: int, show_progress: bool) -> np.ndarray:
+        """Run the model on texts (zeros if embeddings are unavailable)."""
+        if self.embedding_model is None:
+            return np.zeros((len(texts), self.embedding_dim))
+        embeddings: np.ndarray = self.embedding_model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=show_progress,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            device=self.device
+        )
+        return embeddings
+
+    def _cache_embedding(self, cache_key: str, embedding: np.ndarray) -> None:
+        """Store an embedding in the in-process cache at ``embedding_dtype`` precision"""
+        if self.embedding_dtype == "float32":
+            self.embedding_cache[cache_key] = embedding
+        else:
+            self.embedding_cache[cache_key] = quantize(embedding, self.embedding_dtype)
+
+    def _get_cached_embedding(self, cache_key: str) -> np.ndarray:
+        """Read an embedding from the in-process cache as float32"""
+        entry = self.embedding_cache[cache_key]
+        return entry.dequantize() if isinstance(entry, QuantizedVectors) else entry
+
     def _get_cache_key(self, text: str) -> str:
         """Generate cache key from text (first 100 chars hash)"""
         return str(hash(text[:100]))
@@ -555,8 +1468,7 @@ class VectorToolSearchEngine:
 
         # Cache results
         for i, tool in enumerate(tools):
-            cache_key = self._get_cache_key(self._get_searchable_text(tool))
-            self.embedding_cache[cache_key] = embeddings[i]
+            self._cache_embedding(self._get_cache_key(self._get_searchable_text(tool)), embeddings[i])
 
         logger.info(f"Embedding cache size: {len(self.embedding_cache)} entries")
 
@@ -589,35 +1501,23 @@ class VectorToolSearchEngine:
         """
         if self.qdrant_available and self.client is not None:
             try:
-                # Find point ID by tool_name
-                search_results = self.client.scroll(
+                self.client.delete(
                     collection_name=self.collection_name,
-                    scroll_filter=Filter(
-                        must=[
-                            FieldCondition(
-                                key="tool_name",
-                                match=MatchValue(value=tool_name)
-                            )
-                        ]
-                    ),
-                    limit=1
+                    points_selector=[self._get_point_id(tool_name)]
                 )
-
-                if search_results[0]:
-                    point_id = search_results[0][0].id
-                    self.client.delete(
-                        collection_name=self.collection_name,
-                        points_selector=[point_id]
-                    )
-                    logger.info(f"Deleted tool '{tool_name}' from Qdrant")
-                    return True
+                if self._qdrant_hashes is not None:
+                    self._qdrant_hashes.pop(tool_name, None)
+                logger.info(f"Deleted tool '{tool_name}' from Qdrant")
+                return True
             except Exception as e:
                 logger.error(f"Failed to delete tool from Qdrant: {e}")
 
-        # Fallback: Delete from memory
-        if tool_name in self.memory_embeddings:
-            del self.memory_embeddings[tool_name]
-            del self.memory_tools[tool_name]
+        # Fallback: Delete from memory (a persisted IVF index is rewritten on
+        # the next index_catalog/save_memory_index; stale rows never surface
+        # because memory search only returns tools present in the catalog)
+        if self.memory_embeddings.remove(tool_name):
+            self.memory_tools.pop(tool_name, None)
+            self._memory_hashes.pop(tool_name, None)
             return True
 
         return False
@@ -627,6 +1527,8 @@ class VectorToolSearchEngine:
         if self.qdrant_available and self.client is not None:
             try:
                 self.client.delete_collection(self.collection_name)
+                self._qdrant_hashes = None
+                self._qdrant_legacy_ids = []
                 logger.info(f"Cleared collection: {self.collection_name}")
                 return True
             except Exception as e:
@@ -635,4 +1537,5 @@ class VectorToolSearchEngine:
         # Clear memory fallback
         self.memory_embeddings.clear()
         self.memory_tools.clear()
+        self._memory_hashes.clear()
         return True
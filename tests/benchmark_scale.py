@@ -13,15 +13,25 @@ Measures:
 Compares Phase 3 (baseline) vs Phase 7 (optimized).
 """
 
+import gc
+import json
 import random
 import time
+import tracemalloc
 
+import numpy as np
 import pytest
 
+from orchestrator.shared.columnar_catalog import ColumnarToolCatalog
 from orchestrator.shared.models import ToolCatalog, ToolDefinition, ToolExample, ToolParameter
+from orchestrator.tools.catalog_snapshot import CatalogSnapshot, write_snapshot
 from orchestrator.tools.sharded_catalog import ShardedCatalog
 from orchestrator.tools.tool_search import ToolSearchEngine  # Phase 3 baseline
-from orchestrator.tools.vector_search import VectorToolSearchEngine  # Phase 7 optimized
+from orchestrator.tools.vector_search import (  # Phase 7 optimized
+    InMemoryVectorIndex,
+    IVFVectorIndex,
+    VectorToolSearchEngine,
+)
 
 # Lightweight fallback for pytest-benchmark when plugin isn't installed.
 try:
@@ -374,6 +384,270 @@ class TestShardedCatalogPerformance:
         assert len(global_results) > 0
 
 
+# ============================================================
+# Local ANN (IVF) Benchmarks
+# ============================================================
+
+def generate_clustered_embeddings(size: int, num_queries: int = 100, dim: int = 384, topics: int = 500):
+    """Generate topic-clustered vectors resembling tool description embeddings"""
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(topics, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, topics, size)] + rng.normal(size=(size, dim)).astype(np.float32)
+    queries = centers[rng.integers(0, topics, num_queries)] + rng.normal(size=(num_queries, dim)).astype(np.float32)
+    return vectors, queries
+
+
+class TestLocalANNIndex:
+    """Compare IVF approximate search against exhaustive in-memory search"""
+
+    @pytest.mark.parametrize("catalog_size", [10_000, 50_000, 100_000])
+    def test_ivf_recall_and_latency(self, catalog_size):
+        """Measure recall@10 and per-query latency vs exhaustive search"""
+        vectors, queries = generate_clustered_embeddings(catalog_size)
+        names = [f"tool_{i}" for i in range(catalog_size)]
+        domains = [f"domain_{i % 20}" for i in range(catalog_size)]
+
+        exact = InMemoryVectorIndex(dim=vectors.shape[1])
+        exact.upsert_many(names, domains, vectors)
+
+        build_start = time.perf_counter()
+        ivf = IVFVectorIndex(dim=vectors.shape[1], n_probe=8)
+        ivf.upsert_many(names, domains, vectors)
+        build_time = (time.perf_counter() - build_start) * 1000
+
+        exact_time = ivf_time = 0.0
+        recall = 0.0
+        for query in queries:
+            start = time.perf_counter()
+            expected = exact.search(query, top_k=10)
+            exact_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            hits = ivf.search(query, top_k=10)
+            ivf_time += time.perf_counter() - start
+
+            recall += len({n for n, _ in expected} & {n for n, _ in hits}) / 10
+
+        recall /= len(queries)
+        exact_ms = exact_time * 1000 / len(queries)
+        ivf_ms = ivf_time * 1000 / len(queries)
+
+        print(f"\nIVF ({catalog_size} vectors, {len(ivf.centroids)} lists, n_probe=8):")
+        print(f"  Build: {build_time:.0f}ms")
+        print(f"  Exhaustive: {exact_ms:.2f}ms/query")
+        print(f"  IVF: {ivf_ms:.2f}ms/query ({exact_ms / ivf_ms:.1f}x faster)")
+        print(f"  Recall@10: {recall:.3f}")
+
+        assert recall >= 0.9, f"IVF recall {recall:.3f} below 0.9"
+        assert ivf_ms < exact_ms
+
+    def test_ivf_incremental_updates_and_reload(self, tmp_path):
+        """Incremental insert/delete and save/load keep recall without retraining"""
+        vectors, queries = generate_clustered_embeddings(20_000)
+        names = [f"tool_{i}" for i in range(len(vectors))]
+        domains = ["general"] * len(vectors)
+
+        ivf = IVFVectorIndex(dim=vectors.shape[1])
+        ivf.upsert_many(names[:10_000], domains[:10_000], vectors[:10_000])
+
+        # Insert in small batches, as index_catalog would for new tools
+        insert_start = time.perf_counter()
+        for start in range(10_000, 20_000, 100):
+            ivf.upsert_many(names[start:start + 100], domains[start:start + 100], vectors[start:start + 100])
+        insert_ms = (time.perf_counter() - insert_start) * 1000 / 100
+
+        for name in names[:1_000]:
+            ivf.remove(name)
+
+        path = tmp_path / "ivf.npz"
+        save_start = time.perf_counter()
+        ivf.save(path)
+        load_start = time.perf_counter()
+        loaded = IVFVectorIndex.load(path)
+        load_time = (time.perf_counter() - load_start) * 1000
+        save_time = (load_start - save_start) * 1000
+
+        exact = InMemoryVectorIndex(dim=vectors.shape[1])
+        exact.upsert_many(names[1_000:], domains[1_000:], vectors[1_000:])
+        recall = sum(
+            len({n for n, _ in exact.search(q, top_k=10)} & {n for n, _ in loaded.search(q, top_k=10)}) / 10
+            for q in queries
+        ) / len(queries)
+
+        print("\nIVF incremental (20000 vectors):")
+        print(f"  Insert: {insert_ms:.2f}ms per 100-vector batch")
+        print(f"  Save: {save_time:.0f}ms, Load: {load_time:.0f}ms")
+        print(f"  Recall@10 after updates + reload: {recall:.3f}")
+
+        assert len(loaded) == 19_000
+        assert recall >= 0.9
+
+
+# ============================================================
+# Columnar Catalog Benchmarks
+# ============================================================
+
+def generate_tool_records(size: int) -> list[dict]:
+    """Serialized tool dicts, as read back from a JSON discovery cache"""
+    catalog = generate_large_catalog(min(size, 1000))
+    templates = [tool.model_dump(mode="json") for tool in catalog.tools.values()]
+    records = []
+    for i in range(size):
+        record = dict(templates[i % len(templates)])
+        record["name"] = f"{record['name']}_{i}"
+        records.append(record)
+    return records
+
+
+def measure_load(load):
+    """Return (result, seconds, bytes allocated); memory is traced in a second run"""
+    gc.collect()
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, allocated
+
+
+class TestColumnarCatalog:
+    """Compare ColumnarToolCatalog against the pydantic ToolCatalog at scale"""
+
+    @pytest.mark.parametrize("catalog_size", [10_000, 100_000])
+    def test_memory_and_load_time(self, catalog_size):
+        """Load the same serialized records into both backends"""
+        records = generate_tool_records(catalog_size)
+
+        regular, regular_time, regular_bytes = measure_load(
+            lambda: ToolCatalog(tools={r["name"]: ToolDefinition.model_validate(r) for r in records})
+        )
+        del regular
+        columnar, columnar_time, columnar_bytes = measure_load(
+            lambda: ColumnarToolCatalog.from_records(records)
+        )
+
+        name = records[catalog_size // 2]["name"]
+        start = time.perf_counter()
+        tool = columnar.get_tool(name)
+        first_access_us = (time.perf_counter() - start) * 1e6
+        start = time.perf_counter()
+        mcp_tools = columnar.get_by_type("mcp")
+        by_type_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\nColumnar catalog ({catalog_size} tools):")
+        print(f"  ToolCatalog: {regular_time * 1000:.0f}ms load, {regular_bytes / 2**20:.1f}MiB")
+        print(f"  Columnar:    {columnar_time * 1000:.0f}ms load, {columnar_bytes / 2**20:.1f}MiB "
+              f"({regular_bytes / columnar_bytes:.1f}x smaller)")
+        print(f"  First get_tool: {first_access_us:.0f}us, get_by_type (empty): {by_type_ms:.2f}ms")
+
+        assert tool is not None and tool.name == name
+        assert mcp_tools == []
+        assert columnar_bytes * 3 < regular_bytes
+        assert columnar_time < regular_time
+
+
+# ============================================================
+# Catalog Snapshot Cold Start
+# ============================================================
+
+class TestCatalogSnapshotColdStart:
+    """Time from process start (catalog on disk) to the first search result"""
+
+    def test_cold_start_first_search(self, tmp_path):
+        """JSON cache + index build vs binary snapshot + restored search state"""
+        catalog = ToolCatalog(tools={r["name"]: ToolDefinition.model_validate(r)
+                                     for r in generate_tool_records(10_000)})
+        query = "create user in github"
+
+        builder = ToolSearchEngine(cache_dir=tmp_path / "build", disk_cache=False)
+        json_path = tmp_path / "discovered_tools.json"
+        json_path.write_text(json.dumps(catalog.model_dump(), default=str))
+        snapshot_path = write_snapshot(
+            tmp_path / "discovered_tools.snapshot", catalog, builder.export_search_state(catalog)
+        )
+
+        # Load the embedding model up front: both paths pay it equally
+        json_engine = ToolSearchEngine(cache_dir=tmp_path / "json", disk_cache=False)
+        json_engine._init_embedding_model()
+        start = time.perf_counter()
+        with open(json_path) as f:
+            loaded = ToolCatalog(**json.load(f))
+        json_results = json_engine.search(query, loaded, top_k=5)
+        json_time = (time.perf_counter() - start) * 1000
+
+        snapshot_engine = ToolSearchEngine(cache_dir=tmp_path / "worker", disk_cache=False)
+        snapshot_engine._init_embedding_model()
+        start = time.perf_counter()
+        with CatalogSnapshot.open(snapshot_path) as snapshot:
+            restored = snapshot.to_catalog()
+            snapshot_engine.restore_search_state(restored, snapshot.search_state())
+        snapshot_results = snapshot_engine.search(query, restored, top_k=5)
+        snapshot_time = (time.perf_counter() - start) * 1000
+
+        print("\nCold start to first search (10000 tools):")
+        print(f"  JSON cache:      {json_time:.0f}ms")
+        print(f"  Binary snapshot: {snapshot_time:.0f}ms")
+
+        assert [t.name for t, _ in snapshot_results] == [t.name for t, _ in json_results]
+        assert snapshot_time < json_time
+        assert snapshot_time < 1000
+
+
+# ============================================================
+# Discovery API Lookups
+# ============================================================
+
+class _RecordPlugin:
+    def __init__(self, records: list[dict]):
+        self.records = records
+
+    def get_tools(self) -> list[dict]:
+        return self.records
+
+    async def execute(self, tool_name: str, params: dict) -> dict:
+        return params
+
+
+class TestDiscoveryLookups:
+    """get_tool_info / list_tools_by_domain as called by the CLI and REST wrapper"""
+
+    def test_lookup_throughput(self):
+        """Indexed lookups vs rescanning and validating every plugin's tools"""
+        from orchestrator.plugins.registry import get_registry
+        from orchestrator.tools import discovery_api
+
+        registry = get_registry()
+        registry.clear()
+        records = generate_tool_records(5_000)
+        registry.register("benchmark", _RecordPlugin(records))
+        names = [r["name"] for r in random.Random(0).sample(records, 200)]
+
+        try:
+            # Previous behaviour: every lookup walked the plugins and validated each entry
+            start = time.perf_counter()
+            for name in names[:20]:
+                next(t for tools in registry.get_all_tools().values()
+                     for t in map(ToolDefinition.model_validate, tools) if t.name == name)
+            scan_ms = (time.perf_counter() - start) * 1000 / 20
+
+            discovery_api.get_tool_info(names[0])  # builds the index
+            start = time.perf_counter()
+            for name in names:
+                assert discovery_api.get_tool_info(name).name == name
+                discovery_api.list_tools_by_domain("github")
+            indexed_ms = (time.perf_counter() - start) * 1000 / len(names)
+        finally:
+            registry.unregister("benchmark")
+
+        print("\nDiscovery lookup (5000 tools):")
+        print(f"  Validate + scan: {scan_ms:.2f}ms per lookup")
+        print(f"  Indexed:         {indexed_ms:.3f}ms per lookup")
+        assert indexed_ms * 10 < scan_ms
+
+
 # ============================================================
 # Comparison Summary
 # ============================================================
@@ -0,0 +1,206 @@
+"""
+Tests for binary catalog snapshots and search-state restore.
+"""
+
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from orchestrator.shared.columnar_catalog import ColumnarToolCatalog
+from orchestrator.shared.models import ToolCatalog, ToolDefinition, ToolExample, ToolParameter
+from orchestrator.tools.bm25_index import BM25Index
+from orchestrator.tools.catalog_snapshot import CatalogSnapshot, write_snapshot
+from orchestrator.tools.tool_discovery import ToolDiscoveryOrchestrator, ToolDiscoveryService
+from orchestrator.tools.tool_search import ToolSearchEngine
+
+
+class HashingModel:
+    """Deterministic embedding stand-in that records what it encodes"""
+
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.encoded: list[str] = []
+
+    def encode(self, sentences, **kwargs):
+        batch = [sentences] if isinstance(sentences, str) else list(sentences)
+        self.encoded.extend(batch)
+        vectors = np.zeros((len(batch), self.dim), dtype=np.float32)
+        for i, text in enumerate(batch):
+            for token in text.lower().replace(":", " ").split():
+                vectors[i, int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dim] += 1.0
+        return vectors[0] if isinstance(sentences, str) else vectors
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+
+@pytest.fixture
+def catalog():
+    catalog = ToolCatalog(source="test", metadata={"origin": "unit"})
+    for i, (domain, verb) in enumerate([
+        ("github", "create pull request"), ("github", "list repositories"),
+        ("slack", "send message"), ("slack", "list channels"),
+        ("aws", "upload file to bucket"), ("finance", "extract receipt text"),
+    ]):
+        catalog.add_tool(ToolDefinition(
+            name=f"{domain}_tool_{i}",
+            type="mcp" if i % 2 else "function",
+            description=f"{verb.capitalize()} in {domain}",
+            domain=domain,
+            defer_loading=i == 4,
+            parameters=[ToolParameter(name="target", type="string", description=f"{verb} target", required=True)],
+            examples=[ToolExample(scenario=verb, input={"target": "x"}, output={"ok": True})],
+        ))
+    return catalog
+
+
+def make_engine(cache_dir, model=None) -> ToolSearchEngine:
+    engine = ToolSearchEngine(cache_dir=cache_dir, disk_cache=False, small_catalog_threshold=0)
+    engine.embedding_model = model or HashingModel()
+    return engine
+
+
+def test_roundtrip_catalog(tmp_path, catalog):
+    path = write_snapshot(tmp_path / "tools.snapshot", catalog)
+
+    with CatalogSnapshot.open(path) as snapshot:
+        assert len(snapshot) == 6
+        assert snapshot.names == list(catalog.tools)
+        assert snapshot.search_state() is None
+        restored = snapshot.to_catalog()
+
+    assert restored.tools == catalog.tools
+    assert restored.source == "test"
+    assert restored.metadata == {"origin": "unit"}
+    assert restored.discovered_at == catalog.discovered_at
+
+
+def test_lazy_catalog_reads_mapped_records(tmp_path, catalog):
+    path = write_snapshot(tmp_path / "tools.snapshot", catalog)
+    snapshot = CatalogSnapshot.open(path)
+    lazy = snapshot.lazy_catalog()
+
+    assert snapshot.get_tool("slack_tool_2") == catalog.get_tool("slack_tool_2")
+    assert lazy.get_description("aws_tool_4") == "Upload file to bucket in aws"
+    assert lazy.get_by_type("mcp") == catalog.get_by_type("mcp")
+    assert lazy.to_llm_format(defer_loading=True) == catalog.to_llm_format(defer_loading=True)
+
+    # Mutating copies the mapped columns; the snapshot itself is untouched
+    extra = ToolDefinition(name="extra", type="agent", description="Extra tool")
+    lazy.add_tool(extra)
+    assert lazy.get_tool("extra") is extra
+    assert len(snapshot) == 6
+    snapshot.close()
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "tools.snapshot"
+    path.write_bytes(b'{"tools": {}}' + b" " * 64)
+    with pytest.raises(ValueError):
+        CatalogSnapshot.open(path)
+
+
+def test_search_state_restore_skips_indexing_and_encoding(tmp_path, catalog):
+    builder = make_engine(tmp_path / "build")
+    path = write_snapshot(tmp_path / "tools.snapshot", catalog, builder.export_search_state(catalog))
+    expected = builder.search("send a slack message", catalog, top_k=3, min_score=0.0)
+
+    # Fresh engine with an empty embedding store (a new host)
+    model = HashingModel()
+    engine = make_engine(tmp_path / "worker", model)
+    with CatalogSnapshot.open(path) as snapshot:
+        restored = snapshot.to_catalog()
+        assert engine.restore_search_state(restored, snapshot.search_state())
+
+    bm25_version = engine.bm25_index.version
+    results = engine.search("send a slack message", restored, top_k=3, min_score=0.0)
+
+    assert [(t.name, round(s, 6)) for t, s in results] == [(t.name, round(s, 6)) for t, s in expected]
+    assert engine.bm25_index.version == bm25_version
+    assert model.encoded == ["send a slack message"]
+
+
+def test_search_state_mismatch_is_ignored(tmp_path, catalog):
+    engine = make_engine(tmp_path / "build")
+    state = engine.export_search_state(catalog)
+    other = ToolCatalog(tools=dict(list(catalog.tools.items())[:3]))
+
+    assert not make_engine(tmp_path / "worker").restore_search_state(other, state)
+    with pytest.raises(ValueError):
+        write_snapshot(tmp_path / "bad.snapshot", other, state)
+
+
+def test_bm25_state_supports_updates_after_load(catalog):
+    tools = list(catalog.tools.values())
+    built = BM25Index()
+    built.sync(tools)
+    loaded = BM25Index()
+    names = [tool.name for tool in tools]
+    loaded.load_state(names, built.export_state(names), tools)
+
+    changed = tools[0].model_copy(update={"description": "Rotate slack credentials"})
+    for index in (built, loaded):
+        index.add(changed)
+        index.remove(tools[1].name)
+
+    names = [tool.name for tool in tools if tool.name != tools[1].name]
+    query = "create pull request rotate slack credentials"
+    np.testing.assert_allclose(loaded.get_scores(query, names), built.get_scores(query, names))
+
+
+class StaticDiscoverer(ToolDiscoveryService):
+    def __init__(self, tools):
+        super().__init__("static")
+        self.tools = tools
+        self.calls = 0
+
+    async def discover(self):
+        self.calls += 1
+        return {tool.name: tool for tool in self.tools}
+
+
+def test_orchestrator_uses_snapshot_cache(tmp_path, catalog, monkeypatch):
+    discoverer = StaticDiscoverer(list(catalog.tools.values()))
+    builder = make_engine(tmp_path / "a")
+    first = ToolDiscoveryOrchestrator(cache_dir=tmp_path, search_engine=builder, cache_search_state=True)
+    first.register_discoverer(discoverer)
+    discovered = asyncio.run(first.discover_all())
+    assert first.cache_file.suffix == ".snapshot"
+    expected = builder.search("send a slack message", discovered, top_k=2, min_score=0.0)
+
+    engine = make_engine(tmp_path / "b")
+    second = ToolDiscoveryOrchestrator(cache_dir=tmp_path, search_engine=engine)
+    second.register_discoverer(discoverer)
+    cached = asyncio.run(second.discover_all())
+
+    validated = []
+    validate = ToolDefinition.model_validate_json
+    monkeypatch.setattr(
+        ToolDefinition, "model_validate_json",
+        classmethod(lambda cls, data, **kwargs: validated.append(data) or validate(data, **kwargs)),
+    )
+    results = engine.search("send a slack message", cached, top_k=2, min_score=0.0)
+
+    # Served from the snapshot columns: only the returned tools were validated
+    assert isinstance(cached, ColumnarToolCatalog)
+    assert [(t.name, round(s, 6)) for t, s in results] == [(t.name, round(s, 6)) for t, s in expected]
+    assert len(validated) == len(results)
+    assert discoverer.calls == 1
+    assert dict(cached.tools) == discovered.tools
+    assert len(engine.bm25_index) == len(discovered.tools)
+
+    second.invalidate_cache()
+    assert not second.cache_file.exists()
+
+
+def test_orchestrator_search_state_is_opt_in(tmp_path, catalog):
+    engine = make_engine(tmp_path / "a")
+    orchestrator = ToolDiscoveryOrchestrator(cache_dir=tmp_path, search_engine=engine)
+    orchestrator.register_discoverer(StaticDiscoverer(list(catalog.tools.values())))
+    asyncio.run(orchestrator.discover_all())
+
+    assert engine.embedding_model.encoded == []
+    with CatalogSnapshot.open(orchestrator.cache_file) as snapshot:
+        assert snapshot.search_state() is None
@@ -0,0 +1,115 @@
+"""
+Tests for the catalog change feed (generation counters, subscribe/diff).
+"""
+
+import copy
+import gc
+
+from orchestrator.shared.change_feed import ChangeFeed
+from orchestrator.shared.models import ToolCatalog, ToolDefinition
+
+
+def make_tool(name: str, description: str = "Tool") -> ToolDefinition:
+    return ToolDefinition(name=name, type="function", description=description)
+
+
+def test_generation_and_changes_since():
+    feed = ChangeFeed()
+    assert feed.generation == 0
+    assert feed.changes_since(0) == []
+
+    feed.record("add", "a", source="p")
+    feed.record("update", "a")
+    feed.record("remove", "a")
+
+    assert feed.generation == 3
+    assert [(c.generation, c.kind) for c in feed.changes_since(1)] == [(2, "update"), (3, "remove")]
+    assert feed.changes_since(0)[0].source == "p"
+
+
+def test_truncated_history_requires_rebuild():
+    feed = ChangeFeed(history=2)
+    for name in "abc":
+        feed.record("add", name)
+
+    assert feed.changes_since(0) is None
+    assert feed.diff_since(0) is None
+    assert [c.name for c in feed.changes_since(1)] == ["b", "c"]
+
+
+def test_diff_collapses_changes():
+    feed = ChangeFeed()
+    feed.record("add", "kept", "v1")
+    feed.record("add", "gone", "v1")
+    since = feed.generation
+
+    feed.record("update", "kept", "v2")
+    feed.record("remove", "gone")
+    feed.record("add", "transient", "v1")
+    feed.record("remove", "transient")
+    feed.record("add", "new", "v1")
+    feed.record("update", "new", "v2")
+
+    diff = feed.diff_since(since)
+    assert diff.added == {"new": "v2"}
+    assert diff.updated == {"kept": "v2"}
+    assert diff.removed == {"gone"}
+    assert diff.generation == feed.generation
+    assert not feed.diff_since(feed.generation)
+
+
+def test_subscribers_and_weak_subscriptions():
+    feed = ChangeFeed()
+    seen = []
+    unsubscribe = feed.subscribe(lambda change: seen.append(change.name))
+
+    class Consumer:
+        def __init__(self):
+            self.names = []
+
+        def on_change(self, change):
+            self.names.append(change.name)
+
+    consumer = Consumer()
+    feed.subscribe(consumer.on_change, weak=True)
+    feed.subscribe(lambda change: 1 / 0)  # failing subscribers do not block delivery
+    feed.record("add", "a")
+    assert consumer.names == ["a"]
+
+    del consumer
+    gc.collect()
+    unsubscribe()
+    feed.record("add", "b")
+    assert seen == ["a"]
+    assert len(feed._subscribers) == 1
+
+
+def test_tool_catalog_tracks_changes():
+    catalog = ToolCatalog(source="unit")
+    events = []
+    catalog.subscribe(events.append)
+
+    catalog.add_tool(make_tool("a"))
+    catalog.add_tool(make_tool("b"))
+    since = catalog.generation
+    catalog.add_tool(make_tool("a", "Changed"))
+    assert catalog.remove_tool("b").name == "b"
+    assert catalog.remove_tool("missing") is None
+
+    assert [(e.kind, e.name, e.source) for e in events] == [
+        ("add", "a", "unit"), ("add", "b", "unit"), ("update", "a", "unit"), ("remove", "b", "unit"),
+    ]
+    diff = catalog.diff_since(since)
+    assert diff.updated["a"].description == "Changed"
+    assert diff.removed == {"b"}
+
+
+def test_feed_is_not_part_of_catalog_value():
+    catalog = ToolCatalog(tools={"a": make_tool("a")})
+    other = ToolCatalog(tools={"a": make_tool("a")}, discovered_at=catalog.discovered_at)
+    catalog.add_tool(make_tool("a"))
+
+    assert catalog == other
+    copied = copy.deepcopy(catalog)
+    assert copied.generation == 0
+    assert copied.tools == catalog.tools
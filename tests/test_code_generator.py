@@ -351,3 +351,35 @@ class OutputModel(BaseModel):
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestStubSync:
+    """Test incremental stub regeneration from catalog changes"""
+
+    def test_sync_regenerates_only_changes(self, generator, test_catalog, stub_dir):
+        """sync() writes added/updated stubs and deletes removed ones"""
+        generator.generate_all()
+        assert generator.sync() == {}
+
+        tools_dir = stub_dir / "tools"
+        untouched = tools_dir / "jira" / "create_ticket.py"
+        untouched.write_text("# unchanged marker")
+
+        test_catalog.add_tool(ToolDefinition(
+            name="search_issues", type="mcp", description="Search issues", domain="jira", parameters=[]
+        ))
+        test_catalog.remove_tool("get_document")
+        stubs = generator.sync()
+
+        assert list(stubs) == [str(tools_dir / "jira" / "search_issues.py")]
+        assert untouched.read_text() == "# unchanged marker"
+        assert "search_issues" in (tools_dir / "jira" / "__init__.py").read_text()
+        assert not (tools_dir / "google_drive").exists()
+        assert "google_drive" not in (tools_dir / "__init__.py").read_text()
+        assert generator.get_stub_info("get_document") is None
+
+    def test_sync_without_generation_builds_everything(self, generator, test_catalog):
+        """sync() before generate_all() falls back to a full generation"""
+        stubs = generator.sync()
+        assert len(stubs) == len(test_catalog.tools)
+
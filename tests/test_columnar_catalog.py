@@ -0,0 +1,127 @@
+"""
+Tests for the columnar, lazily-materialized tool catalog.
+"""
+
+import numpy as np
+import pytest
+
+from orchestrator.shared.columnar_catalog import ColumnarToolCatalog
+from orchestrator.shared.models import ToolCatalog, ToolDefinition, ToolExample, ToolParameter
+
+
+def make_tool(name: str, tool_type: str = "function", domain: str = "general", **kwargs) -> ToolDefinition:
+    return ToolDefinition(
+        name=name,
+        type=tool_type,
+        description=f"{name} description",
+        domain=domain,
+        parameters=[ToolParameter(name="id", type="string", description="Identifier", required=True)],
+        examples=[ToolExample(scenario="Basic use", input={"id": "1"}, output={"ok": True})],
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def tools():
+    return [
+        make_tool("github_create_pr", "mcp", "github"),
+        make_tool("slack_send", "function", "slack"),
+        make_tool("github_list_repos", "mcp", "github", defer_loading=True),
+        make_tool("run_code", "code_exec"),
+    ]
+
+
+def test_matches_tool_catalog_api(tools):
+    regular = ToolCatalog(tools={t.name: t for t in tools})
+    columnar = ColumnarToolCatalog.from_catalog(regular)
+
+    assert len(columnar) == 4
+    assert columnar.get_tool("slack_send") == regular.get_tool("slack_send")
+    assert columnar.get_tool("missing") is None
+    assert columnar.get_by_type("mcp") == regular.get_by_type("mcp")
+    assert columnar.get_by_type("agent") == []
+    assert columnar.to_llm_format() == regular.to_llm_format()
+    assert columnar.to_llm_format(defer_loading=True, include_examples=False) == regular.to_llm_format(
+        defer_loading=True, include_examples=False
+    )
+    assert list(columnar.tools) == list(regular.tools)
+    assert columnar.tools["run_code"].type == "code_exec"
+    with pytest.raises(KeyError):
+        columnar.tools["missing"]
+
+
+def test_records_are_materialized_lazily(tools):
+    catalog = ColumnarToolCatalog.from_records(t.model_dump(mode="json") for t in tools)
+
+    assert not catalog._cache
+    assert catalog.get_description("github_create_pr") == "github_create_pr description"
+    assert catalog.get_record("slack_send")["domain"] == "slack"
+    assert sorted(catalog.domains()) == ["general", "github", "slack"]
+    assert not catalog._cache
+
+    tool = catalog.get_tool("github_create_pr")
+    assert tool == tools[0]
+    assert catalog.get_tool("github_create_pr") is tool
+    assert [t.name for t in catalog.get_by_domain("github")] == ["github_create_pr", "github_list_repos"]
+
+
+def test_cache_is_bounded(tools):
+    catalog = ColumnarToolCatalog.from_records((t.model_dump(mode="json") for t in tools), cache_size=2)
+
+    for tool in catalog.tools.values():
+        assert tool.name in catalog
+    assert len(catalog._cache) == 2
+
+
+def test_invalid_record_rejected():
+    catalog = ColumnarToolCatalog()
+    with pytest.raises(ValueError):
+        catalog.add_record({"name": "x", "type": "bogus", "description": "d"})
+    with pytest.raises(ValueError):
+        catalog.add_record({"type": "function", "description": "d"})
+
+
+def test_readd_supersedes_and_compact(tools):
+    catalog = ColumnarToolCatalog.from_tools(tools)
+    updated = make_tool("slack_send", "agent", "slack")
+    catalog.add_tool(updated)
+
+    assert len(catalog) == 4
+    assert catalog.get_tool("slack_send").type == "agent"
+    assert [t.name for t in catalog.get_by_type("function")] == []
+    assert catalog.names() == ["github_create_pr", "github_list_repos", "run_code", "slack_send"]
+
+    size_before = len(catalog._records)
+    catalog.compact()
+    assert len(catalog._records) < size_before
+    assert catalog.get_tool("slack_send") == updated
+    assert catalog.get_tool("run_code") == tools[3]
+    assert catalog.to_catalog().get_by_type("agent") == [updated]
+
+
+def test_aligned_columns_and_generation(tools):
+    catalog = ColumnarToolCatalog.from_tools(tools, cache_size=0)
+    generation = catalog.generation
+    catalog.add_tool(make_tool("slack_send", "agent", "slack"))
+
+    assert catalog.generation > generation
+    assert catalog.tool_domains() == ["github", "github", "general", "slack"]
+    assert catalog.tool_types() == ["mcp", "mcp", "code_exec", "agent"]
+    lazy = catalog.lazy_tools()
+    assert len(lazy) == 4
+    assert [tool.name for tool in lazy[1:3]] == ["github_list_repos", "run_code"]
+
+    generation = catalog.generation
+    catalog.compact()
+    assert catalog.generation > generation
+
+
+def test_column_reads_are_views(tools):
+    catalog = ColumnarToolCatalog.from_tools(tools)
+    codes = catalog._type_codes.view()
+
+    assert np.shares_memory(codes, catalog._type_codes.view())
+    assert not codes.flags.writeable
+    catalog.add_tool(make_tool("slack_send", "agent", "slack"))
+    assert [t.name for t in catalog.get_by_type("agent")] == ["slack_send"]
+    assert len(catalog._live.view()) == 5
@@ -59,3 +59,60 @@ def test_list_by_domain():
     # Default domain is "general" per models
     tools = list_tools_by_domain("general")
     assert any(t.name == "fin" for t in tools)
+
+
+class CountingPlugin:
+    def __init__(self, tools: list[dict[str, Any]]):
+        self.tools = tools
+        self.calls = 0
+
+    def get_tools(self) -> list[dict[str, Any]]:
+        self.calls += 1
+        return self.tools
+
+    async def execute(self, tool_name: str, params: dict[str, Any]) -> Any:
+        return params
+
+
+def test_lookups_use_index_updated_on_register_and_unregister():
+    registry = get_registry()
+    registry.clear()
+    plugin = CountingPlugin([
+        {"name": "gh_pr", "type": "mcp", "description": "Open a pull request", "domain": "github"},
+        {"name": "gh_issue", "type": "function", "description": "File an issue", "domain": "github"},
+        {"name": "bad", "type": "not-a-type", "description": "Invalid entry"},
+    ])
+    registry.register("counting", plugin)
+
+    assert get_tool_info("gh_pr").type == "mcp"
+    calls = plugin.calls
+    for _ in range(50):
+        assert get_tool_info("gh_issue", detail_level="name")["domain"] == "github"
+        assert [t.name for t in list_tools_by_domain("github")] == ["gh_pr", "gh_issue"]
+        assert [t.name for t in search_tools(query="pull", domain="github")] == ["gh_pr"]
+        assert [t.name for t in get_available_tools(type_filter="function")] == ["gh_issue"]
+    assert plugin.calls == calls  # no rescans while nothing changes
+    assert get_tool_info("bad") is None
+
+    registry.register("counting", CountingPlugin([
+        {"name": "gh_pr", "type": "mcp", "description": "Open a draft pull request", "domain": "github"},
+    ]), replace=True)
+    assert get_tool_info("gh_issue") is None
+    assert get_tool_info("gh_pr").description == "Open a draft pull request"
+
+    registry.unregister("counting")
+    assert list_tools_by_domain("github") == []
+    assert get_available_tools() == []
+
+
+def test_index_follows_tools_added_after_registration():
+    registry = get_registry()
+    registry.clear()
+    assert get_tool_info("late_tool") is None
+
+    @tool(description="Added later")
+    def late_tool(params: dict[str, Any]) -> dict[str, Any]:
+        return params
+
+    assert get_tool_info("late_tool").description == "Added later"
+    assert [t.name for t in get_available_tools(plugin="decorators")] == ["late_tool"]
@@ -0,0 +1,95 @@
+"""Tests for the compiled domain keyword matcher"""
+
+import random
+
+from orchestrator.tools.domain_matcher import DomainRegistry, KeywordMatcher
+from orchestrator.tools.sharded_catalog import DOMAIN_KEYWORDS
+
+
+def naive_scores(domains, text):
+    text = text.lower()
+    return {
+        domain: sum(1 for keyword in config["keywords"] if keyword in text)
+        for domain, config in domains.items()
+        if domain != "general"
+    }
+
+
+def test_keyword_matcher_finds_overlapping_keywords():
+    """Every keyword occurrence is found, including overlaps and nested ones"""
+    matcher = KeywordMatcher(["he", "she", "his", "hers", "pull", "pull request"])
+    assert matcher.find("ushers") == {0, 1, 3}
+    assert matcher.find("open a pull request") == {4, 5}
+    assert matcher.find("nothing") == set()
+    assert matcher.find("") == set()
+
+
+def test_keyword_matcher_matches_substring_scan():
+    """Automaton agrees with a per-keyword substring scan on random text"""
+    rng = random.Random(7)
+    alphabet = "abc "
+    keywords = list({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)})
+    matcher = KeywordMatcher(keywords)
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert matcher.find(text) == {i for i, k in enumerate(keywords) if k in text}
+
+
+def test_registry_scores_match_default_keyword_scan():
+    """Default domains score exactly like the original keyword loop"""
+    registry = DomainRegistry(DOMAIN_KEYWORDS)
+    queries = [
+        "create a github pull request and post to slack",
+        "Query the DATABASE table schema",
+        "deploy lambda function to aws",
+        "unrelated text",
+        "",
+    ]
+    for query in queries:
+        assert registry.scores(query) == naive_scores(DOMAIN_KEYWORDS, query)
+
+
+def test_registry_runtime_registration():
+    """Domains and keywords registered later are matched after recompiling"""
+    registry = DomainRegistry(DOMAIN_KEYWORDS)
+    assert registry.scores("open a jira ticket").get("jira") is None
+
+    registry.register("jira", keywords=["Jira", "ticket"], tools=["create_ticket"])
+    assert registry.scores("open a jira ticket")["jira"] == 2
+    assert registry.classify_name("create_ticket_v2") == "jira"
+
+    registry.register("jira", keywords=["sprint"])
+    assert registry.keywords("jira") == ["jira", "ticket", "sprint"]
+    assert registry.scores("plan the sprint")["jira"] == 1
+
+    assert registry.unregister("jira")
+    assert "jira" not in registry.scores("open a jira ticket")
+    assert not registry.unregister("general")
+
+
+def test_classify_name_prefers_tool_names_then_registration_order():
+    """Known tool names beat keywords; ties go to the first registered domain"""
+    registry = DomainRegistry({
+        "alpha": {"keywords": ["shared"], "tools": []},
+        "beta": {"keywords": ["shared"], "tools": ["shared_beta_tool"]},
+    })
+    assert registry.classify_name("shared_thing") == "alpha"
+    assert registry.classify_name("shared_beta_tool") == "beta"
+    assert registry.classify_name("other") is None
+
+
+def test_general_domain_is_never_scored():
+    """The catch-all domain exists but never receives keyword matches"""
+    registry = DomainRegistry({"general": {"keywords": ["anything"], "tools": []}})
+    assert "general" in registry.domains()
+    assert registry.scores("anything") == {}
+
+
+def test_many_domains():
+    """Sixty domains classify correctly in a single pass"""
+    domains = {f"domain{i}": {"keywords": [f"kw{i}x", f"term{i}y"], "tools": []} for i in range(60)}
+    registry = DomainRegistry(domains)
+    scores = registry.scores("use kw42x with term42y and kw7x")
+    assert scores["domain42"] == 2
+    assert scores["domain7"] == 1
+    assert sum(scores.values()) == 3
@@ -0,0 +1,148 @@
+"""
+Tests for the shared embedding server and its client
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from orchestrator.tools import embedding_server
+from orchestrator.tools.embedding_server import (
+    EmbeddingServer,
+    EmbeddingServerError,
+    RemoteEmbeddingModel,
+    embedding_server_running,
+    load_embedding_model,
+)
+
+pytestmark = pytest.mark.skipif(
+    not embedding_server.UNIX_SOCKETS_AVAILABLE, reason="Unix domain sockets not supported"
+)
+
+
+class FakeModel:
+    """Encodes text as [len(text), word count, 1]; records each encode call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        if isinstance(texts, str):
+            return np.array([len(texts), len(texts.split()), 1.0], dtype=np.float32)
+        return np.array([[len(t), len(t.split()), 1.0] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def running_server(tmp_path):
+    """Embedding server on a background event loop"""
+    model = FakeModel()
+    server = EmbeddingServer(
+        socket_path=tmp_path / "embed.sock",
+        models=["fake-model"],
+        max_wait_ms=50,
+        model_loader=lambda name: model,
+    )
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield server, model
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def test_remote_encode_matches_model(running_server):
+    """Remote encode returns SentenceTransformer-shaped arrays"""
+    server, _ = running_server
+    client = RemoteEmbeddingModel("fake-model", socket_path=server.socket_path, fallback=False)
+
+    batch = client.encode(["create issue", "send message now"])
+    assert batch.shape == (2, 3)
+    assert batch[1].tolist() == [16.0, 3.0, 1.0]
+
+    single = client.encode("hello", normalize_embeddings=True)
+    assert single.shape == (3,)
+    assert np.linalg.norm(single) == pytest.approx(1.0)
+    assert client.get_sentence_embedding_dimension() == 3
+    client.close()
+
+
+def test_concurrent_clients_are_batched(running_server):
+    """Requests from many clients within the window share encode calls"""
+    server, model = running_server
+    clients = [
+        RemoteEmbeddingModel("fake-model", socket_path=server.socket_path, fallback=False) for _ in range(8)
+    ]
+
+    def encode(i):
+        return clients[i].encode([f"query {i}", "x" * i])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(encode, range(8)))
+
+    for i, vectors in enumerate(results):
+        assert vectors[0].tolist() == [len(f"query {i}"), 2.0, 1.0]
+        assert vectors[1][0] == i
+    assert server.stats["requests"] == 8
+    assert len(model.calls) < 8  # at least some requests were merged
+    assert sum(len(call) for call in model.calls) == 16
+
+
+def test_unknown_model_is_rejected(running_server):
+    """Models the server does not serve produce an error (no fallback)"""
+    server, _ = running_server
+    client = RemoteEmbeddingModel("other-model", socket_path=server.socket_path, fallback=False)
+    with pytest.raises(EmbeddingServerError):
+        client.encode(["text"])
+
+
+def test_client_falls_back_when_server_missing(tmp_path, monkeypatch):
+    """Without a server the client encodes in process"""
+    local = FakeModel()
+    monkeypatch.setattr(embedding_server, "SENTENCE_AVAILABLE", True)
+    monkeypatch.setattr(embedding_server, "_load_sentence_transformer", lambda name, device=None: local)
+
+    client = RemoteEmbeddingModel("fake-model", socket_path=tmp_path / "missing.sock")
+    vectors = client.encode(["abc"])
+
+    assert vectors.tolist() == [[3.0, 1.0, 1.0]]
+    assert local.calls == [["abc"]]
+
+    strict = RemoteEmbeddingModel("fake-model", socket_path=tmp_path / "missing.sock", fallback=False)
+    with pytest.raises(EmbeddingServerError):
+        strict.encode(["abc"])
+
+
+def test_load_embedding_model_prefers_server(running_server, tmp_path, monkeypatch):
+    """load_embedding_model returns a remote model only while the server runs"""
+    server, _ = running_server
+    monkeypatch.setenv("TOOLWEAVER_EMBEDDING_SOCKET", str(server.socket_path))
+    assert embedding_server_running()
+    assert isinstance(load_embedding_model("fake-model"), RemoteEmbeddingModel)
+
+    monkeypatch.setenv("TOOLWEAVER_EMBEDDING_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(embedding_server, "SENTENCE_AVAILABLE", False)
+    assert load_embedding_model("fake-model") is None
+
+
+def test_server_refuses_second_instance(running_server):
+    """A live socket is not replaced by a second server"""
+    server, _ = running_server
+    second = EmbeddingServer(socket_path=server.socket_path, models=["fake-model"])
+    with pytest.raises(EmbeddingServerError):
+        asyncio.run(second.start())
@@ -0,0 +1,283 @@
+"""
+Tests for plan execution scheduling in the runtime orchestrator.
+"""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from orchestrator._internal.runtime import orchestrator as runtime
+from orchestrator._internal.runtime.dag_scheduler import PlanGraph, StepFailedError
+from orchestrator._internal.runtime.execution_scheduler import ConcurrencyLimits, ExecutionScheduler
+
+
+def make_plan(*steps):
+    """Plan from (step_id, delay_s, depends_on) tuples."""
+    return {
+        "request_id": "test",
+        "steps": [
+            {"id": sid, "tool": "fake", "input": {"delay": delay}, "depends_on": list(deps)}
+            for sid, delay, deps in steps
+        ],
+        "final_synthesis": {"prompt_template": "{{steps}}"},
+    }
+
+
+class FakeSteps:
+    """Stands in for run_step: sleeps for input["delay"], fails for ids in ``failing``."""
+
+    def __init__(self):
+        self.log: list[tuple[str, str, float]] = []
+        self.failing: set[str] = set()
+
+    async def __call__(self, step, step_outputs, mcp_client, monitor=None, a2a_client=None):
+        sid = step["id"]
+        self.log.append(("start", sid, time.perf_counter()))
+        missing = [dep for dep in step.get("depends_on", []) if dep not in step_outputs]
+        assert not missing, f"{sid} started before {missing}"
+        await asyncio.sleep(step["input"]["delay"])
+        if sid in self.failing:
+            self.log.append(("fail", sid, time.perf_counter()))
+            raise ValueError(f"{sid} broke")
+        self.log.append(("end", sid, time.perf_counter()))
+        return {"step": sid, "inputs": sorted(step_outputs)}
+
+    def times(self, event: str) -> dict[str, float]:
+        return {sid: t for e, sid, t in self.log if e == event}
+
+
+@pytest.fixture
+def fake_steps(monkeypatch):
+    fake = FakeSteps()
+    monkeypatch.setattr(runtime, "run_step", fake)
+    monkeypatch.setattr(runtime, "get_monitor", lambda: None)
+    return fake
+
+
+def test_outputs_follow_dependencies(fake_steps):
+    plan = make_plan(("a", 0, []), ("b", 0, ["a"]), ("c", 0, ["a", "b"]))
+    context = asyncio.run(runtime.execute_plan(plan))
+
+    assert set(context["steps"]) == {"a", "b", "c"}
+    assert set(context["steps"]["c"]["inputs"]) >= {"a", "b"}
+
+
+def test_step_starts_when_its_dependencies_finish(fake_steps):
+    # "slow" shares the first wave with "fast"; "next" only needs "fast"
+    plan = make_plan(("slow", 0.3, []), ("fast", 0.02, []), ("next", 0.02, ["fast"]), ("last", 0.02, ["next"]))
+    start = time.perf_counter()
+    asyncio.run(runtime.execute_plan(plan))
+    elapsed = time.perf_counter() - start
+
+    ends = fake_steps.times("end")
+    assert ends["last"] < ends["slow"]
+    assert elapsed < 0.3 + 0.1  # the critical path, not slow + next + last
+
+
+def test_invalid_graphs_rejected_before_running(fake_steps):
+    with pytest.raises(RuntimeError, match="Cyclic"):
+        asyncio.run(runtime.execute_plan(make_plan(("a", 0, []), ("b", 0, ["c"]), ("c", 0, ["b"]))))
+    with pytest.raises(RuntimeError, match="unknown step"):
+        asyncio.run(runtime.execute_plan(make_plan(("a", 0, ["missing"]))))
+    assert fake_steps.log == []
+
+
+def test_failure_stops_scheduling_dependents(fake_steps):
+    fake_steps.failing.add("bad")
+    plan = make_plan(("bad", 0.01, []), ("other", 0.05, []), ("after_bad", 0, ["bad"]))
+
+    with pytest.raises(StepFailedError, match="Step bad failed: bad broke") as info:
+        asyncio.run(runtime.execute_plan(plan))
+
+    assert info.value.step_id == "bad"
+    assert "after_bad" not in fake_steps.times("start")
+    assert "other" in fake_steps.times("end")  # in-flight siblings still finish
+
+
+def test_stream_yields_results_as_steps_complete(fake_steps):
+    plan = make_plan(("slow", 0.2, []), ("fast", 0.01, []), ("next", 0.01, ["fast"]))
+
+    async def consume():
+        events = []
+        async for step_id, status, result, timing in runtime.execute_plan_stream(plan):
+            events.append((step_id, status, result, timing, time.perf_counter()))
+        return events
+
+    events = asyncio.run(consume())
+
+    assert [(sid, status) for sid, status, *_ in events] == [
+        ("fast", "completed"), ("next", "completed"), ("slow", "completed"),
+    ]
+    assert events[0][2] == {"step": "fast", "inputs": []}
+    assert events[0][4] < fake_steps.times("end")["slow"]  # delivered before the plan finished
+    timing = events[2][3]
+    assert timing.started_s < timing.finished_s
+    assert timing.duration_s == pytest.approx(0.2, abs=0.05)
+
+
+def test_stream_reports_failure_then_raises(fake_steps):
+    fake_steps.failing.add("bad")
+    plan = make_plan(("bad", 0, []), ("ok", 0.02, []))
+    events = []
+
+    async def consume():
+        async for event in runtime.execute_plan_stream(plan):
+            events.append(event)
+
+    with pytest.raises(StepFailedError):
+        asyncio.run(consume())
+    assert [(e.step_id, e.status) for e in events] == [("bad", "failed"), ("ok", "completed")]
+    assert isinstance(events[0].result, ValueError)
+
+
+def test_closing_stream_cancels_in_flight_steps(fake_steps):
+    plan = make_plan(("fast", 0, []), ("slow", 5, []))
+
+    async def consume():
+        stream = runtime.execute_plan_stream(plan)
+        async for event in stream:
+            assert event.step_id == "fast"
+            break
+        await stream.aclose()
+
+    start = time.perf_counter()
+    asyncio.run(consume())
+    assert time.perf_counter() - start < 1
+    assert "slow" not in fake_steps.times("end")
+
+
+def test_fail_fast_cancels_in_flight_siblings(fake_steps):
+    fake_steps.failing.add("bad")
+    plan = make_plan(("bad", 0.01, []), ("slow", 5, []), ("after_slow", 0, ["slow"]))
+    events = []
+
+    async def consume():
+        async for event in runtime.execute_plan_stream(plan, failure_mode="fail_fast"):
+            events.append(event)
+
+    start = time.perf_counter()
+    with pytest.raises(StepFailedError, match="Step bad failed"):
+        asyncio.run(consume())
+
+    assert time.perf_counter() - start < 1
+    assert [(e.step_id, e.status) for e in events] == [("bad", "failed"), ("slow", "cancelled")]
+    assert "slow" not in fake_steps.times("end")
+    assert "after_slow" not in fake_steps.times("start")
+
+
+def test_continue_mode_skips_only_descendants(fake_steps):
+    fake_steps.failing.add("bad")
+    plan = make_plan(
+        ("bad", 0, []), ("child", 0, ["bad"]), ("grandchild", 0, ["child", "side"]),
+        ("side", 0.02, []), ("side_next", 0, ["side"]),
+    )
+    events = []
+
+    async def consume():
+        async for event in runtime.execute_plan_stream(plan, failure_mode="continue"):
+            events.append(event)
+
+    with pytest.raises(StepFailedError) as info:
+        asyncio.run(consume())
+
+    statuses = {e.step_id: e.status for e in events}
+    assert statuses == {
+        "bad": "failed", "child": "skipped", "grandchild": "skipped",
+        "side": "completed", "side_next": "completed",
+    }
+    assert set(info.value.outputs) == {"side", "side_next"}
+    assert set(info.value.failures) == {"bad"}
+    assert not {"child", "grandchild"} & set(fake_steps.times("start"))
+
+
+def test_unknown_failure_mode_rejected(fake_steps):
+    with pytest.raises(ValueError, match="failure_mode"):
+        asyncio.run(runtime.execute_plan(make_plan(("a", 0, [])), failure_mode="ignore"))
+
+
+def test_plan_graph_topological_order():
+    graph = PlanGraph({"c": ["a", "b"], "a": [], "b": ["a"], "d": []})
+    assert graph.order.index("a") < graph.order.index("b") < graph.order.index("c")
+    assert graph.dependents["a"] == ["c", "b"]
+    assert graph.in_degrees() == {"c": 2, "a": 0, "b": 1, "d": 0}
+
+
+def test_critical_path_ranks_weighted_by_latency():
+    graph = PlanGraph({"ocr": [], "parse": ["ocr"], "report": ["parse"], "notify": []})
+    assert graph.critical_path() == {"report": 1, "parse": 2, "ocr": 3, "notify": 1}
+
+    class Monitor:
+        def get_tool_metrics(self, tool_name):
+            if tool_name == "slow":
+                return {"latency": {"p50": 8.0, "p95": 20.0}}
+            if tool_name == "fast":
+                return {"latency": {"p50": 0.5, "p95": 1.0}}
+            return {"error": f"No metrics for tool '{tool_name}'"}
+
+    steps = {
+        "ocr": {"id": "ocr", "tool": "fast"}, "parse": {"id": "parse", "tool": "fast"},
+        "report": {"id": "report", "tool": "unknown"}, "notify": {"id": "notify", "tool": "slow"},
+    }
+    estimates = runtime.estimate_step_latencies(steps, Monitor())
+    assert estimates == {"ocr": 0.5, "parse": 0.5, "report": 8.0, "notify": 8.0}  # unknown -> median
+    assert runtime.estimate_step_latencies(steps, Monitor(), percentile="p95")["notify"] == 20.0
+
+    ranks = graph.critical_path(estimates)
+    assert ranks["ocr"] == pytest.approx(9.0)
+    assert ranks["notify"] == pytest.approx(8.0)
+
+
+def test_contended_slots_go_to_the_longest_chain(fake_steps, caplog, monkeypatch):
+    # orchestrator._internal.logger sets its own level and stops propagation once initialised
+    monkeypatch.setattr(logging.getLogger("orchestrator"), "propagate", True)
+    # Two slots; the side steps are listed first, so arrival order would run them first
+    side = [(f"side{i}", 0.05, []) for i in range(4)]
+    chain = [("a", 0.05, []), ("b", 0.05, ["a"]), ("c", 0.05, ["b"])]
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=2))
+
+    with caplog.at_level("INFO", logger="orchestrator"):
+        asyncio.run(runtime.execute_plan(make_plan(*side, *chain), execution_scheduler=scheduler))
+
+    starts, ends = fake_steps.times("start"), fake_steps.times("end")
+    assert min(starts, key=starts.get) == "a"
+    # a's slot passes straight to b rather than to a side step queued earlier
+    assert starts["b"] - ends["a"] < 0.03
+    assert scheduler.stats() == {"active": {}, "waiting": 0}
+    assert "critical-path priorities (no latency data, in steps): a=3, b=2" in caplog.text
+    assert "Admitted step" in caplog.text
+
+
+def test_schedule_log_marks_assumed_latencies(fake_steps, caplog, monkeypatch):
+    monkeypatch.setattr(logging.getLogger("orchestrator"), "propagate", True)
+
+    class Monitor:
+        def get_tool_metrics(self, tool_name):
+            if tool_name == "fake":
+                return {"latency": {"p50": 0.25}}
+            return {"error": f"No metrics for tool '{tool_name}'"}
+
+        def flush(self):
+            pass
+
+    monkeypatch.setattr(runtime, "get_monitor", lambda: Monitor())
+    plan = make_plan(("a", 0, []), ("b", 0, ["a"]))
+    plan["steps"][1]["tool"] = "new_tool"
+
+    with caplog.at_level("INFO", logger="orchestrator"):
+        asyncio.run(runtime.execute_plan(plan))
+
+    assert "critical-path priorities: a=0.500s, b=0.250s (median latency assumed for ['b'])" in caplog.text
+
+
+def test_cancelled_steps_return_their_slots(fake_steps):
+    fake_steps.failing.add("bad")
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=2))
+    plan = make_plan(("bad", 0.01, []), ("slow", 5, []), ("queued", 5, []))
+
+    with pytest.raises(StepFailedError):
+        asyncio.run(runtime.execute_plan(plan, failure_mode="fail_fast", execution_scheduler=scheduler))
+
+    assert "queued" not in fake_steps.times("start")
+    assert scheduler.stats() == {"active": {}, "waiting": 0}
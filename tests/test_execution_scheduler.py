@@ -0,0 +1,182 @@
+"""
+Tests for runtime-wide step bulkheads (global, per-tool, per-agent, per-type limits).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from orchestrator._internal.runtime import orchestrator as runtime
+from orchestrator._internal.runtime.execution_scheduler import ConcurrencyLimits, ExecutionScheduler
+from orchestrator.shared.models import ToolDefinition
+
+
+class Tracker:
+    """Records how many steps run at once, overall and per tool."""
+
+    def __init__(self):
+        self.running: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.finished: dict[str, float] = {}
+
+    async def run(self, scheduler, step, delay):
+        async with scheduler.slot(step):
+            for key in ("all", step["tool"]):
+                self.running[key] = self.running.get(key, 0) + 1
+                self.peak[key] = max(self.peak.get(key, 0), self.running[key])
+            await asyncio.sleep(delay)
+            for key in ("all", step["tool"]):
+                self.running[key] -= 1
+        self.finished[step["id"]] = time.perf_counter()
+
+
+def step(step_id, tool, **extra):
+    return {"id": step_id, "tool": tool, "input": {}, **extra}
+
+
+def test_global_and_metadata_limits():
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=3))
+    scheduler.register_tools([
+        ToolDefinition(name="receipt_ocr", type="mcp", description="OCR", metadata={"max_concurrency": 1}),
+    ])
+    tracker = Tracker()
+
+    async def main():
+        await asyncio.gather(
+            *(tracker.run(scheduler, step(f"ocr{i}", "receipt_ocr"), 0.01) for i in range(4)),
+            *(tracker.run(scheduler, step(f"parse{i}", "parser"), 0.01) for i in range(6)),
+        )
+
+    asyncio.run(main())
+    assert tracker.peak["receipt_ocr"] == 1
+    assert tracker.peak["all"] == 3
+    assert scheduler.stats() == {"active": {}, "waiting": 0}
+
+
+def test_hot_tool_does_not_block_other_tools():
+    # Plenty of global capacity; receipt_ocr is capped at one call at a time
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=8, per_tool={"receipt_ocr": 1}))
+    tracker = Tracker()
+
+    async def main():
+        ocr = [tracker.run(scheduler, step(f"ocr{i}", "receipt_ocr"), 0.05) for i in range(5)]
+        await asyncio.sleep(0)
+        other = tracker.run(scheduler, step("slack", "slack_send"), 0.01)
+        await asyncio.gather(*ocr, other)
+
+    asyncio.run(main())
+    assert tracker.finished["slack"] < tracker.finished["ocr1"]
+
+
+def test_bulkhead_keys_and_limit_precedence():
+    limits = ConcurrencyLimits(per_tool={"ocr": 2}, per_agent={"researcher": 1}, per_type={"agent": 4})
+    scheduler = ExecutionScheduler(limits)
+    scheduler.register_tools([
+        ToolDefinition(name="ocr", type="mcp", description="OCR", metadata={"max_concurrency": 9}),
+        ToolDefinition(name="fetch", type="function", description="Fetch", metadata={"max_concurrency": 3}),
+    ])
+
+    assert scheduler.bulkheads(step("a", "ocr")) == {"global": None, "type:mcp": None, "tool:ocr": 2}
+    assert scheduler.bulkheads(step("b", "fetch")) == {"global": None, "type:function": None, "tool:fetch": 3}
+    assert scheduler.bulkheads(step("c", "", type="agent", agent_id="researcher")) == {
+        "global": None, "type:agent": 4, "agent:researcher": 1,
+    }
+    assert scheduler.bulkheads(step("d", "code_exec"))["type:code_exec"] is None
+
+
+def test_limits_from_env(monkeypatch):
+    monkeypatch.setenv("TOOLWEAVER_MAX_CONCURRENT_STEPS", "16")
+    monkeypatch.setenv("TOOLWEAVER_TOOL_CONCURRENCY", "receipt_ocr=4, github_create_pr=2,broken=x")
+    monkeypatch.setenv("TOOLWEAVER_TOOL_TYPE_CONCURRENCY", "agent=3")
+    limits = ConcurrencyLimits.from_env()
+
+    assert limits.max_concurrent == 16
+    assert limits.default_per_tool is None
+    assert limits.per_tool == {"receipt_ocr": 4, "github_create_pr": 2}
+    assert limits.per_type == {"agent": 3}
+    assert limits.per_agent == {}
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=1))
+
+    async def main():
+        held = await scheduler.acquire(step("a", "x"))
+        waiting = asyncio.ensure_future(scheduler.acquire(step("b", "x")))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["waiting"] == 1
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        held.release()
+        return scheduler.stats()
+
+    assert asyncio.run(main()) == {"active": {}, "waiting": 0}
+
+
+def test_higher_priority_waiter_admitted_first():
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=1))
+    admitted = []
+
+    async def wait_for_slot(step_id, priority):
+        async with scheduler.slot(step(step_id, "x"), priority=priority):
+            admitted.append(step_id)
+
+    async def main():
+        held = await scheduler.acquire(step("first", "x"))
+        waiters = [asyncio.ensure_future(wait_for_slot(sid, p)) for sid, p in [("low", 1.0), ("high", 5.0), ("mid", 2.0)]]
+        await asyncio.sleep(0)
+        held.release()
+        await asyncio.gather(*waiters)
+
+    asyncio.run(main())
+    assert admitted == ["high", "mid", "low"]
+
+
+def test_concurrent_plans_share_the_global_cap(monkeypatch):
+    running = peak = 0
+
+    async def fake_run_step(step, step_outputs, mcp_client, monitor=None, a2a_client=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return step["id"]
+
+    monkeypatch.setattr(runtime, "run_step", fake_run_step)
+    monkeypatch.setattr(runtime, "get_monitor", lambda: None)
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=2))
+    plan = {
+        "request_id": "test",
+        "steps": [{"id": f"s{i}", "tool": "fake", "input": {}} for i in range(4)],
+        "final_synthesis": {"prompt_template": "{{steps}}"},
+    }
+
+    async def main():
+        return await asyncio.gather(*(runtime.execute_plan(plan, execution_scheduler=scheduler) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert all(len(context["steps"]) == 4 for context in results)
+    assert peak == 2
+
+
+def test_tool_lookup_cached_and_skipped_without_limits():
+    lookups = []
+
+    def lookup(name):
+        lookups.append(name)
+        if name == "ocr":
+            return ToolDefinition(name="ocr", type="mcp", description="OCR", metadata={"max_concurrency": 2})
+        return None
+
+    scheduler = ExecutionScheduler(ConcurrencyLimits(max_concurrent=4), tool_lookup=lookup)
+    for _ in range(3):
+        assert scheduler.bulkheads(step("a", "parser")) == {"global": 4}
+        assert scheduler.bulkheads(step("b", "ocr")) == {"global": 4, "type:mcp": None, "tool:ocr": 2}
+    assert lookups == ["parser", "ocr"]
+
+    scheduler.register_tools([ToolDefinition(name="parser", type="function", description="Parse")])
+    scheduler.bulkheads(step("c", "ocr"))
+    assert lookups == ["parser", "ocr", "ocr"]
@@ -5,6 +5,8 @@ from pathlib import Path
 import pytest
 from aiohttp import web
 
+from orchestrator import get_available_tools, get_tool_info
+from orchestrator.plugins.registry import get_registry
 from orchestrator.tools.mcp_adapter import register_mcp_http_adapter
 
 server_path = Path("samples/24-external-mcp-adapter/server.py")
@@ -47,3 +49,25 @@ async def test_mcp_http_adapter_discover_and_execute():
 
     # Cleanup
     await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_discovered_tools_reach_the_tool_index():
+    app = create_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    get_registry().clear()
+    plugin = register_mcp_http_adapter("srv", f"http://localhost:{port}")
+    # Index built before discovery, as when servers are loaded from config first
+    assert get_tool_info("process_user") is None
+
+    await plugin.discover()
+    assert get_tool_info("process_user").type == "mcp"
+    assert [t.name for t in get_available_tools(plugin="srv")] == list(plugin._defs)
+
+    await runner.cleanup()
+    get_registry().clear()
@@ -131,3 +131,33 @@ async def test_mcp_streaming_retries_on_chunk_timeout():
 
     assert chunks == ["good-0", "good-1"]
     assert calls["attempt"] == 2
+
+
+def test_tool_map_follows_plugin_registry():
+    from orchestrator.plugins.registry import get_registry
+
+    class EchoPlugin:
+        def __init__(self, names):
+            self.names = names
+
+        def get_tools(self):
+            return [{"name": name, "description": name} for name in self.names]
+
+        async def execute(self, tool_name, params):
+            return {"tool": tool_name, **params}
+
+    registry = get_registry()
+    client = MCPClientShim()
+    try:
+        registry.register("feed_test", EchoPlugin(["feed_echo", "receipt_ocr"]))
+        assert "feed_echo" in client.tool_map
+        assert client.tool_map["receipt_ocr"].__name__ == "receipt_ocr_worker"  # built-ins win
+
+        registry.register("feed_test", EchoPlugin(["feed_other"]), replace=True)
+        assert "feed_echo" not in client.tool_map
+        assert asyncio.run(client.call_tool("feed_other", {"x": 1})) == {"tool": "feed_other", "x": 1}
+    finally:
+        registry.unregister("feed_test")
+    assert "feed_other" not in client.tool_map
+    assert "receipt_ocr" in client.tool_map
+
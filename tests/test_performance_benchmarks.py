@@ -127,10 +127,10 @@ class TestRegressionBenchmarks:
         print(f"[OK] Large catalog search (200+ tools): {mean:.2f}ms mean, {p95:.2f}ms p95")
 
     @pytest.mark.asyncio
-    async def test_orchestration_latency(self):
+    async def test_orchestration_latency(self, tmp_path):
         """Verify orchestration maintains <100ms overhead."""
         # Create minimal orchestrator
-        monitor = create_backend("local")
+        monitor = create_backend("local", log_dir=str(tmp_path))
         catalog = await discover_tools(use_cache=True)
         Orchestrator(catalog, monitoring=monitor)
 
@@ -151,9 +151,9 @@ class TestRegressionBenchmarks:
         assert mean < 5.0, f"Orchestration overhead: {mean:.2f}ms"
         print(f"[OK] Orchestration latency: {mean:.2f}ms mean")
 
-    def test_monitoring_overhead(self):
+    def test_monitoring_overhead(self, tmp_path):
         """Verify monitoring adds <5% overhead."""
-        monitor = create_backend("local")
+        monitor = create_backend("local", log_dir=str(tmp_path))
 
         # Simulate monitoring calls
         start = time.perf_counter()
@@ -244,3 +244,41 @@ class TestPlannerToolGrouping:
         assert "mcp_tools" in prompt.lower()
         assert "function_tools" in prompt.lower()
         assert "code_exec_tools" in prompt.lower()
+
+    def test_tool_listing_matches_json_dump(self):
+        """Prompt listing built from cached fragments matches json.dumps of the grouped tools"""
+        import json
+
+        from orchestrator._internal.planning.planner import _format_tool_listing
+
+        tools_by_type = {
+            "mcp": [ToolDefinition(
+                name="mcp_tool",
+                type="mcp",
+                description='Quoted "text"\nand newline',
+                parameters=[ToolParameter(name="x", type="string", description="X", required=True)],
+                metadata={"nested": {"a": [1, 2]}, "empty": {}},
+            )],
+            "function": [],
+            "code_exec": [
+                ToolDefinition(name="code_a", type="code_exec", description="A", parameters=[]),
+                ToolDefinition(name="code_b", type="code_exec", description="B", parameters=[]),
+            ],
+        }
+        expected = {
+            f"{tool_type}_tools": {
+                tool.name: {
+                    "description": tool.description,
+                    "parameters": {p.name: p.type for p in tool.parameters},
+                    "required": [p.name for p in tool.parameters if p.required],
+                    "metadata": tool.metadata,
+                }
+                for tool in tools
+            }
+            for tool_type, tools in tools_by_type.items()
+            if tools
+        }
+
+        assert _format_tool_listing(tools_by_type) == json.dumps(expected, indent=2)
+        assert _format_tool_listing(tools_by_type) == json.dumps(expected, indent=2)
+        assert _format_tool_listing({"mcp": []}) == json.dumps({}, indent=2)
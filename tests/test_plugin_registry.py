@@ -416,3 +416,57 @@ def test_plugin_workflow(clean_registry):
     # 7. Clear all
     clean_registry.clear()
     assert list_plugins() == []
+
+
+# ============================================================
+# Test Change Feed
+# ============================================================
+
+def test_registry_change_feed():
+    """Register/replace/unregister publish per-tool events with the plugin as source."""
+    registry = PluginRegistry()
+    events = []
+    registry.subscribe(lambda change: events.append((change.kind, change.name, change.source)))
+
+    registry.register("jira", ValidPlugin())
+    since = registry.generation
+    registry.register("jira", AnotherValidPlugin(), replace=True)
+    registry.unregister("jira")
+
+    assert events == [
+        ("add", "test_tool_1", "jira"),
+        ("remove", "test_tool_1", "jira"),
+        ("add", "test_tool_2", "jira"),
+        ("remove", "test_tool_2", "jira"),
+    ]
+    diff = registry.diff_since(since)
+    assert diff.removed == {"test_tool_1"}
+    assert not diff.added
+
+
+def test_registry_relays_plugin_changes():
+    """Tools added to a plugin after registration reach registry subscribers."""
+    from orchestrator.shared.models import ToolDefinition
+    from orchestrator.tools.templates import FunctionToolTemplate, _TemplatePlugin
+
+    registry = PluginRegistry()
+    plugin = _TemplatePlugin()
+    registry.register("templates", plugin)
+    since = registry.generation
+
+    plugin.add(FunctionToolTemplate(name="tpl_echo", description="Echo"))
+    plugin.add(FunctionToolTemplate(name="tpl_echo", description="Echo v2"))
+    plugin.add(FunctionToolTemplate(name="tpl_temp", description="Temp"))
+    plugin.remove("tpl_temp")
+
+    diff = registry.diff_since(since)
+    assert list(diff.added) == ["tpl_echo"]
+    assert isinstance(diff.added["tpl_echo"], ToolDefinition)
+    assert diff.added["tpl_echo"].description == "Echo v2"
+
+    # Unregistered plugins are no longer relayed
+    registry.unregister("templates")
+    generation = registry.generation
+    plugin.add(FunctionToolTemplate(name="tpl_late", description="Late"))
+    assert registry.generation == generation
+
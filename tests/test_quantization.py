@@ -0,0 +1,76 @@
+"""
+Tests for embedding quantization helpers
+"""
+
+import numpy as np
+import pytest
+
+from orchestrator.shared.quantization import (
+    QuantizedVectors,
+    pack_embedding,
+    quantize,
+    quantized_scores,
+    unpack_embedding,
+)
+
+
+@pytest.fixture
+def normalized_vectors():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 64)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("dtype,itemsize", [("float32", 4), ("float16", 2), ("int8", 1)])
+def test_quantize_roundtrip(normalized_vectors, dtype, itemsize):
+    """Dequantized vectors stay close to the originals"""
+    quantized = quantize(normalized_vectors, dtype)
+
+    assert quantized.codes.dtype.itemsize == itemsize
+    assert (quantized.scales is not None) == (dtype == "int8")
+    assert np.abs(quantized.dequantize() - normalized_vectors).max() < 0.01
+
+
+def test_int8_memory_reduction(normalized_vectors):
+    """int8 storage (codes + per-vector scale) is close to 4x smaller"""
+    quantized = quantize(normalized_vectors, "int8")
+    assert normalized_vectors.nbytes / quantized.nbytes > 3.5
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_quantized_scores_match_float32(normalized_vectors, dtype):
+    """Scores computed on codes approximate exact cosine similarity"""
+    query = normalized_vectors[3]
+    quantized = quantize(normalized_vectors, dtype)
+
+    scores = quantized_scores(quantized.codes, quantized.scales, query)
+    exact = normalized_vectors @ query
+
+    assert scores.dtype == np.float32
+    assert np.abs(scores - exact).max() < 0.02
+    assert int(np.argmax(scores)) == 3
+
+
+def test_quantize_zero_vector():
+    """All-zero vectors quantize without division errors"""
+    quantized = quantize(np.zeros((2, 8)), "int8")
+    assert np.array_equal(quantized.dequantize(), np.zeros((2, 8), dtype=np.float32))
+
+
+def test_pack_unpack_embedding():
+    """Packed payloads round-trip; other values pass through unchanged"""
+    vector = np.linspace(-1, 1, 16).astype(np.float32)
+
+    payload = pack_embedding(vector, "int8")
+    assert isinstance(payload["codes"], bytes) and len(payload["codes"]) == 16
+    assert np.allclose(unpack_embedding(payload), vector, atol=0.01)
+
+    assert unpack_embedding([0.1, 0.2]) == [0.1, 0.2]
+    assert unpack_embedding(None) is None
+
+
+def test_invalid_dtype():
+    """Unsupported dtypes are rejected"""
+    with pytest.raises(ValueError):
+        quantize(np.zeros(4), "int4")
+    assert isinstance(quantize(np.zeros(4), "float16"), QuantizedVectors)
@@ -253,6 +253,22 @@ def test_tool_cache_embeddings(tool_cache):
     assert np.array_equal(cached, embedding)
 
 
+@pytest.mark.parametrize("dtype,tolerance", [("float16", 1e-3), ("int8", 1e-2)])
+def test_tool_cache_quantized_embeddings(redis_cache_with_fallback, dtype, tolerance):
+    """Quantized embeddings round-trip approximately as float32 vectors"""
+    import numpy as np
+
+    cache = ToolCache(redis_cache_with_fallback, embedding_dtype=dtype)
+    embedding = np.random.rand(384).astype(np.float32)
+    embedding /= np.linalg.norm(embedding)
+
+    assert cache.set_embedding("text123", "all-MiniLM-L6-v2", embedding)
+    cached = cache.get_embedding("text123", "all-MiniLM-L6-v2")
+
+    assert cached.dtype == np.float32
+    assert np.allclose(cached, embedding, atol=tolerance)
+
+
 def test_tool_cache_individual_tools(tool_cache):
     """Test caching individual tool metadata"""
     tool_data = {
@@ -1,9 +1,11 @@
 """Tests for ShardedCatalog domain-based tool organization"""
 
+import threading
+
 import pytest
 
 from orchestrator.shared.models import ToolDefinition, ToolParameter
-from orchestrator.tools.sharded_catalog import DOMAIN_KEYWORDS, ShardedCatalog
+from orchestrator.tools.sharded_catalog import DOMAIN_KEYWORDS, ShardedCatalog, _MemoizedEncoder
 
 
 @pytest.fixture
@@ -441,3 +443,233 @@ def test_unknown_domain_defaults_to_general():
 
     assert domain == "general"
     assert "test_tool" in catalog.shards["general"].tools
+
+
+class KeywordModel:
+    """Embeds text as counts of a few topic words; records encoded texts"""
+
+    VOCAB = ["issue", "pull", "message", "channel", "bucket", "query", "release", "notes"]
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        import numpy as np
+
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.encoded.extend(batch)
+        vectors = np.array(
+            [[t.lower().count(w) for w in self.VOCAB] for t in batch], dtype=np.float32
+        ) + 0.01
+        if kwargs.get("normalize_embeddings"):
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0] if single else vectors
+
+    def get_sentence_embedding_dimension(self):
+        return len(self.VOCAB)
+
+
+@pytest.fixture
+def indexed_catalog(sample_tools, tmp_path, monkeypatch):
+    """Sharded catalog whose shard engines share a fake embedding model"""
+    model = KeywordModel()
+    monkeypatch.setattr(
+        "orchestrator.tools.embedding_server.load_embedding_model", lambda name, device=None: model
+    )
+    catalog = ShardedCatalog(cache_dir=tmp_path)
+    for tool in sample_tools:
+        catalog.add_tool(tool)
+    return catalog, model
+
+
+def test_shard_indexes_load_lazily(indexed_catalog):
+    """Only queried shards get a search index"""
+    catalog, _ = indexed_catalog
+    assert catalog.loaded_shards() == []
+
+    results = catalog.search("create github issue", top_k=2, min_score=0.0)
+
+    assert results[0][0].name == "create_github_issue"
+    assert catalog.loaded_shards() == ["github"]
+    assert all(tool.domain == "github" for tool, _ in results)
+
+
+def test_ambiguous_query_fans_out(indexed_catalog):
+    """Queries matching several domains search those shards and merge by score"""
+    catalog, model = indexed_catalog
+    assert set(catalog.candidate_shards("post github issue to slack channel")) == {"github", "slack"}
+
+    results = catalog.search("post github issue to slack channel", top_k=3, min_score=0.0)
+
+    domains = {tool.domain for tool, _ in results}
+    assert domains == {"github", "slack"}
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert set(catalog.loaded_shards()) == {"github", "slack"}
+    # Query encoded once, shared by both shard engines
+    assert model.encoded.count("post github issue to slack channel") == 1
+
+
+def test_fan_out_scores_share_one_bm25_scale(tmp_path, monkeypatch):
+    """Each shard normalizes BM25 by the best raw score across all searched shards"""
+    monkeypatch.setattr(
+        "orchestrator.tools.embedding_server.load_embedding_model", lambda name, device=None: KeywordModel()
+    )
+    catalog = ShardedCatalog(cache_dir=tmp_path)
+    github = ["Create a new issue in a GitHub repository", "Merge a pull request", "List repository branches",
+              "Tag a release", "Fork a repository", "Star a repository"]
+    slack = ["Send a message to a Slack channel", "Archive a channel", "Invite a user",
+             "Set user status", "Upload a file", "Pin a message"]
+    for domain, descriptions in (("github", github), ("slack", slack)):
+        for i, description in enumerate(descriptions):
+            catalog.add_tool(ToolDefinition(
+                name=f"{domain}_tool_{i}", type="function", description=description, domain=domain
+            ))
+
+    query = "post github issue to slack channel"
+    merged = {tool.name: score for tool, score in catalog.search(query, top_k=20, min_score=0.0)}
+
+    maxes = {d: catalog.get_shard_engine(d).bm25_max(query, catalog.shards[d]) for d in ("github", "slack")}
+    global_max = max(maxes.values())
+    assert 0 < min(maxes.values()) < global_max
+
+    for domain, shard_max in maxes.items():
+        engine = catalog.get_shard_engine(domain)
+        standalone = engine.search(query, catalog.shards[domain], top_k=20, min_score=0.0)
+        for tool, score in standalone:
+            raw = engine.bm25_index.get_scores(query, [tool.name])[0]
+            shift = engine.bm25_weight * raw * (1 / global_max - 1 / shard_max)
+            assert merged[tool.name] == pytest.approx(score + shift)
+
+
+def test_search_widens_when_shard_has_no_results(indexed_catalog):
+    """Too few results from the detected shard triggers a search of the rest"""
+    catalog, _ = indexed_catalog
+    results = catalog.search("github query database", top_k=5, min_score=0.0, min_results=4)
+
+    assert len(results) >= 4
+    assert len({tool.name for tool, _ in results}) == len(results)
+
+
+def test_max_loaded_shards_evicts_least_recent(indexed_catalog):
+    """Shard indexes beyond max_loaded_shards are unloaded LRU-first"""
+    catalog, _ = indexed_catalog
+    catalog.max_loaded_shards = 1
+    catalog.search("create github issue", min_score=0.0)
+    catalog.search("send slack message", min_score=0.0)
+
+    assert catalog.loaded_shards() == ["slack"]
+
+
+@pytest.mark.asyncio
+async def test_search_async_matches_sync(indexed_catalog):
+    """search_async returns the same merged results as search"""
+    catalog, _ = indexed_catalog
+    query = "post github issue to slack channel"
+    sync_results = catalog.search(query, top_k=3, min_score=0.0)
+    async_results = await catalog.search_async(query, top_k=3, min_score=0.0)
+
+    assert [t.name for t, _ in async_results] == [t.name for t, _ in sync_results]
+
+
+@pytest.mark.asyncio
+async def test_search_async_builds_engines_off_the_loop(indexed_catalog):
+    """Cold shard engines (model load, BM25 indexing) are created on the fan-out executor"""
+    catalog, _ = indexed_catalog
+    threads = []
+    factory = catalog.search_engine_factory
+
+    def recording_factory(domain):
+        threads.append(threading.get_ident())
+        return factory(domain)
+
+    catalog.search_engine_factory = recording_factory
+    results = await catalog.search_async("post github issue to slack channel", top_k=3, min_score=0.0)
+
+    assert results
+    assert len(threads) == 2 and threading.get_ident() not in threads
+
+
+def test_encoder_memoizes_queries_only():
+    """Tool-text encodes pass through, so they never evict memoized queries"""
+    model = KeywordModel()
+    encoder = _MemoizedEncoder(model, max_entries=1)
+    encoder.encode_query("open an issue")
+    encoder.encode([f"tool text {i}" for i in range(5)])
+
+    model.encoded.clear()
+    encoder.encode(["open an issue"])
+    assert model.encoded == []
+
+
+def test_register_domain_at_runtime():
+    """Registered domains get a shard and are detected from queries"""
+    catalog = ShardedCatalog()
+    catalog.register_domain("jira", keywords=["jira", "ticket", "sprint"], tools=["create_ticket"])
+
+    assert "jira" in catalog.list_domains()
+    assert catalog.detect_domain("open a ticket for the next sprint") == "jira"
+
+    tool = ToolDefinition(name="create_ticket", type="function", description="New ticket", parameters=[])
+    assert catalog.add_tool(tool) == "jira"
+    assert catalog.get_stats()["jira"] == 1
+
+
+def test_auto_register_domains_from_tools():
+    """With auto_register_domains, unknown tool domains become shards"""
+    catalog = ShardedCatalog(auto_register_domains=True)
+    tool = ToolDefinition(
+        name="page_oncall", type="function", description="Page on-call", parameters=[], domain="pagerduty"
+    )
+
+    assert catalog.add_tool(tool) == "pagerduty"
+    assert "page_oncall" in catalog.shards["pagerduty"].tools
+    assert catalog.detect_domain("escalate in pagerduty") == "pagerduty"
+
+
+def test_load_domains_from_yaml(tmp_path):
+    """Domains can be loaded from a YAML config file"""
+    config = tmp_path / "domains.yaml"
+    config.write_text(
+        "jira:\n  keywords: [jira, ticket]\n  tools: [create_ticket]\n"
+        "github:\n  keywords: [gist]\n"
+    )
+    catalog = ShardedCatalog()
+
+    assert catalog.load_domains(config) == 2
+    assert catalog.detect_domain("file a ticket") == "jira"
+    assert catalog.detect_domain("create a gist") == "github"
+
+
+def test_custom_domains_replace_defaults():
+    """Passing domains replaces the default keyword table"""
+    catalog = ShardedCatalog(domains={"billing": {"keywords": ["invoice"], "tools": []}})
+
+    assert catalog.list_domains() == ["billing", "general"]
+    assert catalog.detect_domain("send the invoice") == "billing"
+    assert catalog.detect_domain("create github issue") is None
+
+
+def test_readd_and_remove_publish_changes():
+    """Re-adding moves a tool between shards; removals and updates reach subscribers"""
+    catalog = ShardedCatalog()
+    events = []
+    catalog.subscribe(lambda change: events.append((change.kind, change.name, change.source)))
+
+    tool = ToolDefinition(name="notify", type="function", description="Notify", domain="slack")
+    catalog.add_tool(tool)
+    since = catalog.generation
+    catalog.add_tool(tool.model_copy(update={"domain": "github"}))
+
+    assert "notify" not in catalog.shards["slack"].tools
+    assert "notify" in catalog.shards["github"].tools
+    assert catalog.get_stats()["slack"] == 0
+    assert catalog.get_stats()["github"] == 1
+
+    assert catalog.remove_tool("notify") == "github"
+    assert catalog.remove_tool("notify") is None
+    assert catalog.get_stats()["total"] == 0
+    assert events == [("add", "notify", "slack"), ("update", "notify", "github"), ("remove", "notify", "github")]
+    assert catalog.diff_since(since).removed == {"notify"}
+
@@ -536,5 +536,74 @@ class TestToolExamples:
         assert "Examples:" not in llm_tools_without[0]["description"]
 
 
+
+class TestSerializationMemo:
+    """Test memoized LLM-format serialization."""
+
+    def make_tool(self) -> ToolDefinition:
+        return ToolDefinition(
+            name="search",
+            type="function",
+            description="Search documents",
+            parameters=[ToolParameter(name="query", type="string", description="Query", required=True)],
+        )
+
+    def test_reuses_serialization(self):
+        """Repeated calls reuse the memo but return independent containers."""
+        tool = self.make_tool()
+        calls = []
+        original = tool._build_llm_format
+        object.__setattr__(tool, "_build_llm_format", lambda *a: calls.append(a) or original(*a))
+
+        first = tool.to_llm_format()
+        first["parameters"]["properties"]["query"]["type"] = "mutated"
+        second = tool.to_llm_format()
+
+        assert len(calls) == 1
+        assert second["parameters"]["properties"]["query"]["type"] == "string"
+        assert tool.to_llm_json() is tool.to_llm_json()
+
+    def test_assignment_invalidates(self):
+        """Reassigning a field or copying drops memoized forms."""
+        tool = self.make_tool()
+        assert tool.to_llm_format()["description"] == "Search documents"
+
+        tool.description = "Search everything"
+        assert tool.to_llm_format()["description"] == "Search everything"
+
+        copied = tool.model_copy(update={"description": "Copied"})
+        assert copied.to_llm_format()["description"] == "Copied"
+        assert tool.to_llm_format()["description"] == "Search everything"
+
+    def test_reregistration_invalidates(self):
+        """add_tool drops memos, covering in-place edits of nested fields."""
+        catalog = ToolCatalog()
+        tool = self.make_tool()
+        catalog.add_tool(tool)
+        assert catalog.to_llm_format()[0]["parameters"]["required"] == ["query"]
+
+        tool.parameters[0].required = False
+        catalog.add_tool(tool)
+        assert catalog.to_llm_format()[0]["parameters"]["required"] == []
+
+    def test_memo_does_not_affect_equality(self):
+        """A tool with memoized forms still equals a fresh copy."""
+        tool = self.make_tool()
+        tool.to_llm_format()
+        assert tool == self.make_tool()
+
+    def test_catalog_json_matches_llm_format(self):
+        """Joined fragments equal encoding the whole list."""
+        import json
+
+        catalog = ToolCatalog()
+        catalog.add_tool(self.make_tool())
+        catalog.add_tool(ToolDefinition(name="later", type="mcp", description="Deferred", defer_loading=True))
+
+        for defer in (False, True):
+            assert catalog.to_llm_json(defer_loading=defer) == json.dumps(catalog.to_llm_format(defer_loading=defer))
+        assert ToolCatalog().to_llm_json() == "[]"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
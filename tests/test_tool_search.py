@@ -5,16 +5,58 @@ Tests BM25 search, embedding search, hybrid scoring, caching,
 smart routing, score thresholds, and result ranking.
 """
 
+import hashlib
 import shutil
 import tempfile
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from orchestrator.shared.models import ToolCatalog, ToolDefinition, ToolParameter
+from orchestrator.tools.bm25_index import BM25Index, tokenize, tool_bm25_text
+from orchestrator.tools.inference import InferenceExecutor
 from orchestrator.tools.tool_search import ToolSearchEngine, search_tools
 
 
+class FakeEmbeddingModel:
+    """Deterministic stand-in for SentenceTransformer (bag of hashed tokens)"""
+
+    def __init__(self, dim: int = 32):
+        self.dim = dim
+        self.encoded: list[str] = []
+        self.batches: list[int] = []
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().replace(":", " ").split():
+            vector[int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dim] += 1.0
+        return vector
+
+    def encode(self, sentences, **kwargs):
+        self.batches.append(1 if isinstance(sentences, str) else len(sentences))
+        if isinstance(sentences, str):
+            self.encoded.append(sentences)
+            return self._vector(sentences)
+        self.encoded.extend(sentences)
+        return np.array([self._vector(s) for s in sentences])
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+
+def bm25_scores(engine: ToolSearchEngine, query: str, catalog: ToolCatalog) -> np.ndarray:
+    """Normalized BM25 scores for every catalog tool, via the engine's catalog view"""
+    view = engine._get_catalog_view(catalog)
+    return engine._bm25_scores_slots(view.bm25_index, [query], engine._ensure_bm25_slots(view))[0]
+
+
+def embedding_scores(engine: ToolSearchEngine, query: str, catalog: ToolCatalog) -> np.ndarray:
+    """Embedding scores (0-1) for every catalog tool, via the engine's catalog view"""
+    view = engine._get_catalog_view(catalog)
+    return engine._view_embedding_scores([query], view, np.arange(len(view.tools)))[0]
+
+
 @pytest.fixture
 def temp_cache_dir():
     """Create temporary cache directory for tests"""
@@ -180,7 +222,7 @@ class TestBM25Search:
         tools = list(sample_catalog.tools.values())
 
         # Search for "receipt" - should match receipt_ocr highly
-        scores = engine._bm25_search("receipt ocr", tools)
+        scores = bm25_scores(engine, "receipt ocr", sample_catalog)
 
         # Find receipt_ocr index
         receipt_idx = next(i for i, t in enumerate(tools) if t.name == "receipt_ocr")
@@ -191,13 +233,77 @@ class TestBM25Search:
     def test_bm25_normalization(self, sample_catalog, temp_cache_dir):
         """Test BM25 scores are normalized to 0-1"""
         engine = ToolSearchEngine(cache_dir=temp_cache_dir)
-        tools = list(sample_catalog.tools.values())
 
-        scores = engine._bm25_search("test query", tools)
+        scores = bm25_scores(engine, "test query", sample_catalog)
 
         assert all(0 <= s <= 1 for s in scores)
         assert max(scores) <= 1.0
 
+    def test_bm25_index_matches_okapi(self, sample_catalog):
+        """Test incremental index scores match rank_bm25.BM25Okapi"""
+        rank_bm25 = pytest.importorskip("rank_bm25")
+        tools = list(sample_catalog.tools.values())
+
+        index = BM25Index()
+        index.sync(tools)
+        okapi = rank_bm25.BM25Okapi([tokenize(tool_bm25_text(t)) for t in tools])
+
+        for query in ["receipt ocr", "send message", "sql query file", "unknown"]:
+            expected = okapi.get_scores(tokenize(query))
+            actual = index.get_scores(query, [t.name for t in tools])
+            assert actual == pytest.approx(expected)
+
+    def test_bm25_index_incremental_updates(self, sample_catalog):
+        """Test adding, replacing and removing single tools updates the index"""
+        index = BM25Index()
+        index.sync(sample_catalog.tools.values())
+        assert len(index) == 6
+
+        # Unchanged catalog: nothing re-indexed
+        assert index.sync(sample_catalog.tools.values()) == 0
+
+        new_tool = ToolDefinition(
+            name="pdf_extract",
+            type="function",
+            description="Extract tables from PDF invoices",
+            source="test",
+        )
+        sample_catalog.add_tool(new_tool)
+        assert index.sync(sample_catalog.tools.values()) == 1
+        assert index.get_scores("pdf invoices", ["pdf_extract"])[0] > 0
+
+        del sample_catalog.tools["receipt_ocr"]
+        assert index.sync(sample_catalog.tools.values()) == 1
+        assert "receipt_ocr" not in index
+        assert len(index) == 6
+
+        # Freed slot is reused rather than growing the index
+        sample_catalog.add_tool(new_tool.model_copy(update={"name": "pdf_merge"}))
+        index.sync(sample_catalog.tools.values())
+        assert len(index._names) == 7
+
+    def test_bm25_index_per_catalog(self, sample_catalog, temp_cache_dir):
+        """Test switching catalogs re-indexes nothing and catalog changes reuse its index"""
+        other = ToolCatalog(source="other", version="1.0")
+        other.add_tool(ToolDefinition(name="sms_send", type="function", description="Send an SMS", source="test"))
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, small_catalog_threshold=0)
+
+        engine.search("send", sample_catalog, min_score=0.0)
+        index = engine.bm25_index
+        version = index.version
+        engine.search("send", other, min_score=0.0)
+        assert engine.bm25_index is not index
+        assert len(engine.bm25_index) == 1
+
+        engine.search("send", sample_catalog, min_score=0.0)
+        assert engine.bm25_index is index
+        assert index.version == version
+
+        sample_catalog.add_tool(other.tools["sms_send"])
+        engine.search("send", sample_catalog, min_score=0.0)
+        assert engine.bm25_index is index
+        assert len(index) == 7
+
 
 class TestEmbeddingSearch:
     """Test embedding-based semantic search"""
@@ -208,8 +314,7 @@ class TestEmbeddingSearch:
         assert engine.embedding_model is None
 
         # Trigger embedding search
-        tools = list(sample_catalog.tools.values())
-        engine._embedding_search("test", tools)
+        embedding_scores(engine, "test", sample_catalog)
 
         # Model should now be loaded
         assert engine.embedding_model is not None
@@ -220,7 +325,7 @@ class TestEmbeddingSearch:
         tools = list(sample_catalog.tools.values())
 
         # Search for "communication" - should match slack/email
-        scores = engine._embedding_search("send communication message", tools)
+        scores = embedding_scores(engine, "send communication message", sample_catalog)
 
         # Find slack and email indices
         slack_idx = next(i for i, t in enumerate(tools) if "slack" in t.name)
@@ -235,9 +340,8 @@ class TestEmbeddingSearch:
     def test_embedding_scores_normalized(self, sample_catalog, temp_cache_dir):
         """Test embedding scores are in 0-1 range"""
         engine = ToolSearchEngine(cache_dir=temp_cache_dir)
-        tools = list(sample_catalog.tools.values())
 
-        scores = engine._embedding_search("test query", tools)
+        scores = embedding_scores(engine, "test query", sample_catalog)
 
         assert all(0 <= s <= 1 for s in scores)
 
@@ -293,18 +397,46 @@ class TestCaching:
         tools = list(sample_catalog.tools.values())
 
         # First search - computes embeddings
-        engine._embedding_search("test", tools)
+        embedding_scores(engine, "test", sample_catalog)
 
-        # Check cache files exist
-        cache_files = list(temp_cache_dir.glob("emb_*.npy"))
-        assert len(cache_files) > 0
+        # Check consolidated store exists with one row per tool
+        assert list(temp_cache_dir.glob("embeddings_*.f32"))
+        rows = len(engine.embedding_store)
+        assert rows == len(tools)
 
         # Second search - should use cached embeddings
-        engine._embedding_search("test", tools)
+        embedding_scores(engine, "test", sample_catalog)
+
+        # Row count should remain the same
+        assert len(engine.embedding_store) == rows
+
+    def test_embedding_store_shared_across_engines(self, sample_catalog, temp_cache_dir):
+        """Test a second engine reuses the mapped matrix without re-encoding"""
+        first = ToolSearchEngine(cache_dir=temp_cache_dir)
+        first.embedding_model = FakeEmbeddingModel()
+        expected = embedding_scores(first, "send message", sample_catalog)
+
+        second = ToolSearchEngine(cache_dir=temp_cache_dir)
+        second.embedding_model = FakeEmbeddingModel()
+        actual = embedding_scores(second, "send message", sample_catalog)
+
+        assert actual == pytest.approx(expected)
+        # Only the query was encoded; tool vectors came from the store
+        assert second.embedding_model.encoded == ["send message"]
 
-        # Cache file count should remain the same
-        cache_files_after = list(temp_cache_dir.glob("emb_*.npy"))
-        assert len(cache_files_after) == len(cache_files)
+    def test_embedding_store_reencodes_changed_tool(self, sample_catalog, temp_cache_dir):
+        """Test re-registered tools with new descriptions get a new row"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        engine.embedding_model = FakeEmbeddingModel()
+        embedding_scores(engine, "test", sample_catalog)
+        rows_before = len(engine.embedding_store)
+
+        sample_catalog.add_tool(sample_catalog.tools["email_send"].model_copy(
+            update={"description": "Send an email with attachments"}
+        ))
+        embedding_scores(engine, "test", sample_catalog)
+
+        assert len(engine.embedding_store) == rows_before + 1
 
     def test_query_result_caching(self, sample_catalog, temp_cache_dir):
         """Test query results are cached"""
@@ -337,6 +469,312 @@ class TestCaching:
             assert s1 == s2
 
 
+class TestColdStartEncoding:
+    """Test batched encoding of uncached tool embeddings"""
+
+    def test_cache_misses_encoded_in_batches(self, temp_cache_dir):
+        """Test misses are encoded in batches of encode_batch_size"""
+        catalog = ToolCatalog(source="test")
+        for i in range(25):
+            catalog.add_tool(ToolDefinition(
+                name=f"tool_{i}", type="function", description=f"Tool {i}", source="test"
+            ))
+
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, encode_batch_size=10)
+        engine.embedding_model = FakeEmbeddingModel()
+        embedding_scores(engine, "query", catalog)
+
+        # One call for the query, then 10 + 10 + 5 tool texts
+        assert engine.embedding_model.batches == [1, 10, 10, 5]
+
+    def test_warm_prebuilds_embeddings(self, sample_catalog, temp_cache_dir):
+        """Test warm() encodes the catalog so searches only encode the query"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        engine.embedding_model = FakeEmbeddingModel()
+
+        assert engine.warm(sample_catalog) == 6
+        assert len(engine.embedding_store) == 6
+        assert len(engine.bm25_index) == 6
+
+        engine.embedding_model.batches.clear()
+        embedding_scores(engine, "send message", sample_catalog)
+        assert engine.embedding_model.batches == [1]
+
+
+class TestBatchSearch:
+    """Test multi-query search_many API"""
+
+    @pytest.fixture
+    def large_catalog(self, sample_catalog):
+        for i in range(20):
+            sample_catalog.add_tool(ToolDefinition(
+                name=f"report_tool_{i}",
+                type="function",
+                description=f"Generate report number {i} for analytics",
+                domain="data",
+                source="test",
+            ))
+        return sample_catalog
+
+    def test_search_many_matches_search(self, large_catalog, temp_cache_dir, tmp_path):
+        """Test batch results equal per-query search results"""
+        queries = ["send slack message", "receipt ocr", "analytics report", "sql database"]
+
+        batch_engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        batch_engine.embedding_model = FakeEmbeddingModel()
+        batch_results = batch_engine.search_many(queries, large_catalog, top_k=3, min_score=0.0)
+
+        single_engine = ToolSearchEngine(cache_dir=tmp_path)
+        single_engine.embedding_model = FakeEmbeddingModel()
+        for query, results in zip(queries, batch_results, strict=True):
+            expected = single_engine.search(query, large_catalog, top_k=3, min_score=0.0)
+            assert [t.name for t, _ in results] == [t.name for t, _ in expected]
+            assert [s for _, s in results] == pytest.approx([s for _, s in expected])
+
+    def test_search_many_single_encode_call(self, large_catalog, temp_cache_dir):
+        """Test all queries are encoded in one model call"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        engine.embedding_model = FakeEmbeddingModel()
+        engine.warm(large_catalog)
+        engine.embedding_model.batches.clear()
+
+        results = engine.search_many(["a", "b", "c", "a"], large_catalog, top_k=2, min_score=0.0)
+
+        assert engine.embedding_model.batches == [3]
+        assert len(results) == 4
+        assert results[0] == results[3]
+        assert all(len(r) == 2 for r in results)
+
+    def test_search_many_respects_filters(self, large_catalog, temp_cache_dir):
+        """Test domain filter is applied to every query"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        engine.embedding_model = FakeEmbeddingModel()
+
+        results = engine.search_many(
+            ["report", "message"], large_catalog, top_k=5, min_score=0.0, domain="data"
+        )
+
+        for query_results in results:
+            assert all(tool.domain == "data" for tool, _ in query_results)
+
+
+class TestQueryCache:
+    """Test in-memory LRU query cache keyed on catalog content"""
+
+    @pytest.fixture
+    def large_catalog(self, sample_catalog):
+        for i in range(20):
+            sample_catalog.add_tool(ToolDefinition(
+                name=f"extra_tool_{i}", type="function", description=f"Extra tool {i}", source="test"
+            ))
+        return sample_catalog
+
+    def test_memory_hit_skips_disk(self, large_catalog, temp_cache_dir):
+        """Test memory-only cache serves repeats without writing files"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, disk_cache=False)
+        engine.embedding_model = FakeEmbeddingModel()
+
+        first = engine.search("send email", large_catalog, top_k=3, min_score=0.0)
+        engine.embedding_model.batches.clear()
+        second = engine.search("send email", large_catalog, top_k=3, min_score=0.0)
+
+        assert first == second
+        assert engine.embedding_model.batches == []
+        assert not list(temp_cache_dir.glob("search_*.pkl"))
+
+    def test_description_change_invalidates(self, large_catalog, temp_cache_dir):
+        """Test changing a tool description changes the cache key"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        key_before = engine._get_cache_key("q", large_catalog)
+        assert engine._get_cache_key("q", large_catalog) == key_before
+
+        large_catalog.add_tool(large_catalog.tools["file_read"].model_copy(
+            update={"description": "Read a file from object storage"}
+        ))
+
+        assert engine._get_cache_key("q", large_catalog) != key_before
+
+    def test_lru_eviction_and_ttl(self, temp_cache_dir):
+        """Test size bound evicts oldest entry and TTL expires entries"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, query_cache_size=2, disk_cache=False)
+
+        engine._save_to_cache("a", [])
+        engine._save_to_cache("b", [])
+        engine._load_from_cache("a")  # "a" becomes most recently used
+        engine._save_to_cache("c", [])
+
+        assert engine._load_from_cache("b") is None
+        assert engine._load_from_cache("a") == []
+
+        engine.query_cache_ttl_s = 0
+        engine._query_cache["c"] = (0.0, [])
+        assert engine._load_from_cache("c") is None
+
+
+class TestTwoStageSearch:
+    """Test retrieve-then-rerank search mode"""
+
+    @pytest.fixture
+    def large_catalog(self):
+        catalog = ToolCatalog(source="test")
+        verbs = ["create", "delete", "list", "update"]
+        nouns = ["issue", "user", "invoice", "channel", "report"]
+        for i in range(60):
+            verb, noun = verbs[i % 4], nouns[i % 5]
+            catalog.add_tool(ToolDefinition(
+                name=f"{verb}_{noun}_{i}",
+                type="function",
+                description=f"{verb.capitalize()} a {noun} record {i}",
+                source="test",
+            ))
+        return catalog
+
+    def test_two_stage_matches_exhaustive_with_wide_candidates(self, large_catalog, temp_cache_dir):
+        """Test two-stage equals exhaustive when all matches are candidates"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, disk_cache=False, candidate_k=1000)
+        engine.embedding_model = FakeEmbeddingModel()
+
+        for query in ["create issue", "delete user invoice"]:
+            exhaustive = engine.search(query, large_catalog, top_k=5, min_score=0.0, mode="exhaustive")
+            two_stage = engine.search(query, large_catalog, top_k=5, min_score=0.0, mode="two_stage")
+            assert [t.name for t, _ in two_stage] == [t.name for t, _ in exhaustive]
+            assert [s for _, s in two_stage] == pytest.approx([s for _, s in exhaustive])
+
+    def test_two_stage_falls_back_without_keyword_matches(self, large_catalog, temp_cache_dir):
+        """Test queries with no BM25 candidates still return results"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, disk_cache=False, search_mode="two_stage")
+        engine.embedding_model = FakeEmbeddingModel()
+
+        results = engine.search("zzz unmatched", large_catalog, top_k=3, min_score=0.0)
+        assert len(results) == 3
+
+    def test_recall_report(self, large_catalog, temp_cache_dir):
+        """Test recall report compares two-stage against exhaustive"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, disk_cache=False)
+        engine.embedding_model = FakeEmbeddingModel()
+
+        report = engine.recall_report(["create issue", "list report"], large_catalog, top_k=5, candidate_k=5)
+
+        assert report["top_k"] == 5
+        assert report["candidate_k"] == 5
+        assert report["num_tools"] == 60
+        assert 0.0 <= report["recall_at_k"] <= 1.0
+        assert len(report["queries"]) == 2
+        assert engine.candidate_k == 200
+
+    def test_unknown_mode_rejected(self, large_catalog, temp_cache_dir):
+        """Test invalid mode raises ValueError"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        with pytest.raises(ValueError):
+            engine.search("create issue", large_catalog, mode="fuzzy")
+
+
+class TestAsyncSearch:
+    """Test non-blocking search_async entry point"""
+
+    @pytest.fixture
+    def large_catalog(self, sample_catalog):
+        for i in range(20):
+            sample_catalog.add_tool(ToolDefinition(
+                name=f"extra_tool_{i}", type="function", description=f"Extra tool {i}", source="test"
+            ))
+        return sample_catalog
+
+    async def test_search_async_matches_search(self, large_catalog, temp_cache_dir, tmp_path):
+        """Test async results equal synchronous results"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, disk_cache=False)
+        engine.embedding_model = FakeEmbeddingModel()
+        sync_engine = ToolSearchEngine(cache_dir=tmp_path, disk_cache=False)
+        sync_engine.embedding_model = FakeEmbeddingModel()
+
+        results = await engine.search_async("send email", large_catalog, top_k=3, min_score=0.0)
+        expected = sync_engine.search("send email", large_catalog, top_k=3, min_score=0.0)
+
+        assert [t.name for t, _ in results] == [t.name for t, _ in expected]
+
+    async def test_search_async_does_not_block_loop(self, large_catalog, temp_cache_dir):
+        """Test slow encodes run off the event loop with bounded concurrency"""
+        import asyncio
+        import threading
+        import time as time_module
+
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class SlowModel(FakeEmbeddingModel):
+            def encode(self, sentences, **kwargs):
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time_module.sleep(0.05)
+                with lock:
+                    active -= 1
+                return super().encode(sentences, **kwargs)
+
+        engine = ToolSearchEngine(
+            cache_dir=temp_cache_dir,
+            disk_cache=False,
+            inference_executor=InferenceExecutor(max_concurrency=1),
+        )
+        engine.embedding_model = SlowModel()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        await asyncio.gather(*[
+            engine.search_async(f"query {i}", large_catalog, min_score=0.0) for i in range(3)
+        ])
+        ticker_task.cancel()
+
+        assert ticks > 5
+        assert peak == 1
+        engine.inference_executor.shutdown()
+
+    async def test_search_async_offloads_only_encodes(self, large_catalog, temp_cache_dir):
+        """Test cache hits skip the executor and engine state is updated on the loop thread"""
+        import threading
+
+        class RecordingExecutor(InferenceExecutor):
+            def __init__(self):
+                super().__init__()
+                self.calls: list[str] = []
+
+            async def run(self, func, *args, **kwargs):
+                self.calls.append(func.__name__)
+                return await super().run(func, *args, **kwargs)
+
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir, disk_cache=False, inference_executor=RecordingExecutor())
+        engine.embedding_model = FakeEmbeddingModel()
+        append_threads = []
+        append_many = engine.embedding_store.append_many
+
+        def recording_append_many(keys, vectors):
+            append_threads.append(threading.current_thread())
+            return append_many(keys, vectors)
+
+        engine.embedding_store.append_many = recording_append_many
+
+        first = await engine.search_async("send email", large_catalog, min_score=0.0)
+        assert engine.inference_executor.calls == ["_query_embeddings", "_encode_texts"]
+        assert append_threads == [threading.main_thread()]
+
+        again = await engine.search_async("send email", large_catalog, min_score=0.0)
+        assert again == first
+        assert engine.inference_executor.calls == ["_query_embeddings", "_encode_texts"]
+
+        await engine.search_async("read file", large_catalog, min_score=0.0)
+        assert engine.inference_executor.calls[2:] == ["_query_embeddings"]
+        engine.inference_executor.shutdown()
+
+
 class TestScoreThresholds:
     """Test minimum score filtering"""
 
@@ -466,6 +904,75 @@ class TestConvenienceFunction:
         assert {t.name for t in comms_tools} == {"slack_send_message", "email_send"}
 
 
+class TestFilterPositions:
+    """Test precomputed domain/type positions used by filtered searches"""
+
+    def test_positions_match_filters(self, sample_catalog, temp_cache_dir):
+        """Test positions for domain, type and combined filters"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        view = engine._get_catalog_view(sample_catalog)
+
+        def names(positions):
+            return {view.tools[i].name for i in positions}
+
+        assert names(view.positions("finance")) == {"receipt_ocr", "line_item_parser"}
+        assert names(view.positions(type_filter="mcp")) == {"receipt_ocr", "line_item_parser"}
+        assert names(view.positions("comms", "function")) == {"slack_send_message", "email_send"}
+        assert len(view.positions("comms", "mcp")) == 0
+        assert len(view.positions("missing")) == 0
+        assert len(view.positions()) == 6
+
+    def test_view_reused_until_catalog_changes(self, sample_catalog, temp_cache_dir):
+        """Test the view is rebuilt only when tool objects change"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        view = engine._get_catalog_view(sample_catalog)
+        assert engine._get_catalog_view(sample_catalog) is view
+
+        sample_catalog.add_tool(ToolDefinition(
+            name="sms_send", type="function", description="Send an SMS", domain="comms", source="test"
+        ))
+        rebuilt = engine._get_catalog_view(sample_catalog)
+        assert rebuilt is not view
+        assert "sms_send" in {rebuilt.tools[i].name for i in rebuilt.positions("comms")}
+
+    def test_view_validated_by_generation(self, sample_catalog, temp_cache_dir, monkeypatch):
+        """Test a cached view is reused without walking the tools, and re-registration rebuilds it"""
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        view = engine._get_catalog_view(sample_catalog)
+
+        class NoScan(dict):
+            def values(self):
+                raise AssertionError("catalog tools scanned for a cached view")
+
+        monkeypatch.setattr(sample_catalog, "tools", NoScan(sample_catalog.tools))
+        assert engine._get_catalog_view(sample_catalog) is view
+        monkeypatch.undo()
+
+        updated = sample_catalog.tools["email_send"].model_copy(update={"description": "Send an email now"})
+        sample_catalog.add_tool(updated)
+        rebuilt = engine._get_catalog_view(sample_catalog)
+        assert rebuilt is not view
+        assert updated in rebuilt.tools
+
+    def test_filtered_search_scores_only_matching_rows(self, sample_catalog, temp_cache_dir):
+        """Test filtered search returns only tools from the requested domain"""
+        for i in range(30):
+            sample_catalog.add_tool(ToolDefinition(
+                name=f"ledger_tool_{i}",
+                type="function",
+                description=f"Post ledger entry {i}",
+                domain="finance" if i % 2 else "data",
+                source="test",
+            ))
+        engine = ToolSearchEngine(cache_dir=temp_cache_dir)
+        engine.embedding_model = FakeEmbeddingModel()
+
+        results = engine.search("ledger entry", sample_catalog, top_k=5, min_score=0.0, domain="finance")
+
+        assert len(results) == 5
+        assert all(tool.domain == "finance" for tool, _ in results)
+
+
 class TestExplainResults:
     """Test result explanation functionality"""
 
@@ -4,12 +4,21 @@ Tests for Vector Tool Search Engine (Phase 7)
 Validates Qdrant integration, fallback behavior, and performance.
 """
 
+import threading
 import time
+from types import SimpleNamespace
 
+import numpy as np
 import pytest
 
 from orchestrator.shared.models import ToolCatalog, ToolDefinition, ToolParameter
-from orchestrator.tools.vector_search import VectorToolSearchEngine
+from orchestrator.tools.embedding_store import EmbeddingStore
+from orchestrator.tools.inference import InferenceExecutor
+from orchestrator.tools.vector_search import (
+    InMemoryVectorIndex,
+    IVFVectorIndex,
+    VectorToolSearchEngine,
+)
 
 
 @pytest.fixture
@@ -314,5 +323,438 @@ def test_scalability(search_engine_with_fallback, catalog_size):
         assert search_time < target * 5, f"Search time {search_time:.1f}ms exceeds {target*5}ms (5x target)"
 
 
+def test_in_memory_index_matches_bruteforce():
+    """Vectorized fallback ranks like per-tool cosine similarity"""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16)).astype(np.float32)
+    names = [f"tool_{i}" for i in range(200)]
+    domains = ["github" if i % 2 else "slack" for i in range(200)]
+
+    index = InMemoryVectorIndex(dim=16)
+    index.upsert_many(names, domains, vectors)
+    query = rng.normal(size=16)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = sorted(
+        ((n, float(v @ (query / np.linalg.norm(query)))) for n, d, v in zip(names, domains, normalized, strict=True)
+         if d == "github"),
+        key=lambda x: x[1],
+        reverse=True,
+    )[:5]
+
+    hits = index.search(query, top_k=5, min_score=-1.0, domain="github")
+    assert [n for n, _ in hits] == [n for n, _ in expected]
+    assert [s for _, s in hits] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+
+def test_in_memory_index_remove_and_reuse():
+    """Deleted rows are excluded from search and reused on insert"""
+    index = InMemoryVectorIndex(dim=4)
+    index.upsert_many(["a", "b"], ["x", "y"], np.eye(4)[:2])
+
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert len(index) == 1
+    assert [n for n, _ in index.search(np.eye(4)[0], top_k=5)] == ["b"]
+
+    index.upsert_many(["c"], ["x"], np.eye(4)[2:3])
+    assert len(index.names) == 2
+    assert [n for n, _ in index.search(np.eye(4)[2], top_k=1, domain="x")] == ["c"]
+
+
+def test_in_memory_index_allowed_names():
+    """Hits outside the caller's catalog are skipped without losing top_k"""
+    index = InMemoryVectorIndex(dim=2)
+    index.upsert_many(["a", "b", "c"], ["g", "g", "g"], [[1, 0], [0.9, 0.1], [0.5, 0.5]])
+
+    hits = index.search([1, 0], top_k=2, min_score=0.0, allowed={"b", "c"})
+    assert [n for n, _ in hits] == ["b", "c"]
+
+
+def test_memory_fallback_with_fake_model(large_catalog):
+    """Fallback search uses the contiguous index end to end"""
+    class KeywordModel:
+        vocab = ["github", "slack", "aws", "database", "utility", "messages", "pr"]
+
+        def encode(self, texts, **kwargs):
+            return np.array([
+                [1.0 if w in t.lower() else 0.0 for w in self.vocab] + [0.01] for t in texts
+            ])
+
+    engine = VectorToolSearchEngine(fallback_to_memory=True, embedding_dim=8, use_gpu=False)
+    engine.client = object()  # skip Qdrant connection attempts
+    engine.qdrant_available = False
+    engine.embedding_model = KeywordModel()
+
+    assert engine.index_catalog(large_catalog)
+    results = engine.search("slack messages", large_catalog, top_k=3, domain="slack")
+    assert len(results) == 3
+    assert all(tool.domain == "slack" for tool, _ in results)
+
+    assert engine.delete_tool("slack_operation_0")
+    names = {tool.name for tool, _ in engine.search("slack messages", large_catalog, top_k=50)}
+    assert "slack_operation_0" not in names
+
+
+def _clustered_vectors(n, dim=16, topics=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    return (centers[rng.integers(0, topics, n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def test_ivf_index_full_probe_matches_exhaustive():
+    """Probing every list returns exactly the exhaustive ranking"""
+    vectors = _clustered_vectors(500)
+    names = [f"tool_{i}" for i in range(500)]
+    domains = ["github" if i % 3 else "slack" for i in range(500)]
+
+    exact = InMemoryVectorIndex(dim=16)
+    exact.upsert_many(names, domains, vectors)
+    ivf = IVFVectorIndex(dim=16, n_lists=10, min_train_size=100)
+    ivf.upsert_many(names, domains, vectors)
+    assert ivf.is_trained
+
+    query = vectors[7] + 0.1
+    assert ivf.search(query, top_k=10, n_probe=10) == exact.search(query, top_k=10)
+    assert [n for n, _ in ivf.search(query, top_k=10, domain="slack", n_probe=10)] == [
+        n for n, _ in exact.search(query, top_k=10, domain="slack")
+    ]
+    # Default probing is approximate but finds the query's own neighbourhood
+    assert ivf.search(vectors[7], top_k=1)[0][0] == "tool_7"
+
+
+def test_ivf_index_untrained_is_exhaustive():
+    """Below min_train_size the index behaves like the exhaustive one"""
+    ivf = IVFVectorIndex(dim=4, min_train_size=100)
+    ivf.upsert_many(["a", "b"], ["x", "y"], np.eye(4)[:2])
+    assert not ivf.is_trained
+    assert [n for n, _ in ivf.search(np.eye(4)[1], top_k=1)] == ["b"]
+
+
+def test_ivf_index_incremental_insert_delete():
+    """Inserts after training are assigned to lists; deletes leave them"""
+    vectors = _clustered_vectors(300)
+    names = [f"tool_{i}" for i in range(300)]
+    ivf = IVFVectorIndex(dim=16, n_lists=8, min_train_size=200, retrain_growth=100)
+    ivf.upsert_many(names[:200], ["d"] * 200, vectors[:200])
+    centroids = ivf.centroids.copy()
+
+    ivf.upsert_many(names[200:], ["d"] * 100, vectors[200:])
+    assert np.array_equal(ivf.centroids, centroids)  # no retrain
+    assert sum(len(rows) for rows in ivf._lists) == 300
+    assert ivf.search(vectors[250], top_k=1)[0][0] == "tool_250"
+
+    assert ivf.remove("tool_250")
+    assert sum(len(rows) for rows in ivf._lists) == 299
+    assert "tool_250" not in [n for n, _ in ivf.search(vectors[250], top_k=5, n_probe=8)]
+
+
+def test_ivf_index_save_load_roundtrip(tmp_path):
+    """A saved index reloads with the same lists and results"""
+    vectors = _clustered_vectors(400)
+    names = [f"tool_{i}" for i in range(400)]
+    ivf = IVFVectorIndex(dim=16, n_lists=8, n_probe=2, min_train_size=100)
+    ivf.upsert_many(names, ["d"] * 400, vectors)
+    ivf.remove("tool_3")
+
+    path = tmp_path / "index.npz"
+    ivf.save(path)
+    loaded = IVFVectorIndex.load(path)
+
+    assert len(loaded) == 399
+    assert np.array_equal(loaded.centroids, ivf.centroids)
+    assert loaded.n_probe == 2
+    for query in vectors[:20]:
+        assert loaded.search(query, top_k=5) == ivf.search(query, top_k=5)
+
+
+def test_ann_index_persisted_by_engine(large_catalog, tmp_path):
+    """index_catalog saves the IVF index and a new engine reuses it"""
+    class KeywordModel:
+        vocab = ["github", "slack", "aws", "database", "utility", "messages", "pr"]
+
+        def encode(self, texts, **kwargs):
+            return np.array([
+                [1.0 if w in t.lower() else 0.0 for w in self.vocab] + [0.01] for t in texts
+            ])
+
+    path = tmp_path / "tools.npz"
+    engine = VectorToolSearchEngine(embedding_dim=8, use_gpu=False, ann_index_path=path)
+    engine.client = object()
+    engine.embedding_model = KeywordModel()
+    assert isinstance(engine.memory_embeddings, IVFVectorIndex)
+    assert engine.index_catalog(large_catalog)
+    assert path.exists()
+
+    restored = VectorToolSearchEngine(embedding_dim=8, use_gpu=False, ann_index_path=path)
+    restored.client = object()
+    restored.embedding_model = KeywordModel()
+    assert len(restored.memory_embeddings) == len(large_catalog.tools)
+
+    results = restored.search("slack messages", large_catalog, top_k=3, domain="slack")
+    assert len(results) == 3
+    assert all(tool.domain == "slack" for tool, _ in results)
+
+
+@pytest.mark.parametrize("dtype,max_bytes", [("float16", 2), ("int8", 1.1)])
+def test_quantized_index_matches_float32(dtype, max_bytes):
+    """Quantized storage is smaller and ranks like the float32 index"""
+    vectors = _clustered_vectors(1000, dim=64)
+    names = [f"tool_{i}" for i in range(1000)]
+    exact = InMemoryVectorIndex(dim=64)
+    exact.upsert_many(names, ["d"] * 1000, vectors)
+    quantized = InMemoryVectorIndex(dim=64, dtype=dtype)
+    quantized.upsert_many(names, ["d"] * 1000, vectors)
+
+    assert quantized.nbytes <= exact.nbytes * max_bytes / 4
+    assert np.allclose(quantized["tool_5"], exact["tool_5"], atol=0.01)
+
+    recall = 0.0
+    for query in vectors[:50]:
+        expected = {n for n, _ in exact.search(query, top_k=10)}
+        recall += len(expected & {n for n, _ in quantized.search(query, top_k=10)}) / 10
+    assert recall / 50 >= 0.9
+
+
+def test_quantized_index_exact_rerank(tmp_path):
+    """Reranked scores are the exact float32 cosine similarities"""
+    vectors = _clustered_vectors(300, dim=32)
+    names = [f"tool_{i}" for i in range(300)]
+    exact = InMemoryVectorIndex(dim=32)
+    exact.upsert_many(names, ["d"] * 300, vectors)
+
+    store = EmbeddingStore(tmp_path, name="vectors")
+    reranked = InMemoryVectorIndex(dim=32, dtype="int8", exact_store=store, rerank_factor=4)
+    reranked.upsert_many(names, ["d"] * 300, vectors)
+    assert len(store) == 300
+
+    query = vectors[11] + 0.05
+    hits = reranked.search(query, top_k=5)
+    expected = exact.search(query, top_k=5)
+    assert [n for n, _ in hits] == [n for n, _ in expected]
+    assert [s for _, s in hits] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+
+def test_quantized_ivf_save_load(tmp_path):
+    """Quantized IVF indexes persist codes, scales and exact-store rows"""
+    vectors = _clustered_vectors(400)
+    names = [f"tool_{i}" for i in range(400)]
+    store = EmbeddingStore(tmp_path, name="vectors")
+    ivf = IVFVectorIndex(dim=16, n_lists=8, min_train_size=100, dtype="int8", exact_store=store)
+    ivf.upsert_many(names, ["d"] * 400, vectors)
+
+    ivf.save(tmp_path / "index.npz")
+    loaded = IVFVectorIndex.load(tmp_path / "index.npz", exact_store=store)
+
+    assert loaded.dtype == "int8"
+    assert loaded.matrix.dtype == np.int8
+    for query in vectors[:10]:
+        assert loaded.search(query, top_k=5) == ivf.search(query, top_k=5)
+
+
+def test_quantized_embedding_cache():
+    """Engine cache stores quantized entries and returns float32 vectors"""
+    engine = VectorToolSearchEngine(embedding_dim=8, use_gpu=False, embedding_dtype="int8")
+    engine.client = object()
+
+    class Model:
+        def encode(self, texts, **kwargs):
+            return np.array([[len(t), 1, 0, 0, 0, 0, 0, 1] for t in texts], dtype=np.float32)
+
+    engine.embedding_model = Model()
+    first = engine._generate_embeddings_batch(["abc"], show_progress=False)
+    cached = engine._generate_embeddings_batch(["abc"], show_progress=False)
+
+    entry = next(iter(engine.embedding_cache.values()))
+    assert entry.codes.dtype == np.int8
+    assert np.allclose(cached, first, rtol=0.01)
+
+
+class CountingModel:
+    """Deterministic fake encoder that records every text it encodes"""
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                vectors[i, hash(token) % self.dim] += 1.0
+        return vectors
+
+
+def _delta_catalog(n=20):
+    return ToolCatalog(tools={
+        f"tool_{i}": ToolDefinition(
+            name=f"tool_{i}", type="function", description=f"Operation number {i}", domain="general"
+        )
+        for i in range(n)
+    })
+
+
+def test_index_catalog_delta_memory(tmp_path):
+    """Re-indexing only encodes added/changed tools and drops removed ones"""
+    engine = VectorToolSearchEngine(embedding_dim=8, use_gpu=False, ann_index_path=tmp_path / "idx.npz")
+    engine.client = object()
+    engine.embedding_model = model = CountingModel()
+
+    catalog = _delta_catalog()
+    assert engine.index_catalog(catalog)
+    assert len(model.encoded) == 20
+
+    model.encoded.clear()
+    assert engine.index_catalog(catalog)
+    assert model.encoded == []
+
+    catalog.tools["tool_3"] = ToolDefinition(
+        name="tool_3", type="function", description="Renamed operation", domain="general"
+    )
+    catalog.tools["tool_new"] = ToolDefinition(
+        name="tool_new", type="function", description="Brand new operation", domain="general"
+    )
+    del catalog.tools["tool_7"]
+    assert engine.index_catalog(catalog)
+    assert sorted(model.encoded) == ["Brand new operation", "Renamed operation"]
+    assert "tool_7" not in engine.memory_embeddings
+    assert len(engine.memory_embeddings) == 20
+
+    # Partial catalogs can be indexed without deleting everything else
+    model.encoded.clear()
+    partial = ToolCatalog(tools={"tool_1": catalog.tools["tool_1"]})
+    assert engine.index_catalog(partial, delete_missing=False)
+    assert model.encoded == [] and len(engine.memory_embeddings) == 20
+
+    # A restarted engine restores the hashes with the persisted index
+    restored = VectorToolSearchEngine(embedding_dim=8, use_gpu=False, ann_index_path=tmp_path / "idx.npz")
+    restored.client = object()
+    restored.embedding_model = restored_model = CountingModel()
+    assert restored.index_catalog(catalog)
+    assert restored_model.encoded == []
+
+
+class FakeQdrant:
+    """In-memory stand-in for the Qdrant client calls used by indexing"""
+
+    def __init__(self):
+        self.points = {}
+        self.upsert_calls = 0
+        self.deleted = []
+
+    def get_collections(self):
+        return SimpleNamespace(collections=[SimpleNamespace(name="toolweaver_tools")])
+
+    def upsert(self, collection_name, points):
+        self.upsert_calls += 1
+        for point in points:
+            self.points[point.id] = point
+
+    def scroll(self, collection_name, limit, offset=None, **kwargs):
+        assert "scroll_filter" not in kwargs
+        ids = sorted(self.points, key=str)
+        start = offset or 0
+        page = [self.points[i] for i in ids[start:start + limit]]
+        return page, (start + limit if start + limit < len(ids) else None)
+
+    def delete(self, collection_name, points_selector):
+        self.deleted.append(list(points_selector))
+        for point_id in points_selector:
+            self.points.pop(point_id, None)
+
+
+def _qdrant_engine(monkeypatch, client, **kwargs):
+    from orchestrator.tools import vector_search
+
+    monkeypatch.setattr(vector_search, "PointStruct", SimpleNamespace)
+    engine = VectorToolSearchEngine(embedding_dim=8, use_gpu=False, **kwargs)
+    engine.client = client
+    engine.qdrant_available = True
+    engine.embedding_model = CountingModel()
+    return engine
+
+
+def test_index_catalog_delta_qdrant(monkeypatch):
+    """Qdrant indexing upserts changed tools in batches and deletes removed ones"""
+    client = FakeQdrant()
+    # A point written by the old sequential-ID indexer
+    client.points[0] = SimpleNamespace(id=0, payload={"tool_name": "tool_0"})
+
+    engine = _qdrant_engine(monkeypatch, client, upsert_batch_size=8)
+    model = engine.embedding_model
+
+    catalog = _delta_catalog()
+    assert engine.index_catalog(catalog)
+    assert len(model.encoded) == 20
+    assert client.upsert_calls == 3  # 20 points in batches of 8
+    assert 0 not in client.points and len(client.points) == 20
+
+    del catalog.tools["tool_5"]
+    model.encoded.clear()
+    fresh = _qdrant_engine(monkeypatch, client)
+    fresh.embedding_model = model
+    assert fresh.index_catalog(catalog)
+    assert model.encoded == []
+    assert {p.payload["tool_name"] for p in client.points.values()} == set(catalog.tools)
+
+
+def test_partial_qdrant_index_keeps_legacy_points(monkeypatch):
+    """Legacy points survive partial indexing; delete_tool deletes by stable point ID"""
+    client = FakeQdrant()
+    client.points[0] = SimpleNamespace(id=0, payload={"tool_name": "tool_0"})
+    engine = _qdrant_engine(monkeypatch, client)
+
+    partial = ToolCatalog(tools={"tool_1": _delta_catalog().tools["tool_1"]})
+    assert engine.index_catalog(partial, delete_missing=False)
+    assert 0 in client.points
+
+    assert engine.index_catalog(_delta_catalog())
+    assert 0 not in client.points
+
+    client.deleted.clear()
+    assert engine.delete_tool("tool_3")
+    assert client.deleted == [[engine._get_point_id("tool_3")]]
+    assert "tool_3" not in engine._qdrant_hashes
+
+
+async def test_search_async_offloads_only_encodes():
+    """Cached query embeddings skip the inference executor; fallback scoring stays on the loop"""
+    class RecordingExecutor(InferenceExecutor):
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        async def run(self, func, *args, **kwargs):
+            self.calls.append(func.__name__)
+            return await super().run(func, *args, **kwargs)
+
+    engine = VectorToolSearchEngine(embedding_dim=8, use_gpu=False, inference_executor=RecordingExecutor())
+    engine.client = object()  # skip Qdrant connection attempts
+    engine.embedding_model = model = CountingModel()
+    catalog = _delta_catalog()
+    upsert_threads = []
+    upsert_many = engine.memory_embeddings.upsert_many
+
+    def recording_upsert(*args, **kwargs):
+        upsert_threads.append(threading.get_ident())
+        return upsert_many(*args, **kwargs)
+
+    engine.memory_embeddings.upsert_many = recording_upsert
+
+    first = await engine.search_async("operation number 3", catalog, top_k=3, min_score=0.0)
+    # Only the encodes leave the loop; the cold index is filled on the calling thread
+    assert engine.inference_executor.calls == ["_encode_query", "_encode_tools"]
+    assert upsert_threads == [threading.get_ident()]
+    assert first == engine.search("operation number 3", catalog, top_k=3, min_score=0.0)
+
+    model.encoded.clear()
+    again = await engine.search_async("operation number 3", catalog, top_k=3, min_score=0.0)
+    assert again == first
+    assert engine.inference_executor.calls == ["_encode_query", "_encode_tools"]
+    assert model.encoded == []
+    engine.inference_executor.shutdown()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])